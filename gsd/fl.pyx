@@ -12,14 +12,19 @@ See :ref:`fl-examples` for detailed example code.
 
 """
 
+import fnmatch
 import logging
+import mmap
 import numpy
 import os
+import re
 from pickle import PickleError
 import warnings
 from libc.stdint cimport uint8_t, int8_t, uint16_t, int16_t, uint32_t, int32_t,\
-    uint64_t, int64_t
+    uint64_t, int64_t, UINT16_MAX
 from libc.errno cimport errno
+from libc.stdlib cimport malloc, free
+from libc.string cimport memcpy
 cimport gsd.libgsd as libgsd
 cimport numpy
 
@@ -60,6 +65,70 @@ cdef __raise_on_error(retval, extra):
     elif retval != 0:
         raise RuntimeError("Unknown error: " + extra)
 
+# numpy data types of the gsd chunk types
+_numpy_dtype = {
+    libgsd.GSD_TYPE_UINT8: numpy.dtype(numpy.uint8),
+    libgsd.GSD_TYPE_UINT16: numpy.dtype(numpy.uint16),
+    libgsd.GSD_TYPE_UINT32: numpy.dtype(numpy.uint32),
+    libgsd.GSD_TYPE_UINT64: numpy.dtype(numpy.uint64),
+    libgsd.GSD_TYPE_INT8: numpy.dtype(numpy.int8),
+    libgsd.GSD_TYPE_INT16: numpy.dtype(numpy.int16),
+    libgsd.GSD_TYPE_INT32: numpy.dtype(numpy.int32),
+    libgsd.GSD_TYPE_INT64: numpy.dtype(numpy.int64),
+    libgsd.GSD_TYPE_FLOAT: numpy.dtype(numpy.float32),
+    libgsd.GSD_TYPE_DOUBLE: numpy.dtype(numpy.float64),
+    libgsd.GSD_TYPE_CHARACTER: numpy.dtype(numpy.int8),
+}
+
+# numpy data type of gsd_index_entry
+_index_dtype = numpy.dtype([
+    ('frame', numpy.uint64),
+    ('N', numpy.uint64),
+    ('location', numpy.int64),
+    ('M', numpy.uint32),
+    ('id', numpy.uint16),
+    ('type', numpy.uint8),
+    ('flags', numpy.uint8),
+])
+
+_durability = {
+    'fsync': libgsd.GSD_DURABILITY_FSYNC,
+    'fdatasync': libgsd.GSD_DURABILITY_FDATASYNC,
+    'group': libgsd.GSD_DURABILITY_GROUP,
+    'none': libgsd.GSD_DURABILITY_NONE,
+}
+
+
+def _literal_prefix(pattern, syntax):
+    """Find the literal start that all names matching a pattern share.
+
+    Args:
+        pattern (str): Pattern to match.
+        syntax (str): ``'glob'`` or ``'regex'``.
+
+    Returns:
+        str: A prefix of every name that matches *pattern*.
+    """
+    if syntax == 'glob':
+        special = '*?['
+        optional = ''
+    else:
+        # alternatives may start with any string
+        if '|' in pattern:
+            return ''
+        special = '.^$*+?{}[]\\|()'
+        optional = '*?{'
+
+    for i, c in enumerate(pattern):
+        if c in special:
+            # the quantifier applies to the previous character
+            if c in optional and i > 0:
+                return pattern[: i - 1]
+            return pattern[:i]
+
+    return pattern
+
+
 # Getter methods for 2D numpy arrays of all supported types
 # cython needs strongly typed numpy arrays to get a void *
 # to the data, so we implement each by hand here and dispacth
@@ -146,8 +215,12 @@ cdef void * __get_ptr_float64(data):
         return <void*>&data_array_float64[0, 0]
 
 
-def open(name, mode, application=None, schema=None, schema_version=None):
-    """open(name, mode, application=None, schema=None, schema_version=None)
+def open(name, mode, application=None, schema=None, schema_version=None,
+         compression=None, durability='fsync', expected_frames=None,
+         expected_index_entries=None, expected_names=None):
+    """open(name, mode, application=None, schema=None, schema_version=None, \
+    compression=None, durability='fsync', expected_frames=None, \
+    expected_index_entries=None, expected_names=None)
 
     :py:func:`open` opens a GSD file and returns a :py:class:`GSDFile` instance.
     The return value of :py:func:`open` can be used as a context manager.
@@ -164,6 +237,18 @@ def open(name, mode, application=None, schema=None, schema_version=None):
         schema_version (tuple[int, int]): Schema version number
             (major, minor).
 
+        compression (list[str]): Compress chunks with names that match any
+            of these shell-style patterns (see `fnmatch`).
+
+        durability (str): When to sync written data to the storage device.
+
+        expected_frames (int): Expected number of frames in the file.
+
+        expected_index_entries (int): Expected number of chunks in the file.
+
+        expected_names (int): Expected number of distinct chunk names in the
+            file.
+
     Valid values for ``mode``:
 
     +------------------+---------------------------------------------+
@@ -195,6 +280,45 @@ def open(name, mode, application=None, schema=None, schema_version=None):
     When opening a file for writing (``'w'``, ``'x'``, or ``'a'`` modes): The
     given ``application``, ``schema``, and ``schema_version`` must not be None.
 
+    :py:meth:`GSDFile.write_chunk` shuffles the bytes of chunks with names that
+    match a pattern in ``compression`` and compresses them. Compression is most
+    effective on numeric data where neighboring values are similar, such as
+    particle positions, velocities, and images. :py:meth:`GSDFile.read_chunk`
+    decompresses chunks transparently. Files with compressed chunks require
+    GSD 3.5 or newer to read.
+
+    Valid values for ``durability``:
+
+    +------------------+---------------------------------------------+
+    | durability       | description                                 |
+    +==================+=============================================+
+    | ``'fsync'``      | Call ``fsync`` on every flush.              |
+    +------------------+---------------------------------------------+
+    | ``'fdatasync'``  | Call ``fdatasync`` on every flush.          |
+    +------------------+---------------------------------------------+
+    | ``'group'``      | Flush and call ``fsync`` at the end of a    |
+    |                  | frame only after                            |
+    |                  | `GSDFile.group_commit_frames` frames or     |
+    |                  | `GSDFile.group_commit_interval` seconds.    |
+    +------------------+---------------------------------------------+
+    | ``'none'``       | Never sync.                                 |
+    +------------------+---------------------------------------------+
+
+    Each flush writes the data of a frame before the index entries that refer
+    to it. With ``'fsync'``, ``'fdatasync'``, and ``'group'``, the data reaches
+    the storage device before the index, so a system crash loses at most the
+    frames written after the last flush. ``'none'`` leaves the order in which
+    the operating system writes to the device undefined. Syncing is slow on
+    network file systems, choose ``'group'`` or ``'none'`` to sync less often.
+
+    The file index and the name list grow as needed, each time copying their
+    contents to the end of the file and leaving the old copy in place as unused
+    space. When writing, :py:func:`open` reserves space for
+    ``expected_index_entries`` chunks and ``expected_names`` names up front.
+    When the index grows, it grows to hold ``expected_frames`` frames with the
+    average number of chunks per frame written so far. :py:func:`open` ignores
+    these hints when reading.
+
     Example:
 
         .. ipython:: python
@@ -223,7 +347,9 @@ def open(name, mode, application=None, schema=None, schema_version=None):
             f.close()
     """
 
-    return GSDFile(str(name), mode, application, schema, schema_version)
+    return GSDFile(str(name), mode, application, schema, schema_version,
+                   compression, durability, expected_frames,
+                   expected_index_entries, expected_names)
 
 
 cdef class GSDFile:
@@ -276,24 +402,105 @@ cdef class GSDFile:
 
         index_entries_to_buffer (int): Number of index entries to buffer before
             flushing.
+
+        compression (tuple[str]): Patterns of chunk names to compress.
+
+        durability (str): When to sync written data to the storage device.
+
+        group_commit_frames (int): Number of frames to end between flushes
+            with the ``'group'`` durability.
+
+        group_commit_interval (float): Time (in seconds) between flushes with
+            the ``'group'`` durability.
+
+        expected_frames (int): Expected number of frames in the file, used to
+            size the index when it grows.
+
+        index_growth_factor (float): Factor to multiply the index size by
+            each time it grows.
+
+        preallocate (int): Size of the extents (in bytes) to reserve file space
+            in ahead of writes. Set to 0 to disable preallocation.
+
+        direct_io (bool): Set to ``True`` to transfer large chunks with direct
+            I/O.
+
+        asynchronous (bool): Set to ``True`` to write frames in a background
+            thread.
+
+        index (numpy.ndarray): Index entries of all chunks in the file as a
+            read-only structured array with the fields ``frame``, ``N``,
+            ``location``, ``M``, ``id``, ``type``, and ``flags``.
+
+        names (numpy.ndarray): Chunk names in the file, indexed by the ``id``
+            field of :py:attr:`index`.
+
+    Large trajectories fragment on the storage device when the file grows in
+    many small writes. Set :py:attr:`preallocate` to a large size, such as
+    ``2**30``, to reserve space for the file in large contiguous extents.
+    :py:meth:`close` releases the space past the end of the file. Preallocation
+    is available on Linux and has no effect on other platforms.
+
+    Reading and writing large chunks through the page cache evicts other data
+    from memory. With :py:attr:`direct_io` set to ``True``,
+    :py:meth:`write_chunk` writes chunks larger than
+    :py:attr:`maximum_write_buffer_size` with ``O_DIRECT`` and
+    :py:meth:`read_chunk` reads them the same way. Direct I/O is available on
+    Linux for file systems that support it. Setting :py:attr:`direct_io` raises
+    an exception otherwise.
+
+    :py:attr:`index` and :py:attr:`names` allow vectorized queries of the
+    chunks in the file, such as ``names[index['id']]`` for the name of each
+    entry. In the ``'r'`` mode, :py:attr:`index` is a view of the index in a
+    memory map of the file. In other modes it is a copy of the index that
+    includes the frames written so far.
+
+    With :py:attr:`asynchronous` set to ``True``, :py:meth:`write_chunk` copies
+    the data and returns immediately. :py:meth:`end_frame` hands the frame to a
+    background thread that writes it to the file while the caller prepares the
+    next frame. :py:meth:`end_frame` blocks only when the background thread is
+    still writing the previous frame. Methods that read from the file wait for
+    the queued frames first. Call :py:meth:`wait` to block until the
+    background thread writes all queued frames. :py:meth:`end_frame`,
+    :py:meth:`flush`, :py:meth:`wait`, and :py:meth:`close` raise errors
+    encountered by the background thread. Asynchronous writes are not available
+    on Windows.
     """
 
     cdef libgsd.gsd_handle __handle
     cdef bint __is_open
     cdef str mode
     cdef str name
+    cdef object __data_map
+    cdef tuple __compression
+    cdef dict __compress_name
+    cdef list __borrowed
+    cdef dict __name_cache
+    cdef dict __read_plans
 
     def __init__(self,
                  name,
                  mode,
                  application,
                  schema,
-                 schema_version):
+                 schema_version,
+                 compression=None,
+                 durability='fsync',
+                 expected_frames=None,
+                 expected_index_entries=None,
+                 expected_names=None):
         cdef libgsd.gsd_open_flag c_flags
         cdef int exclusive_create = 0
         cdef int overwrite = 0
 
         self.mode = mode
+        self.compression = compression
+        self.__borrowed = []
+        self.__name_cache = {}
+        self.__read_plans = {}
+
+        if durability not in _durability:
+            raise ValueError("Invalid durability: " + str(durability))
 
         if mode == 'w':
             c_flags = libgsd.GSD_OPEN_READWRITE
@@ -375,6 +582,19 @@ cdef class GSDFile:
                                    + self.schema)
 
         self.__is_open = True
+        self.durability = durability
+
+        if mode != 'r':
+            if expected_frames is not None:
+                self.expected_frames = expected_frames
+            if expected_index_entries is not None:
+                retval = libgsd.gsd_reserve_index(&self.__handle,
+                                                  expected_index_entries)
+                __raise_on_error(retval, name)
+            if expected_names is not None:
+                retval = libgsd.gsd_reserve_names(&self.__handle,
+                                                  expected_names)
+                __raise_on_error(retval, name)
 
     def close(self):
         """close()
@@ -408,6 +628,11 @@ cdef class GSDFile:
             with nogil:
                 retval = libgsd.gsd_close(&self.__handle)
             self.__is_open = False
+            self.__borrowed.clear()
+
+            # Arrays returned by read_chunk(copy=False) hold references to the
+            # memory map and keep it alive after the file is closed.
+            self.__data_map = None
 
             __raise_on_error(retval, self.name)
 
@@ -449,6 +674,9 @@ cdef class GSDFile:
             retval = libgsd.gsd_truncate(&self.__handle)
 
         __raise_on_error(retval, self.name)
+        self.__borrowed.clear()
+        self.__name_cache.clear()
+        self.__read_plans.clear()
 
     def end_frame(self):
         """end_frame()
@@ -495,6 +723,7 @@ cdef class GSDFile:
             retval = libgsd.gsd_end_frame(&self.__handle)
 
         __raise_on_error(retval, self.name)
+        self.__borrowed.clear()
 
     def flush(self):
         """flush()
@@ -511,9 +740,26 @@ cdef class GSDFile:
             retval = libgsd.gsd_flush(&self.__handle)
 
         __raise_on_error(retval, self.name)
+        self.__borrowed.clear()
+
+    def wait(self):
+        """wait()
+
+        Wait for the background thread to write all queued frames.
+
+        Does nothing when :py:attr:`asynchronous` is ``False``.
+        """
 
-    def write_chunk(self, name, data):
-        """write_chunk(name, data)
+        if not self.__is_open:
+            raise ValueError("File is not open")
+
+        with nogil:
+            retval = libgsd.gsd_wait(&self.__handle)
+
+        __raise_on_error(retval, self.name)
+
+    def write_chunk(self, name, data, borrow=False):
+        """write_chunk(name, data, borrow=False)
 
         Write a data chunk to the file. After writing all chunks in the
         current frame, call :py:meth:`end_frame()`.
@@ -523,6 +769,8 @@ cdef class GSDFile:
             data: Data to write into the chunk. Must be a numpy
                   array, or array-like, with 2 or fewer
                   dimensions.
+            borrow (bool): Set to ``True`` to write the chunk without copying
+                  it into the write buffer.
 
         Warning:
             :py:meth:`write_chunk()` will implicitly converts array-like and
@@ -530,6 +778,16 @@ cdef class GSDFile:
             ``numpy.ascontiguousarray(data)``. This may or may not produce
             desired data types in the output file and incurs overhead.
 
+        :py:meth:`write_chunk()` compresses the chunk when ``name`` matches a
+        pattern in :py:attr:`compression`. The chunk is stored uncompressed
+        when compression does not reduce its size.
+
+        By default, :py:meth:`write_chunk()` copies chunks smaller than
+        :py:attr:`maximum_write_buffer_size` into the write buffer. With
+        ``borrow=True``, the file holds a reference to the array instead and
+        :py:meth:`end_frame()` writes all buffered chunks with one vectored
+        write. Do not modify the array until :py:meth:`end_frame()` returns.
+
         Example:
             .. ipython:: python
 
@@ -631,20 +889,51 @@ cdef class GSDFile:
         # for all data types
         logger.debug('write chunk: ' + self.name + ' - ' + name)
 
+        cdef uint8_t flags = 0
+        compress = self.__compress_name.get(name)
+        if compress is None:
+            compress = any(fnmatch.fnmatchcase(name, pattern)
+                           for pattern in self.__compression)
+            self.__compress_name[name] = compress
+        if compress:
+            flags = libgsd.GSD_FLAG_COMPRESSED
+
         cdef char * c_name
         name_e = name.encode('utf-8')
         c_name = name_e
+        # a new name invalidates the cached name queries and read plans
+        if (self.__name_cache or self.__read_plans) and self.__is_new_name(c_name):
+            self.__name_cache.clear()
+            self.__read_plans.clear()
+
+        cdef bint c_borrow = borrow
         with nogil:
-            retval = libgsd.gsd_write_chunk(&self.__handle,
-                                            c_name,
-                                            gsd_type,
-                                            N,
-                                            M,
-                                            0,
-                                            data_ptr)
+            if c_borrow:
+                retval = libgsd.gsd_write_chunk_borrowed(&self.__handle,
+                                                         c_name,
+                                                         gsd_type,
+                                                         N,
+                                                         M,
+                                                         flags,
+                                                         data_ptr)
+            else:
+                retval = libgsd.gsd_write_chunk(&self.__handle,
+                                                c_name,
+                                                gsd_type,
+                                                N,
+                                                M,
+                                                flags,
+                                                data_ptr)
 
         __raise_on_error(retval, self.name)
 
+        if c_borrow:
+            # keep the data alive until end_frame writes it
+            if gsd_type == libgsd.GSD_TYPE_CHARACTER:
+                self.__borrowed.append(bytes_view)
+            else:
+                self.__borrowed.append(data_array)
+
     def chunk_exists(self, frame, name):
         """chunk_exists(frame, name)
 
@@ -704,14 +993,79 @@ cdef class GSDFile:
 
         return index_entry != NULL
 
-    def read_chunk(self, frame, name):
-        """read_chunk(frame, name)
+    def frames_with_chunk(self, name):
+        """frames_with_chunk(name)
+
+        Find the frames that have a chunk.
+
+        Args:
+            name (str): Name of the chunk
+
+        Returns:
+            `numpy.ndarray` of ``numpy.uint64``: Indices of the frames that
+            have the chunk, in increasing order.
+
+        :py:meth:`frames_with_chunk()` builds a directory of the index entries
+        of each chunk name the first time it is called and after the file
+        changes. Each following call looks up the name in constant time.
+
+        Example:
+            .. ipython:: python
+
+                with gsd.fl.open(name='file.gsd', mode='w',
+                                 application="My application",
+                                 schema="My Schema", schema_version=[1,0]) as f:
+                    f.write_chunk(name='chunk1',
+                                  data=numpy.array([1,2,3,4],
+                                                   dtype=numpy.float32))
+                    f.end_frame()
+                    f.end_frame()
+                    f.write_chunk(name='chunk1',
+                                  data=numpy.array([9,10,11,12],
+                                                   dtype=numpy.float32))
+                    f.end_frame()
+
+                f = gsd.fl.open(name='file.gsd', mode='r')
+                f.frames_with_chunk(name='chunk1')
+                f.frames_with_chunk(name='chunk2')
+                f.close()
+        """
+
+        if not self.__is_open:
+            raise ValueError("File is not open")
+
+        cdef char * c_name
+        name_e = name.encode('utf-8')
+        c_name = name_e
+        cdef const uint64_t* entries
+        cdef size_t n
+        cdef size_t i
+        cdef int retval
+
+        with nogil:
+            retval = libgsd.gsd_find_chunk_entries(&self.__handle,
+                                                   c_name,
+                                                   &entries,
+                                                   &n)
+        __raise_on_error(retval, self.name)
+
+        cdef numpy.ndarray[uint64_t, ndim=1, mode="c"] frames = \
+            numpy.empty(n, dtype=numpy.uint64)
+        for i in range(n):
+            frames[i] = self.__handle.file_index.data[entries[i]].frame
+
+        return frames
+
+    def read_chunk(self, frame, name, copy=True):
+        """read_chunk(frame, name, copy=True)
 
         Read a data chunk from the file and return it as a numpy array.
 
         Args:
             frame (int): Index of the frame to read
             name (str): Name of the chunk
+            copy (bool): Set to ``False`` to return a read-only view of the
+                chunk in a memory map of the file.
 
         Returns:
             ``(N,M)`` or ``(N,)`` `numpy.ndarray` of ``type``: Data read from
@@ -724,6 +1078,15 @@ cdef class GSDFile:
             new numpy array for storage. To avoid overhead, call
             :py:meth:`read_chunk()` on the same chunk only once.
 
+        When ``copy`` is ``False``, :py:meth:`read_chunk()` maps the file into
+        memory and returns a read-only array that points directly at the chunk
+        data in the mapping. The operating system pages in the data on first
+        access and there is no additional copy. The mapping remains valid as
+        long as any returned array refers to it, even after the file is closed.
+        ``copy=False`` requires a file opened in the ``'r'`` mode. String
+        chunks are always returned as new `str` objects and compressed chunks
+        are always decompressed into new arrays.
+
         Example:
             .. ipython:: python
                 :okexcept:
@@ -775,6 +1138,17 @@ cdef class GSDFile:
         cdef libgsd.gsd_type gsd_type
         gsd_type = <libgsd.gsd_type>index_entry.type
 
+        if not copy:
+            if self.mode != 'r':
+                raise ValueError("copy=False requires a file opened in mode 'r'")
+
+            if (gsd_type != libgsd.GSD_TYPE_CHARACTER
+                    and not index_entry.flags & libgsd.GSD_FLAG_COMPRESSED
+                    and index_entry.N != 0 and index_entry.M != 0):
+                logger.debug('map chunk: ' + self.name + ' - '
+                             + str(frame) + ' - ' + name)
+                return self.__map_chunk(index_entry)
+
         cdef void *data_ptr
         if gsd_type == libgsd.GSD_TYPE_UINT8:
             data_array = numpy.empty(dtype=numpy.uint8,
@@ -859,16 +1233,376 @@ cdef class GSDFile:
         else:
             return data_array
 
-    def find_matching_chunk_names(self, match):
-        """find_matching_chunk_names(match)
+    cdef __map_chunk(self, const libgsd.gsd_index_entry* index_entry):
+        """Return a read-only view of a chunk in the memory mapped file."""
+        dtype = _numpy_dtype.get(index_entry.type)
+        if dtype is None:
+            raise ValueError("invalid type for chunk")
+
+        cdef uint64_t size = index_entry.N * index_entry.M * dtype.itemsize
+        if (index_entry.location == 0
+                or index_entry.location + size > self.__handle.file_size):
+            __raise_on_error(libgsd.GSD_ERROR_FILE_CORRUPT, self.name)
+
+        if self.__data_map is None:
+            self.__data_map = mmap.mmap(self.__handle.fd,
+                                        self.__handle.file_size,
+                                        access=mmap.ACCESS_READ)
+
+        data_array = numpy.frombuffer(self.__data_map,
+                                      dtype=dtype,
+                                      count=index_entry.N * index_entry.M,
+                                      offset=index_entry.location)
+
+        if index_entry.M == 1:
+            return data_array
+        else:
+            return data_array.reshape([index_entry.N, index_entry.M])
+
+    def read_frame(self, frame, names=None):
+        """read_frame(frame, names=None)
+
+        Read several data chunks from a frame.
+
+        Args:
+            frame (int): Index of the frame to read.
+            names (list[str]): Names of the chunks to read. Set to ``None`` to
+                read all chunks in the frame.
+
+        Returns:
+            dict[str, numpy.ndarray]: Data read from the file, keyed by chunk
+            name. The values have the same types and shapes as those returned
+            by :py:meth:`read_chunk()`. Chunks that are not present in the
+            frame are omitted.
+
+        :py:meth:`read_frame()` reads chunks that are close together in the
+        file with one system call into a single buffer. The returned arrays
+        are views into this buffer, except for chunks that are not aligned in
+        the file. :py:meth:`read_frame()` copies those into new arrays.
+
+        Example:
+            .. ipython:: python
+
+                with gsd.fl.open(name='file.gsd', mode='w',
+                                 application="My application",
+                                 schema="My Schema", schema_version=[1,0]) as f:
+                    f.write_chunk(name='chunk1',
+                                  data=numpy.array([1,2,3,4],
+                                                   dtype=numpy.float32))
+                    f.write_chunk(name='chunk2',
+                                  data=numpy.array([[5,6],[7,8]],
+                                                   dtype=numpy.float32))
+                    f.end_frame()
+
+                f = gsd.fl.open(name='file.gsd', mode='r')
+                f.read_frame(frame=0)
+                f.read_frame(frame=0, names=['chunk2', 'chunk3'])
+                f.close()
+        """
+
+        if not self.__is_open:
+            raise ValueError("File is not open")
+
+        if names is None:
+            names = self.find_matching_chunk_names('')
+
+        plan_names, plan_ids = self.__read_plan(names)
+
+        cdef int64_t c_frame = frame
+        cdef const libgsd.gsd_index_entry* index_entry
+        cdef size_t n_names = len(plan_names)
+        cdef size_t n = 0
+        cdef size_t i
+        cdef uint64_t size
+        cdef void *data_ptr
+        cdef numpy.ndarray[uint16_t, ndim=1, mode="c"] ids = plan_ids
+        cdef numpy.ndarray[uint64_t, ndim=1, mode="c"] offsets
+        cdef numpy.ndarray arena
+        cdef const libgsd.gsd_index_entry** chunks = \
+            <const libgsd.gsd_index_entry**>malloc(
+                sizeof(libgsd.gsd_index_entry*) * (n_names + 1))
+        if chunks == NULL:
+            raise MemoryError("Unable to allocate memory")
+
+        found_names = []
+        result = {}
+        try:
+            with nogil:
+                retval = libgsd.gsd_find_frame_chunks(&self.__handle,
+                                                      c_frame,
+                                                      &ids[0],
+                                                      n_names,
+                                                      chunks)
+            __raise_on_error(retval, self.name)
 
-        Find all the chunk names in the file that start with the string *match*.
+            for i in range(n_names):
+                if chunks[i] != NULL:
+                    chunks[n] = chunks[i]
+                    found_names.append(plan_names[i])
+                    n += 1
+
+            offsets = numpy.zeros(n + 1, dtype=numpy.uint64)
+            with nogil:
+                retval = libgsd.gsd_plan_frame_read(&self.__handle,
+                                                    chunks,
+                                                    n,
+                                                    &offsets[0],
+                                                    &size)
+            __raise_on_error(retval, self.name)
+
+            logger.debug('read frame: ' + self.name + ' - ' + str(frame)
+                         + ' - ' + str(n) + ' chunks')
+
+            arena = numpy.empty(size, dtype=numpy.uint8)
+            data_ptr = numpy.PyArray_DATA(arena)
+            with nogil:
+                retval = libgsd.gsd_read_frame(&self.__handle,
+                                               data_ptr,
+                                               chunks,
+                                               n,
+                                               &offsets[0])
+            __raise_on_error(retval, self.name)
+
+            for i in range(n):
+                name = found_names[i]
+                index_entry = chunks[i]
+                dtype = _numpy_dtype.get(index_entry.type)
+                if dtype is None:
+                    raise ValueError("invalid type for chunk: " + name)
+
+                start = offsets[i]
+                data_array = arena[start:start + index_entry.N * index_entry.M
+                                   * dtype.itemsize].view(dtype)
+                if not data_array.flags.aligned:
+                    data_array = data_array.copy()
+
+                if index_entry.type == libgsd.GSD_TYPE_CHARACTER:
+                    if index_entry.M == 1:
+                        result[name] = data_array.tobytes().rstrip(
+                            b'\x00').decode('UTF-8')
+                    else:
+                        result[name] = data_array.reshape([index_entry.M,
+                                                           index_entry.N])
+                elif index_entry.M == 1:
+                    result[name] = data_array
+                else:
+                    result[name] = data_array.reshape([index_entry.N,
+                                                       index_entry.M])
+        finally:
+            free(chunks)
+
+        return result
+
+    def read_chunk_series(self, name, frames=None, out=None):
+        """read_chunk_series(name, frames=None, out=None)
+
+        Read the same data chunk from several frames into one array.
 
         Args:
-            match (str): Start of the chunk name to match
+            name (str): Name of the chunk.
+            frames (list[int]): Indices of the frames to read. Set to ``None``
+                to read all frames.
+            out (numpy.ndarray): Array to read into. Set to ``None`` to
+                allocate a new array.
 
         Returns:
-            list[str]: Matching chunk names
+            tuple[numpy.ndarray, numpy.ndarray]: ``(data, mask)``. ``data``
+            has the shape ``(nframes, N, M)``, or ``(nframes, N)`` when
+            ``M == 1``, and row ``i`` holds the chunk from ``frames[i]``.
+            ``mask[i]`` is ``True`` when that frame has the chunk.
+
+        :py:meth:`read_chunk_series()` looks up the chunk name once and reads
+        the chunk from every frame into ``data`` without holding the GIL. It
+        reads uncompressed chunks that are close together in the file with one
+        call. All frames that have the chunk must store it with the same
+        ``N``, ``M``, and type. Rows for frames without the chunk are zero in a
+        new array and left unchanged in ``out``. ``out`` must be C-contiguous
+        and have the shape and type of ``data``.
+
+        Example:
+            .. ipython:: python
+
+                with gsd.fl.open(name='file.gsd', mode='w',
+                                 application="My application",
+                                 schema="My Schema", schema_version=[1,0]) as f:
+                    f.write_chunk(name='chunk1',
+                                  data=numpy.array([1,2], dtype=numpy.float32))
+                    f.end_frame()
+                    f.end_frame()
+                    f.write_chunk(name='chunk1',
+                                  data=numpy.array([3,4], dtype=numpy.float32))
+                    f.end_frame()
+
+                f = gsd.fl.open(name='file.gsd', mode='r')
+                f.read_chunk_series(name='chunk1')
+                f.close()
+        """
+
+        if not self.__is_open:
+            raise ValueError("File is not open")
+
+        nframes = self.nframes
+        if frames is None:
+            frame_array = numpy.arange(nframes, dtype=numpy.int64)
+        else:
+            frame_array = numpy.asarray(frames, dtype=numpy.int64).reshape(-1)
+            if numpy.any((frame_array < 0) | (frame_array >= nframes)):
+                raise IndexError("frame index out of range in: " + self.name)
+
+        cdef numpy.ndarray[uint64_t, ndim=1, mode="c"] c_frames = \
+            numpy.ascontiguousarray(frame_array, dtype=numpy.uint64)
+        cdef size_t n = c_frames.shape[0]
+        cdef size_t i
+        cdef int retval
+        cdef char * c_name
+        name_e = name.encode('utf-8')
+        c_name = name_e
+        cdef const uint64_t* frames_ptr = NULL
+        if n > 0:
+            frames_ptr = &c_frames[0]
+        cdef const libgsd.gsd_index_entry* first = NULL
+        cdef void *data_ptr
+        cdef const libgsd.gsd_index_entry** chunks = \
+            <const libgsd.gsd_index_entry**>malloc(
+                sizeof(libgsd.gsd_index_entry*) * (n + 1))
+        if chunks == NULL:
+            raise MemoryError("Unable to allocate memory")
+
+        try:
+            with nogil:
+                retval = libgsd.gsd_find_chunk_series(&self.__handle,
+                                                      c_name,
+                                                      frames_ptr,
+                                                      n,
+                                                      chunks)
+            __raise_on_error(retval, self.name)
+
+            mask = numpy.zeros(n, dtype=bool)
+            for i in range(n):
+                if chunks[i] != NULL:
+                    mask[i] = True
+                    if first == NULL:
+                        first = chunks[i]
+
+            if first == NULL:
+                if out is None:
+                    raise KeyError("chunk " + name + " not found in: "
+                                   + self.name)
+                return out, mask
+
+            if first.type == libgsd.GSD_TYPE_CHARACTER:
+                raise ValueError("read_chunk_series does not read string "
+                                 "chunks: " + name)
+            dtype = _numpy_dtype.get(first.type)
+            if dtype is None:
+                raise ValueError("invalid type for chunk: " + name)
+
+            if first.M == 1:
+                shape = (n, first.N)
+            else:
+                shape = (n, first.N, first.M)
+
+            if out is None:
+                out = numpy.zeros(shape, dtype=dtype)
+            elif (not isinstance(out, numpy.ndarray) or out.dtype != dtype
+                    or out.shape != shape or not out.flags.c_contiguous
+                    or not out.flags.writeable):
+                raise ValueError("out must be a writeable C-contiguous array "
+                                 "with dtype " + str(dtype) + " and shape "
+                                 + str(shape))
+
+            logger.debug('read chunk series: ' + self.name + ' - ' + name
+                         + ' - ' + str(n) + ' frames')
+
+            data_ptr = numpy.PyArray_DATA(out)
+            with nogil:
+                retval = libgsd.gsd_read_chunk_series(&self.__handle,
+                                                      data_ptr,
+                                                      chunks,
+                                                      n)
+            if retval == libgsd.GSD_ERROR_INVALID_ARGUMENT:
+                raise ValueError("chunk " + name + " changes shape or type "
+                                 "between frames in: " + self.name)
+            __raise_on_error(retval, self.name)
+        finally:
+            free(chunks)
+
+        return out, mask
+
+    cdef bint __is_new_name(self, const char* c_name):
+        """Test whether the file has no chunks with the given name.
+
+        Assume that the name is new when writing asynchronously, as the
+        writer thread may be adding names.
+        """
+        if libgsd.gsd_get_async(&self.__handle):
+            return True
+
+        cdef uint16_t c_id
+        retval = libgsd.gsd_find_chunk_ids(&self.__handle, &c_name, 1, &c_id)
+        __raise_on_error(retval, self.name)
+        return c_id == UINT16_MAX
+
+    cdef tuple __read_plan(self, names):
+        """Find the ids of the chunk names to read.
+
+        Cache the ids for each list of names until a name is added to the
+        file, so that :py:meth:`read_frame()` encodes and hashes each name once
+        instead of once per frame.
+        """
+        key = tuple(names)
+        plan = self.__read_plans.get(key)
+        if plan is not None:
+            return plan
+
+        cdef size_t n = len(key)
+        encoded = [name.encode('utf-8') for name in key]
+        ids = numpy.empty(n + 1, dtype=numpy.uint16)
+        cdef numpy.ndarray[uint16_t, ndim=1, mode="c"] c_ids = ids
+        cdef const char** c_names = <const char**>malloc(
+            sizeof(char*) * (n + 1))
+        if c_names == NULL:
+            raise MemoryError("Unable to allocate memory")
+
+        cdef size_t i
+        try:
+            for i in range(n):
+                c_names[i] = encoded[i]
+            with nogil:
+                retval = libgsd.gsd_find_chunk_ids(&self.__handle,
+                                                   c_names,
+                                                   n,
+                                                   &c_ids[0])
+            __raise_on_error(retval, self.name)
+        finally:
+            free(c_names)
+
+        plan = (key, ids)
+        self.__read_plans[key] = plan
+        return plan
+
+    def find_matching_chunk_names(self, match, syntax='prefix'):
+        """find_matching_chunk_names(match, syntax='prefix')
+
+        Find all the chunk names in the file that match *match*.
+
+        Args:
+            match (str): Pattern to match.
+            syntax (str): How to interpret *match*: ``'prefix'`` finds the
+                names that start with *match*, ``'glob'`` finds the names that
+                match the shell-style pattern (see `fnmatch.fnmatchcase`), and
+                ``'regex'`` finds the names that match the regular expression
+                in full (see `re.fullmatch`).
+
+        Returns:
+            list[str]: Matching chunk names in the order they were added to the
+            file.
+
+        The file keeps a sorted index of the chunk names, so the time to find
+        the names that start with a given prefix is proportional to the number
+        of matches. Glob and regex queries filter the names that start with the
+        literal prefix of the pattern. :py:class:`GSDFile` caches the results
+        until the next call to :py:meth:`write_chunk`.
 
         Example:
             .. ipython:: python
@@ -899,12 +1633,35 @@ cdef class GSDFile:
                 f.find_matching_chunk_names('data')
                 f.find_matching_chunk_names('input')
                 f.find_matching_chunk_names('other')
+                f.find_matching_chunk_names('*/chunk[13]', syntax='glob')
+                f.find_matching_chunk_names(r'input/chunk\\d', syntax='regex')
                 f.close()
         """
 
         if not self.__is_open:
             raise ValueError("File is not open")
 
+        key = (syntax, match)
+        names = self.__name_cache.get(key)
+        if names is not None:
+            return list(names)
+
+        if syntax == 'prefix':
+            names = self.__find_prefix(match)
+        elif syntax == 'glob':
+            names = [name for name in self.__find_prefix(_literal_prefix(match, syntax))
+                     if fnmatch.fnmatchcase(name, match)]
+        elif syntax == 'regex':
+            regex = re.compile(match)
+            names = [name for name in self.__find_prefix(_literal_prefix(match, syntax))
+                     if regex.fullmatch(name)]
+        else:
+            raise ValueError("Invalid syntax: " + str(syntax))
+
+        self.__name_cache[key] = names
+        return list(names)
+
+    cdef list __find_prefix(self, str match):
         cdef const char * c_found
         cdef char * c_match
         match_e = match.encode('utf-8')
@@ -993,6 +1750,47 @@ cdef class GSDFile:
 
             return libgsd.gsd_get_nframes(&self.__handle)
 
+    property index:
+        def __get__(self):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            cdef int retval
+            if self.mode != 'r':
+                with nogil:
+                    retval = libgsd.gsd_flush(&self.__handle)
+                __raise_on_error(retval, self.name)
+
+            cdef size_t n = self.__handle.file_index.size
+            cdef numpy.ndarray index
+
+            if (self.mode == 'r' and n > 0
+                    and self.__handle.header.gsd_version
+                    >= libgsd.gsd_make_version(2, 0)):
+                if self.__data_map is None:
+                    self.__data_map = mmap.mmap(self.__handle.fd,
+                                                self.__handle.file_size,
+                                                access=mmap.ACCESS_READ)
+
+                return numpy.frombuffer(
+                    self.__data_map,
+                    dtype=_index_dtype,
+                    count=n,
+                    offset=self.__handle.header.index_location)
+
+            # gsd 1.0 files store the index unsorted, copy the sorted index
+            index = numpy.empty(n, dtype=_index_dtype)
+            if n > 0:
+                memcpy(numpy.PyArray_DATA(index),
+                       self.__handle.file_index.data,
+                       n * sizeof(libgsd.gsd_index_entry))
+            index.flags.writeable = False
+            return index
+
+    property names:
+        def __get__(self):
+            return numpy.array(self.find_matching_chunk_names(''), dtype=str)
+
     property maximum_write_buffer_size:
         def __get__(self):
             if not self.__is_open:
@@ -1007,6 +1805,141 @@ cdef class GSDFile:
             retval = libgsd.gsd_set_maximum_write_buffer_size(&self.__handle, size)
             __raise_on_error(retval, self.name)
 
+    property compression:
+        def __get__(self):
+            return self.__compression
+
+        def __set__(self, patterns):
+            if patterns is None:
+                patterns = ()
+            elif isinstance(patterns, str):
+                patterns = (patterns,)
+
+            self.__compression = tuple(patterns)
+            self.__compress_name = {}
+
+    property durability:
+        def __get__(self):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            c_durability = libgsd.gsd_get_durability(&self.__handle)
+            for key, value in _durability.items():
+                if value == c_durability:
+                    return key
+
+        def __set__(self, durability):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            if durability not in _durability:
+                raise ValueError("Invalid durability: " + str(durability))
+
+            retval = libgsd.gsd_set_durability(&self.__handle,
+                                               _durability[durability])
+            __raise_on_error(retval, self.name)
+
+    property group_commit_frames:
+        def __get__(self):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            return libgsd.gsd_get_group_commit_frames(&self.__handle)
+
+        def __set__(self, number):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            retval = libgsd.gsd_set_group_commit_frames(&self.__handle, number)
+            __raise_on_error(retval, self.name)
+
+    property group_commit_interval:
+        def __get__(self):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            return libgsd.gsd_get_group_commit_interval(&self.__handle)
+
+        def __set__(self, interval):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            retval = libgsd.gsd_set_group_commit_interval(&self.__handle,
+                                                          interval)
+            __raise_on_error(retval, self.name)
+
+    property expected_frames:
+        def __get__(self):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            return libgsd.gsd_get_expected_frames(&self.__handle)
+
+        def __set__(self, number):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            retval = libgsd.gsd_set_expected_frames(&self.__handle, number)
+            __raise_on_error(retval, self.name)
+
+    property index_growth_factor:
+        def __get__(self):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            return libgsd.gsd_get_index_growth_factor(&self.__handle)
+
+        def __set__(self, factor):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            retval = libgsd.gsd_set_index_growth_factor(&self.__handle, factor)
+            __raise_on_error(retval, self.name)
+
+    property direct_io:
+        def __get__(self):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            return bool(libgsd.gsd_get_direct_io(&self.__handle))
+
+        def __set__(self, enable):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            retval = libgsd.gsd_set_direct_io(&self.__handle, bool(enable))
+            __raise_on_error(retval, self.name)
+
+    property asynchronous:
+        def __get__(self):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            return bool(libgsd.gsd_get_async(&self.__handle))
+
+        def __set__(self, enable):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            cdef int c_enable = bool(enable)
+            with nogil:
+                retval = libgsd.gsd_set_async(&self.__handle, c_enable)
+            __raise_on_error(retval, self.name)
+
+    property preallocate:
+        def __get__(self):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            return libgsd.gsd_get_preallocate_size(&self.__handle)
+
+        def __set__(self, size):
+            if not self.__is_open:
+                raise ValueError("File is not open")
+
+            retval = libgsd.gsd_set_preallocate_size(&self.__handle, size)
+            __raise_on_error(retval, self.name)
+
     property index_entries_to_buffer:
         def __get__(self):
             if not self.__is_open:
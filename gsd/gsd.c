@@ -1,6 +1,11 @@
 // Copyright (c) 2016-2024 The Regents of the University of Michigan
 // Part of GSD, released under the BSD 2-Clause License.
 
+// request copy_file_range and fallocate from glibc
+#ifdef __linux__
+#define _GNU_SOURCE
+#endif
+
 #include <sys/stat.h>
 #ifdef _WIN32
 
@@ -14,7 +19,9 @@
 
 #else // linux / mac
 
+#ifndef _XOPEN_SOURCE
 #define _XOPEN_SOURCE 500
+#endif
 #include <sys/mman.h>
 #include <unistd.h>
 #define GSD_USE_MMAP 1
@@ -31,9 +38,47 @@
 #include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include <time.h>
 
 #include "gsd.h"
 
+// copy_file_range is available in glibc 2.27 and newer
+#if defined(__GLIBC__) && (__GLIBC__ > 2 || (__GLIBC__ == 2 && __GLIBC_MINOR__ >= 27))
+#define GSD_USE_COPY_FILE_RANGE 1
+#else
+#define GSD_USE_COPY_FILE_RANGE 0
+#endif
+
+// direct I/O bypasses the page cache on Linux
+#if defined(__linux__) && defined(O_DIRECT)
+#define GSD_USE_DIRECT_IO 1
+#else
+#define GSD_USE_DIRECT_IO 0
+#endif
+
+// pwritev writes many buffers with one call on Linux
+#ifdef __linux__
+#include <sys/uio.h>
+#define GSD_USE_PWRITEV 1
+#else
+#define GSD_USE_PWRITEV 0
+#endif
+
+// the async writer uses POSIX threads
+#ifndef _WIN32
+#include <pthread.h>
+#define GSD_USE_THREADS 1
+#else
+#define GSD_USE_THREADS 0
+#endif
+
+// fallocate can reserve space without changing the file size on Linux
+#if defined(__linux__) && defined(FALLOC_FL_KEEP_SIZE)
+#define GSD_USE_FALLOCATE 1
+#else
+#define GSD_USE_FALLOCATE 0
+#endif
+
 /** @file gsd.c
     @brief Implements the GSD C API
 */
@@ -59,6 +104,12 @@ enum
     GSD_INITIAL_FRAME_INDEX_SIZE = 16
     };
 
+/// Initial size of the frame directory
+enum
+    {
+    GSD_INITIAL_FRAME_DIRECTORY_SIZE = 1024
+    };
+
 /// Initial size of write buffer
 enum
     {
@@ -77,12 +128,30 @@ enum
     GSD_DEFAULT_INDEX_ENTRIES_TO_BUFFER = 256 * 1024
     };
 
-/// Size of hash map
+/// Minimum number of slots in the name/id hash map
+enum
+    {
+    GSD_INITIAL_NAME_MAP_SIZE = 16
+    };
+
+/// Number of slots in the name/id hash map that holds the maximum number of names
+enum
+    {
+    GSD_MAXIMUM_NAME_MAP_SIZE = 131072
+    };
+
+/// Default factor to multiply the index size by when it grows
+static const double GSD_DEFAULT_INDEX_GROWTH_FACTOR = 2.0;
+
+/// Default number of frames between flushes with GSD_DURABILITY_GROUP
 enum
     {
-    GSD_NAME_MAP_SIZE = 57557
+    GSD_DEFAULT_GROUP_COMMIT_FRAMES = 100
     };
 
+/// Default time (in seconds) between flushes with GSD_DURABILITY_GROUP
+static const double GSD_DEFAULT_GROUP_COMMIT_INTERVAL = 10.0;
+
 /// Current GSD file specification
 enum
     {
@@ -91,7 +160,67 @@ enum
 
 enum
     {
-    GSD_CURRENT_FILE_VERSION_MINOR = 1
+    GSD_CURRENT_FILE_VERSION_MINOR = 2
+    };
+
+/// Number of bits in the LZ match finder hash
+enum
+    {
+    GSD_LZ_HASH_BITS = 14
+    };
+
+/// Minimum length of a LZ match
+enum
+    {
+    GSD_LZ_MIN_MATCH = 4
+    };
+
+/// Maximum distance to a LZ match
+enum
+    {
+    GSD_LZ_MAX_OFFSET = 65535
+    };
+
+/// Alignment of the locations, sizes, and buffers of direct I/O transfers
+enum
+    {
+    GSD_DIRECT_IO_ALIGNMENT = 4096
+    };
+
+/// Initial number of segments in the write segment list
+enum
+    {
+    GSD_INITIAL_WRITE_SEGMENTS = 64
+    };
+
+/// Maximum number of segments to write with one call to pwritev()
+enum
+    {
+    GSD_IOVEC_BATCH_SIZE = 256
+    };
+
+/// Size of the aligned buffer used for direct I/O transfers from unaligned memory
+enum
+    {
+    GSD_DIRECT_IO_BOUNCE_BUFFER_SIZE = 4 * 1024 * 1024
+    };
+
+/// Largest gap between chunks that gsd_read_frame() reads through rather than starting a new read
+enum
+    {
+    GSD_READ_FRAME_MAX_GAP = 4096
+    };
+
+/// Alignment of the runs of chunks in a gsd_read_frame() buffer
+enum
+    {
+    GSD_READ_FRAME_ALIGNMENT = 8
+    };
+
+/// Size of the buffer that gsd_read_chunk_series() reads runs of nearby chunks into
+enum
+    {
+    GSD_READ_SERIES_BUFFER_SIZE = 1024 * 1024
     };
 
 // define windows wrapper functions
@@ -144,6 +273,27 @@ inline static void gsd_util_zero_memory(void* d, size_t size_to_zero)
     memset(d, 0, size_to_zero);
     }
 
+/** @internal
+    @brief Read a monotonic clock
+
+    The clock does not jump when the wall clock changes.
+
+    @returns The time in seconds since an arbitrary point in the past.
+*/
+inline static double gsd_util_monotonic_time(void)
+    {
+#ifdef _WIN32
+    return (double)GetTickCount64() / 1000.0;
+#else
+    struct timespec now;
+    if (clock_gettime(CLOCK_MONOTONIC, &now) != 0)
+        {
+        return (double)time(NULL);
+        }
+    return (double)now.tv_sec + (double)now.tv_nsec * 1e-9;
+#endif
+    }
+
 /** @internal
     @brief Write large data buffer to file
 
@@ -238,189 +388,248 @@ inline static ssize_t gsd_io_pread_retry(int fd, void* buf, size_t count, int64_
     }
 
 /** @internal
-    @brief Allocate a name/id map
+    @brief Sync written data to the storage device according to the durability policy.
 
-    @param map Map to allocate.
-    @param size Number of entries in the map.
+    @param handle Handle to the open file.
 
     @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int gsd_name_id_map_allocate(struct gsd_name_id_map* map, size_t size)
+inline static int gsd_sync(struct gsd_handle* handle)
     {
-    if (map == NULL || map->v || size == 0 || map->size != 0)
+    int retval = 0;
+    if (handle->durability == GSD_DURABILITY_NONE)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return GSD_SUCCESS;
         }
-
-    map->v = calloc(size, sizeof(struct gsd_name_id_pair));
-    if (map->v == NULL)
+#if !defined(_WIN32) && !defined(__APPLE__)
+    if (handle->durability == GSD_DURABILITY_FDATASYNC)
         {
-        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        retval = fdatasync(handle->fd);
+        }
+    else
+#endif
+        {
+        retval = fsync(handle->fd);
         }
 
-    map->size = size;
-
+    if (retval != 0)
+        {
+        return GSD_ERROR_IO;
+        }
     return GSD_SUCCESS;
     }
 
 /** @internal
-    @brief Free a name/id map
+    @brief Reserve file space ahead of a write that extends the file.
 
-    @param map Map to free.
+    @param handle Handle to the open file.
+    @param end Location of the end of the file after the write.
 
-    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+    Allocate space in extents of gsd_handle::preallocate_size bytes without changing the file size.
+    Preallocation is only a hint to the file system, so errors are not reported. After the first
+    error, do not try again.
 */
-inline static int gsd_name_id_map_free(struct gsd_name_id_map* map)
+inline static void gsd_preallocate(struct gsd_handle* handle, int64_t end)
     {
-    if (map == NULL || map->v == NULL || map->size == 0)
+#if GSD_USE_FALLOCATE
+    if (handle->preallocate_size == 0 || end <= handle->allocated_size)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return;
         }
 
-    // free all of the linked lists
-    size_t i;
-    for (i = 0; i < map->size; i++)
+    int64_t extent = (int64_t)handle->preallocate_size;
+    int64_t new_allocated_size = (end + extent - 1) / extent * extent;
+    int64_t start = handle->allocated_size;
+    if (start < handle->file_size)
         {
-        free(map->v[i].name);
-
-        struct gsd_name_id_pair* cur = map->v[i].next;
-        while (cur != NULL)
-            {
-            struct gsd_name_id_pair* prev = cur;
-            cur = cur->next;
-            free(prev->name);
-            free(prev);
-            }
+        start = handle->file_size;
         }
 
-    // free the main map
-    free(map->v);
-
-    map->v = 0;
-    map->size = 0;
+    int retval = fallocate(handle->fd, FALLOC_FL_KEEP_SIZE, start, new_allocated_size - start);
+    if (retval != 0)
+        {
+        // the file system does not support preallocation
+        handle->allocated_size = INT64_MAX;
+        return;
+        }
 
-    return GSD_SUCCESS;
+    handle->allocated_size = new_allocated_size;
+#else
+    (void)handle;
+    (void)end;
+#endif
     }
 
+#if GSD_USE_DIRECT_IO
 /** @internal
-    @brief Hash a string
+    @brief Write a large chunk with direct I/O.
 
-    @param str String to hash
+    @param handle Handle to the open file.
+    @param buf Data to write.
+    @param count Number of bytes to write.
+    @param offset Location to write to (a multiple of GSD_DIRECT_IO_ALIGNMENT).
 
-    @returns Hashed value of the string.
+    Write the largest multiple of GSD_DIRECT_IO_ALIGNMENT bytes through gsd_handle::direct_fd,
+    directly from *buf* when it is aligned and through an aligned bounce buffer when it is not.
+    Write the remaining bytes through the buffered file descriptor.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static unsigned long gsd_hash_str(const unsigned char* str)
+inline static int
+gsd_io_pwrite_direct(struct gsd_handle* handle, const char* buf, size_t count, int64_t offset)
     {
-    unsigned long hash = 5381; // NOLINT
-    int c;
+    size_t aligned_count = count / GSD_DIRECT_IO_ALIGNMENT * GSD_DIRECT_IO_ALIGNMENT;
 
-    while ((c = *str++))
+    if ((uintptr_t)buf % GSD_DIRECT_IO_ALIGNMENT == 0)
         {
-        hash = ((hash << 5) + hash) + c; /* hash * 33 + c NOLINT */
+        ssize_t bytes_written = gsd_io_pwrite_retry(handle->direct_fd, buf, aligned_count, offset);
+        if (bytes_written == -1 || (size_t)bytes_written != aligned_count)
+            {
+            return GSD_ERROR_IO;
+            }
         }
+    else if (aligned_count > 0)
+        {
+        void* bounce = NULL;
+        if (posix_memalign(&bounce, GSD_DIRECT_IO_ALIGNMENT, GSD_DIRECT_IO_BOUNCE_BUFFER_SIZE) != 0)
+            {
+            return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+            }
 
-    return hash;
+        size_t total_bytes_written = 0;
+        while (total_bytes_written < aligned_count)
+            {
+            size_t bytes_to_write = GSD_DIRECT_IO_BOUNCE_BUFFER_SIZE;
+            if (aligned_count - total_bytes_written < bytes_to_write)
+                {
+                bytes_to_write = aligned_count - total_bytes_written;
+                }
+
+            memcpy(bounce, buf + total_bytes_written, bytes_to_write);
+            ssize_t bytes_written = gsd_io_pwrite_retry(handle->direct_fd,
+                                                        bounce,
+                                                        bytes_to_write,
+                                                        offset + total_bytes_written);
+            if (bytes_written == -1 || (size_t)bytes_written != bytes_to_write)
+                {
+                free(bounce);
+                return GSD_ERROR_IO;
+                }
+
+            total_bytes_written += bytes_to_write;
+            }
+
+        free(bounce);
+        }
+
+    size_t tail = count - aligned_count;
+    if (tail > 0)
+        {
+        ssize_t bytes_written
+            = gsd_io_pwrite_retry(handle->fd, buf + aligned_count, tail, offset + aligned_count);
+        if (bytes_written == -1 || (size_t)bytes_written != tail)
+            {
+            return GSD_ERROR_IO;
+            }
+        }
+
+    return GSD_SUCCESS;
     }
 
 /** @internal
-    @brief Insert a string into a name/id map
+    @brief Read a large chunk with direct I/O.
 
-    @param map Map to insert into.
-    @param str String to insert.
-    @param id ID to associate with the string.
+    @param handle Handle to the open file.
+    @param buf Buffer to read into.
+    @param count Number of bytes to read.
+    @param offset Location to read from (a multiple of GSD_DIRECT_IO_ALIGNMENT).
+
+    The counterpart of gsd_io_pwrite_direct().
 
     @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int gsd_name_id_map_insert(struct gsd_name_id_map* map, const char* str, uint16_t id)
+inline static int gsd_io_pread_direct(struct gsd_handle* handle, char* buf, size_t count, int64_t offset)
     {
-    if (map == NULL || map->v == NULL || map->size == 0)
-        {
-        return GSD_ERROR_INVALID_ARGUMENT;
-        }
+    size_t aligned_count = count / GSD_DIRECT_IO_ALIGNMENT * GSD_DIRECT_IO_ALIGNMENT;
 
-    size_t hash = gsd_hash_str((const unsigned char*)str) % map->size;
-
-    // base case: no conflict
-    if (map->v[hash].name == NULL)
+    if ((uintptr_t)buf % GSD_DIRECT_IO_ALIGNMENT == 0)
         {
-        map->v[hash].name = calloc(strlen(str) + 1, sizeof(char));
-        if (map->v[hash].name == NULL)
+        ssize_t bytes_read = gsd_io_pread_retry(handle->direct_fd, buf, aligned_count, offset);
+        if (bytes_read == -1 || (size_t)bytes_read != aligned_count)
             {
-            return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+            return GSD_ERROR_IO;
             }
-        memcpy(map->v[hash].name, str, strlen(str) + 1);
-        map->v[hash].id = id;
-        map->v[hash].next = NULL;
         }
-    else
+    else if (aligned_count > 0)
         {
-        // go to the end of the conflict list
-        struct gsd_name_id_pair* insert_point = map->v + hash;
-
-        while (insert_point->next != NULL)
+        void* bounce = NULL;
+        if (posix_memalign(&bounce, GSD_DIRECT_IO_ALIGNMENT, GSD_DIRECT_IO_BOUNCE_BUFFER_SIZE) != 0)
             {
-            insert_point = insert_point->next;
+            return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
             }
 
-        // allocate and insert a new entry
-        insert_point->next = malloc(sizeof(struct gsd_name_id_pair));
-        if (insert_point->next == NULL)
+        size_t total_bytes_read = 0;
+        while (total_bytes_read < aligned_count)
             {
-            return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+            size_t bytes_to_read = GSD_DIRECT_IO_BOUNCE_BUFFER_SIZE;
+            if (aligned_count - total_bytes_read < bytes_to_read)
+                {
+                bytes_to_read = aligned_count - total_bytes_read;
+                }
+
+            ssize_t bytes_read = gsd_io_pread_retry(handle->direct_fd,
+                                                    bounce,
+                                                    bytes_to_read,
+                                                    offset + total_bytes_read);
+            if (bytes_read == -1 || (size_t)bytes_read != bytes_to_read)
+                {
+                free(bounce);
+                return GSD_ERROR_IO;
+                }
+            memcpy(buf + total_bytes_read, bounce, bytes_to_read);
+
+            total_bytes_read += bytes_to_read;
             }
 
-        insert_point->next->name = calloc(strlen(str) + 1, sizeof(char));
-        if (insert_point->next->name == NULL)
+        free(bounce);
+        }
+
+    size_t tail = count - aligned_count;
+    if (tail > 0)
+        {
+        ssize_t bytes_read
+            = gsd_io_pread_retry(handle->fd, buf + aligned_count, tail, offset + aligned_count);
+        if (bytes_read == -1 || (size_t)bytes_read != tail)
             {
-            return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+            return GSD_ERROR_IO;
             }
-        memcpy(insert_point->next->name, str, strlen(str) + 1);
-        insert_point->next->id = id;
-        insert_point->next->next = NULL;
         }
 
     return GSD_SUCCESS;
     }
+#endif
 
 /** @internal
-    @brief Find an ID in a name/id mapping
+    @brief Close the direct I/O file descriptor.
 
-    @param map Map to search.
-    @param str String to search.
+    @param handle Handle to the open file.
 
-    @returns The ID if found, or UINT16_MAX if not found.
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static uint16_t gsd_name_id_map_find(struct gsd_name_id_map* map, const char* str)
+inline static int gsd_close_direct_fd(struct gsd_handle* handle)
     {
-    if (map == NULL || map->v == NULL || map->size == 0)
+    if (handle->direct_fd < 0)
         {
-        return UINT16_MAX;
+        return GSD_SUCCESS;
         }
 
-    size_t hash = gsd_hash_str((const unsigned char*)str) % map->size;
-
-    struct gsd_name_id_pair* cur = map->v + hash;
-
-    while (cur != NULL)
+    int retval = close(handle->direct_fd);
+    handle->direct_fd = -1;
+    if (retval != 0)
         {
-        if (cur->name == NULL)
-            {
-            // not found
-            return UINT16_MAX;
-            }
-
-        if (strcmp(str, cur->name) == 0)
-            {
-            // found
-            return cur->id;
-            }
-
-        // keep looking
-        cur = cur->next;
+        return GSD_ERROR_IO;
         }
-
-    // not found in any conflict
-    return UINT16_MAX;
+    return GSD_SUCCESS;
     }
 
 /** @internal
@@ -442,6 +651,11 @@ inline static int gsd_is_entry_valid(struct gsd_handle* handle, size_t idx)
 
     // validate that we don't read past the end of the file
     size_t size = entry.N * entry.M * gsd_sizeof_type((enum gsd_type)entry.type);
+    if (entry.flags & GSD_FLAG_COMPRESSED)
+        {
+        // gsd_read_chunk validates the compressed data that follows the codec header
+        size = sizeof(struct gsd_codec_header);
+        }
     if ((entry.location + size) > (uint64_t)handle->file_size)
         {
         return 0;
@@ -460,7 +674,7 @@ inline static int gsd_is_entry_valid(struct gsd_handle* handle, size_t idx)
         }
 
     // check for valid flags
-    if (entry.flags != 0)
+    if ((entry.flags & ~GSD_FLAG_COMPRESSED) != 0)
         {
         return 0;
         }
@@ -563,1731 +777,4359 @@ inline static int gsd_byte_buffer_free(struct gsd_byte_buffer* buf)
     }
 
 /** @internal
-    @brief Allocate a buffer of index entries
+    @brief Ensure that a byte buffer holds at least the given number of bytes.
 
-    @param buf Buffer to allocate.
-    @param reserve Number of entries to allocate.
+    @param buf Buffer to reserve.
+    @param reserve Minimum number of bytes to allocate.
 
-    @post The buffer's data element has *reserve* elements allocated in memory.
+    @post The contents of the buffer are undefined.
 
     @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int gsd_index_buffer_allocate(struct gsd_index_buffer* buf, size_t reserve)
+inline static int gsd_byte_buffer_reserve(struct gsd_byte_buffer* buf, size_t reserve)
     {
-    if (buf == NULL || buf->mapped_data || buf->data || reserve == 0 || buf->reserved != 0
-        || buf->size != 0)
+    if (buf == NULL)
         {
         return GSD_ERROR_INVALID_ARGUMENT;
         }
 
-    buf->data = calloc(reserve, sizeof(struct gsd_index_entry));
-    if (buf->data == NULL)
+    if (buf->reserved >= reserve)
         {
-        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        return GSD_SUCCESS;
         }
 
-    buf->size = 0;
-    buf->reserved = reserve;
-    buf->mapped_data = NULL;
-    buf->mapped_len = 0;
+    if (buf->data != NULL)
+        {
+        int retval = gsd_byte_buffer_free(buf);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
 
-    return GSD_SUCCESS;
+    return gsd_byte_buffer_allocate(buf, reserve);
     }
 
 /** @internal
-    @brief Map index entries from the file
-
-    @param buf Buffer to map.
-    @param handle GSD file handle to map.
-
-    @post The buffer's data element contains the index data from the file.
+    @brief Allocate a name/id map
 
-    On some systems, this will use mmap to efficiently access the file. On others, it may result in
-    an allocation and read of the entire index from the file.
+    @param map Map to allocate.
+    @param n_names Expected number of names in the map.
 
     @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int gsd_index_buffer_map(struct gsd_index_buffer* buf, struct gsd_handle* handle)
+inline static int gsd_name_id_map_allocate(struct gsd_name_id_map* map, size_t n_names)
     {
-    if (buf == NULL || buf->mapped_data || buf->data || buf->reserved != 0 || buf->size != 0)
+    if (map == NULL || map->slots || map->size != 0)
         {
         return GSD_ERROR_INVALID_ARGUMENT;
         }
 
-    // validate that the index block exists inside the file
-    if (handle->header.index_location
-            + sizeof(struct gsd_index_entry) * handle->header.index_allocated_entries
-        > (uint64_t)handle->file_size)
+    // keep the load factor at or below 1/2
+    size_t size = GSD_INITIAL_NAME_MAP_SIZE;
+    while (size < n_names * 2 && size < GSD_MAXIMUM_NAME_MAP_SIZE)
         {
-        return GSD_ERROR_FILE_CORRUPT;
+        size *= 2;
         }
 
-#if GSD_USE_MMAP
-    // map the index in read only mode
-    size_t page_size = getpagesize();
-    size_t index_size = sizeof(struct gsd_index_entry) * handle->header.index_allocated_entries;
-    size_t offset = (handle->header.index_location / page_size) * page_size;
-    buf->mapped_data = mmap(NULL,
-                            index_size + (handle->header.index_location - offset),
-                            PROT_READ,
-                            MAP_SHARED,
-                            handle->fd,
-                            offset);
-
-    if (buf->mapped_data == MAP_FAILED)
+    map->slots = malloc(sizeof(uint16_t) * size);
+    if (map->slots == NULL)
         {
-        return GSD_ERROR_IO;
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
         }
+    memset(map->slots, 0xff, sizeof(uint16_t) * size);
+    map->size = size;
 
-    buf->data = (struct gsd_index_entry*)(((char*)buf->mapped_data)
-                                          + (handle->header.index_location - offset));
+    return GSD_SUCCESS;
+    }
 
-    buf->mapped_len = index_size + (handle->header.index_location - offset);
-    buf->reserved = handle->header.index_allocated_entries;
-#else
-    // mmap not supported, read the data from the disk
-    int retval = gsd_index_buffer_allocate(buf, handle->header.index_allocated_entries);
-    if (retval != GSD_SUCCESS)
-        {
-        return retval;
-        }
+/** @internal
+    @brief Free a name/id map
 
-    ssize_t bytes_read = gsd_io_pread_retry(handle->fd,
-                                            buf->data,
-                                            sizeof(struct gsd_index_entry)
-                                                * handle->header.index_allocated_entries,
-                                            handle->header.index_location);
+    @param map Map to free.
 
-    if (bytes_read == -1
-        || bytes_read != sizeof(struct gsd_index_entry) * handle->header.index_allocated_entries)
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_name_id_map_free(struct gsd_name_id_map* map)
+    {
+    if (map == NULL || map->slots == NULL || map->size == 0)
         {
-        return GSD_ERROR_IO;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-#endif
 
-    // determine the number of index entries in the list
-    // file is corrupt if first index entry is invalid
-    if (buf->data[0].location != 0 && !gsd_is_entry_valid(handle, 0))
+    free(map->slots);
+    free(map->v);
+    free(map->sorted);
+    free(map->matches);
+    if (map->names.reserved > 0)
         {
-        return GSD_ERROR_FILE_CORRUPT;
+        gsd_byte_buffer_free(&map->names);
         }
 
-    if (buf->data[0].location == 0)
+    gsd_util_zero_memory(map, sizeof(struct gsd_name_id_map));
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Hash a string
+
+    @param str String to hash
+
+    @returns Hashed value of the string.
+*/
+inline static unsigned long gsd_hash_str(const unsigned char* str)
+    {
+    unsigned long hash = 5381; // NOLINT
+    int c;
+
+    while ((c = *str++))
         {
-        buf->size = 0;
+        hash = ((hash << 5) + hash) + c; /* hash * 33 + c NOLINT */
         }
-    else
-        {
-        // determine the number of index entries (marked by location = 0)
-        // binary search for the first index entry with location 0
-        size_t L = 0;
-        size_t R = buf->reserved;
 
-        // progressively narrow the search window by halves
-        do
-            {
-            size_t m = (L + R) / 2;
+    return hash;
+    }
 
-            // file is corrupt if any index entry is invalid or frame does not increase
-            // monotonically
-            if (buf->data[m].location != 0
-                && (!gsd_is_entry_valid(handle, m) || buf->data[m].frame < buf->data[L].frame))
-                {
-                return GSD_ERROR_FILE_CORRUPT;
-                }
+/** @internal
+    @brief Place a mapping in the hash table
 
-            if (buf->data[m].location != 0)
-                {
-                L = m;
-                }
-            else
-                {
-                R = m;
-                }
-            } while ((R - L) > 1);
+    @param map Map to modify.
+    @param i Position of the mapping in map->v.
 
-        // this finds R = the first index entry with location = 0
-        buf->size = R;
+    Probe linearly from the slot selected by the hash to the first empty slot.
+*/
+inline static void gsd_name_id_map_place(struct gsd_name_id_map* map, uint16_t i)
+    {
+    size_t mask = map->size - 1;
+    size_t slot = map->v[i].hash & mask;
+    while (map->slots[slot] != UINT16_MAX)
+        {
+        slot = (slot + 1) & mask;
         }
-
-    return GSD_SUCCESS;
+    map->slots[slot] = i;
     }
 
 /** @internal
-    @brief Free the memory allocated by the index buffer or unmap the mapped memory.
+    @brief Double the number of slots in a name/id map
 
-    @param buf Buffer to free.
+    @param map Map to grow.
 
     @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int gsd_index_buffer_free(struct gsd_index_buffer* buf)
+inline static int gsd_name_id_map_grow(struct gsd_name_id_map* map)
     {
-    if (buf == NULL || buf->data == NULL)
+    size_t new_size = map->size * 2;
+    uint16_t* new_slots = malloc(sizeof(uint16_t) * new_size);
+    if (new_slots == NULL)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
         }
+    memset(new_slots, 0xff, sizeof(uint16_t) * new_size);
 
-#if GSD_USE_MMAP
-    if (buf->mapped_data)
-        {
-        int retval = munmap(buf->mapped_data, buf->mapped_len);
+    free(map->slots);
+    map->slots = new_slots;
+    map->size = new_size;
 
-        if (retval != 0)
-            {
-            return GSD_ERROR_IO;
-            }
-        }
-    else
-#endif
+    // rehash in insertion order so that the first of any duplicate names is found first
+    size_t i;
+    for (i = 0; i < map->n_pairs; i++)
         {
-        free(buf->data);
+        gsd_name_id_map_place(map, (uint16_t)i);
         }
 
-    gsd_util_zero_memory(buf, sizeof(struct gsd_index_buffer));
     return GSD_SUCCESS;
     }
 
 /** @internal
-    @brief Add a new index entry and provide a pointer to it.
-
-    @param buf Buffer to add too.
-    @param entry [out] Pointer to set to the new entry.
+    @brief Insert a string into a name/id map
 
-    Double the size of the reserved space as needed to hold the new entry. Does not accept mapped
-    indices.
+    @param map Map to insert into.
+    @param str String to insert.
+    @param id ID to associate with the string.
 
     @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int gsd_index_buffer_add(struct gsd_index_buffer* buf, struct gsd_index_entry** entry)
+inline static int gsd_name_id_map_insert(struct gsd_name_id_map* map, const char* str, uint16_t id)
     {
-    if (buf == NULL || buf->mapped_data || entry == NULL || buf->reserved == 0)
+    if (map == NULL || map->slots == NULL || map->size == 0)
         {
         return GSD_ERROR_INVALID_ARGUMENT;
         }
 
-    if (buf->size == buf->reserved)
+    // a file holds fewer than UINT16_MAX names
+    if (map->n_pairs >= UINT16_MAX)
         {
-        // grow the array
-        size_t new_reserved = buf->reserved * 2;
-        // NOLINTNEXTLINE(bugprone-suspicious-realloc-usage): realloc is used correctly
-        buf->data = realloc(buf->data, sizeof(struct gsd_index_entry) * new_reserved);
-        if (buf->data == NULL)
+        return GSD_ERROR_NAMELIST_FULL;
+        }
+
+    int retval;
+    if ((map->n_pairs + 1) * 2 > map->size)
+        {
+        retval = gsd_name_id_map_grow(map);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    if (map->n_pairs == map->reserved)
+        {
+        size_t new_reserved = map->reserved * 2;
+        if (new_reserved == 0)
+            {
+            new_reserved = map->size / 2;
+            }
+
+        struct gsd_name_id_pair* new_v
+            = realloc(map->v, sizeof(struct gsd_name_id_pair) * new_reserved);
+        if (new_v == NULL)
             {
             return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
             }
+        map->v = new_v;
+        map->reserved = new_reserved;
+        }
+
+    // copy the name
+    size_t len = strlen(str) + 1;
+    if (map->names.reserved == 0)
+        {
+        retval = gsd_byte_buffer_allocate(&map->names, GSD_INITIAL_NAME_BUFFER_SIZE);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
 
-        // zero the new memory
-        gsd_util_zero_memory(buf->data + buf->reserved,
-                             sizeof(struct gsd_index_entry) * (new_reserved - buf->reserved));
-        buf->reserved = new_reserved;
+    struct gsd_name_id_pair* pair = &map->v[map->n_pairs];
+    pair->name = map->names.size;
+    pair->hash = (uint32_t)gsd_hash_str((const unsigned char*)str);
+    pair->id = id;
+
+    retval = gsd_byte_buffer_append(&map->names, str, len);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
         }
 
-    size_t insert_pos = buf->size;
-    buf->size++;
-    *entry = buf->data + insert_pos;
+    gsd_name_id_map_place(map, (uint16_t)map->n_pairs);
+    map->n_pairs++;
 
     return GSD_SUCCESS;
     }
 
-inline static int gsd_cmp_index_entry(const struct gsd_index_entry* a,
-                                      const struct gsd_index_entry* b)
-    {
-    int result = 0;
+/** @internal
+    @brief Find an ID in a name/id mapping
 
-    if (a->frame < b->frame)
-        {
-        result = -1;
-        }
+    @param map Map to search.
+    @param str String to search.
 
-    if (a->frame > b->frame)
+    @returns The ID if found, or UINT16_MAX if not found.
+*/
+inline static uint16_t gsd_name_id_map_find(struct gsd_name_id_map* map, const char* str)
+    {
+    if (map == NULL || map->slots == NULL || map->size == 0)
         {
-        result = 1;
+        return UINT16_MAX;
         }
 
-    if (a->frame == b->frame)
-        {
-        if (a->id < b->id)
-            {
-            result = -1;
-            }
+    uint32_t hash = (uint32_t)gsd_hash_str((const unsigned char*)str);
+    size_t mask = map->size - 1;
+    size_t slot = hash & mask;
 
-        if (a->id > b->id)
+    // the load factor is at most 1/2, so there is always an empty slot to end the probe
+    while (map->slots[slot] != UINT16_MAX)
+        {
+        const struct gsd_name_id_pair* pair = &map->v[map->slots[slot]];
+        if (pair->hash == hash && strcmp(str, map->names.data + pair->name) == 0)
             {
-            result = 1;
+            // found
+            return pair->id;
             }
 
-        if (a->id == b->id)
-            {
-            result = 0;
-            }
+        // keep looking
+        slot = (slot + 1) & mask;
         }
 
-    return result;
+    // not found
+    return UINT16_MAX;
     }
 
 /** @internal
-    @brief Compute heap parent node.
-    @param i Node index.
-*/
-inline static size_t gsd_heap_parent(size_t i)
-    {
-    return (i - 1) / 2;
-    }
+    @brief Get a name in a name/id map
 
-/** @internal
-    @brief Compute heap left child.
-    @param i Node index.
-*/
-inline static size_t gsd_heap_left_child(size_t i)
-    {
-    return 2 * i + 1;
-    }
+    @param map Map to read.
+    @param i Position of the mapping in map->v.
 
-/** @internal
-    @brief Swap the nodes *a* and *b* in the buffer
-    @param buf Buffer.
-    @param a First index to swap.
-    @param b Second index to swap.
+    @returns The name of the mapping.
 */
-inline static void gsd_heap_swap(struct gsd_index_buffer* buf, size_t a, size_t b)
+inline static const char* gsd_name_id_map_name(const struct gsd_name_id_map* map, uint16_t i)
     {
-    struct gsd_index_entry tmp = buf->data[a];
-    buf->data[a] = buf->data[b];
-    buf->data[b] = tmp;
+    return map->names.data + map->v[i].name;
     }
 
 /** @internal
-    @brief Shift heap node downward
-    @param buf Buffer.
-    @param start First index of the valid heap in *buf*.
-    @param end Last index of the valid hep in *buf*.
+    @brief Merge two sorted runs of mapping positions
+
+    @param map Map that holds the names.
+    @param dst Output array with room for *n_a* + *n_b* positions.
+    @param a First run.
+    @param n_a Number of positions in the first run.
+    @param b Second run.
+    @param n_b Number of positions in the second run.
+
+    Positions in *a* come before positions in *b* with equal names.
 */
-inline static void gsd_heap_shift_down(struct gsd_index_buffer* buf, size_t start, size_t end)
+inline static void gsd_name_id_map_merge(const struct gsd_name_id_map* map,
+                                         uint16_t* dst,
+                                         const uint16_t* a,
+                                         size_t n_a,
+                                         const uint16_t* b,
+                                         size_t n_b)
     {
-    size_t root = start;
-
-    while (gsd_heap_left_child(root) <= end)
+    size_t i = 0;
+    size_t j = 0;
+    size_t k = 0;
+    while (i < n_a && j < n_b)
         {
-        size_t child = gsd_heap_left_child(root);
-        size_t swap = root;
-
-        if (gsd_cmp_index_entry(buf->data + swap, buf->data + child) < 0)
+        if (strcmp(gsd_name_id_map_name(map, b[j]), gsd_name_id_map_name(map, a[i])) < 0)
             {
-            swap = child;
+            dst[k++] = b[j++];
             }
-        if (child + 1 <= end && gsd_cmp_index_entry(buf->data + swap, buf->data + child + 1) < 0)
+        else
             {
-            swap = child + 1;
+            dst[k++] = a[i++];
             }
+        }
 
-        if (swap == root)
+    // the final merge may write the remainder of b onto itself
+    memmove(dst + k, a + i, sizeof(uint16_t) * (n_a - i));
+    k += n_a - i;
+    memmove(dst + k, b + j, sizeof(uint16_t) * (n_b - j));
+    }
+
+/** @internal
+    @brief Sort the names added to a name/id map since the last call
+
+    @param map Map to sort.
+
+    Sort the new mappings with a bottom up merge sort and merge them with the sorted mappings, so
+    that appending a few names to a large map takes O(N) time.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_name_id_map_sort(struct gsd_name_id_map* map)
+    {
+    if (map->n_sorted == map->n_pairs)
+        {
+        return GSD_SUCCESS;
+        }
+
+    uint16_t* new_sorted = realloc(map->sorted, sizeof(uint16_t) * map->n_pairs);
+    if (new_sorted == NULL)
+        {
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        }
+    map->sorted = new_sorted;
+
+    uint16_t* tmp = malloc(sizeof(uint16_t) * map->n_pairs);
+    if (tmp == NULL)
+        {
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        }
+
+    size_t i;
+    for (i = map->n_sorted; i < map->n_pairs; i++)
+        {
+        map->sorted[i] = (uint16_t)i;
+        }
+
+    // sort the new positions, swapping between the two arrays each pass
+    uint16_t* src = map->sorted + map->n_sorted;
+    uint16_t* dst = tmp + map->n_sorted;
+    size_t n_new = map->n_pairs - map->n_sorted;
+    size_t width;
+    for (width = 1; width < n_new; width *= 2)
+        {
+        for (i = 0; i < n_new; i += 2 * width)
             {
-            return;
+            size_t n_a = width < n_new - i ? width : n_new - i;
+            size_t n_b = 2 * width < n_new - i ? width : n_new - i - n_a;
+            gsd_name_id_map_merge(map, dst + i, src + i, n_a, src + i + n_a, n_b);
             }
 
-        gsd_heap_swap(buf, root, swap);
-        root = swap;
+        uint16_t* swap = src;
+        src = dst;
+        dst = swap;
         }
+
+    // merge the sorted new positions with the previously sorted positions
+    gsd_name_id_map_merge(map, tmp, map->sorted, map->n_sorted, src, n_new);
+    memcpy(map->sorted, tmp, sizeof(uint16_t) * map->n_pairs);
+    free(tmp);
+
+    map->n_sorted = map->n_pairs;
+
+    return GSD_SUCCESS;
     }
 
 /** @internal
-    @brief Convert unordered index buffer to a heap
-    @param buf Buffer.
+    @brief Compare two mapping positions
+
+    @param a Pointer to the first position.
+    @param b Pointer to the second position.
+
+    @returns Negative, zero, or positive as *a* is less than, equal to, or greater than *b*.
 */
-inline static void gsd_heapify(struct gsd_index_buffer* buf)
+inline static int gsd_cmp_position(const void* a, const void* b)
     {
-    ssize_t start = gsd_heap_parent(buf->size - 1);
+    return (int)*(const uint16_t*)a - (int)*(const uint16_t*)b;
+    }
 
-    while (start >= 0)
+/** @internal
+    @brief Find the first sorted name that is not less than the given string
+
+    @param map Sorted map to search.
+    @param str String to search for.
+
+    @returns The position in map->sorted of the first name not less than *str*.
+*/
+inline static size_t gsd_name_id_map_lower_bound(const struct gsd_name_id_map* map, const char* str)
+    {
+    size_t L = 0;
+    size_t R = map->n_sorted;
+    while (L < R)
         {
-        gsd_heap_shift_down(buf, start, buf->size - 1);
-        start--;
+        size_t m = L + (R - L) / 2;
+        if (strcmp(gsd_name_id_map_name(map, map->sorted[m]), str) < 0)
+            {
+            L = m + 1;
+            }
+        else
+            {
+            R = m;
+            }
         }
+
+    return L;
     }
 
 /** @internal
-    @brief Sort the index buffer.
-
-    @param buf Buffer to sort.
+    @brief Group the bytes of the elements by significance.
 
-    Sorts an in-memory index buffer. Does not accept mapped indices.
+    @param dst Output buffer.
+    @param src Input buffer.
+    @param n_elements Number of elements in *src*.
+    @param element_size Size of each element in bytes.
 
-    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+    Byte *j* of element *i* is placed at `dst[j * n_elements + i]`. The high bytes of similar
+    numbers are often identical, so the shuffled data compresses better.
 */
-inline static int gsd_index_buffer_sort(struct gsd_index_buffer* buf)
+inline static void
+gsd_shuffle(char* dst, const char* src, size_t n_elements, size_t element_size)
     {
-    if (buf == NULL || buf->mapped_data || buf->reserved == 0)
+    for (size_t i = 0; i < n_elements; i++)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        for (size_t j = 0; j < element_size; j++)
+            {
+            dst[j * n_elements + i] = src[i * element_size + j];
+            }
         }
+    }
 
-    // arrays of size 0 or 1 are already sorted
-    if (buf->size <= 1)
+/** @internal
+    @brief Reverse gsd_shuffle().
+
+    @param dst Output buffer.
+    @param src Input buffer.
+    @param n_elements Number of elements in *src*.
+    @param element_size Size of each element in bytes.
+*/
+inline static void
+gsd_unshuffle(char* dst, const char* src, size_t n_elements, size_t element_size)
+    {
+    for (size_t j = 0; j < element_size; j++)
         {
-        return GSD_SUCCESS;
+        for (size_t i = 0; i < n_elements; i++)
+            {
+            dst[i * element_size + j] = src[j * n_elements + i];
+            }
         }
+    }
 
-    gsd_heapify(buf);
+/** @internal
+    @brief Write a LZ length continuation.
 
-    size_t end = buf->size - 1;
-    while (end > 0)
+    @param dst Output buffer.
+    @param pos Position in *dst* to write.
+    @param length Length to write.
+
+    @returns The position in *dst* following the length.
+*/
+inline static size_t gsd_lz_write_length(uint8_t* dst, size_t pos, size_t length)
+    {
+    while (length >= UINT8_MAX)
         {
-        gsd_heap_swap(buf, end, 0);
-        end = end - 1;
-        gsd_heap_shift_down(buf, 0, end);
+        dst[pos++] = UINT8_MAX;
+        length -= UINT8_MAX;
         }
-
-    return GSD_SUCCESS;
+    dst[pos++] = (uint8_t)length;
+    return pos;
     }
 
 /** @internal
-    @brief Utility function to expand the memory space for the index block in the file.
+    @brief Read a LZ length continuation.
 
-    @param handle Handle to the open gsd file.
-    @param size_required The new index must be able to hold at least this many elements.
+    @param src Input buffer.
+    @param src_size Number of bytes in *src*.
+    @param pos [in/out] Position in *src* to read.
+    @param length [in/out] Length to add the continuation to.
 
-    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+    @returns GSD_SUCCESS on success, GSD_ERROR_FILE_CORRUPT when the length is truncated.
 */
-inline static int gsd_expand_file_index(struct gsd_handle* handle, size_t size_required)
+inline static int
+gsd_lz_read_length(const uint8_t* src, size_t src_size, size_t* pos, size_t* length)
     {
-    if (handle->open_flags == GSD_OPEN_READONLY)
+    uint8_t value;
+    do
         {
-        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
-        }
+        if (*pos >= src_size)
+            {
+            return GSD_ERROR_FILE_CORRUPT;
+            }
+        value = src[(*pos)++];
+        *length += value;
+        } while (value == UINT8_MAX);
 
-    // multiply the index size each time it grows
-    // this allows the index to grow rapidly to accommodate new frames
-    const int multiplication_factor = 2;
+    return GSD_SUCCESS;
+    }
 
-    // save the old size and update the new size
-    size_t size_old = handle->header.index_allocated_entries;
-    size_t size_new = size_old * multiplication_factor;
+/** @internal
+    @brief Write one LZ sequence.
 
-    while (size_new <= size_required)
-        {
-        size_new *= multiplication_factor;
-        }
+    @param dst Output buffer.
+    @param capacity Number of bytes available in *dst*.
+    @param pos [in/out] Position in *dst* to write.
+    @param literals Literal bytes.
+    @param n_literals Number of literal bytes.
+    @param offset Distance back to the start of the match.
+    @param match_length Length of the match (0 for the last sequence).
 
-    // Mac systems deadlock when writing from a mapped region into the tail end of that same region
-    // unmap the index first and copy it over by chunks
-    int retval = gsd_index_buffer_free(&handle->file_index);
-    if (retval != 0)
+    @returns 1 on success, 0 when the sequence does not fit in *dst*.
+*/
+inline static int gsd_lz_write_sequence(uint8_t* dst,
+                                        size_t capacity,
+                                        size_t* pos,
+                                        const uint8_t* literals,
+                                        size_t n_literals,
+                                        size_t offset,
+                                        size_t match_length)
+    {
+    size_t match_code = match_length > 0 ? match_length - GSD_LZ_MIN_MATCH : 0;
+    size_t max_sequence_size
+        = 1 + (n_literals / UINT8_MAX + 1) + n_literals + 2 + (match_code / UINT8_MAX + 1);
+    if (max_sequence_size > capacity - *pos)
         {
-        return retval;
+        return 0;
         }
 
-    // allocate the copy buffer
-    uint64_t copy_buffer_size
-        = GSD_DEFAULT_INDEX_ENTRIES_TO_BUFFER * sizeof(struct gsd_index_entry);
-    if (copy_buffer_size > size_old * sizeof(struct gsd_index_entry))
+    size_t p = *pos;
+    dst[p++] = (uint8_t)(((n_literals < 15 ? n_literals : 15) << 4)
+                         | (match_code < 15 ? match_code : 15));
+    if (n_literals >= 15)
         {
-        copy_buffer_size = size_old * sizeof(struct gsd_index_entry);
+        p = gsd_lz_write_length(dst, p, n_literals - 15);
         }
-    char* buf = malloc(copy_buffer_size);
+    memcpy(dst + p, literals, n_literals);
+    p += n_literals;
 
-    // write the current index to the end of the file
-    int64_t new_index_location = lseek(handle->fd, 0, SEEK_END);
-    int64_t old_index_location = handle->header.index_location;
-    size_t total_bytes_written = 0;
-    size_t old_index_bytes = size_old * sizeof(struct gsd_index_entry);
-    while (total_bytes_written < old_index_bytes)
+    if (match_length > 0)
         {
-        size_t bytes_to_copy = copy_buffer_size;
-        if (old_index_bytes - total_bytes_written < copy_buffer_size)
+        dst[p++] = (uint8_t)(offset & 0xFF);
+        dst[p++] = (uint8_t)(offset >> 8);
+        if (match_code >= 15)
             {
-            bytes_to_copy = old_index_bytes - total_bytes_written;
+            p = gsd_lz_write_length(dst, p, match_code - 15);
             }
+        }
+
+    *pos = p;
+    return 1;
+    }
+
+/** @internal
+    @brief Compress a buffer with the LZ codec.
+
+    @param dst Output buffer.
+    @param capacity Number of bytes available in *dst*.
+    @param src Input buffer.
+    @param size Number of bytes in *src* (must be less than UINT32_MAX).
+    @param table Hash table with `1 << GSD_LZ_HASH_BITS` entries.
+
+    The compressed stream is a series of sequences. Each sequence starts with a token byte that
+    holds the number of literal bytes in the high 4 bits and the match length minus
+    GSD_LZ_MIN_MATCH in the low 4 bits. A 4-bit value of 15 continues the length in the following
+    bytes, each adding 0-255 with 255 indicating that another byte follows. The literal length
+    continuation is followed by the literal bytes, a 2-byte little endian match offset, and the
+    match length continuation. The last sequence has only literals.
+
+    @returns The number of bytes written to *dst*, or 0 when the compressed stream does not fit.
+*/
+inline static size_t
+gsd_lz_compress(uint8_t* dst, size_t capacity, const uint8_t* src, size_t size, uint32_t* table)
+    {
+    size_t ip = 0;
+    size_t anchor = 0;
+    size_t op = 0;
+
+    // table entries store position + 1 so that 0 marks an empty slot
+    gsd_util_zero_memory(table, sizeof(uint32_t) << GSD_LZ_HASH_BITS);
 
-        ssize_t bytes_read = gsd_io_pread_retry(handle->fd,
-                                                buf,
-                                                bytes_to_copy,
-                                                old_index_location + total_bytes_written);
+    while (size >= GSD_LZ_MIN_MATCH && ip <= size - GSD_LZ_MIN_MATCH)
+        {
+        uint32_t sequence;
+        memcpy(&sequence, src + ip, sizeof(uint32_t));
+        uint32_t hash = (sequence * 2654435761U) >> (32 - GSD_LZ_HASH_BITS);
+        size_t candidate = table[hash];
+        table[hash] = (uint32_t)(ip + 1);
 
-        if (bytes_read == -1 || bytes_read != bytes_to_copy)
+        if (candidate == 0 || ip - (candidate - 1) > GSD_LZ_MAX_OFFSET
+            || memcmp(src + candidate - 1, src + ip, GSD_LZ_MIN_MATCH) != 0)
             {
-            free(buf);
-            return GSD_ERROR_IO;
+            ip++;
+            continue;
             }
 
-        ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd,
-                                                    buf,
-                                                    bytes_to_copy,
-                                                    new_index_location + total_bytes_written);
+        size_t match = candidate - 1;
+        size_t match_length = GSD_LZ_MIN_MATCH;
+        while (ip + match_length < size && src[match + match_length] == src[ip + match_length])
+            {
+            match_length++;
+            }
 
-        if (bytes_written == -1 || bytes_written != bytes_to_copy)
+        if (!gsd_lz_write_sequence(dst,
+                                   capacity,
+                                   &op,
+                                   src + anchor,
+                                   ip - anchor,
+                                   ip - match,
+                                   match_length))
             {
-            free(buf);
-            return GSD_ERROR_IO;
+            return 0;
             }
 
-        total_bytes_written += bytes_written;
+        ip += match_length;
+        anchor = ip;
         }
 
-    // fill the new index space with 0s
-    gsd_util_zero_memory(buf, copy_buffer_size);
+    if (!gsd_lz_write_sequence(dst, capacity, &op, src + anchor, size - anchor, 0, 0))
+        {
+        return 0;
+        }
 
-    size_t new_index_bytes = size_new * sizeof(struct gsd_index_entry);
-    while (total_bytes_written < new_index_bytes)
+    return op;
+    }
+
+/** @internal
+    @brief Decompress a buffer compressed by gsd_lz_compress().
+
+    @param dst Output buffer.
+    @param size Number of bytes expected in *dst*.
+    @param src Compressed stream.
+    @param src_size Number of bytes in *src*.
+
+    @returns GSD_SUCCESS on success, GSD_ERROR_FILE_CORRUPT when the stream is invalid.
+*/
+inline static int
+gsd_lz_decompress(uint8_t* dst, size_t size, const uint8_t* src, size_t src_size)
+    {
+    size_t ip = 0;
+    size_t op = 0;
+
+    while (ip < src_size)
         {
-        size_t bytes_to_copy = copy_buffer_size;
-        if (new_index_bytes - total_bytes_written < copy_buffer_size)
+        uint8_t token = src[ip++];
+
+        size_t n_literals = token >> 4;
+        if (n_literals == 15 && gsd_lz_read_length(src, src_size, &ip, &n_literals) != GSD_SUCCESS)
+            {
+            return GSD_ERROR_FILE_CORRUPT;
+            }
+        if (n_literals > src_size - ip || n_literals > size - op)
             {
-            bytes_to_copy = new_index_bytes - total_bytes_written;
+            return GSD_ERROR_FILE_CORRUPT;
             }
+        memcpy(dst + op, src + ip, n_literals);
+        ip += n_literals;
+        op += n_literals;
 
-        ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd,
-                                                    buf,
-                                                    bytes_to_copy,
-                                                    new_index_location + total_bytes_written);
+        // the last sequence has no match
+        if (ip == src_size)
+            {
+            break;
+            }
 
-        if (bytes_written == -1 || bytes_written != bytes_to_copy)
+        if (src_size - ip < 2)
             {
-            free(buf);
-            return GSD_ERROR_IO;
+            return GSD_ERROR_FILE_CORRUPT;
             }
+        size_t offset = (size_t)src[ip] | ((size_t)src[ip + 1] << 8);
+        ip += 2;
 
-        total_bytes_written += bytes_written;
+        size_t match_length = token & 0xF;
+        if (match_length == 15
+            && gsd_lz_read_length(src, src_size, &ip, &match_length) != GSD_SUCCESS)
+            {
+            return GSD_ERROR_FILE_CORRUPT;
+            }
+        match_length += GSD_LZ_MIN_MATCH;
+
+        if (offset == 0 || offset > op || match_length > size - op)
+            {
+            return GSD_ERROR_FILE_CORRUPT;
+            }
+
+        if (offset >= match_length)
+            {
+            memcpy(dst + op, dst + op - offset, match_length);
+            }
+        else
+            {
+            // overlapping matches repeat the last offset bytes
+            for (size_t i = 0; i < match_length; i++)
+                {
+                dst[op + i] = dst[op - offset + i];
+                }
+            }
+        op += match_length;
         }
 
-    // sync the expanded index
-    retval = fsync(handle->fd);
-    if (retval != 0)
+    if (op != size)
         {
-        free(buf);
-        return GSD_ERROR_IO;
+        return GSD_ERROR_FILE_CORRUPT;
         }
 
-    // free the copy buffer
-    free(buf);
+    return GSD_SUCCESS;
+    }
 
-    // update the header
-    handle->header.index_location = new_index_location;
-    handle->file_size = handle->header.index_location + total_bytes_written;
-    handle->header.index_allocated_entries = size_new;
+/** @internal
+    @brief Compress a chunk with GSD_CODEC_SHUFFLE_LZ.
 
-    // write the new header out
-    ssize_t bytes_written
-        = gsd_io_pwrite_retry(handle->fd, &(handle->header), sizeof(struct gsd_header), 0);
-    if (bytes_written != sizeof(struct gsd_header))
+    @param handle Handle to the open gsd file.
+    @param data Chunk data.
+    @param n_elements Number of elements in *data*.
+    @param element_size Size of each element in bytes.
+    @param compressed [out] The codec header followed by the compressed data.
+    @param compressed_size [out] Number of bytes in *compressed*.
+
+    *compressed* points into gsd_handle::codec_buffer and is valid until the next call.
+    *compressed_size* is 0 when compression does not reduce the size of the chunk.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_compress_chunk(struct gsd_handle* handle,
+                                     const void* data,
+                                     size_t n_elements,
+                                     size_t element_size,
+                                     const char** compressed,
+                                     size_t* compressed_size)
+    {
+    size_t size = n_elements * element_size;
+    *compressed_size = 0;
+
+    if (size <= sizeof(struct gsd_codec_header) || size >= UINT32_MAX)
         {
-        return GSD_ERROR_IO;
+        return GSD_SUCCESS;
         }
 
-    // sync the updated header
-    retval = fsync(handle->fd);
-    if (retval != 0)
+    // codec buffer layout: hash table, shuffled data, codec header and compressed data
+    size_t table_size = sizeof(uint32_t) << GSD_LZ_HASH_BITS;
+    int retval = gsd_byte_buffer_reserve(&handle->codec_buffer, table_size + size * 2);
+    if (retval != GSD_SUCCESS)
         {
-        return GSD_ERROR_IO;
+        return retval;
         }
 
-    // remap the file index
-    retval = gsd_index_buffer_map(&handle->file_index, handle);
-    if (retval != 0)
+    uint32_t* table = (uint32_t*)handle->codec_buffer.data;
+    char* shuffled = handle->codec_buffer.data + table_size;
+    char* output = shuffled + size;
+
+    const char* input = data;
+    if (element_size > 1)
         {
-        return retval;
+        gsd_shuffle(shuffled, data, n_elements, element_size);
+        input = shuffled;
+        }
+
+    struct gsd_codec_header header;
+    gsd_util_zero_memory(&header, sizeof(struct gsd_codec_header));
+    header.codec = GSD_CODEC_SHUFFLE_LZ;
+    header.compressed_size = gsd_lz_compress((uint8_t*)output + sizeof(struct gsd_codec_header),
+                                             size - sizeof(struct gsd_codec_header) - 1,
+                                             (const uint8_t*)input,
+                                             size,
+                                             table);
+    if (header.compressed_size == 0)
+        {
+        return GSD_SUCCESS;
         }
 
+    memcpy(output, &header, sizeof(struct gsd_codec_header));
+    *compressed = output;
+    *compressed_size = sizeof(struct gsd_codec_header) + header.compressed_size;
     return GSD_SUCCESS;
     }
 
 /** @internal
-    @brief Flush the write buffer.
+    @brief Read and decompress a chunk stored with GSD_FLAG_COMPRESSED.
 
-    gsd_write_frame() writes small data chunks into the write buffer. It adds index entries for
-    these chunks to gsd_handle::buffer_index with locations offset from the start of the write
-    buffer. gsd_flush_write_buffer() writes the buffer to the end of the file, moves the index
-    entries to gsd_handle::frame_index and updates the location to reference the beginning of the
-    file.
+    @param handle Handle to the open gsd file.
+    @param data Data buffer to read into.
+    @param chunk Chunk to read.
 
-    @param handle Handle to flush the write buffer.
-    @returns GSD_SUCCESS on success or GSD_* error codes on error
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int gsd_flush_write_buffer(struct gsd_handle* handle)
+inline static int
+gsd_read_compressed_chunk(struct gsd_handle* handle, void* data, const struct gsd_index_entry* chunk)
     {
-    if (handle == NULL)
+    size_t element_size = gsd_sizeof_type((enum gsd_type)chunk->type);
+    size_t n_elements = chunk->N * chunk->M;
+    size_t size = n_elements * element_size;
+
+    struct gsd_codec_header header;
+    if ((chunk->location + sizeof(struct gsd_codec_header)) > (uint64_t)handle->file_size)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return GSD_ERROR_FILE_CORRUPT;
         }
-
-    if (handle->write_buffer.size == 0 && handle->buffer_index.size == 0)
+    ssize_t bytes_read = gsd_io_pread_retry(handle->fd,
+                                            &header,
+                                            sizeof(struct gsd_codec_header),
+                                            chunk->location);
+    if (bytes_read == -1 || bytes_read != sizeof(struct gsd_codec_header))
         {
-        // nothing to do
-        return GSD_SUCCESS;
+        return GSD_ERROR_IO;
         }
 
-    if (handle->write_buffer.size > 0 && handle->buffer_index.size == 0)
+    int64_t data_location = chunk->location + sizeof(struct gsd_codec_header);
+    if (header.codec != GSD_CODEC_SHUFFLE_LZ || header.compressed_size == 0
+        || header.compressed_size > (uint64_t)(handle->file_size - data_location))
         {
-        // error: bytes in buffer, but no index for them
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return GSD_ERROR_FILE_CORRUPT;
         }
 
-    // write the buffer to the end of the file
-    uint64_t offset = handle->file_size;
-    ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd,
-                                                handle->write_buffer.data,
-                                                handle->write_buffer.size,
-                                                offset);
+    // Allocate a temporary buffer per call so that concurrent reads from read-only handles remain
+    // safe. Shuffled data is decompressed after the compressed bytes, then unshuffled into *data*.
+    size_t shuffled_size = element_size > 1 ? size : 0;
+    char* buffer = malloc(header.compressed_size + shuffled_size);
+    if (buffer == NULL)
+        {
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        }
 
-    if (bytes_written == -1 || bytes_written != handle->write_buffer.size)
+    bytes_read = gsd_io_pread_retry(handle->fd, buffer, header.compressed_size, data_location);
+    if (bytes_read == -1 || (uint64_t)bytes_read != header.compressed_size)
         {
+        free(buffer);
         return GSD_ERROR_IO;
         }
 
-    handle->file_size += handle->write_buffer.size;
+    char* decompressed = element_size > 1 ? buffer + header.compressed_size : data;
+    int retval = gsd_lz_decompress((uint8_t*)decompressed,
+                                   size,
+                                   (const uint8_t*)buffer,
+                                   header.compressed_size);
+    if (retval == GSD_SUCCESS && element_size > 1)
+        {
+        gsd_unshuffle(data, decompressed, n_elements, element_size);
+        }
 
-    // reset write_buffer for new data
-    handle->write_buffer.size = 0;
+    free(buffer);
+    return retval;
+    }
 
-    // Move buffer_index entries to frame_index.
-    size_t i;
-    for (i = 0; i < handle->buffer_index.size; i++)
-        {
-        struct gsd_index_entry* new_index;
-        int retval = gsd_index_buffer_add(&handle->frame_index, &new_index);
-        if (retval != GSD_SUCCESS)
+/** @internal
+    @brief Free a write segment list
+
+    @param list List to free.
+*/
+inline static void gsd_write_segment_list_free(struct gsd_write_segment_list* list)
+    {
+    free(list->data);
+    gsd_util_zero_memory(list, sizeof(struct gsd_write_segment_list));
+    }
+
+/** @internal
+    @brief Append a segment to a write segment list
+
+    @param list List to append to.
+    @param data Borrowed data, or NULL for a segment in the write buffer.
+    @param offset Offset of the segment in the write buffer (when *data* is NULL).
+    @param size Number of bytes in the segment.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_write_segment_list_append(struct gsd_write_segment_list* list,
+                                                const char* data,
+                                                size_t offset,
+                                                size_t size)
+    {
+    if (list->size == list->reserved)
+        {
+        size_t new_reserved = GSD_INITIAL_WRITE_SEGMENTS;
+        if (list->reserved > 0)
             {
-            return retval;
+            new_reserved = list->reserved * 2;
             }
 
-        *new_index = handle->buffer_index.data[i];
-        new_index->location += offset;
+        struct gsd_write_segment* new_data
+            = realloc(list->data, sizeof(struct gsd_write_segment) * new_reserved);
+        if (new_data == NULL)
+            {
+            return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+            }
+
+        list->data = new_data;
+        list->reserved = new_reserved;
         }
 
-    // clear the buffer index for new entries
-    handle->buffer_index.size = 0;
+    struct gsd_write_segment* segment = &list->data[list->size];
+    segment->data = data;
+    segment->offset = offset;
+    segment->size = size;
+    list->size++;
 
     return GSD_SUCCESS;
     }
 
 /** @internal
-    @brief Flush the name buffer.
+    @brief Add a segment for the bytes copied into the write buffer since the last segment
 
-    gsd_write_frame() adds new names to the frame_names buffer. gsd_flush_name_buffer() flushes
-    this buffer at the end of a frame write and commits the new names to the file. If necessary,
-    the namelist is written to a new location in the file.
+    @param handle Handle to the open gsd file.
 
-    @param handle Handle to flush the write buffer.
-    @returns GSD_SUCCESS on success or GSD_* error codes on error
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int gsd_flush_name_buffer(struct gsd_handle* handle)
+inline static int gsd_write_segment_list_add_copied(struct gsd_handle* handle)
     {
-    if (handle == NULL)
-        {
-        return GSD_ERROR_INVALID_ARGUMENT;
-        }
-
-    if (handle->frame_names.n_names == 0)
+    struct gsd_write_segment_list* list = &handle->write_segments;
+    if (handle->write_buffer.size == list->copied)
         {
-        // nothing to do
         return GSD_SUCCESS;
         }
 
-    if (handle->frame_names.data.size == 0)
-        {
-        // error: bytes in buffer, but no names for them
-        return GSD_ERROR_INVALID_ARGUMENT;
-        }
+    int retval = gsd_write_segment_list_append(list,
+                                               NULL,
+                                               list->copied,
+                                               handle->write_buffer.size - list->copied);
+    list->copied = handle->write_buffer.size;
+    return retval;
+    }
 
-    size_t old_reserved = handle->file_names.data.reserved;
-    size_t old_size = handle->file_names.data.size;
+/** @internal
+    @brief Write the segments in the write buffer to the file
 
-    // add the new names to the file name list and zero the frame list
-    int retval = gsd_byte_buffer_append(&handle->file_names.data,
-                                        handle->frame_names.data.data,
-                                        handle->frame_names.data.size);
-    if (retval != GSD_SUCCESS)
-        {
-        return retval;
-        }
+    @param handle Handle to the open gsd file.
+    @param offset Location in the file to write the first segment at.
 
-    handle->file_names.n_names += handle->frame_names.n_names;
-    handle->frame_names.n_names = 0;
-    handle->frame_names.data.size = 0;
-    gsd_util_zero_memory(handle->frame_names.data.data, handle->frame_names.data.reserved);
+    Write up to GSD_IOVEC_BATCH_SIZE segments with each call to pwritev().
 
-    // reserved space must be a multiple of the GSD name size
-    if (handle->file_names.data.reserved % GSD_NAME_SIZE != 0)
-        {
-        return GSD_ERROR_INVALID_ARGUMENT;
-        }
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_io_pwrite_segments(struct gsd_handle* handle, int64_t offset)
+    {
+    const struct gsd_write_segment_list* list = &handle->write_segments;
+    size_t i = 0;
 
-    if (handle->file_names.data.reserved > old_reserved)
+    while (i < list->size)
         {
-        // write the new name list to the end of the file
-        uint64_t offset = handle->file_size;
-        ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd,
-                                                    handle->file_names.data.data,
-                                                    handle->file_names.data.reserved,
-                                                    offset);
-
-        if (bytes_written == -1 || bytes_written != handle->file_names.data.reserved)
+#if GSD_USE_PWRITEV
+        struct iovec iov[GSD_IOVEC_BATCH_SIZE];
+        int count = 0;
+        for (; i + count < list->size && count < GSD_IOVEC_BATCH_SIZE; count++)
             {
-            return GSD_ERROR_IO;
+            const struct gsd_write_segment* segment = &list->data[i + count];
+            const char* data = segment->data;
+            if (data == NULL)
+                {
+                data = handle->write_buffer.data + segment->offset;
+                }
+
+            iov[count].iov_base = (void*)data;
+            iov[count].iov_len = segment->size;
             }
 
-        // sync the updated name list
-        retval = fsync(handle->fd);
-        if (retval != 0)
+        ssize_t bytes_written = pwritev(handle->fd, iov, count, offset);
+        if (bytes_written == -1)
             {
-            return GSD_ERROR_IO;
+            if (errno != EINTR)
+                {
+                return GSD_ERROR_IO;
+                }
+            bytes_written = 0;
             }
 
-        handle->file_size += handle->file_names.data.reserved;
-        handle->header.namelist_location = offset;
-        handle->header.namelist_allocated_entries
-            = handle->file_names.data.reserved / GSD_NAME_SIZE;
+        // finish a partial write one segment at a time
+        size_t skip = (size_t)bytes_written;
+        int j;
+        for (j = 0; j < count; j++)
+            {
+            if (skip < iov[j].iov_len)
+                {
+                size_t remaining = iov[j].iov_len - skip;
+                ssize_t retval = gsd_io_pwrite_retry(handle->fd,
+                                                     (const char*)iov[j].iov_base + skip,
+                                                     remaining,
+                                                     offset + (int64_t)skip);
+                if (retval == -1 || (size_t)retval != remaining)
+                    {
+                    return GSD_ERROR_IO;
+                    }
+                skip = 0;
+                }
+            else
+                {
+                skip -= iov[j].iov_len;
+                }
 
-        // write the new header out
-        bytes_written
-            = gsd_io_pwrite_retry(handle->fd, &(handle->header), sizeof(struct gsd_header), 0);
-        if (bytes_written != sizeof(struct gsd_header))
+            offset += (int64_t)iov[j].iov_len;
+            }
+
+        i += count;
+#else
+        const struct gsd_write_segment* segment = &list->data[i];
+        const char* data = segment->data;
+        if (data == NULL)
             {
-            return GSD_ERROR_IO;
+            data = handle->write_buffer.data + segment->offset;
             }
-        }
-    else
-        {
-        // write the new name list to the old index location
-        uint64_t offset = handle->header.namelist_location;
-        ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd,
-                                                    handle->file_names.data.data + old_size,
-                                                    handle->file_names.data.reserved - old_size,
-                                                    offset + old_size);
-        if (bytes_written != (handle->file_names.data.reserved - old_size))
+
+        ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd, data, segment->size, offset);
+        if (bytes_written == -1 || (size_t)bytes_written != segment->size)
             {
             return GSD_ERROR_IO;
             }
-        }
 
-    // sync the updated name list or header
-    retval = fsync(handle->fd);
-    if (retval != 0)
-        {
-        return GSD_ERROR_IO;
+        offset += (int64_t)segment->size;
+        i++;
+#endif
         }
 
     return GSD_SUCCESS;
     }
 
 /** @internal
-    @brief utility function to append a name to the namelist
+    @brief Free the memory allocated by the frame directory.
 
-    @param id [out] ID of the new name
-    @param handle handle to the open gsd file
-    @param name string name
+    @param dir Directory to free.
+*/
+inline static void gsd_frame_directory_free(struct gsd_frame_directory* dir)
+    {
+    free(dir->data);
+    gsd_util_zero_memory(dir, sizeof(struct gsd_frame_directory));
+    }
 
-    Append a name to the names in the current frame. gsd_end_frame() will add this list to the
-    file names.
+/** @internal
+    @brief Extend the frame directory to cover the given frame.
 
-    @return
-      - GSD_SUCCESS (0) on success. Negative value on failure:
-      - GSD_ERROR_IO: IO error (check errno).
-      - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory.
-      - GSD_ERROR_FILE_MUST_BE_WRITABLE: File must not be read only.
+    @param handle Handle to the open file.
+    @param frame Frame to look up.
+
+    The file index is sorted by frame and new frames are only added at the end, so the directory
+    remains valid as the file grows. Each call scans only the index entries of the frames not yet
+    in the directory.
+
+    @pre *frame* is less than the number of frames in the file index.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int gsd_append_name(uint16_t* id, struct gsd_handle* handle, const char* name)
+inline static int gsd_frame_directory_extend(struct gsd_handle* handle, uint64_t frame)
     {
-    if (handle->open_flags == GSD_OPEN_READONLY)
-        {
-        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
-        }
-
-    if (handle->file_names.n_names + handle->frame_names.n_names == UINT16_MAX)
+    struct gsd_frame_directory* dir = &handle->frame_directory;
+    if (dir->size > frame + 1)
         {
-        // no more names may be added
-        return GSD_ERROR_NAMELIST_FULL;
+        return GSD_SUCCESS;
         }
 
-    // Provide the ID of the new name
-    *id = (uint16_t)(handle->file_names.n_names + handle->frame_names.n_names);
-
-    if (handle->header.gsd_version < gsd_make_version(2, 0))
+    if (dir->reserved < frame + 2)
         {
-        // v1 files always allocate GSD_NAME_SIZE bytes for each name and put a NULL terminator
-        // at address 63
-        char name_v1[GSD_NAME_SIZE];
-        strncpy(name_v1, name, GSD_NAME_SIZE - 1);
-        name_v1[GSD_NAME_SIZE - 1] = 0;
-        gsd_byte_buffer_append(&handle->frame_names.data, name_v1, GSD_NAME_SIZE);
-        handle->frame_names.n_names++;
+        size_t new_reserved = dir->reserved;
+        if (new_reserved == 0)
+            {
+            new_reserved = GSD_INITIAL_FRAME_DIRECTORY_SIZE;
+            }
+        while (new_reserved < frame + 2)
+            {
+            new_reserved = new_reserved * 2;
+            }
 
-        // update the name/id mapping with the truncated name
-        int retval = gsd_name_id_map_insert(&handle->name_map, name_v1, *id);
-        if (retval != GSD_SUCCESS)
+        uint64_t* new_data = realloc(dir->data, sizeof(uint64_t) * new_reserved);
+        if (new_data == NULL)
             {
-            return retval;
+            return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
             }
+        dir->data = new_data;
+        dir->reserved = new_reserved;
         }
-    else
+
+    uint64_t entry = 0;
+    if (dir->size > 0)
         {
-        gsd_byte_buffer_append(&handle->frame_names.data, name, strlen(name) + 1);
-        handle->frame_names.n_names++;
+        entry = dir->data[dir->size - 1];
+        }
 
-        // update the name/id mapping
-        int retval = gsd_name_id_map_insert(&handle->name_map, name, *id);
-        if (retval != GSD_SUCCESS)
+    while (dir->size < frame + 2)
+        {
+        while (entry < handle->file_index.size && handle->file_index.data[entry].frame < dir->size)
             {
-            return retval;
+            entry++;
             }
+        dir->data[dir->size] = entry;
+        dir->size++;
         }
 
     return GSD_SUCCESS;
     }
 
 /** @internal
-    @brief Cross-platform wrapper for the POSIX open() system function.
-    @param pathname file path using UTF-8 encoding on all platforms
-    @return file descriptor
+    @brief Free the memory allocated by the chunk directory.
+
+    @param dir Directory to free.
 */
-inline static int gsd_open_file(const char* pathname, int flags, int mode)
+inline static void gsd_chunk_directory_free(struct gsd_chunk_directory* dir)
     {
-#ifndef _WIN32
-    return open(pathname, flags, mode);
-#else
-    // On Windows, we call the _wopen() function, which requires converting the UTF-8 input path to
-    // UTF-16 wide-character encoding.
-    int count_wchars;
-    wchar_t* wpathname;
-    int fd;
-
-    // First, determine the number of wide characters needed to represent the input string.
-    count_wchars = MultiByteToWideChar(CP_UTF8, 0, pathname, -1, NULL, 0);
-    // Then allocate temporary wchar_t buffer and perform the string conversion.
-    wpathname = malloc(sizeof(wchar_t) * count_wchars);
-    MultiByteToWideChar(CP_UTF8, 0, pathname, -1, wpathname, count_wchars);
-    fd = _wopen(wpathname, flags, mode);
-    free(wpathname);
-    return fd;
-#endif
+    free(dir->offsets);
+    free(dir->entries);
+    gsd_util_zero_memory(dir, sizeof(struct gsd_chunk_directory));
     }
 
 /** @internal
-    @brief Truncate the file and write a new gsd header.
+    @brief Build the chunk directory when the file index has changed.
 
-    @param fd file descriptor to initialize
-    @param application Generating application name (truncated to 63 chars)
-    @param schema Schema name for data to be written in this GSD file (truncated to 63 chars)
-    @param schema_version Version of the scheme data to be written (make with gsd_make_version())
+    @param handle Handle to the open file.
+
+    Groups the positions of the index entries by name id with a counting sort. The sort is stable
+    and the file index is sorted by frame, so the entries of each name id are also sorted by frame.
+    The directory is rebuilt when the number of entries in the file index changes.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int
-gsd_initialize_file(int fd, const char* application, const char* schema, uint32_t schema_version)
+inline static int gsd_chunk_directory_update(struct gsd_handle* handle)
     {
-    // check if the file was created
-    if (fd == -1)
+    struct gsd_chunk_directory* dir = &handle->chunk_directory;
+    size_t n_ids = handle->name_map.n_pairs;
+    if (dir->offsets != NULL && dir->size == handle->file_index.size && dir->n_ids == n_ids)
         {
-        return GSD_ERROR_IO;
+        return GSD_SUCCESS;
         }
 
-    int retval = ftruncate(fd, 0);
-    if (retval != 0)
+    gsd_chunk_directory_free(dir);
+
+    uint64_t* offsets = calloc(n_ids + 1, sizeof(uint64_t));
+    uint64_t* entries = malloc(sizeof(uint64_t) * (handle->file_index.size + 1));
+    if (offsets == NULL || entries == NULL)
         {
-        return GSD_ERROR_IO;
+        free(offsets);
+        free(entries);
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
         }
 
-    // populate header fields
-    struct gsd_header header;
-    gsd_util_zero_memory(&header, sizeof(header));
-
-    header.magic = GSD_MAGIC_ID;
-    header.gsd_version
-        = gsd_make_version(GSD_CURRENT_FILE_VERSION_MAJOR, GSD_CURRENT_FILE_VERSION_MINOR);
-    strncpy(header.application, application, sizeof(header.application) - 1);
-    header.application[sizeof(header.application) - 1] = 0;
-    strncpy(header.schema, schema, sizeof(header.schema) - 1);
-    header.schema[sizeof(header.schema) - 1] = 0;
-    header.schema_version = schema_version;
-    header.index_location = sizeof(header);
-    header.index_allocated_entries = GSD_INITIAL_INDEX_SIZE;
-    header.namelist_location
-        = header.index_location + sizeof(struct gsd_index_entry) * header.index_allocated_entries;
-    header.namelist_allocated_entries = GSD_INITIAL_NAME_BUFFER_SIZE / GSD_NAME_SIZE;
-    gsd_util_zero_memory(header.reserved, sizeof(header.reserved));
-
-    // write the header out
-    ssize_t bytes_written = gsd_io_pwrite_retry(fd, &header, sizeof(header), 0);
-    if (bytes_written != sizeof(header))
+    // count the entries of each id, skipping ids without a name
+    size_t i;
+    for (i = 0; i < handle->file_index.size; i++)
         {
-        return GSD_ERROR_IO;
+        uint16_t id = handle->file_index.data[i].id;
+        if (id < n_ids)
+            {
+            offsets[id + 1]++;
+            }
         }
-
-    // allocate and zero default index memory
-    struct gsd_index_entry index[GSD_INITIAL_INDEX_SIZE];
-    gsd_util_zero_memory(index, sizeof(index));
-
-    // write the empty index out
-    bytes_written = gsd_io_pwrite_retry(fd, index, sizeof(index), sizeof(header));
-    if (bytes_written != sizeof(index))
+    for (i = 0; i < n_ids; i++)
         {
-        return GSD_ERROR_IO;
+        offsets[i + 1] += offsets[i];
         }
 
-    // allocate and zero the namelist memory
-    char names[GSD_INITIAL_NAME_BUFFER_SIZE];
-    gsd_util_zero_memory(names, sizeof(char) * GSD_INITIAL_NAME_BUFFER_SIZE);
+    // place the entries, using the end of each group as its cursor
+    for (i = 0; i < handle->file_index.size; i++)
+        {
+        uint16_t id = handle->file_index.data[i].id;
+        if (id < n_ids)
+            {
+            entries[offsets[id]] = i;
+            offsets[id]++;
+            }
+        }
+    for (i = n_ids; i > 0; i--)
+        {
+        offsets[i] = offsets[i - 1];
+        }
+    offsets[0] = 0;
 
-    // write the namelist out
-    bytes_written = gsd_io_pwrite_retry(fd, names, sizeof(names), sizeof(header) + sizeof(index));
-    if (bytes_written != sizeof(names))
+    dir->offsets = offsets;
+    dir->n_ids = n_ids;
+    dir->entries = entries;
+    dir->size = handle->file_index.size;
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Allocate a buffer of index entries
+
+    @param buf Buffer to allocate.
+    @param reserve Number of entries to allocate.
+
+    @post The buffer's data element has *reserve* elements allocated in memory.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_index_buffer_allocate(struct gsd_index_buffer* buf, size_t reserve)
+    {
+    if (buf == NULL || buf->mapped_data || buf->data || reserve == 0 || buf->reserved != 0
+        || buf->size != 0)
         {
-        return GSD_ERROR_IO;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
 
-    // sync file
-    retval = fsync(fd);
-    if (retval != 0)
+    buf->data = calloc(reserve, sizeof(struct gsd_index_entry));
+    if (buf->data == NULL)
         {
-        return GSD_ERROR_IO;
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
         }
 
+    buf->size = 0;
+    buf->reserved = reserve;
+    buf->mapped_data = NULL;
+    buf->mapped_len = 0;
+
     return GSD_SUCCESS;
     }
 
 /** @internal
-    @brief Read in the file index and initialize the handle.
+    @brief Map index entries from the file
 
-    @param handle Handle to read the header
+    @param buf Buffer to map.
+    @param handle GSD file handle to map.
 
-    @pre handle->fd is an open file.
-    @pre handle->open_flags is set.
+    @post The buffer's data element contains the index data from the file.
+
+    On some systems, this will use mmap to efficiently access the file. On others, it may result in
+    an allocation and read of the entire index from the file.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
 */
-inline static int gsd_initialize_handle(struct gsd_handle* handle)
+inline static int gsd_index_buffer_map(struct gsd_index_buffer* buf, struct gsd_handle* handle)
     {
-    // check if the file was created
-    if (handle->fd == -1)
+    if (buf == NULL || buf->mapped_data || buf->data || buf->reserved != 0 || buf->size != 0)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    // validate that the index block exists inside the file
+    if (handle->header.index_location
+            + sizeof(struct gsd_index_entry) * handle->header.index_allocated_entries
+        > (uint64_t)handle->file_size)
+        {
+        return GSD_ERROR_FILE_CORRUPT;
+        }
+
+#if GSD_USE_MMAP
+    // map the index in read only mode
+    size_t page_size = getpagesize();
+    size_t index_size = sizeof(struct gsd_index_entry) * handle->header.index_allocated_entries;
+    size_t offset = (handle->header.index_location / page_size) * page_size;
+    buf->mapped_data = mmap(NULL,
+                            index_size + (handle->header.index_location - offset),
+                            PROT_READ,
+                            MAP_SHARED,
+                            handle->fd,
+                            offset);
+
+    if (buf->mapped_data == MAP_FAILED)
         {
         return GSD_ERROR_IO;
         }
 
-    // read the header
-    ssize_t bytes_read
-        = gsd_io_pread_retry(handle->fd, &handle->header, sizeof(struct gsd_header), 0);
-    if (bytes_read == -1)
+    buf->data = (struct gsd_index_entry*)(((char*)buf->mapped_data)
+                                          + (handle->header.index_location - offset));
+
+    buf->mapped_len = index_size + (handle->header.index_location - offset);
+    buf->reserved = handle->header.index_allocated_entries;
+#else
+    // mmap not supported, read the data from the disk
+    int retval = gsd_index_buffer_allocate(buf, handle->header.index_allocated_entries);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    ssize_t bytes_read = gsd_io_pread_retry(handle->fd,
+                                            buf->data,
+                                            sizeof(struct gsd_index_entry)
+                                                * handle->header.index_allocated_entries,
+                                            handle->header.index_location);
+
+    if (bytes_read == -1
+        || bytes_read != sizeof(struct gsd_index_entry) * handle->header.index_allocated_entries)
         {
         return GSD_ERROR_IO;
         }
-    if (bytes_read != sizeof(struct gsd_header))
+#endif
+
+    // determine the number of index entries in the list
+    // file is corrupt if first index entry is invalid
+    if (buf->data[0].location != 0 && !gsd_is_entry_valid(handle, 0))
         {
-        return GSD_ERROR_NOT_A_GSD_FILE;
+        return GSD_ERROR_FILE_CORRUPT;
+        }
+
+    if (buf->data[0].location == 0)
+        {
+        buf->size = 0;
+        }
+    else
+        {
+        // determine the number of index entries (marked by location = 0)
+        // binary search for the first index entry with location 0
+        size_t L = 0;
+        size_t R = buf->reserved;
+
+        // progressively narrow the search window by halves
+        do
+            {
+            size_t m = (L + R) / 2;
+
+            // file is corrupt if any index entry is invalid or frame does not increase
+            // monotonically
+            if (buf->data[m].location != 0
+                && (!gsd_is_entry_valid(handle, m) || buf->data[m].frame < buf->data[L].frame))
+                {
+                return GSD_ERROR_FILE_CORRUPT;
+                }
+
+            if (buf->data[m].location != 0)
+                {
+                L = m;
+                }
+            else
+                {
+                R = m;
+                }
+            } while ((R - L) > 1);
+
+        // this finds R = the first index entry with location = 0
+        buf->size = R;
+        }
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Free the memory allocated by the index buffer or unmap the mapped memory.
+
+    @param buf Buffer to free.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_index_buffer_free(struct gsd_index_buffer* buf)
+    {
+    if (buf == NULL || buf->data == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+#if GSD_USE_MMAP
+    if (buf->mapped_data)
+        {
+        int retval = munmap(buf->mapped_data, buf->mapped_len);
+
+        if (retval != 0)
+            {
+            return GSD_ERROR_IO;
+            }
+        }
+    else
+#endif
+        {
+        free(buf->data);
+        }
+
+    gsd_util_zero_memory(buf, sizeof(struct gsd_index_buffer));
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Add a new index entry and provide a pointer to it.
+
+    @param buf Buffer to add too.
+    @param entry [out] Pointer to set to the new entry.
+
+    Double the size of the reserved space as needed to hold the new entry. Does not accept mapped
+    indices.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_index_buffer_add(struct gsd_index_buffer* buf, struct gsd_index_entry** entry)
+    {
+    if (buf == NULL || buf->mapped_data || entry == NULL || buf->reserved == 0)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    if (buf->size == buf->reserved)
+        {
+        // grow the array
+        size_t new_reserved = buf->reserved * 2;
+        // NOLINTNEXTLINE(bugprone-suspicious-realloc-usage): realloc is used correctly
+        buf->data = realloc(buf->data, sizeof(struct gsd_index_entry) * new_reserved);
+        if (buf->data == NULL)
+            {
+            return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+            }
+
+        // zero the new memory
+        gsd_util_zero_memory(buf->data + buf->reserved,
+                             sizeof(struct gsd_index_entry) * (new_reserved - buf->reserved));
+        buf->reserved = new_reserved;
+        }
+
+    size_t insert_pos = buf->size;
+    buf->size++;
+    *entry = buf->data + insert_pos;
+
+    return GSD_SUCCESS;
+    }
+
+inline static int gsd_cmp_index_entry(const struct gsd_index_entry* a,
+                                      const struct gsd_index_entry* b)
+    {
+    int result = 0;
+
+    if (a->frame < b->frame)
+        {
+        result = -1;
+        }
+
+    if (a->frame > b->frame)
+        {
+        result = 1;
         }
 
-    // validate the header
-    if (handle->header.magic != GSD_MAGIC_ID)
+    if (a->frame == b->frame)
+        {
+        if (a->id < b->id)
+            {
+            result = -1;
+            }
+
+        if (a->id > b->id)
+            {
+            result = 1;
+            }
+
+        if (a->id == b->id)
+            {
+            result = 0;
+            }
+        }
+
+    return result;
+    }
+
+/** @internal
+    @brief Compute heap parent node.
+    @param i Node index.
+*/
+inline static size_t gsd_heap_parent(size_t i)
+    {
+    return (i - 1) / 2;
+    }
+
+/** @internal
+    @brief Compute heap left child.
+    @param i Node index.
+*/
+inline static size_t gsd_heap_left_child(size_t i)
+    {
+    return 2 * i + 1;
+    }
+
+/** @internal
+    @brief Swap the nodes *a* and *b* in the buffer
+    @param buf Buffer.
+    @param a First index to swap.
+    @param b Second index to swap.
+*/
+inline static void gsd_heap_swap(struct gsd_index_buffer* buf, size_t a, size_t b)
+    {
+    struct gsd_index_entry tmp = buf->data[a];
+    buf->data[a] = buf->data[b];
+    buf->data[b] = tmp;
+    }
+
+/** @internal
+    @brief Shift heap node downward
+    @param buf Buffer.
+    @param start First index of the valid heap in *buf*.
+    @param end Last index of the valid hep in *buf*.
+*/
+inline static void gsd_heap_shift_down(struct gsd_index_buffer* buf, size_t start, size_t end)
+    {
+    size_t root = start;
+
+    while (gsd_heap_left_child(root) <= end)
+        {
+        size_t child = gsd_heap_left_child(root);
+        size_t swap = root;
+
+        if (gsd_cmp_index_entry(buf->data + swap, buf->data + child) < 0)
+            {
+            swap = child;
+            }
+        if (child + 1 <= end && gsd_cmp_index_entry(buf->data + swap, buf->data + child + 1) < 0)
+            {
+            swap = child + 1;
+            }
+
+        if (swap == root)
+            {
+            return;
+            }
+
+        gsd_heap_swap(buf, root, swap);
+        root = swap;
+        }
+    }
+
+/** @internal
+    @brief Convert unordered index buffer to a heap
+    @param buf Buffer.
+*/
+inline static void gsd_heapify(struct gsd_index_buffer* buf)
+    {
+    ssize_t start = gsd_heap_parent(buf->size - 1);
+
+    while (start >= 0)
+        {
+        gsd_heap_shift_down(buf, start, buf->size - 1);
+        start--;
+        }
+    }
+
+/** @internal
+    @brief Sort the index buffer.
+
+    @param buf Buffer to sort.
+
+    Sorts an in-memory index buffer. Does not accept mapped indices.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_index_buffer_sort(struct gsd_index_buffer* buf)
+    {
+    if (buf == NULL || buf->mapped_data || buf->reserved == 0)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    // arrays of size 0 or 1 are already sorted
+    if (buf->size <= 1)
+        {
+        return GSD_SUCCESS;
+        }
+
+    gsd_heapify(buf);
+
+    size_t end = buf->size - 1;
+    while (end > 0)
+        {
+        gsd_heap_swap(buf, end, 0);
+        end = end - 1;
+        gsd_heap_shift_down(buf, 0, end);
+        }
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Copy bytes from one location in the file to another.
+
+    @param fd File descriptor.
+    @param src Location of the bytes to copy.
+    @param dst Location to copy the bytes to.
+    @param count Number of bytes to copy.
+
+    Copy the bytes in the kernel with copy_file_range() when it is available. Otherwise, or when
+    copy_file_range() fails (for example, because the file system does not support it), copy the
+    remaining bytes through a buffer.
+
+    @pre The source and destination ranges do not overlap.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_io_copy_range(int fd, int64_t src, int64_t dst, size_t count)
+    {
+#if GSD_USE_COPY_FILE_RANGE
+    while (count > 0)
+        {
+        loff_t src_offset = src;
+        loff_t dst_offset = dst;
+        ssize_t bytes_copied = copy_file_range(fd, &src_offset, fd, &dst_offset, count, 0);
+        if (bytes_copied <= 0)
+            {
+            break;
+            }
+
+        src += bytes_copied;
+        dst += bytes_copied;
+        count -= bytes_copied;
+        }
+#endif
+
+    if (count == 0)
+        {
+        return GSD_SUCCESS;
+        }
+
+    size_t buffer_size = GSD_DEFAULT_INDEX_ENTRIES_TO_BUFFER * sizeof(struct gsd_index_entry);
+    if (buffer_size > count)
+        {
+        buffer_size = count;
+        }
+    char* buf = malloc(buffer_size);
+    if (buf == NULL)
+        {
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        }
+
+    size_t total_bytes_copied = 0;
+    while (total_bytes_copied < count)
+        {
+        size_t bytes_to_copy = buffer_size;
+        if (count - total_bytes_copied < buffer_size)
+            {
+            bytes_to_copy = count - total_bytes_copied;
+            }
+
+        ssize_t bytes_read = gsd_io_pread_retry(fd, buf, bytes_to_copy, src + total_bytes_copied);
+        if (bytes_read == -1 || (size_t)bytes_read != bytes_to_copy)
+            {
+            free(buf);
+            return GSD_ERROR_IO;
+            }
+
+        ssize_t bytes_written
+            = gsd_io_pwrite_retry(fd, buf, bytes_to_copy, dst + total_bytes_copied);
+        if (bytes_written == -1 || (size_t)bytes_written != bytes_to_copy)
+            {
+            free(buf);
+            return GSD_ERROR_IO;
+            }
+
+        total_bytes_copied += bytes_to_copy;
+        }
+
+    free(buf);
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Compute the size of the index block after it grows.
+
+    @param handle Handle to the open gsd file.
+    @param size_required The new index must be able to hold at least this many elements.
+
+    Grow the index by the handle's growth factor until it holds *size_required* entries. When the
+    handle has an expected number of frames, also make room for that many frames with the average
+    number of entries per frame written so far.
+
+    @returns The new number of entries in the index.
+*/
+inline static size_t gsd_grow_index_size(struct gsd_handle* handle, size_t size_required)
+    {
+    size_t size_new = handle->header.index_allocated_entries;
+    if (size_new == 0)
+        {
+        size_new = GSD_INITIAL_INDEX_SIZE;
+        }
+
+    while (size_new <= size_required)
+        {
+        size_t size_next = (size_t)((double)size_new * handle->index_growth_factor);
+        if (size_next <= size_new)
+            {
+            size_next = size_new + 1;
+            }
+        size_new = size_next;
+        }
+
+    uint64_t frames_written = handle->cur_frame;
+    if (handle->expected_frames > frames_written && frames_written > 0)
+        {
+        double entries_per_frame = (double)size_required / (double)frames_written;
+        size_t size_expected = (size_t)(entries_per_frame * (double)handle->expected_frames) + 1;
+        if (size_expected > size_new)
+            {
+            size_new = size_expected;
+            }
+        }
+
+    return size_new;
+    }
+
+/** @internal
+    @brief Utility function to expand the memory space for the index block in the file.
+
+    @param handle Handle to the open gsd file.
+    @param size_new Number of entries in the new index.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_expand_file_index(struct gsd_handle* handle, size_t size_new)
+    {
+    if (handle->open_flags == GSD_OPEN_READONLY)
+        {
+        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        }
+
+    size_t size_old = handle->header.index_allocated_entries;
+    if (size_new <= size_old)
+        {
+        return GSD_SUCCESS;
+        }
+
+    // Mac systems deadlock when writing from a mapped region into the tail end of that same region
+    // unmap the index first and copy it over by chunks
+    int retval = gsd_index_buffer_free(&handle->file_index);
+    if (retval != 0)
+        {
+        return retval;
+        }
+
+    // copy the current index to the end of the file
+    int64_t new_index_location = lseek(handle->fd, 0, SEEK_END);
+    if (new_index_location == -1)
+        {
+        return GSD_ERROR_IO;
+        }
+    size_t old_index_bytes = size_old * sizeof(struct gsd_index_entry);
+    size_t new_index_bytes = size_new * sizeof(struct gsd_index_entry);
+    gsd_preallocate(handle, new_index_location + new_index_bytes);
+    retval = gsd_io_copy_range(handle->fd,
+                               handle->header.index_location,
+                               new_index_location,
+                               old_index_bytes);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    // fill the new index space with 0s
+#ifdef _WIN32
+    size_t zero_buffer_size = GSD_DEFAULT_INDEX_ENTRIES_TO_BUFFER * sizeof(struct gsd_index_entry);
+    if (zero_buffer_size > new_index_bytes - old_index_bytes)
+        {
+        zero_buffer_size = new_index_bytes - old_index_bytes;
+        }
+    char* buf = calloc(zero_buffer_size, sizeof(char));
+    if (buf == NULL)
+        {
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        }
+
+    size_t total_bytes_written = old_index_bytes;
+    while (total_bytes_written < new_index_bytes)
+        {
+        size_t bytes_to_write = zero_buffer_size;
+        if (new_index_bytes - total_bytes_written < zero_buffer_size)
+            {
+            bytes_to_write = new_index_bytes - total_bytes_written;
+            }
+
+        ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd,
+                                                    buf,
+                                                    bytes_to_write,
+                                                    new_index_location + total_bytes_written);
+        if (bytes_written == -1 || bytes_written != bytes_to_write)
+            {
+            free(buf);
+            return GSD_ERROR_IO;
+            }
+
+        total_bytes_written += bytes_written;
+        }
+
+    free(buf);
+#else
+    // the new index is at the end of the file, extending the file fills it with 0s
+    retval = ftruncate(handle->fd, new_index_location + new_index_bytes);
+    if (retval != 0)
+        {
+        return GSD_ERROR_IO;
+        }
+#endif
+
+    // sync the expanded index
+    retval = gsd_sync(handle);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    // update the header
+    handle->header.index_location = new_index_location;
+    handle->file_size = handle->header.index_location + new_index_bytes;
+    handle->header.index_allocated_entries = size_new;
+
+    // write the new header out
+    ssize_t bytes_written
+        = gsd_io_pwrite_retry(handle->fd, &(handle->header), sizeof(struct gsd_header), 0);
+    if (bytes_written != sizeof(struct gsd_header))
+        {
+        return GSD_ERROR_IO;
+        }
+
+    // sync the updated header
+    retval = gsd_sync(handle);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    // remap the file index
+    retval = gsd_index_buffer_map(&handle->file_index, handle);
+    if (retval != 0)
+        {
+        return retval;
+        }
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Flush the write buffer.
+
+    gsd_write_frame() writes small data chunks into the write buffer. It adds index entries for
+    these chunks to gsd_handle::buffer_index with locations offset from the start of the write
+    buffer. gsd_flush_write_buffer() writes the buffer to the end of the file, moves the index
+    entries to gsd_handle::frame_index and updates the location to reference the beginning of the
+    file.
+
+    @param handle Handle to flush the write buffer.
+    @returns GSD_SUCCESS on success or GSD_* error codes on error
+*/
+inline static int gsd_flush_write_buffer(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    size_t buffered_size = handle->write_buffer.size + handle->write_segments.borrowed;
+    if (buffered_size == 0 && handle->buffer_index.size == 0)
+        {
+        // nothing to do
+        return GSD_SUCCESS;
+        }
+
+    if (buffered_size > 0 && handle->buffer_index.size == 0)
+        {
+        // error: bytes in buffer, but no index for them
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    // write the buffer to the end of the file
+    uint64_t offset = handle->file_size;
+    gsd_preallocate(handle, offset + buffered_size);
+    if (handle->write_segments.size == 0)
+        {
+        ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd,
+                                                    handle->write_buffer.data,
+                                                    handle->write_buffer.size,
+                                                    offset);
+
+        if (bytes_written == -1 || (size_t)bytes_written != handle->write_buffer.size)
+            {
+            return GSD_ERROR_IO;
+            }
+        }
+    else
+        {
+        // interleave the borrowed chunks with the copied chunks
+        int retval = gsd_write_segment_list_add_copied(handle);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+
+        retval = gsd_io_pwrite_segments(handle, offset);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+
+        handle->write_segments.size = 0;
+        handle->write_segments.copied = 0;
+        handle->write_segments.borrowed = 0;
+        }
+
+    handle->file_size += buffered_size;
+
+    // reset write_buffer for new data
+    handle->write_buffer.size = 0;
+
+    // Move buffer_index entries to frame_index.
+    size_t i;
+    for (i = 0; i < handle->buffer_index.size; i++)
+        {
+        struct gsd_index_entry* new_index;
+        int retval = gsd_index_buffer_add(&handle->frame_index, &new_index);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+
+        *new_index = handle->buffer_index.data[i];
+        new_index->location += offset;
+        }
+
+    // clear the buffer index for new entries
+    handle->buffer_index.size = 0;
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Write the name list to the end of the file.
+
+    @param handle Handle to the open gsd file.
+
+    Write all gsd_handle::file_names.data.reserved bytes of the name list to the end of the file and
+    point the header at the new location. The caller must sync the header.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_relocate_name_list(struct gsd_handle* handle)
+    {
+    // write the new name list to the end of the file
+    uint64_t offset = handle->file_size;
+    gsd_preallocate(handle, offset + handle->file_names.data.reserved);
+    ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd,
+                                                handle->file_names.data.data,
+                                                handle->file_names.data.reserved,
+                                                offset);
+
+    if (bytes_written == -1 || (size_t)bytes_written != handle->file_names.data.reserved)
+        {
+        return GSD_ERROR_IO;
+        }
+
+    // sync the updated name list
+    int retval = gsd_sync(handle);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    handle->file_size += handle->file_names.data.reserved;
+    handle->header.namelist_location = offset;
+    handle->header.namelist_allocated_entries = handle->file_names.data.reserved / GSD_NAME_SIZE;
+
+    // write the new header out
+    bytes_written
+        = gsd_io_pwrite_retry(handle->fd, &(handle->header), sizeof(struct gsd_header), 0);
+    if (bytes_written != sizeof(struct gsd_header))
+        {
+        return GSD_ERROR_IO;
+        }
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Flush the name buffer.
+
+    gsd_write_frame() adds new names to the frame_names buffer. gsd_flush_name_buffer() flushes
+    this buffer at the end of a frame write and commits the new names to the file. If necessary,
+    the namelist is written to a new location in the file.
+
+    @param handle Handle to flush the write buffer.
+    @returns GSD_SUCCESS on success or GSD_* error codes on error
+*/
+inline static int gsd_flush_name_buffer(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    if (handle->frame_names.n_names == 0)
+        {
+        // nothing to do
+        return GSD_SUCCESS;
+        }
+
+    if (handle->frame_names.data.size == 0)
+        {
+        // error: bytes in buffer, but no names for them
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    size_t old_reserved = handle->file_names.data.reserved;
+    size_t old_size = handle->file_names.data.size;
+
+    // add the new names to the file name list and zero the frame list
+    int retval = gsd_byte_buffer_append(&handle->file_names.data,
+                                        handle->frame_names.data.data,
+                                        handle->frame_names.data.size);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    handle->file_names.n_names += handle->frame_names.n_names;
+    handle->frame_names.n_names = 0;
+    handle->frame_names.data.size = 0;
+    gsd_util_zero_memory(handle->frame_names.data.data, handle->frame_names.data.reserved);
+
+    // reserved space must be a multiple of the GSD name size
+    if (handle->file_names.data.reserved % GSD_NAME_SIZE != 0)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    if (handle->file_names.data.reserved > old_reserved)
+        {
+        retval = gsd_relocate_name_list(handle);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+    else
+        {
+        // write the new name list to the old index location
+        uint64_t offset = handle->header.namelist_location;
+        ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd,
+                                                    handle->file_names.data.data + old_size,
+                                                    handle->file_names.data.reserved - old_size,
+                                                    offset + old_size);
+        if ((size_t)bytes_written != (handle->file_names.data.reserved - old_size))
+            {
+            return GSD_ERROR_IO;
+            }
+        }
+
+    // sync the updated name list or header
+    retval = gsd_sync(handle);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief utility function to append a name to the namelist
+
+    @param id [out] ID of the new name
+    @param handle handle to the open gsd file
+    @param name string name
+
+    Append a name to the names in the current frame. gsd_end_frame() will add this list to the
+    file names.
+
+    @return
+      - GSD_SUCCESS (0) on success. Negative value on failure:
+      - GSD_ERROR_IO: IO error (check errno).
+      - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory.
+      - GSD_ERROR_FILE_MUST_BE_WRITABLE: File must not be read only.
+*/
+inline static int gsd_append_name(uint16_t* id, struct gsd_handle* handle, const char* name)
+    {
+    if (handle->open_flags == GSD_OPEN_READONLY)
+        {
+        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        }
+
+    if (handle->file_names.n_names + handle->frame_names.n_names == UINT16_MAX)
+        {
+        // no more names may be added
+        return GSD_ERROR_NAMELIST_FULL;
+        }
+
+    // Provide the ID of the new name
+    *id = (uint16_t)(handle->file_names.n_names + handle->frame_names.n_names);
+
+    if (handle->header.gsd_version < gsd_make_version(2, 0))
+        {
+        // v1 files always allocate GSD_NAME_SIZE bytes for each name and put a NULL terminator
+        // at address 63
+        char name_v1[GSD_NAME_SIZE];
+        strncpy(name_v1, name, GSD_NAME_SIZE - 1);
+        name_v1[GSD_NAME_SIZE - 1] = 0;
+        gsd_byte_buffer_append(&handle->frame_names.data, name_v1, GSD_NAME_SIZE);
+        handle->frame_names.n_names++;
+
+        // update the name/id mapping with the truncated name
+        int retval = gsd_name_id_map_insert(&handle->name_map, name_v1, *id);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+    else
+        {
+        gsd_byte_buffer_append(&handle->frame_names.data, name, strlen(name) + 1);
+        handle->frame_names.n_names++;
+
+        // update the name/id mapping
+        int retval = gsd_name_id_map_insert(&handle->name_map, name, *id);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Cross-platform wrapper for the POSIX open() system function.
+    @param pathname file path using UTF-8 encoding on all platforms
+    @return file descriptor
+*/
+inline static int gsd_open_file(const char* pathname, int flags, int mode)
+    {
+#ifndef _WIN32
+    return open(pathname, flags, mode);
+#else
+    // On Windows, we call the _wopen() function, which requires converting the UTF-8 input path to
+    // UTF-16 wide-character encoding.
+    int count_wchars;
+    wchar_t* wpathname;
+    int fd;
+
+    // First, determine the number of wide characters needed to represent the input string.
+    count_wchars = MultiByteToWideChar(CP_UTF8, 0, pathname, -1, NULL, 0);
+    // Then allocate temporary wchar_t buffer and perform the string conversion.
+    wpathname = malloc(sizeof(wchar_t) * count_wchars);
+    MultiByteToWideChar(CP_UTF8, 0, pathname, -1, wpathname, count_wchars);
+    fd = _wopen(wpathname, flags, mode);
+    free(wpathname);
+    return fd;
+#endif
+    }
+
+/** @internal
+    @brief Truncate the file and write a new gsd header.
+
+    @param fd file descriptor to initialize
+    @param application Generating application name (truncated to 63 chars)
+    @param schema Schema name for data to be written in this GSD file (truncated to 63 chars)
+    @param schema_version Version of the scheme data to be written (make with gsd_make_version())
+*/
+inline static int
+gsd_initialize_file(int fd, const char* application, const char* schema, uint32_t schema_version)
+    {
+    // check if the file was created
+    if (fd == -1)
+        {
+        return GSD_ERROR_IO;
+        }
+
+    int retval = ftruncate(fd, 0);
+    if (retval != 0)
+        {
+        return GSD_ERROR_IO;
+        }
+
+    // populate header fields
+    struct gsd_header header;
+    gsd_util_zero_memory(&header, sizeof(header));
+
+    header.magic = GSD_MAGIC_ID;
+    header.gsd_version
+        = gsd_make_version(GSD_CURRENT_FILE_VERSION_MAJOR, GSD_CURRENT_FILE_VERSION_MINOR);
+    strncpy(header.application, application, sizeof(header.application) - 1);
+    header.application[sizeof(header.application) - 1] = 0;
+    strncpy(header.schema, schema, sizeof(header.schema) - 1);
+    header.schema[sizeof(header.schema) - 1] = 0;
+    header.schema_version = schema_version;
+    header.index_location = sizeof(header);
+    header.index_allocated_entries = GSD_INITIAL_INDEX_SIZE;
+    header.namelist_location
+        = header.index_location + sizeof(struct gsd_index_entry) * header.index_allocated_entries;
+    header.namelist_allocated_entries = GSD_INITIAL_NAME_BUFFER_SIZE / GSD_NAME_SIZE;
+    gsd_util_zero_memory(header.reserved, sizeof(header.reserved));
+
+    // write the header out
+    ssize_t bytes_written = gsd_io_pwrite_retry(fd, &header, sizeof(header), 0);
+    if (bytes_written != sizeof(header))
+        {
+        return GSD_ERROR_IO;
+        }
+
+    // allocate and zero default index memory
+    struct gsd_index_entry index[GSD_INITIAL_INDEX_SIZE];
+    gsd_util_zero_memory(index, sizeof(index));
+
+    // write the empty index out
+    bytes_written = gsd_io_pwrite_retry(fd, index, sizeof(index), sizeof(header));
+    if (bytes_written != sizeof(index))
+        {
+        return GSD_ERROR_IO;
+        }
+
+    // allocate and zero the namelist memory
+    char names[GSD_INITIAL_NAME_BUFFER_SIZE];
+    gsd_util_zero_memory(names, sizeof(char) * GSD_INITIAL_NAME_BUFFER_SIZE);
+
+    // write the namelist out
+    bytes_written = gsd_io_pwrite_retry(fd, names, sizeof(names), sizeof(header) + sizeof(index));
+    if (bytes_written != sizeof(names))
+        {
+        return GSD_ERROR_IO;
+        }
+
+    // sync file
+    retval = fsync(fd);
+    if (retval != 0)
+        {
+        return GSD_ERROR_IO;
+        }
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Read in the file index and initialize the handle.
+
+    @param handle Handle to read the header
+
+    @pre handle->fd is an open file.
+    @pre handle->open_flags is set.
+*/
+inline static int gsd_initialize_handle(struct gsd_handle* handle)
+    {
+    // check if the file was created
+    if (handle->fd == -1)
+        {
+        return GSD_ERROR_IO;
+        }
+
+    // read the header
+    ssize_t bytes_read
+        = gsd_io_pread_retry(handle->fd, &handle->header, sizeof(struct gsd_header), 0);
+    if (bytes_read == -1)
+        {
+        return GSD_ERROR_IO;
+        }
+    if (bytes_read != sizeof(struct gsd_header))
+        {
+        return GSD_ERROR_NOT_A_GSD_FILE;
+        }
+
+    // validate the header
+    if (handle->header.magic != GSD_MAGIC_ID)
+        {
+        return GSD_ERROR_NOT_A_GSD_FILE;
+        }
+
+    if (handle->header.gsd_version < gsd_make_version(1, 0)
+        && handle->header.gsd_version != gsd_make_version(0, 3))
+        {
+        return GSD_ERROR_INVALID_GSD_FILE_VERSION;
+        }
+
+    if (handle->header.gsd_version >= gsd_make_version(3, 0))
+        {
+        return GSD_ERROR_INVALID_GSD_FILE_VERSION;
+        }
+
+    // determine the file size
+    handle->file_size = lseek(handle->fd, 0, SEEK_END);
+
+    // validate that the namelist block exists inside the file
+    if (handle->header.namelist_location
+            + (GSD_NAME_SIZE * handle->header.namelist_allocated_entries)
+        > (uint64_t)handle->file_size)
+        {
+        return GSD_ERROR_FILE_CORRUPT;
+        }
+
+    // allocate the hash map, sized for the names the name list can hold
+    int retval
+        = gsd_name_id_map_allocate(&handle->name_map, handle->header.namelist_allocated_entries);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    // read the namelist block
+    size_t namelist_n_bytes = GSD_NAME_SIZE * handle->header.namelist_allocated_entries;
+    retval = gsd_byte_buffer_allocate(&handle->file_names.data, namelist_n_bytes);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+    bytes_read = gsd_io_pread_retry(handle->fd,
+                                    handle->file_names.data.data,
+                                    namelist_n_bytes,
+                                    handle->header.namelist_location);
+
+    if (bytes_read == -1 || (size_t)bytes_read != namelist_n_bytes)
+        {
+        return GSD_ERROR_IO;
+        }
+
+    // The name buffer must end in a NULL terminator or else the file is corrupt
+    if (handle->file_names.data.data[handle->file_names.data.reserved - 1] != 0)
+        {
+        return GSD_ERROR_FILE_CORRUPT;
+        }
+
+    // Add the names to the hash map. Also determine the number of used bytes in the namelist.
+    size_t name_start = 0;
+    handle->file_names.n_names = 0;
+    while (name_start < handle->file_names.data.reserved)
+        {
+        char* name = handle->file_names.data.data + name_start;
+
+        // an empty name notes the end of the list
+        if (name[0] == 0)
+            {
+            break;
+            }
+
+        retval
+            = gsd_name_id_map_insert(&handle->name_map, name, (uint16_t)handle->file_names.n_names);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        handle->file_names.n_names++;
+
+        if (handle->header.gsd_version < gsd_make_version(2, 0))
+            {
+            // gsd v1 stores names in fixed 64 byte segments
+            name_start += GSD_NAME_SIZE;
+            }
+        else
+            {
+            size_t len = strnlen(name, handle->file_names.data.reserved - name_start);
+            name_start += len + 1;
+            }
+        }
+
+    handle->file_names.data.size = name_start;
+
+    // read in the file index
+    retval = gsd_index_buffer_map(&handle->file_index, handle);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    // determine the current frame counter
+    if (handle->file_index.size == 0)
+        {
+        handle->cur_frame = 0;
+        }
+    else
+        {
+        handle->cur_frame = handle->file_index.data[handle->file_index.size - 1].frame + 1;
+        }
+
+    // if this is a write mode, allocate the initial frame index and the name buffer
+    if (handle->open_flags != GSD_OPEN_READONLY)
+        {
+        retval = gsd_index_buffer_allocate(&handle->frame_index, GSD_INITIAL_FRAME_INDEX_SIZE);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+
+        retval = gsd_index_buffer_allocate(&handle->buffer_index, GSD_INITIAL_FRAME_INDEX_SIZE);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+
+        retval = gsd_byte_buffer_allocate(&handle->write_buffer, GSD_INITIAL_WRITE_BUFFER_SIZE);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+
+        handle->frame_names.n_names = 0;
+        retval = gsd_byte_buffer_allocate(&handle->frame_names.data, GSD_NAME_SIZE);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    handle->pending_index_entries = 0;
+    handle->flushed_buffer_index_entries = 0;
+    handle->maximum_write_buffer_size = GSD_DEFAULT_MAXIMUM_WRITE_BUFFER_SIZE;
+    handle->index_entries_to_buffer = GSD_DEFAULT_INDEX_ENTRIES_TO_BUFFER;
+    handle->preallocate_size = 0;
+    handle->allocated_size = 0;
+    handle->direct_fd = -1;
+    handle->expected_frames = 0;
+    handle->index_growth_factor = GSD_DEFAULT_INDEX_GROWTH_FACTOR;
+    handle->durability = GSD_DURABILITY_FSYNC;
+    handle->group_commit_frames = GSD_DEFAULT_GROUP_COMMIT_FRAMES;
+    handle->group_commit_interval = GSD_DEFAULT_GROUP_COMMIT_INTERVAL;
+    handle->frames_since_flush = 0;
+    handle->last_flush_time = gsd_util_monotonic_time();
+
+    // Silently upgrade writable files from a previous matching major version to the latest
+    // minor version.
+    if ((handle->open_flags == GSD_OPEN_READWRITE || handle->open_flags == GSD_OPEN_APPEND)
+        && (handle->header.gsd_version
+            <= gsd_make_version(GSD_CURRENT_FILE_VERSION_MAJOR, GSD_CURRENT_FILE_VERSION_MINOR))
+        && (handle->header.gsd_version >> (sizeof(uint32_t) * 4) == GSD_CURRENT_FILE_VERSION_MAJOR))
+        {
+        handle->header.gsd_version
+            = gsd_make_version(GSD_CURRENT_FILE_VERSION_MAJOR, GSD_CURRENT_FILE_VERSION_MINOR);
+        size_t bytes_written
+            = gsd_io_pwrite_retry(handle->fd, &(handle->header), sizeof(struct gsd_header), 0);
+
+        if (bytes_written != sizeof(struct gsd_header))
+            {
+            return GSD_ERROR_IO;
+            }
+        }
+
+    return GSD_SUCCESS;
+    }
+
+// the async writer thread calls the synchronous implementations of the public API
+inline static int gsd_end_frame_now(struct gsd_handle* handle);
+inline static int gsd_flush_now(struct gsd_handle* handle);
+inline static int gsd_write_chunk_now(struct gsd_handle* handle,
+                                      const char* name,
+                                      enum gsd_type type,
+                                      uint64_t N,
+                                      uint32_t M,
+                                      uint8_t flags,
+                                      const void* data,
+                                      int borrow);
+
+#if GSD_USE_THREADS
+
+/// Initial size of the async writer queue buffers
+enum
+    {
+    GSD_INITIAL_ASYNC_BUFFER_SIZE = 1024 * 16
+    };
+
+/** @internal
+    @brief Header of a chunk queued for the async writer thread
+
+    The name (including the null terminator) and the chunk data follow the header in the queue.
+*/
+struct gsd_async_record
+    {
+    uint64_t N;
+    uint32_t M;
+    uint16_t name_size;
+    uint8_t type;
+    uint8_t flags;
+    };
+
+/** @internal
+    @brief State of the async writer thread
+
+    The calling thread appends chunks to buffers[fill]. The writer thread writes the chunks in
+    buffers[1 - fill] while busy is set. All fields are guarded by mutex, except for buffers[fill],
+    which only the calling thread accesses.
+*/
+struct gsd_async_writer
+    {
+    /// The writer thread.
+    pthread_t thread;
+
+    /// Guards the state shared between the threads.
+    pthread_mutex_t mutex;
+
+    /// Signals changes to busy and stop.
+    pthread_cond_t cond;
+
+    /// Double buffered queue of chunks.
+    struct gsd_byte_buffer buffers[2];
+
+    /// Index of the buffer the calling thread appends to.
+    int fill;
+
+    /// Set when the writer thread has a buffer to write.
+    int busy;
+
+    /// Set when the writer thread should end the frame after writing the buffer.
+    int end_frame;
+
+    /// Set to stop the writer thread.
+    int stop;
+
+    /// First error encountered by the writer thread.
+    int error;
+
+    /// Number of frames in the file, including frames queued for the writer thread.
+    uint64_t n_frames;
+    };
+
+/** @internal
+    @brief Write the chunks queued in a buffer
+
+    @param handle Handle to an open GSD file.
+    @param buf Buffer of queued chunks.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_async_write_buffer(struct gsd_handle* handle, struct gsd_byte_buffer* buf)
+    {
+    size_t pos = 0;
+    while (pos < buf->size)
+        {
+        struct gsd_async_record record;
+        memcpy(&record, buf->data + pos, sizeof(struct gsd_async_record));
+        pos += sizeof(struct gsd_async_record);
+
+        const char* name = buf->data + pos;
+        pos += record.name_size;
+
+        const char* data = buf->data + pos;
+        pos += record.N * record.M * gsd_sizeof_type((enum gsd_type)record.type);
+
+        int retval = gsd_write_chunk_now(handle,
+                                         name,
+                                         (enum gsd_type)record.type,
+                                         record.N,
+                                         record.M,
+                                         record.flags,
+                                         record.N > 0 ? data : NULL,
+                                         0);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Main loop of the async writer thread
+
+    @param arg Handle to an open GSD file.
+
+    @returns NULL
+*/
+static void* gsd_async_writer_main(void* arg)
+    {
+    struct gsd_handle* handle = (struct gsd_handle*)arg;
+    struct gsd_async_writer* writer = handle->async_writer;
+
+    pthread_mutex_lock(&writer->mutex);
+    while (1)
+        {
+        while (!writer->busy && !writer->stop)
+            {
+            pthread_cond_wait(&writer->cond, &writer->mutex);
+            }
+
+        if (!writer->busy)
+            {
+            break;
+            }
+
+        struct gsd_byte_buffer* buf = &writer->buffers[1 - writer->fill];
+        int end_frame = writer->end_frame;
+        pthread_mutex_unlock(&writer->mutex);
+
+        int retval = gsd_async_write_buffer(handle, buf);
+        if (retval == GSD_SUCCESS && end_frame)
+            {
+            retval = gsd_end_frame_now(handle);
+            }
+        buf->size = 0;
+
+        pthread_mutex_lock(&writer->mutex);
+        if (writer->error == GSD_SUCCESS)
+            {
+            writer->error = retval;
+            }
+        writer->busy = 0;
+        pthread_cond_broadcast(&writer->cond);
+        }
+    pthread_mutex_unlock(&writer->mutex);
+
+    return NULL;
+    }
+
+/** @internal
+    @brief Queue a chunk for the async writer thread
+
+    @param handle Handle to an open GSD file.
+    @param name Name of the data chunk.
+    @param type type ID that identifies the type of data in *data*.
+    @param N Number of rows in the data.
+    @param M Number of columns in the data.
+    @param flags Chunk flags.
+    @param data Data buffer.
+
+    Copies *name* and *data* so the caller may reuse them immediately.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_async_append(struct gsd_handle* handle,
+                                   const char* name,
+                                   enum gsd_type type,
+                                   uint64_t N,
+                                   uint32_t M,
+                                   uint8_t flags,
+                                   const void* data)
+    {
+    struct gsd_async_writer* writer = handle->async_writer;
+    struct gsd_byte_buffer* buf = &writer->buffers[writer->fill];
+
+    size_t name_size = strlen(name) + 1;
+    if (name_size > UINT16_MAX)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    struct gsd_async_record record;
+    gsd_util_zero_memory(&record, sizeof(struct gsd_async_record));
+    record.N = N;
+    record.M = M;
+    record.name_size = (uint16_t)name_size;
+    record.type = (uint8_t)type;
+    record.flags = flags;
+
+    int retval = gsd_byte_buffer_append(buf, (const char*)&record, sizeof(struct gsd_async_record));
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    retval = gsd_byte_buffer_append(buf, name, name_size);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    size_t size = N * M * gsd_sizeof_type(type);
+    if (size > 0)
+        {
+        retval = gsd_byte_buffer_append(buf, data, size);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Hand the queued chunks to the async writer thread
+
+    @param handle Handle to an open GSD file.
+    @param end_frame Set to end the frame after writing the queued chunks.
+
+    Blocks while the writer thread is busy with the previous buffer. When the writer thread reports
+    an error, discard the queued chunks and return the error.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_async_submit(struct gsd_handle* handle, int end_frame)
+    {
+    struct gsd_async_writer* writer = handle->async_writer;
+
+    pthread_mutex_lock(&writer->mutex);
+    while (writer->busy)
+        {
+        pthread_cond_wait(&writer->cond, &writer->mutex);
+        }
+
+    int retval = writer->error;
+    writer->error = GSD_SUCCESS;
+    if (retval != GSD_SUCCESS)
+        {
+        writer->buffers[writer->fill].size = 0;
+        }
+    else
+        {
+        writer->end_frame = end_frame;
+        writer->fill = 1 - writer->fill;
+        writer->busy = 1;
+        if (end_frame)
+            {
+            writer->n_frames++;
+            }
+        pthread_cond_broadcast(&writer->cond);
+        }
+    pthread_mutex_unlock(&writer->mutex);
+
+    return retval;
+    }
+
+#endif
+
+/** @internal
+    @brief Wait for the async writer thread to write all queued chunks
+
+    @param handle Handle to an open GSD file.
+
+    Returns (and clears) the first error the writer thread encountered. Does nothing when async
+    writes are disabled.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_async_wait(struct gsd_handle* handle)
+    {
+#if GSD_USE_THREADS
+    struct gsd_async_writer* writer = handle->async_writer;
+    if (writer == NULL)
+        {
+        return GSD_SUCCESS;
+        }
+
+    int retval = GSD_SUCCESS;
+    if (writer->buffers[writer->fill].size > 0)
+        {
+        retval = gsd_async_submit(handle, 0);
+        }
+
+    pthread_mutex_lock(&writer->mutex);
+    while (writer->busy)
+        {
+        pthread_cond_wait(&writer->cond, &writer->mutex);
+        }
+    if (retval == GSD_SUCCESS)
+        {
+        retval = writer->error;
+        }
+    writer->error = GSD_SUCCESS;
+    pthread_mutex_unlock(&writer->mutex);
+
+    return retval;
+#else
+    (void)handle;
+    return GSD_SUCCESS;
+#endif
+    }
+
+/** @internal
+    @brief Wait for the async writer thread to write all queued chunks
+
+    @param handle Handle to an open GSD file.
+
+    Use in functions that cannot report errors. The next call to gsd_end_frame(), gsd_flush(),
+    gsd_wait(), or gsd_close() reports any error the writer thread encountered.
+*/
+inline static void gsd_async_drain(struct gsd_handle* handle)
+    {
+#if GSD_USE_THREADS
+    int retval = gsd_async_wait(handle);
+    if (retval != GSD_SUCCESS)
+        {
+        pthread_mutex_lock(&handle->async_writer->mutex);
+        handle->async_writer->error = retval;
+        pthread_mutex_unlock(&handle->async_writer->mutex);
+        }
+#else
+    (void)handle;
+#endif
+    }
+
+uint32_t gsd_make_version(unsigned int major, unsigned int minor)
+    {
+    return major << (sizeof(uint32_t) * 4) | minor;
+    }
+
+int gsd_create(const char* fname,
+               const char* application,
+               const char* schema,
+               uint32_t schema_version)
+    {
+    int extra_flags = 0;
+#ifdef _WIN32
+    extra_flags = _O_BINARY;
+#endif
+
+    // create the file
+    int fd = gsd_open_file(fname,
+                           O_RDWR | O_CREAT | O_TRUNC | extra_flags,
+                           S_IRUSR | S_IWUSR | S_IRGRP | S_IWGRP);
+    int retval = gsd_initialize_file(fd, application, schema, schema_version);
+    if (fd != -1)
+        {
+        close(fd);
+        }
+    return retval;
+    }
+
+int gsd_create_and_open(struct gsd_handle* handle,
+                        const char* fname,
+                        const char* application,
+                        const char* schema,
+                        uint32_t schema_version,
+                        const enum gsd_open_flag flags,
+                        int exclusive_create)
+    {
+    // zero the handle
+    gsd_util_zero_memory(handle, sizeof(struct gsd_handle));
+
+    int extra_flags = 0;
+#ifdef _WIN32
+    extra_flags = _O_BINARY;
+#endif
+
+    // set the open flags in the handle
+    if (flags == GSD_OPEN_READWRITE)
+        {
+        handle->open_flags = GSD_OPEN_READWRITE;
+        }
+    else if (flags == GSD_OPEN_READONLY)
+        {
+        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        }
+    else if (flags == GSD_OPEN_APPEND)
+        {
+        handle->open_flags = GSD_OPEN_APPEND;
+        }
+
+    // set the exclusive create bit
+    if (exclusive_create)
+        {
+        extra_flags |= O_EXCL;
+        }
+
+    // create the file
+    handle->fd = gsd_open_file(fname,
+                               O_RDWR | O_CREAT | O_TRUNC | extra_flags,
+                               S_IRUSR | S_IWUSR | S_IRGRP | S_IWGRP);
+    int retval = gsd_initialize_file(handle->fd, application, schema, schema_version);
+    if (retval != 0)
+        {
+        if (handle->fd != -1)
+            {
+            close(handle->fd);
+            }
+        return retval;
+        }
+
+    retval = gsd_initialize_handle(handle);
+    if (retval != 0)
+        {
+        if (handle->fd != -1)
+            {
+            close(handle->fd);
+            }
+        }
+    return retval;
+    }
+
+int gsd_open(struct gsd_handle* handle, const char* fname, const enum gsd_open_flag flags)
+    {
+    // zero the handle
+    gsd_util_zero_memory(handle, sizeof(struct gsd_handle));
+
+    int extra_flags = 0;
+#ifdef _WIN32
+    extra_flags = _O_BINARY;
+#endif
+
+    // open the file
+    if (flags == GSD_OPEN_READWRITE)
+        {
+        handle->fd = gsd_open_file(fname, O_RDWR | extra_flags, 0);
+        handle->open_flags = GSD_OPEN_READWRITE;
+        }
+    else if (flags == GSD_OPEN_READONLY)
+        {
+        handle->fd = gsd_open_file(fname, O_RDONLY | extra_flags, 0);
+        handle->open_flags = GSD_OPEN_READONLY;
+        }
+    else if (flags == GSD_OPEN_APPEND)
+        {
+        handle->fd = gsd_open_file(fname, O_RDWR | extra_flags, 0);
+        handle->open_flags = GSD_OPEN_APPEND;
+        }
+
+    int retval = gsd_initialize_handle(handle);
+    if (retval != 0)
+        {
+        if (handle->fd != -1)
+            {
+            close(handle->fd);
+            }
+        }
+    return retval;
+    }
+
+int gsd_truncate(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+    if (handle->open_flags == GSD_OPEN_READONLY)
+        {
+        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        }
+
+    int retval = gsd_async_wait(handle);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    // deallocate indices
+    if (handle->frame_names.data.reserved > 0)
+        {
+        retval = gsd_byte_buffer_free(&handle->frame_names.data);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    if (handle->file_names.data.reserved > 0)
+        {
+        retval = gsd_byte_buffer_free(&handle->file_names.data);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    retval = gsd_name_id_map_free(&handle->name_map);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    retval = gsd_index_buffer_free(&handle->file_index);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    if (handle->frame_index.reserved > 0)
+        {
+        retval = gsd_index_buffer_free(&handle->frame_index);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    if (handle->buffer_index.reserved > 0)
+        {
+        retval = gsd_index_buffer_free(&handle->buffer_index);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    if (handle->write_buffer.reserved > 0)
+        {
+        retval = gsd_byte_buffer_free(&handle->write_buffer);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    gsd_frame_directory_free(&handle->frame_directory);
+    gsd_chunk_directory_free(&handle->chunk_directory);
+    gsd_write_segment_list_free(&handle->write_segments);
+
+    retval = gsd_close_direct_fd(handle);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    // keep a copy of the old header
+    struct gsd_header old_header = handle->header;
+    retval = gsd_initialize_file(handle->fd,
+                                 old_header.application,
+                                 old_header.schema,
+                                 old_header.schema_version);
+
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+#if GSD_USE_THREADS
+    if (handle->async_writer != NULL)
+        {
+        handle->async_writer->n_frames = 0;
+        }
+#endif
+
+    return gsd_initialize_handle(handle);
+    }
+
+int gsd_close(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    // write the queued chunks and stop the writer thread
+    int retval = gsd_set_async(handle, 0);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    if (handle->open_flags != GSD_OPEN_READONLY)
+        {
+        retval = gsd_flush(handle);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    // release the preallocated space past the end of the file
+    if (handle->allocated_size > 0)
+        {
+        int64_t end = lseek(handle->fd, 0, SEEK_END);
+        if (end == -1 || ftruncate(handle->fd, end) != 0)
+            {
+            return GSD_ERROR_IO;
+            }
+        }
+
+    retval = gsd_close_direct_fd(handle);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    // save the fd so we can use it after freeing the handle
+    int fd = handle->fd;
+
+    retval = gsd_index_buffer_free(&handle->file_index);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    if (handle->frame_index.reserved > 0)
+        {
+        retval = gsd_index_buffer_free(&handle->frame_index);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    if (handle->buffer_index.reserved > 0)
+        {
+        retval = gsd_index_buffer_free(&handle->buffer_index);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    if (handle->write_buffer.reserved > 0)
+        {
+        retval = gsd_byte_buffer_free(&handle->write_buffer);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    if (handle->codec_buffer.reserved > 0)
+        {
+        retval = gsd_byte_buffer_free(&handle->codec_buffer);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    gsd_frame_directory_free(&handle->frame_directory);
+    gsd_chunk_directory_free(&handle->chunk_directory);
+    gsd_write_segment_list_free(&handle->write_segments);
+
+    retval = gsd_name_id_map_free(&handle->name_map);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    if (handle->frame_names.data.reserved > 0)
+        {
+        handle->frame_names.n_names = 0;
+        retval = gsd_byte_buffer_free(&handle->frame_names.data);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    if (handle->file_names.data.reserved > 0)
+        {
+        handle->file_names.n_names = 0;
+        retval = gsd_byte_buffer_free(&handle->file_names.data);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    // close the file
+    retval = close(fd);
+    if (retval != 0)
+        {
+        return GSD_ERROR_IO;
+        }
+
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief End the current frame
+
+    @param handle Handle to an open GSD file.
+
+    Implements gsd_end_frame() on the calling thread.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_end_frame_now(struct gsd_handle* handle)
+    {
+    // the caller may reuse borrowed data after gsd_end_frame returns
+    if (handle->write_segments.borrowed > 0)
         {
-        return GSD_ERROR_NOT_A_GSD_FILE;
+        size_t frame_index_size = handle->frame_index.size;
+        int retval = gsd_flush_write_buffer(handle);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+
+        // these entries count toward the buffered index entries, not the frame index
+        handle->flushed_buffer_index_entries += handle->frame_index.size - frame_index_size;
         }
 
-    if (handle->header.gsd_version < gsd_make_version(1, 0)
-        && handle->header.gsd_version != gsd_make_version(0, 3))
+    handle->cur_frame++;
+    handle->pending_index_entries = 0;
+
+    if (handle->durability == GSD_DURABILITY_GROUP)
         {
-        return GSD_ERROR_INVALID_GSD_FILE_VERSION;
+        // defer the flush until the end of the group
+        handle->frames_since_flush++;
+        if (handle->frames_since_flush >= handle->group_commit_frames
+            || gsd_util_monotonic_time() - handle->last_flush_time
+                   >= handle->group_commit_interval
+            || handle->buffer_index.size > handle->index_entries_to_buffer
+            || handle->frame_index.size > handle->index_entries_to_buffer)
+            {
+            return gsd_flush_now(handle);
+            }
+
+        return GSD_SUCCESS;
         }
 
-    if (handle->header.gsd_version >= gsd_make_version(3, 0))
+    if (handle->frame_index.size > handle->flushed_buffer_index_entries
+        || handle->buffer_index.size + handle->flushed_buffer_index_entries
+               > handle->index_entries_to_buffer)
         {
-        return GSD_ERROR_INVALID_GSD_FILE_VERSION;
+        return gsd_flush_now(handle);
         }
 
-    // determine the file size
-    handle->file_size = lseek(handle->fd, 0, SEEK_END);
+    return GSD_SUCCESS;
+    }
 
-    // validate that the namelist block exists inside the file
-    if (handle->header.namelist_location
-            + (GSD_NAME_SIZE * handle->header.namelist_allocated_entries)
-        > (uint64_t)handle->file_size)
-        {
-        return GSD_ERROR_FILE_CORRUPT;
-        }
+/** @internal
+    @brief Flush the write buffer
 
-    // allocate the hash map
-    int retval = gsd_name_id_map_allocate(&handle->name_map, GSD_NAME_MAP_SIZE);
+    @param handle Handle to an open GSD file.
+
+    Implements gsd_flush() on the calling thread.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_flush_now(struct gsd_handle* handle)
+    {
+    // flush the namelist buffer
+    int retval = gsd_flush_name_buffer(handle);
     if (retval != GSD_SUCCESS)
         {
         return retval;
         }
 
-    // read the namelist block
-    size_t namelist_n_bytes = GSD_NAME_SIZE * handle->header.namelist_allocated_entries;
-    retval = gsd_byte_buffer_allocate(&handle->file_names.data, namelist_n_bytes);
+    // flush the write buffer
+    retval = gsd_flush_write_buffer(handle);
     if (retval != GSD_SUCCESS)
         {
         return retval;
         }
-    bytes_read = gsd_io_pread_retry(handle->fd,
-                                    handle->file_names.data.data,
-                                    namelist_n_bytes,
-                                    handle->header.namelist_location);
 
-    if (bytes_read == -1 || bytes_read != namelist_n_bytes)
+    // sync the data before writing the index
+    retval = gsd_sync(handle);
+    if (retval != GSD_SUCCESS)
         {
-        return GSD_ERROR_IO;
+        return retval;
         }
 
-    // The name buffer must end in a NULL terminator or else the file is corrupt
-    if (handle->file_names.data.data[handle->file_names.data.reserved - 1] != 0)
+    // Write the frame index to the file, excluding the index entries that are part of the current
+    // frame.
+    if (handle->pending_index_entries > handle->frame_index.size)
         {
-        return GSD_ERROR_FILE_CORRUPT;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
+    uint64_t index_entries_to_write = handle->frame_index.size - handle->pending_index_entries;
 
-    // Add the names to the hash map. Also determine the number of used bytes in the namelist.
-    size_t name_start = 0;
-    handle->file_names.n_names = 0;
-    while (name_start < handle->file_names.data.reserved)
+    if (index_entries_to_write > 0)
         {
-        char* name = handle->file_names.data.data + name_start;
-
-        // an empty name notes the end of the list
-        if (name[0] == 0)
+        // ensure there is enough space in the index
+        if ((handle->file_index.size + index_entries_to_write) > handle->file_index.reserved)
             {
-            break;
+            retval = gsd_expand_file_index(
+                handle,
+                gsd_grow_index_size(handle, handle->file_index.size + index_entries_to_write));
+            if (retval != GSD_SUCCESS)
+                {
+                return retval;
+                }
             }
 
-        retval
-            = gsd_name_id_map_insert(&handle->name_map, name, (uint16_t)handle->file_names.n_names);
-        if (retval != GSD_SUCCESS)
+        // sort the index before writing
+        retval = gsd_index_buffer_sort(&handle->frame_index);
+        if (retval != 0)
             {
             return retval;
             }
-        handle->file_names.n_names++;
 
-        if (handle->header.gsd_version < gsd_make_version(2, 0))
+        // write the frame index entries to the file
+        int64_t write_pos = handle->header.index_location
+                            + sizeof(struct gsd_index_entry) * handle->file_index.size;
+
+        size_t bytes_to_write = sizeof(struct gsd_index_entry) * index_entries_to_write;
+        ssize_t bytes_written
+            = gsd_io_pwrite_retry(handle->fd, handle->frame_index.data, bytes_to_write, write_pos);
+
+        if (bytes_written == -1 || (size_t)bytes_written != bytes_to_write)
             {
-            // gsd v1 stores names in fixed 64 byte segments
-            name_start += GSD_NAME_SIZE;
+            return GSD_ERROR_IO;
             }
-        else
+
+#if !GSD_USE_MMAP
+        // add the entries to the file index
+        memcpy(handle->file_index.data + handle->file_index.size,
+               handle->frame_index.data,
+               sizeof(struct gsd_index_entry) * index_entries_to_write);
+#endif
+
+        // update size of file index
+        handle->file_index.size += index_entries_to_write;
+
+        // Clear the frame index, keeping those in the current unfinished frame.
+        if (handle->pending_index_entries > 0)
             {
-            size_t len = strnlen(name, handle->file_names.data.reserved - name_start);
-            name_start += len + 1;
+            for (uint64_t i = 0; i < handle->pending_index_entries; i++)
+                {
+                handle->frame_index.data[i]
+                    = handle->frame_index
+                          .data[handle->frame_index.size - handle->pending_index_entries + i];
+                }
             }
+
+        handle->frame_index.size = handle->pending_index_entries;
         }
 
-    handle->file_names.data.size = name_start;
+    handle->flushed_buffer_index_entries = 0;
+    handle->frames_since_flush = 0;
+    handle->last_flush_time = gsd_util_monotonic_time();
 
-    // read in the file index
-    retval = gsd_index_buffer_map(&handle->file_index, handle);
-    if (retval != GSD_SUCCESS)
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Validate the arguments to gsd_write_chunk()
+
+    @param handle Handle to an open GSD file.
+    @param N Number of rows in the data.
+    @param M Number of columns in the data.
+    @param flags Chunk flags.
+    @param data Data buffer.
+
+    @returns GSD_SUCCESS when the arguments are valid, GSD_* error codes otherwise.
+*/
+inline static int gsd_validate_write_chunk(struct gsd_handle* handle,
+                                           uint64_t N,
+                                           uint32_t M,
+                                           uint8_t flags,
+                                           const void* data)
+    {
+    if (handle == NULL)
         {
-        return retval;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-
-    // determine the current frame counter
-    if (handle->file_index.size == 0)
+    if (N > 0 && data == NULL)
         {
-        handle->cur_frame = 0;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-    else
+    if (M == 0)
         {
-        handle->cur_frame = handle->file_index.data[handle->file_index.size - 1].frame + 1;
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+    if (handle->open_flags == GSD_OPEN_READONLY)
+        {
+        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        }
+    if ((flags & ~GSD_FLAG_COMPRESSED) != 0)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
 
-    // if this is a write mode, allocate the initial frame index and the name buffer
-    if (handle->open_flags != GSD_OPEN_READONLY)
+    return GSD_SUCCESS;
+    }
+
+/** @internal
+    @brief Write a data chunk to the current frame
+
+    @param handle Handle to an open GSD file.
+    @param name Name of the data chunk.
+    @param type type ID that identifies the type of data in *data*.
+    @param N Number of rows in the data.
+    @param M Number of columns in the data.
+    @param flags Chunk flags.
+    @param data Data buffer.
+    @param borrow Set to reference *data* in the write buffer instead of copying it.
+
+    Implements gsd_write_chunk() and gsd_write_chunk_borrowed() on the calling thread. The caller
+    must validate the arguments.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int gsd_write_chunk_now(struct gsd_handle* handle,
+                                      const char* name,
+                                      enum gsd_type type,
+                                      uint64_t N,
+                                      uint32_t M,
+                                      uint8_t flags,
+                                      const void* data,
+                                      int borrow)
+    {
+    uint16_t id = gsd_name_id_map_find(&handle->name_map, name);
+    if (id == UINT16_MAX)
         {
-        retval = gsd_index_buffer_allocate(&handle->frame_index, GSD_INITIAL_FRAME_INDEX_SIZE);
+        // not found, append to the index
+        int retval = gsd_append_name(&id, handle, name);
         if (retval != GSD_SUCCESS)
             {
             return retval;
             }
 
-        retval = gsd_index_buffer_allocate(&handle->buffer_index, GSD_INITIAL_FRAME_INDEX_SIZE);
+        if (id == UINT16_MAX)
+            {
+            // this should never happen
+            return GSD_ERROR_NAMELIST_FULL;
+            }
+        }
+
+    struct gsd_index_entry entry;
+    // populate fields in the entry's data
+    gsd_util_zero_memory(&entry, sizeof(struct gsd_index_entry));
+    entry.frame = handle->cur_frame;
+    entry.id = id;
+    entry.type = (uint8_t)type;
+    entry.N = N;
+    entry.M = M;
+    size_t size = N * M * gsd_sizeof_type(type);
+
+    // compressed chunks require file version 2.2
+    if ((flags & GSD_FLAG_COMPRESSED) && handle->header.gsd_version >= gsd_make_version(2, 2))
+        {
+        const char* compressed = NULL;
+        size_t compressed_size = 0;
+        int retval = gsd_compress_chunk(handle,
+                                        data,
+                                        N * M,
+                                        gsd_sizeof_type(type),
+                                        &compressed,
+                                        &compressed_size);
         if (retval != GSD_SUCCESS)
             {
             return retval;
             }
 
-        retval = gsd_byte_buffer_allocate(&handle->write_buffer, GSD_INITIAL_WRITE_BUFFER_SIZE);
+        // store the chunk uncompressed when compression does not reduce its size
+        if (compressed_size > 0)
+            {
+            entry.flags = GSD_FLAG_COMPRESSED;
+            data = compressed;
+            size = compressed_size;
+            }
+        }
+
+    // decide whether to write this chunk to the buffer or straight to disk
+    if (size < handle->maximum_write_buffer_size)
+        {
+        // flush the buffer if this entry won't fit
+        if (size > (handle->maximum_write_buffer_size - handle->write_buffer.size
+                    - handle->write_segments.borrowed))
+            {
+            gsd_flush_write_buffer(handle);
+            }
+
+        entry.location = handle->write_buffer.size + handle->write_segments.borrowed;
+
+        // add an entry to the buffer index
+        struct gsd_index_entry* index_entry;
+
+        int retval = gsd_index_buffer_add(&handle->buffer_index, &index_entry);
         if (retval != GSD_SUCCESS)
             {
             return retval;
             }
+        *index_entry = entry;
 
-        handle->frame_names.n_names = 0;
-        retval = gsd_byte_buffer_allocate(&handle->frame_names.data, GSD_NAME_SIZE);
+        // add the data to the write buffer
+        if (size > 0 && borrow && !(entry.flags & GSD_FLAG_COMPRESSED))
+            {
+            // reference the caller's data, keeping the chunks in order
+            retval = gsd_write_segment_list_add_copied(handle);
+            if (retval != GSD_SUCCESS)
+                {
+                return retval;
+                }
+
+            retval = gsd_write_segment_list_append(&handle->write_segments, data, 0, size);
+            if (retval != GSD_SUCCESS)
+                {
+                return retval;
+                }
+            handle->write_segments.borrowed += size;
+            }
+        else if (size > 0)
+            {
+            retval = gsd_byte_buffer_append(&handle->write_buffer, data, size);
+            if (retval != GSD_SUCCESS)
+                {
+                return retval;
+                }
+            }
+        }
+    else
+        {
+        // add an entry to the frame index
+        struct gsd_index_entry* index_entry;
+
+        int retval = gsd_index_buffer_add(&handle->frame_index, &index_entry);
         if (retval != GSD_SUCCESS)
             {
             return retval;
             }
-        }
+        *index_entry = entry;
 
-    handle->pending_index_entries = 0;
-    handle->maximum_write_buffer_size = GSD_DEFAULT_MAXIMUM_WRITE_BUFFER_SIZE;
-    handle->index_entries_to_buffer = GSD_DEFAULT_INDEX_ENTRIES_TO_BUFFER;
+        // find the location at the end of the file for the chunk
+        index_entry->location = handle->file_size;
+
+#if GSD_USE_DIRECT_IO
+        if (handle->direct_fd >= 0)
+            {
+            // direct I/O transfers start at aligned locations
+            index_entry->location = (handle->file_size + GSD_DIRECT_IO_ALIGNMENT - 1)
+                                    / GSD_DIRECT_IO_ALIGNMENT * GSD_DIRECT_IO_ALIGNMENT;
+            gsd_preallocate(handle, index_entry->location + size);
+
+            retval = gsd_io_pwrite_direct(handle, data, size, index_entry->location);
+            if (retval != GSD_SUCCESS)
+                {
+                return retval;
+                }
+
+            handle->file_size = index_entry->location + size;
+            handle->pending_index_entries++;
+            return GSD_SUCCESS;
+            }
+#endif
 
-    // Silently upgrade writable files from a previous matching major version to the latest
-    // minor version.
-    if ((handle->open_flags == GSD_OPEN_READWRITE || handle->open_flags == GSD_OPEN_APPEND)
-        && (handle->header.gsd_version
-            <= gsd_make_version(GSD_CURRENT_FILE_VERSION_MAJOR, GSD_CURRENT_FILE_VERSION_MINOR))
-        && (handle->header.gsd_version >> (sizeof(uint32_t) * 4) == GSD_CURRENT_FILE_VERSION_MAJOR))
-        {
-        handle->header.gsd_version
-            = gsd_make_version(GSD_CURRENT_FILE_VERSION_MAJOR, GSD_CURRENT_FILE_VERSION_MINOR);
-        size_t bytes_written
-            = gsd_io_pwrite_retry(handle->fd, &(handle->header), sizeof(struct gsd_header), 0);
+        gsd_preallocate(handle, index_entry->location + size);
 
-        if (bytes_written != sizeof(struct gsd_header))
+        // write the data
+        ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd, data, size, index_entry->location);
+        if (bytes_written == -1 || (size_t)bytes_written != size)
             {
             return GSD_ERROR_IO;
             }
+
+        // update the file_size in the handle
+        handle->file_size += bytes_written;
         }
 
+    handle->pending_index_entries++;
     return GSD_SUCCESS;
     }
 
-uint32_t gsd_make_version(unsigned int major, unsigned int minor)
-    {
-    return major << (sizeof(uint32_t) * 4) | minor;
-    }
-
-int gsd_create(const char* fname,
-               const char* application,
-               const char* schema,
-               uint32_t schema_version)
+int gsd_end_frame(struct gsd_handle* handle)
     {
-    int extra_flags = 0;
-#ifdef _WIN32
-    extra_flags = _O_BINARY;
-#endif
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+    if (handle->open_flags == GSD_OPEN_READONLY)
+        {
+        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        }
 
-    // create the file
-    int fd = gsd_open_file(fname,
-                           O_RDWR | O_CREAT | O_TRUNC | extra_flags,
-                           S_IRUSR | S_IWUSR | S_IRGRP | S_IWGRP);
-    int retval = gsd_initialize_file(fd, application, schema, schema_version);
-    if (fd != -1)
+#if GSD_USE_THREADS
+    if (handle->async_writer != NULL)
         {
-        close(fd);
+        return gsd_async_submit(handle, 1);
         }
-    return retval;
+#endif
+
+    return gsd_end_frame_now(handle);
     }
 
-int gsd_create_and_open(struct gsd_handle* handle,
-                        const char* fname,
-                        const char* application,
-                        const char* schema,
-                        uint32_t schema_version,
-                        const enum gsd_open_flag flags,
-                        int exclusive_create)
+int gsd_flush(struct gsd_handle* handle)
     {
-    // zero the handle
-    gsd_util_zero_memory(handle, sizeof(struct gsd_handle));
-
-    int extra_flags = 0;
-#ifdef _WIN32
-    extra_flags = _O_BINARY;
-#endif
-
-    // set the open flags in the handle
-    if (flags == GSD_OPEN_READWRITE)
+    if (handle == NULL)
         {
-        handle->open_flags = GSD_OPEN_READWRITE;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-    else if (flags == GSD_OPEN_READONLY)
+    if (handle->open_flags == GSD_OPEN_READONLY)
         {
         return GSD_ERROR_FILE_MUST_BE_WRITABLE;
         }
-    else if (flags == GSD_OPEN_APPEND)
-        {
-        handle->open_flags = GSD_OPEN_APPEND;
-        }
 
-    // set the exclusive create bit
-    if (exclusive_create)
+    int retval = gsd_async_wait(handle);
+    if (retval != GSD_SUCCESS)
         {
-        extra_flags |= O_EXCL;
+        return retval;
         }
 
-    // create the file
-    handle->fd = gsd_open_file(fname,
-                               O_RDWR | O_CREAT | O_TRUNC | extra_flags,
-                               S_IRUSR | S_IWUSR | S_IRGRP | S_IWGRP);
-    int retval = gsd_initialize_file(handle->fd, application, schema, schema_version);
-    if (retval != 0)
+    return gsd_flush_now(handle);
+    }
+
+int gsd_write_chunk(struct gsd_handle* handle,
+                    const char* name,
+                    enum gsd_type type,
+                    uint64_t N,
+                    uint32_t M,
+                    uint8_t flags,
+                    const void* data)
+    {
+    // validate input
+    int retval = gsd_validate_write_chunk(handle, N, M, flags, data);
+    if (retval != GSD_SUCCESS)
         {
-        if (handle->fd != -1)
-            {
-            close(handle->fd);
-            }
         return retval;
         }
 
-    retval = gsd_initialize_handle(handle);
-    if (retval != 0)
+#if GSD_USE_THREADS
+    if (handle->async_writer != NULL)
         {
-        if (handle->fd != -1)
-            {
-            close(handle->fd);
-            }
+        return gsd_async_append(handle, name, type, N, M, flags, data);
         }
-    return retval;
+#endif
+
+    return gsd_write_chunk_now(handle, name, type, N, M, flags, data, 0);
     }
 
-int gsd_open(struct gsd_handle* handle, const char* fname, const enum gsd_open_flag flags)
+int gsd_write_chunk_borrowed(struct gsd_handle* handle,
+                             const char* name,
+                             enum gsd_type type,
+                             uint64_t N,
+                             uint32_t M,
+                             uint8_t flags,
+                             const void* data)
     {
-    // zero the handle
-    gsd_util_zero_memory(handle, sizeof(struct gsd_handle));
-
-    int extra_flags = 0;
-#ifdef _WIN32
-    extra_flags = _O_BINARY;
-#endif
-
-    // open the file
-    if (flags == GSD_OPEN_READWRITE)
-        {
-        handle->fd = gsd_open_file(fname, O_RDWR | extra_flags, 0);
-        handle->open_flags = GSD_OPEN_READWRITE;
-        }
-    else if (flags == GSD_OPEN_READONLY)
-        {
-        handle->fd = gsd_open_file(fname, O_RDONLY | extra_flags, 0);
-        handle->open_flags = GSD_OPEN_READONLY;
-        }
-    else if (flags == GSD_OPEN_APPEND)
+    // validate input
+    int retval = gsd_validate_write_chunk(handle, N, M, flags, data);
+    if (retval != GSD_SUCCESS)
         {
-        handle->fd = gsd_open_file(fname, O_RDWR | extra_flags, 0);
-        handle->open_flags = GSD_OPEN_APPEND;
+        return retval;
         }
 
-    int retval = gsd_initialize_handle(handle);
-    if (retval != 0)
+#if GSD_USE_THREADS
+    // the writer thread needs a copy of the data
+    if (handle->async_writer != NULL)
         {
-        if (handle->fd != -1)
-            {
-            close(handle->fd);
-            }
+        return gsd_async_append(handle, name, type, N, M, flags, data);
         }
-    return retval;
+#endif
+
+    return gsd_write_chunk_now(handle, name, type, N, M, flags, data, 1);
     }
 
-int gsd_truncate(struct gsd_handle* handle)
+uint64_t gsd_get_nframes(struct gsd_handle* handle)
     {
     if (handle == NULL)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return 0;
         }
-    if (handle->open_flags == GSD_OPEN_READONLY)
+#if GSD_USE_THREADS
+    if (handle->async_writer != NULL)
         {
-        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        // include the frames still queued for the writer thread
+        return handle->async_writer->n_frames;
         }
+#endif
+    return handle->cur_frame;
+    }
 
-    int retval = 0;
+/** @internal
+    @brief Find a chunk by name id
 
-    // deallocate indices
-    if (handle->frame_names.data.reserved > 0)
+    @param handle Handle to the open file.
+    @param frame Frame to search (less than the number of frames in the file index).
+    @param match_id Id of the chunk name.
+
+    @returns A pointer to the index entry of the chunk, or NULL when the frame has no such chunk.
+*/
+inline static const struct gsd_index_entry*
+gsd_find_chunk_id(struct gsd_handle* handle, uint64_t frame, uint16_t match_id)
+    {
+    // limit the search to the index entries of the given frame
+    int retval = gsd_frame_directory_extend(handle, frame);
+    if (retval != GSD_SUCCESS)
         {
-        retval = gsd_byte_buffer_free(&handle->frame_names.data);
-        if (retval != GSD_SUCCESS)
-            {
-            return retval;
-            }
+        return NULL;
         }
+    size_t first = handle->frame_directory.data[frame];
+    size_t last = handle->frame_directory.data[frame + 1];
 
-    if (handle->file_names.data.reserved > 0)
+    if (handle->header.gsd_version >= gsd_make_version(2, 0))
         {
-        retval = gsd_byte_buffer_free(&handle->file_names.data);
-        if (retval != GSD_SUCCESS)
+        // gsd 2.0 files sort the entire index
+        // binary search for the index entry
+        ssize_t L = (ssize_t)first;
+        ssize_t R = (ssize_t)last - 1;
+        struct gsd_index_entry T;
+        T.frame = frame;
+        T.id = match_id;
+
+        while (L <= R)
             {
-            return retval;
+            size_t m = (L + R) / 2;
+            int cmp = gsd_cmp_index_entry(handle->file_index.data + m, &T);
+            if (cmp == -1)
+                {
+                L = m + 1;
+                }
+            else if (cmp == 1)
+                {
+                R = m - 1;
+                }
+            else
+                {
+                return &(handle->file_index.data[m]);
+                }
             }
         }
-
-    retval = gsd_name_id_map_free(&handle->name_map);
-    if (retval != GSD_SUCCESS)
+    else
         {
-        return retval;
+        // gsd 1.0 file: search all index entries with the matching frame
+        for (size_t cur_index = last; cur_index > first; cur_index--)
+            {
+            // check the id
+            if (match_id == handle->file_index.data[cur_index - 1].id)
+                {
+                return &(handle->file_index.data[cur_index - 1]);
+                }
+            }
         }
 
-    retval = gsd_index_buffer_free(&handle->file_index);
-    if (retval != GSD_SUCCESS)
+    // if we got here, we didn't find the specified chunk
+    return NULL;
+    }
+
+const struct gsd_index_entry*
+gsd_find_chunk(struct gsd_handle* handle, uint64_t frame, const char* name)
+    {
+    if (handle == NULL)
         {
-        return retval;
+        return NULL;
         }
-
-    if (handle->frame_index.reserved > 0)
+    if (name == NULL)
         {
-        retval = gsd_index_buffer_free(&handle->frame_index);
-        if (retval != GSD_SUCCESS)
-            {
-            return retval;
-            }
+        return NULL;
         }
-
-    if (handle->buffer_index.reserved > 0)
+    if (frame >= gsd_get_nframes(handle))
         {
-        retval = gsd_index_buffer_free(&handle->buffer_index);
-        if (retval != GSD_SUCCESS)
-            {
-            return retval;
-            }
+        return NULL;
         }
-
-    if (handle->write_buffer.reserved > 0)
+    if (handle->open_flags != GSD_OPEN_READONLY)
         {
-        retval = gsd_byte_buffer_free(&handle->write_buffer);
+        int retval = gsd_flush(handle);
         if (retval != GSD_SUCCESS)
             {
-            return retval;
+            return NULL;
             }
         }
 
-    // keep a copy of the old header
-    struct gsd_header old_header = handle->header;
-    retval = gsd_initialize_file(handle->fd,
-                                 old_header.application,
-                                 old_header.schema,
-                                 old_header.schema_version);
-
-    if (retval != GSD_SUCCESS)
+    // find the id for the given name
+    uint16_t match_id = gsd_name_id_map_find(&handle->name_map, name);
+    if (match_id == UINT16_MAX)
         {
-        return retval;
+        return NULL;
         }
 
-    return gsd_initialize_handle(handle);
+    return gsd_find_chunk_id(handle, frame, match_id);
     }
 
-int gsd_close(struct gsd_handle* handle)
+int gsd_find_chunk_ids(struct gsd_handle* handle,
+                       const char* const* names,
+                       size_t n,
+                       uint16_t* ids)
     {
     if (handle == NULL)
         {
         return GSD_ERROR_INVALID_ARGUMENT;
         }
-
-    int retval;
-
-    if (handle->open_flags != GSD_OPEN_READONLY)
+    if (n == 0)
         {
-        retval = gsd_flush(handle);
-        if (retval != GSD_SUCCESS)
-            {
-            return retval;
-            }
+        return GSD_SUCCESS;
         }
-
-    // save the fd so we can use it after freeing the handle
-    int fd = handle->fd;
-
-    retval = gsd_index_buffer_free(&handle->file_index);
-    if (retval != GSD_SUCCESS)
+    if (names == NULL || ids == NULL)
         {
-        return retval;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
 
-    if (handle->frame_index.reserved > 0)
+    for (size_t i = 0; i < n; i++)
         {
-        retval = gsd_index_buffer_free(&handle->frame_index);
-        if (retval != GSD_SUCCESS)
+        ids[i] = UINT16_MAX;
+        if (names[i] != NULL)
             {
-            return retval;
+            ids[i] = gsd_name_id_map_find(&handle->name_map, names[i]);
             }
         }
 
-    if (handle->buffer_index.reserved > 0)
+    return GSD_SUCCESS;
+    }
+
+int gsd_find_frame_chunks(struct gsd_handle* handle,
+                          uint64_t frame,
+                          const uint16_t* ids,
+                          size_t n,
+                          const struct gsd_index_entry** chunks)
+    {
+    if (handle == NULL)
         {
-        retval = gsd_index_buffer_free(&handle->buffer_index);
-        if (retval != GSD_SUCCESS)
-            {
-            return retval;
-            }
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-
-    if (handle->write_buffer.reserved > 0)
+    if (n == 0)
         {
-        retval = gsd_byte_buffer_free(&handle->write_buffer);
-        if (retval != GSD_SUCCESS)
-            {
-            return retval;
-            }
+        return GSD_SUCCESS;
         }
-
-    retval = gsd_name_id_map_free(&handle->name_map);
-    if (retval != GSD_SUCCESS)
+    if (ids == NULL || chunks == NULL)
         {
-        return retval;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-
-    if (handle->frame_names.data.reserved > 0)
+    if (handle->open_flags == GSD_OPEN_APPEND)
         {
-        handle->frame_names.n_names = 0;
-        retval = gsd_byte_buffer_free(&handle->frame_names.data);
-        if (retval != GSD_SUCCESS)
-            {
-            return retval;
-            }
+        return GSD_ERROR_FILE_MUST_BE_READABLE;
         }
-
-    if (handle->file_names.data.reserved > 0)
+    if (handle->open_flags != GSD_OPEN_READONLY)
         {
-        handle->file_names.n_names = 0;
-        retval = gsd_byte_buffer_free(&handle->file_names.data);
+        int retval = gsd_flush(handle);
         if (retval != GSD_SUCCESS)
             {
             return retval;
             }
         }
 
-    // close the file
-    retval = close(fd);
-    if (retval != 0)
+    int in_file = frame < gsd_get_nframes(handle);
+    for (size_t i = 0; i < n; i++)
         {
-        return GSD_ERROR_IO;
+        chunks[i] = NULL;
+        if (in_file && ids[i] != UINT16_MAX)
+            {
+            chunks[i] = gsd_find_chunk_id(handle, frame, ids[i]);
+            }
         }
 
     return GSD_SUCCESS;
     }
 
-int gsd_end_frame(struct gsd_handle* handle)
+/** @internal
+    @brief Read a chunk
+
+    @param handle Handle to the open file.
+    @param data Data buffer to read into.
+    @param chunk Chunk to read.
+
+    Implements gsd_read_chunk() without validating the arguments or flushing the file.
+
+    @returns GSD_SUCCESS on success, GSD_* error codes on error.
+*/
+inline static int
+gsd_read_chunk_now(struct gsd_handle* handle, void* data, const struct gsd_index_entry* chunk)
     {
-    if (handle == NULL)
+    size_t size = chunk->N * chunk->M * gsd_sizeof_type((enum gsd_type)chunk->type);
+    if (size == 0)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return GSD_ERROR_FILE_CORRUPT;
         }
-    if (handle->open_flags == GSD_OPEN_READONLY)
+    if (chunk->location == 0)
         {
-        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        return GSD_ERROR_FILE_CORRUPT;
         }
 
-    handle->cur_frame++;
-    handle->pending_index_entries = 0;
-
-    if (handle->frame_index.size > 0 || handle->buffer_index.size > handle->index_entries_to_buffer)
+    if (chunk->flags & GSD_FLAG_COMPRESSED)
         {
-        return gsd_flush(handle);
+        return gsd_read_compressed_chunk(handle, data, chunk);
         }
 
-    return GSD_SUCCESS;
-    }
-
-int gsd_flush(struct gsd_handle* handle)
-    {
-    if (handle == NULL)
+    // validate that we don't read past the end of the file
+    if ((chunk->location + size) > (uint64_t)handle->file_size)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return GSD_ERROR_FILE_CORRUPT;
         }
-    if (handle->open_flags == GSD_OPEN_READONLY)
+
+#if GSD_USE_DIRECT_IO
+    if (handle->direct_fd >= 0 && size >= handle->maximum_write_buffer_size
+        && chunk->location % GSD_DIRECT_IO_ALIGNMENT == 0)
         {
-        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        return gsd_io_pread_direct(handle, data, size, chunk->location);
         }
+#endif
 
-    // flush the namelist buffer
-    int retval = gsd_flush_name_buffer(handle);
-    if (retval != GSD_SUCCESS)
+    ssize_t bytes_read = gsd_io_pread_retry(handle->fd, data, size, chunk->location);
+    if (bytes_read == -1 || (size_t)bytes_read != size)
         {
-        return retval;
+        return GSD_ERROR_IO;
         }
 
-    // flush the write buffer
-    retval = gsd_flush_write_buffer(handle);
-    if (retval != GSD_SUCCESS)
+    return GSD_SUCCESS;
+    }
+
+int gsd_read_chunk(struct gsd_handle* handle, void* data, const struct gsd_index_entry* chunk)
+    {
+    if (handle == NULL)
         {
-        return retval;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-
-    // sync the data before writing the index
-    retval = fsync(handle->fd);
-    if (retval != 0)
+    if (data == NULL)
         {
-        return GSD_ERROR_IO;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-
-    // Write the frame index to the file, excluding the index entries that are part of the current
-    // frame.
-    if (handle->pending_index_entries > handle->frame_index.size)
+    if (chunk == NULL)
         {
         return GSD_ERROR_INVALID_ARGUMENT;
         }
-    uint64_t index_entries_to_write = handle->frame_index.size - handle->pending_index_entries;
-
-    if (index_entries_to_write > 0)
+    if (handle->open_flags != GSD_OPEN_READONLY)
         {
-        // ensure there is enough space in the index
-        if ((handle->file_index.size + index_entries_to_write) > handle->file_index.reserved)
-            {
-            gsd_expand_file_index(handle, handle->file_index.size + index_entries_to_write);
-            }
-
-        // sort the index before writing
-        retval = gsd_index_buffer_sort(&handle->frame_index);
-        if (retval != 0)
+        int retval = gsd_flush(handle);
+        if (retval != GSD_SUCCESS)
             {
             return retval;
             }
+        }
 
-        // write the frame index entries to the file
-        int64_t write_pos = handle->header.index_location
-                            + sizeof(struct gsd_index_entry) * handle->file_index.size;
+    return gsd_read_chunk_now(handle, data, chunk);
+    }
 
-        size_t bytes_to_write = sizeof(struct gsd_index_entry) * index_entries_to_write;
-        ssize_t bytes_written
-            = gsd_io_pwrite_retry(handle->fd, handle->frame_index.data, bytes_to_write, write_pos);
+/** @internal
+    @brief Sort chunks by location.
 
-        if (bytes_written == -1 || bytes_written != bytes_to_write)
+    @param chunks Chunks to sort.
+    @param order [out] Indices of *chunks* in order of increasing location.
+    @param n Number of chunks.
+*/
+inline static void
+gsd_sort_chunks_by_location(const struct gsd_index_entry* const* chunks, size_t* order, size_t n)
+    {
+    // insertion sort: frames have few chunks and they are often already in order
+    for (size_t i = 0; i < n; i++)
+        {
+        size_t j = i;
+        while (j > 0 && chunks[order[j - 1]]->location > chunks[i]->location)
             {
-            return GSD_ERROR_IO;
+            order[j] = order[j - 1];
+            j--;
             }
+        order[j] = i;
+        }
+    }
 
-#if !GSD_USE_MMAP
-        // add the entries to the file index
-        memcpy(handle->file_index.data + handle->file_index.size,
-               handle->frame_index.data,
-               sizeof(struct gsd_index_entry) * index_entries_to_write);
-#endif
+/** @internal
+    @brief Validate a chunk passed to gsd_plan_frame_read() or gsd_read_frame().
 
-        // update size of file index
-        handle->file_index.size += index_entries_to_write;
+    @param handle Handle to the open gsd file.
+    @param chunk Chunk to validate.
+    @param size [out] Number of bytes of data in the chunk.
 
-        // Clear the frame index, keeping those in the current unfinished frame.
-        if (handle->pending_index_entries > 0)
-            {
-            for (uint64_t i = 0; i < handle->pending_index_entries; i++)
-                {
-                handle->frame_index.data[i]
-                    = handle->frame_index
-                          .data[handle->frame_index.size - handle->pending_index_entries + i];
-                }
-            }
+    @returns GSD_SUCCESS when the chunk is valid, GSD_* error codes otherwise.
+*/
+inline static int
+gsd_validate_frame_chunk(struct gsd_handle* handle, const struct gsd_index_entry* chunk, size_t* size)
+    {
+    if (chunk == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
 
-        handle->frame_index.size = handle->pending_index_entries;
+    *size = chunk->N * chunk->M * gsd_sizeof_type((enum gsd_type)chunk->type);
+    if (*size == 0)
+        {
+        return GSD_SUCCESS;
+        }
+    if (chunk->location == 0)
+        {
+        return GSD_ERROR_FILE_CORRUPT;
+        }
+    if (!(chunk->flags & GSD_FLAG_COMPRESSED)
+        && (chunk->location + *size) > (uint64_t)handle->file_size)
+        {
+        return GSD_ERROR_FILE_CORRUPT;
         }
 
     return GSD_SUCCESS;
     }
 
-int gsd_write_chunk(struct gsd_handle* handle,
-                    const char* name,
-                    enum gsd_type type,
-                    uint64_t N,
-                    uint32_t M,
-                    uint8_t flags,
-                    const void* data)
+int gsd_plan_frame_read(struct gsd_handle* handle,
+                        const struct gsd_index_entry* const* chunks,
+                        size_t n,
+                        uint64_t* offsets,
+                        uint64_t* size)
     {
-    // validate input
-    if (N > 0 && data == NULL)
+    if (handle == NULL || size == NULL)
         {
         return GSD_ERROR_INVALID_ARGUMENT;
         }
-    if (M == 0)
+    *size = 0;
+    if (n == 0)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return GSD_SUCCESS;
         }
-    if (handle->open_flags == GSD_OPEN_READONLY)
+    if (chunks == NULL || offsets == NULL)
         {
-        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-    if (flags != 0)
+
+    size_t* order = malloc(sizeof(size_t) * n);
+    if (order == NULL)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
         }
+    gsd_sort_chunks_by_location(chunks, order, n);
 
-    uint16_t id = gsd_name_id_map_find(&handle->name_map, name);
-    if (id == UINT16_MAX)
+    // Place chunks that are close together in the file in runs that are read with one call. Each
+    // run keeps the alignment of its first chunk modulo GSD_READ_FRAME_ALIGNMENT.
+    uint64_t end = 0;
+    uint64_t run_offset = 0;
+    int64_t run_start = 0;
+    int64_t run_end = -1;
+    for (size_t k = 0; k < n; k++)
         {
-        // not found, append to the index
-        int retval = gsd_append_name(&id, handle, name);
+        const struct gsd_index_entry* chunk = chunks[order[k]];
+        size_t chunk_size;
+        int retval = gsd_validate_frame_chunk(handle, chunk, &chunk_size);
         if (retval != GSD_SUCCESS)
             {
+            free(order);
             return retval;
             }
 
-        if (id == UINT16_MAX)
+        if (chunk_size == 0)
             {
-            // this should never happen
-            return GSD_ERROR_NAMELIST_FULL;
+            offsets[order[k]] = 0;
+            continue;
+            }
+
+        if (chunk->flags & GSD_FLAG_COMPRESSED)
+            {
+            // compressed chunks are decompressed into their own aligned region
+            uint64_t offset = (end + GSD_READ_FRAME_ALIGNMENT - 1) / GSD_READ_FRAME_ALIGNMENT
+                              * GSD_READ_FRAME_ALIGNMENT;
+            offsets[order[k]] = offset;
+            end = offset + chunk_size;
+            run_end = -1;
+            continue;
+            }
+
+        if (run_end >= 0 && chunk->location <= run_end + GSD_READ_FRAME_MAX_GAP)
+            {
+            offsets[order[k]] = run_offset + (chunk->location - run_start);
+            if (chunk->location + (int64_t)chunk_size > run_end)
+                {
+                run_end = chunk->location + (int64_t)chunk_size;
+                }
+            }
+        else
+            {
+            run_offset = (end + GSD_READ_FRAME_ALIGNMENT - 1) / GSD_READ_FRAME_ALIGNMENT
+                             * GSD_READ_FRAME_ALIGNMENT
+                         + chunk->location % GSD_READ_FRAME_ALIGNMENT;
+            run_start = chunk->location;
+            run_end = chunk->location + (int64_t)chunk_size;
+            offsets[order[k]] = run_offset;
+            }
+
+        if (run_offset + (run_end - run_start) > end)
+            {
+            end = run_offset + (run_end - run_start);
             }
         }
 
-    struct gsd_index_entry entry;
-    // populate fields in the entry's data
-    gsd_util_zero_memory(&entry, sizeof(struct gsd_index_entry));
-    entry.frame = handle->cur_frame;
-    entry.id = id;
-    entry.type = (uint8_t)type;
-    entry.N = N;
-    entry.M = M;
-    size_t size = N * M * gsd_sizeof_type(type);
+    free(order);
+    *size = end;
+    return GSD_SUCCESS;
+    }
 
-    // decide whether to write this chunk to the buffer or straight to disk
-    if (size < handle->maximum_write_buffer_size)
+int gsd_read_frame(struct gsd_handle* handle,
+                   void* data,
+                   const struct gsd_index_entry* const* chunks,
+                   size_t n,
+                   const uint64_t* offsets)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+    if (n == 0)
         {
-        // flush the buffer if this entry won't fit
-        if (size > (handle->maximum_write_buffer_size - handle->write_buffer.size))
+        return GSD_SUCCESS;
+        }
+    if (data == NULL || chunks == NULL || offsets == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+    if (handle->open_flags == GSD_OPEN_APPEND)
+        {
+        return GSD_ERROR_FILE_MUST_BE_READABLE;
+        }
+    if (handle->open_flags != GSD_OPEN_READONLY)
+        {
+        int retval = gsd_flush(handle);
+        if (retval != GSD_SUCCESS)
             {
-            gsd_flush_write_buffer(handle);
+            return retval;
             }
+        }
 
-        entry.location = handle->write_buffer.size;
-
-        // add an entry to the buffer index
-        struct gsd_index_entry* index_entry;
+    size_t* order = malloc(sizeof(size_t) * n);
+    if (order == NULL)
+        {
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        }
+    gsd_sort_chunks_by_location(chunks, order, n);
 
-        int retval = gsd_index_buffer_add(&handle->buffer_index, &index_entry);
-        if (retval != GSD_SUCCESS)
+    // Read the runs of uncompressed chunks. Chunks belong to the same run when their placement
+    // in the buffer matches their placement in the file.
+    int retval = GSD_SUCCESS;
+    size_t k = 0;
+    while (k < n && retval == GSD_SUCCESS)
+        {
+        const struct gsd_index_entry* first = chunks[order[k]];
+        size_t chunk_size;
+        retval = gsd_validate_frame_chunk(handle, first, &chunk_size);
+        if (retval != GSD_SUCCESS || chunk_size == 0 || (first->flags & GSD_FLAG_COMPRESSED))
             {
-            return retval;
+            k++;
+            continue;
             }
-        *index_entry = entry;
 
-        // add the data to the write buffer
-        if (size > 0)
+        uint64_t run_offset = offsets[order[k]];
+        int64_t run_end = first->location + (int64_t)chunk_size;
+        for (k++; k < n; k++)
             {
-            retval = gsd_byte_buffer_append(&handle->write_buffer, data, size);
+            const struct gsd_index_entry* chunk = chunks[order[k]];
+            retval = gsd_validate_frame_chunk(handle, chunk, &chunk_size);
             if (retval != GSD_SUCCESS)
                 {
-                return retval;
+                break;
+                }
+            if (chunk_size == 0)
+                {
+                continue;
+                }
+            if ((chunk->flags & GSD_FLAG_COMPRESSED)
+                || chunk->location > run_end + GSD_READ_FRAME_MAX_GAP
+                || offsets[order[k]] - run_offset != (uint64_t)(chunk->location - first->location))
+                {
+                break;
+                }
+            if (chunk->location + (int64_t)chunk_size > run_end)
+                {
+                run_end = chunk->location + (int64_t)chunk_size;
                 }
             }
-        }
-    else
-        {
-        // add an entry to the frame index
-        struct gsd_index_entry* index_entry;
 
-        int retval = gsd_index_buffer_add(&handle->frame_index, &index_entry);
-        if (retval != GSD_SUCCESS)
+        if (retval == GSD_SUCCESS)
             {
-            return retval;
+            size_t run_size = run_end - first->location;
+            ssize_t bytes_read = gsd_io_pread_retry(handle->fd,
+                                                    (char*)data + run_offset,
+                                                    run_size,
+                                                    first->location);
+            if (bytes_read == -1 || (size_t)bytes_read != run_size)
+                {
+                retval = GSD_ERROR_IO;
+                }
             }
-        *index_entry = entry;
-
-        // find the location at the end of the file for the chunk
-        index_entry->location = handle->file_size;
+        }
 
-        // write the data
-        ssize_t bytes_written = gsd_io_pwrite_retry(handle->fd, data, size, index_entry->location);
-        if (bytes_written == -1 || bytes_written != size)
+    // Decompress the compressed chunks after reading the runs.
+    for (k = 0; k < n && retval == GSD_SUCCESS; k++)
+        {
+        const struct gsd_index_entry* chunk = chunks[order[k]];
+        if ((chunk->flags & GSD_FLAG_COMPRESSED) && chunk->N * chunk->M > 0)
             {
-            return GSD_ERROR_IO;
+            retval = gsd_read_compressed_chunk(handle, (char*)data + offsets[order[k]], chunk);
             }
-
-        // update the file_size in the handle
-        handle->file_size += bytes_written;
         }
 
-    handle->pending_index_entries++;
-    return GSD_SUCCESS;
+    free(order);
+    return retval;
     }
 
-uint64_t gsd_get_nframes(struct gsd_handle* handle)
+int gsd_find_chunk_series(struct gsd_handle* handle,
+                          const char* name,
+                          const uint64_t* frames,
+                          size_t n,
+                          const struct gsd_index_entry** chunks)
     {
-    if (handle == NULL)
+    if (handle == NULL || name == NULL)
         {
-        return 0;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-    return handle->cur_frame;
-    }
-
-const struct gsd_index_entry*
-gsd_find_chunk(struct gsd_handle* handle, uint64_t frame, const char* name)
-    {
-    if (handle == NULL)
+    if (n == 0)
         {
-        return NULL;
+        return GSD_SUCCESS;
         }
-    if (name == NULL)
+    if (frames == NULL || chunks == NULL)
         {
-        return NULL;
+        return GSD_ERROR_INVALID_ARGUMENT;
         }
-    if (frame >= gsd_get_nframes(handle))
+    if (handle->open_flags == GSD_OPEN_APPEND)
         {
-        return NULL;
+        return GSD_ERROR_FILE_MUST_BE_READABLE;
         }
     if (handle->open_flags != GSD_OPEN_READONLY)
         {
         int retval = gsd_flush(handle);
         if (retval != GSD_SUCCESS)
             {
-            return NULL;
+            return retval;
             }
         }
 
-    // find the id for the given name
+    for (size_t i = 0; i < n; i++)
+        {
+        chunks[i] = NULL;
+        }
+
     uint16_t match_id = gsd_name_id_map_find(&handle->name_map, name);
     if (match_id == UINT16_MAX)
         {
-        return NULL;
+        return GSD_SUCCESS;
         }
-
-    if (handle->header.gsd_version >= gsd_make_version(2, 0))
+    int retval = gsd_chunk_directory_update(handle);
+    if (retval != GSD_SUCCESS)
         {
-        // gsd 2.0 files sort the entire index
-        // binary search for the index entry
-        ssize_t L = 0;
-        ssize_t R = handle->file_index.size - 1;
-        struct gsd_index_entry T;
-        T.frame = frame;
-        T.id = match_id;
+        return retval;
+        }
 
-        while (L <= R)
+    // binary search the frames that have the chunk for each requested frame
+    const struct gsd_chunk_directory* dir = &handle->chunk_directory;
+    if (match_id >= dir->n_ids)
+        {
+        return GSD_SUCCESS;
+        }
+    const uint64_t* entries = dir->entries + dir->offsets[match_id];
+    size_t n_entries = dir->offsets[match_id + 1] - dir->offsets[match_id];
+    for (size_t i = 0; i < n; i++)
+        {
+        size_t L = 0;
+        size_t R = n_entries;
+        while (L < R)
             {
-            size_t m = (L + R) / 2;
-            int cmp = gsd_cmp_index_entry(handle->file_index.data + m, &T);
-            if (cmp == -1)
+            size_t m = L + (R - L) / 2;
+            if (handle->file_index.data[entries[m]].frame < frames[i])
                 {
                 L = m + 1;
                 }
-            else if (cmp == 1)
-                {
-                R = m - 1;
-                }
             else
                 {
-                return &(handle->file_index.data[m]);
+                R = m;
                 }
             }
+        if (L < n_entries && handle->file_index.data[entries[L]].frame == frames[i])
+            {
+            chunks[i] = &handle->file_index.data[entries[L]];
+            }
         }
-    else
+
+    return GSD_SUCCESS;
+    }
+
+int gsd_read_chunk_series(struct gsd_handle* handle,
+                          void* data,
+                          const struct gsd_index_entry* const* chunks,
+                          size_t n)
+    {
+    if (handle == NULL)
         {
-        // gsd 1.0 file: use binary search to find the frame and linear search to find the entry
-        size_t L = 0;
-        size_t R = handle->file_index.size;
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+    if (n == 0)
+        {
+        return GSD_SUCCESS;
+        }
+    if (data == NULL || chunks == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+    if (handle->open_flags == GSD_OPEN_APPEND)
+        {
+        return GSD_ERROR_FILE_MUST_BE_READABLE;
+        }
 
-        // progressively narrow the search window by halves
-        do
+    // all chunks in the series must have the same shape and type
+    const struct gsd_index_entry* first = NULL;
+    for (size_t i = 0; i < n; i++)
+        {
+        const struct gsd_index_entry* chunk = chunks[i];
+        if (chunk == NULL)
             {
-            size_t m = (L + R) / 2;
+            continue;
+            }
+        if (first == NULL)
+            {
+            first = chunk;
+            }
+        else if (chunk->N != first->N || chunk->M != first->M || chunk->type != first->type)
+            {
+            return GSD_ERROR_INVALID_ARGUMENT;
+            }
+        }
+    if (first == NULL)
+        {
+        return GSD_SUCCESS;
+        }
+
+    if (handle->open_flags != GSD_OPEN_READONLY)
+        {
+        int retval = gsd_flush(handle);
+        if (retval != GSD_SUCCESS)
+            {
+            return retval;
+            }
+        }
+
+    size_t size = first->N * first->M * gsd_sizeof_type((enum gsd_type)first->type);
+    if (size == 0)
+        {
+        return GSD_SUCCESS;
+        }
+
+    // Read runs of uncompressed chunks that follow each other closely in the file with one call
+    // into a staging buffer. Read other chunks directly into data.
+    char* buffer = NULL;
+    int retval = GSD_SUCCESS;
+    size_t i = 0;
+    while (i < n && retval == GSD_SUCCESS)
+        {
+        const struct gsd_index_entry* run_first = chunks[i];
+        if (run_first == NULL)
+            {
+            i++;
+            continue;
+            }
 
-            if (frame < handle->file_index.data[m].frame)
+        size_t run_stop = i + 1;
+        size_t run_length = 1;
+        int64_t run_end = run_first->location + (int64_t)size;
+        if (!(run_first->flags & GSD_FLAG_COMPRESSED) && run_first->location != 0)
+            {
+            for (size_t j = i + 1; j < n; j++)
                 {
-                R = m;
+                const struct gsd_index_entry* chunk = chunks[j];
+                if (chunk == NULL)
+                    {
+                    continue;
+                    }
+                if ((chunk->flags & GSD_FLAG_COMPRESSED) || chunk->location < run_end
+                    || chunk->location > run_end + GSD_READ_FRAME_MAX_GAP
+                    || chunk->location + size - run_first->location > GSD_READ_SERIES_BUFFER_SIZE)
+                    {
+                    break;
+                    }
+                run_end = chunk->location + (int64_t)size;
+                run_stop = j + 1;
+                run_length++;
                 }
-            else
+            }
+
+        if (run_length == 1)
+            {
+            retval = gsd_read_chunk_now(handle, (char*)data + i * size, run_first);
+            i = run_stop;
+            continue;
+            }
+
+        if (run_end > handle->file_size)
+            {
+            retval = GSD_ERROR_FILE_CORRUPT;
+            break;
+            }
+        if (buffer == NULL)
+            {
+            buffer = malloc(GSD_READ_SERIES_BUFFER_SIZE);
+            if (buffer == NULL)
                 {
-                L = m;
+                retval = GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+                break;
                 }
-            } while ((R - L) > 1);
-
-        // this finds L = the rightmost index with the desired frame
-        int64_t cur_index;
+            }
 
-        // search all index entries with the matching frame
-        for (cur_index = L; (cur_index >= 0) && (handle->file_index.data[cur_index].frame == frame);
-             cur_index--)
+        size_t run_size = run_end - run_first->location;
+        ssize_t bytes_read = gsd_io_pread_retry(handle->fd, buffer, run_size, run_first->location);
+        if (bytes_read == -1 || (size_t)bytes_read != run_size)
+            {
+            retval = GSD_ERROR_IO;
+            break;
+            }
+        for (size_t j = i; j < run_stop; j++)
             {
-            // if the frame matches, check the id
-            if (match_id == handle->file_index.data[cur_index].id)
+            if (chunks[j] != NULL)
                 {
-                return &(handle->file_index.data[cur_index]);
+                memcpy((char*)data + j * size,
+                       buffer + (chunks[j]->location - run_first->location),
+                       size);
                 }
             }
+        i = run_stop;
         }
 
-    // if we got here, we didn't find the specified chunk
-    return NULL;
+    free(buffer);
+    return retval;
     }
 
-int gsd_read_chunk(struct gsd_handle* handle, void* data, const struct gsd_index_entry* chunk)
+int gsd_find_chunk_entries(struct gsd_handle* handle,
+                           const char* name,
+                           const uint64_t** entries,
+                           size_t* n)
     {
-    if (handle == NULL)
-        {
-        return GSD_ERROR_INVALID_ARGUMENT;
-        }
-    if (data == NULL)
+    if (handle == NULL || name == NULL || entries == NULL || n == NULL)
         {
         return GSD_ERROR_INVALID_ARGUMENT;
         }
-    if (chunk == NULL)
+    if (handle->open_flags == GSD_OPEN_APPEND)
         {
-        return GSD_ERROR_INVALID_ARGUMENT;
+        return GSD_ERROR_FILE_MUST_BE_READABLE;
         }
     if (handle->open_flags != GSD_OPEN_READONLY)
         {
@@ -2298,26 +5140,25 @@ int gsd_read_chunk(struct gsd_handle* handle, void* data, const struct gsd_index
             }
         }
 
-    size_t size = chunk->N * chunk->M * gsd_sizeof_type((enum gsd_type)chunk->type);
-    if (size == 0)
-        {
-        return GSD_ERROR_FILE_CORRUPT;
-        }
-    if (chunk->location == 0)
+    *entries = NULL;
+    *n = 0;
+
+    uint16_t match_id = gsd_name_id_map_find(&handle->name_map, name);
+    if (match_id == UINT16_MAX)
         {
-        return GSD_ERROR_FILE_CORRUPT;
+        return GSD_SUCCESS;
         }
-
-    // validate that we don't read past the end of the file
-    if ((chunk->location + size) > (uint64_t)handle->file_size)
+    int retval = gsd_chunk_directory_update(handle);
+    if (retval != GSD_SUCCESS)
         {
-        return GSD_ERROR_FILE_CORRUPT;
+        return retval;
         }
 
-    ssize_t bytes_read = gsd_io_pread_retry(handle->fd, data, size, chunk->location);
-    if (bytes_read == -1 || bytes_read != size)
+    const struct gsd_chunk_directory* dir = &handle->chunk_directory;
+    if (match_id < dir->n_ids)
         {
-        return GSD_ERROR_IO;
+        *entries = dir->entries + dir->offsets[match_id];
+        *n = dir->offsets[match_id + 1] - dir->offsets[match_id];
         }
 
     return GSD_SUCCESS;
@@ -2388,10 +5229,6 @@ gsd_find_matching_chunk_name(struct gsd_handle* handle, const char* match, const
         {
         return NULL;
         }
-    if (handle->file_names.n_names == 0)
-        {
-        return NULL;
-        }
     if (handle->open_flags != GSD_OPEN_READONLY)
         {
         int retval = gsd_flush(handle);
@@ -2401,60 +5238,84 @@ gsd_find_matching_chunk_name(struct gsd_handle* handle, const char* match, const
             }
         }
 
-    // return nothing found if the name buffer is corrupt
-    if (handle->file_names.data.data[handle->file_names.data.reserved - 1] != 0)
+    struct gsd_name_id_map* map = &handle->name_map;
+    if (map->n_pairs == 0)
         {
         return NULL;
         }
 
-    // determine search start index
-    const char* search_str;
-    if (prev == NULL)
+    // sort the names added since the last search
+    int retval = gsd_name_id_map_sort(map);
+    if (retval != GSD_SUCCESS)
         {
-        search_str = handle->file_names.data.data;
+        return NULL;
         }
-    else
+
+    if (prev != NULL)
         {
         // return not found if prev is not in range
-        if (prev < handle->file_names.data.data)
-            {
-            return NULL;
-            }
-        if (prev >= (handle->file_names.data.data + handle->file_names.data.reserved))
+        if (prev < map->names.data || prev >= map->names.data + map->names.size)
             {
             return NULL;
             }
 
-        if (handle->header.gsd_version < gsd_make_version(2, 0))
+        // continue the last query
+        if (map->cursor < map->n_matches
+            && gsd_name_id_map_name(map, map->matches[map->cursor]) == prev)
             {
-            search_str = prev + GSD_NAME_SIZE;
-            }
-        else
-            {
-            search_str = prev + strlen(prev) + 1;
+            map->cursor++;
+            if (map->cursor < map->n_matches)
+                {
+                return gsd_name_id_map_name(map, map->matches[map->cursor]);
+                }
+            return NULL;
             }
         }
 
+    // names that start with match are adjacent in sorted order
+    size_t first = gsd_name_id_map_lower_bound(map, match);
+    size_t last = first;
     size_t match_len = strlen(match);
+    while (last < map->n_sorted
+           && strncmp(match, gsd_name_id_map_name(map, map->sorted[last]), match_len) == 0)
+        {
+        last++;
+        }
 
-    while (search_str < (handle->file_names.data.data + handle->file_names.data.reserved))
+    // return the matches in the order the names were added
+    map->n_matches = last - first;
+    if (map->n_matches == 0)
         {
-        if (search_str[0] != 0 && 0 == strncmp(match, search_str, match_len))
-            {
-            return search_str;
-            }
+        return NULL;
+        }
 
-        if (handle->header.gsd_version < gsd_make_version(2, 0))
-            {
-            search_str += GSD_NAME_SIZE;
-            }
-        else
+    uint16_t* new_matches = realloc(map->matches, sizeof(uint16_t) * map->n_pairs);
+    if (new_matches == NULL)
+        {
+        map->n_matches = 0;
+        return NULL;
+        }
+    map->matches = new_matches;
+    memcpy(map->matches, map->sorted + first, sizeof(uint16_t) * map->n_matches);
+    qsort(map->matches, map->n_matches, sizeof(uint16_t), gsd_cmp_position);
+
+    map->cursor = 0;
+    if (prev != NULL)
+        {
+        // find the name after prev
+        while (map->cursor < map->n_matches
+               && gsd_name_id_map_name(map, map->matches[map->cursor]) != prev)
             {
-            search_str += strlen(search_str) + 1;
+            map->cursor++;
             }
+        map->cursor++;
+        }
+
+    if (map->cursor < map->n_matches)
+        {
+        return gsd_name_id_map_name(map, map->matches[map->cursor]);
         }
 
-    // searched past the end of the list, return NULL
     return NULL;
     }
 
@@ -2468,6 +5329,12 @@ int gsd_upgrade(struct gsd_handle* handle)
         {
         return GSD_ERROR_INVALID_ARGUMENT;
         }
+
+    int retval = gsd_async_wait(handle);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
     if (handle->frame_index.size > 0 || handle->frame_names.n_names > 0)
         {
         return GSD_ERROR_INVALID_ARGUMENT;
@@ -2480,7 +5347,7 @@ int gsd_upgrade(struct gsd_handle* handle)
             // make a copy of the file index
             struct gsd_index_buffer buf;
             gsd_util_zero_memory(&buf, sizeof(struct gsd_index_buffer));
-            int retval = gsd_index_buffer_allocate(&buf, handle->file_index.size);
+            retval = gsd_index_buffer_allocate(&buf, handle->file_index.size);
             if (retval != GSD_SUCCESS)
                 {
                 return retval;
@@ -2503,7 +5370,8 @@ int gsd_upgrade(struct gsd_handle* handle)
                                                         sizeof(struct gsd_index_entry) * buf.size,
                                                         handle->header.index_location);
 
-            if (bytes_written == -1 || bytes_written != sizeof(struct gsd_index_entry) * buf.size)
+            if (bytes_written == -1
+                || (size_t)bytes_written != sizeof(struct gsd_index_entry) * buf.size)
                 {
                 gsd_index_buffer_free(&buf);
                 return GSD_ERROR_IO;
@@ -2528,22 +5396,23 @@ int gsd_upgrade(struct gsd_handle* handle)
             // compact the name list without changing its size or position on the disk
             struct gsd_byte_buffer new_name_buf;
             gsd_util_zero_memory(&new_name_buf, sizeof(struct gsd_byte_buffer));
-            int retval = gsd_byte_buffer_allocate(&new_name_buf, handle->file_names.data.reserved);
+            retval = gsd_byte_buffer_allocate(&new_name_buf, handle->file_names.data.reserved);
             if (retval != GSD_SUCCESS)
                 {
                 return retval;
                 }
 
-            const char* name = gsd_find_matching_chunk_name(handle, "", NULL);
-            while (name != NULL)
+            // keep the names in id order, v1 files store each name in GSD_NAME_SIZE bytes
+            size_t i;
+            for (i = 0; i < handle->file_names.n_names; i++)
                 {
+                const char* name = handle->file_names.data.data + i * GSD_NAME_SIZE;
                 retval = gsd_byte_buffer_append(&new_name_buf, name, strlen(name) + 1);
                 if (retval != GSD_SUCCESS)
                     {
                     gsd_byte_buffer_free(&new_name_buf);
                     return retval;
                     }
-                name = gsd_find_matching_chunk_name(handle, "", name);
                 }
 
             if (new_name_buf.reserved != handle->file_names.data.reserved)
@@ -2558,7 +5427,7 @@ int gsd_upgrade(struct gsd_handle* handle)
                                                         new_name_buf.reserved,
                                                         handle->header.namelist_location);
 
-            if (bytes_written == -1 || bytes_written != new_name_buf.reserved)
+            if (bytes_written == -1 || (size_t)bytes_written != new_name_buf.reserved)
                 {
                 gsd_byte_buffer_free(&new_name_buf);
                 return GSD_ERROR_IO;
@@ -2595,7 +5464,7 @@ int gsd_upgrade(struct gsd_handle* handle)
             }
 
         // sync the updated header
-        int retval = fsync(handle->fd);
+        retval = fsync(handle->fd);
         if (retval != 0)
             {
             return GSD_ERROR_IO;
@@ -2634,6 +5503,8 @@ int gsd_set_maximum_write_buffer_size(struct gsd_handle* handle, uint64_t size)
         return GSD_ERROR_INVALID_ARGUMENT;
         }
 
+    gsd_async_drain(handle);
+
     handle->maximum_write_buffer_size = size;
 
     return GSD_SUCCESS;
@@ -2655,11 +5526,386 @@ int gsd_set_index_entries_to_buffer(struct gsd_handle* handle, uint64_t number)
         return GSD_ERROR_INVALID_ARGUMENT;
         }
 
+    gsd_async_drain(handle);
+
     handle->index_entries_to_buffer = number;
 
     return GSD_SUCCESS;
     }
 
+int gsd_reserve_index(struct gsd_handle* handle, uint64_t n_entries)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    gsd_async_drain(handle);
+    if (handle->open_flags == GSD_OPEN_READONLY)
+        {
+        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        }
+    if (n_entries < handle->header.index_allocated_entries)
+        {
+        return GSD_SUCCESS;
+        }
+
+    // keep one zero entry at the end of the index, as gsd_grow_index_size() does
+    return gsd_expand_file_index(handle, n_entries + 1);
+    }
+
+int gsd_reserve_names(struct gsd_handle* handle, uint64_t n_names)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    gsd_async_drain(handle);
+    if (handle->open_flags == GSD_OPEN_READONLY)
+        {
+        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        }
+
+    size_t new_reserved = n_names * GSD_NAME_SIZE;
+    size_t old_reserved = handle->file_names.data.reserved;
+    if (new_reserved <= old_reserved)
+        {
+        return GSD_SUCCESS;
+        }
+
+    char* old_data = handle->file_names.data.data;
+    // NOLINTNEXTLINE(bugprone-suspicious-realloc-usage): realloc is used correctly
+    handle->file_names.data.data = realloc(old_data, sizeof(char) * new_reserved);
+    if (handle->file_names.data.data == NULL)
+        {
+        handle->file_names.data.data = old_data;
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        }
+    gsd_util_zero_memory(handle->file_names.data.data + old_reserved, new_reserved - old_reserved);
+    handle->file_names.data.reserved = new_reserved;
+
+    int retval = gsd_relocate_name_list(handle);
+    if (retval != GSD_SUCCESS)
+        {
+        return retval;
+        }
+
+    // sync the updated header
+    return gsd_sync(handle);
+    }
+
+uint64_t gsd_get_expected_frames(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return 0;
+        }
+    return handle->expected_frames;
+    }
+
+int gsd_set_expected_frames(struct gsd_handle* handle, uint64_t number)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    gsd_async_drain(handle);
+
+    handle->expected_frames = number;
+
+    return GSD_SUCCESS;
+    }
+
+double gsd_get_index_growth_factor(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return 0;
+        }
+    return handle->index_growth_factor;
+    }
+
+int gsd_set_index_growth_factor(struct gsd_handle* handle, double factor)
+    {
+    if (handle == NULL || !(factor > 1))
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    gsd_async_drain(handle);
+
+    handle->index_growth_factor = factor;
+
+    return GSD_SUCCESS;
+    }
+
+int gsd_get_direct_io(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return 0;
+        }
+    return handle->direct_fd >= 0;
+    }
+
+int gsd_set_direct_io(struct gsd_handle* handle, int enable)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    gsd_async_drain(handle);
+
+    if (!enable)
+        {
+        return gsd_close_direct_fd(handle);
+        }
+
+#if GSD_USE_DIRECT_IO
+    if (handle->direct_fd >= 0)
+        {
+        return GSD_SUCCESS;
+        }
+
+    int flags = O_RDWR;
+    if (handle->open_flags == GSD_OPEN_READONLY)
+        {
+        flags = O_RDONLY;
+        }
+    else if (handle->open_flags == GSD_OPEN_APPEND)
+        {
+        flags = O_WRONLY;
+        }
+
+    // open a second descriptor to the same file
+    char path[64];
+    snprintf(path, sizeof(path), "/proc/self/fd/%d", handle->fd);
+    handle->direct_fd = open(path, flags | O_DIRECT);
+    if (handle->direct_fd < 0)
+        {
+        handle->direct_fd = -1;
+        return GSD_ERROR_IO;
+        }
+
+    return GSD_SUCCESS;
+#else
+    return GSD_ERROR_INVALID_ARGUMENT;
+#endif
+    }
+
+uint64_t gsd_get_preallocate_size(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return 0;
+        }
+    return handle->preallocate_size;
+    }
+
+int gsd_set_preallocate_size(struct gsd_handle* handle, uint64_t size)
+    {
+    if (handle == NULL || size > INT64_MAX)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    gsd_async_drain(handle);
+    if (handle->open_flags == GSD_OPEN_READONLY)
+        {
+        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        }
+
+    handle->preallocate_size = size;
+
+    return GSD_SUCCESS;
+    }
+
+enum gsd_durability gsd_get_durability(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return GSD_DURABILITY_FSYNC;
+        }
+    return handle->durability;
+    }
+
+int gsd_set_durability(struct gsd_handle* handle, enum gsd_durability durability)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    gsd_async_drain(handle);
+    if (durability != GSD_DURABILITY_FSYNC && durability != GSD_DURABILITY_FDATASYNC
+        && durability != GSD_DURABILITY_GROUP && durability != GSD_DURABILITY_NONE)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    handle->durability = durability;
+    handle->frames_since_flush = 0;
+    handle->last_flush_time = gsd_util_monotonic_time();
+
+    return GSD_SUCCESS;
+    }
+
+uint64_t gsd_get_group_commit_frames(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return 0;
+        }
+    return handle->group_commit_frames;
+    }
+
+int gsd_set_group_commit_frames(struct gsd_handle* handle, uint64_t number)
+    {
+    if (handle == NULL || number == 0)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    gsd_async_drain(handle);
+
+    handle->group_commit_frames = number;
+
+    return GSD_SUCCESS;
+    }
+
+double gsd_get_group_commit_interval(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return 0;
+        }
+    return handle->group_commit_interval;
+    }
+
+int gsd_set_group_commit_interval(struct gsd_handle* handle, double interval)
+    {
+    if (handle == NULL || !(interval > 0))
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    gsd_async_drain(handle);
+
+    handle->group_commit_interval = interval;
+
+    return GSD_SUCCESS;
+    }
+
+int gsd_get_async(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return 0;
+        }
+    return handle->async_writer != NULL;
+    }
+
+int gsd_set_async(struct gsd_handle* handle, int enable)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+#if GSD_USE_THREADS
+    struct gsd_async_writer* writer = handle->async_writer;
+
+    if (!enable)
+        {
+        if (writer == NULL)
+            {
+            return GSD_SUCCESS;
+            }
+
+        int retval = gsd_async_wait(handle);
+
+        // stop the writer thread even when a queued write failed
+        pthread_mutex_lock(&writer->mutex);
+        writer->stop = 1;
+        pthread_cond_broadcast(&writer->cond);
+        pthread_mutex_unlock(&writer->mutex);
+        pthread_join(writer->thread, NULL);
+
+        pthread_cond_destroy(&writer->cond);
+        pthread_mutex_destroy(&writer->mutex);
+        gsd_byte_buffer_free(&writer->buffers[0]);
+        gsd_byte_buffer_free(&writer->buffers[1]);
+        free(writer);
+        handle->async_writer = NULL;
+
+        return retval;
+        }
+
+    if (handle->open_flags == GSD_OPEN_READONLY)
+        {
+        return GSD_ERROR_FILE_MUST_BE_WRITABLE;
+        }
+    if (writer != NULL)
+        {
+        return GSD_SUCCESS;
+        }
+
+    writer = calloc(1, sizeof(struct gsd_async_writer));
+    if (writer == NULL)
+        {
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        }
+
+    if (gsd_byte_buffer_allocate(&writer->buffers[0], GSD_INITIAL_ASYNC_BUFFER_SIZE)
+            != GSD_SUCCESS
+        || gsd_byte_buffer_allocate(&writer->buffers[1], GSD_INITIAL_ASYNC_BUFFER_SIZE)
+               != GSD_SUCCESS)
+        {
+        gsd_byte_buffer_free(&writer->buffers[0]);
+        gsd_byte_buffer_free(&writer->buffers[1]);
+        free(writer);
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        }
+
+    pthread_mutex_init(&writer->mutex, NULL);
+    pthread_cond_init(&writer->cond, NULL);
+    writer->n_frames = handle->cur_frame;
+    handle->async_writer = writer;
+
+    if (pthread_create(&writer->thread, NULL, gsd_async_writer_main, handle) != 0)
+        {
+        handle->async_writer = NULL;
+        pthread_cond_destroy(&writer->cond);
+        pthread_mutex_destroy(&writer->mutex);
+        gsd_byte_buffer_free(&writer->buffers[0]);
+        gsd_byte_buffer_free(&writer->buffers[1]);
+        free(writer);
+        return GSD_ERROR_MEMORY_ALLOCATION_FAILED;
+        }
+
+    return GSD_SUCCESS;
+#else
+    if (!enable)
+        {
+        return GSD_SUCCESS;
+        }
+    return GSD_ERROR_INVALID_ARGUMENT;
+#endif
+    }
+
+int gsd_wait(struct gsd_handle* handle)
+    {
+    if (handle == NULL)
+        {
+        return GSD_ERROR_INVALID_ARGUMENT;
+        }
+
+    return gsd_async_wait(handle);
+    }
+
 // undefine windows wrapper macros
 #ifdef _WIN32
 #undef lseek
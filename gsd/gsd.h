@@ -105,6 +105,40 @@ extern "C"
         GSD_ERROR_FILE_MUST_BE_READABLE = -9,
         };
 
+    /// Index entry flags
+    enum gsd_flag
+        {
+        /** The chunk is compressed. The data at the chunk's location begins with a
+            gsd_codec_header followed by the compressed bytes.
+        */
+        GSD_FLAG_COMPRESSED = 1
+        };
+
+    /// Identifiers for the chunk compression codecs
+    enum gsd_codec
+        {
+        /// Byte shuffle followed by LZ77 compression.
+        GSD_CODEC_SHUFFLE_LZ = 1
+        };
+
+    /// Policies that control when gsd_flush() syncs data to the storage device
+    enum gsd_durability
+        {
+        /// Call fsync() before writing the index and after updating the header (default).
+        GSD_DURABILITY_FSYNC = 0,
+
+        /// Call fdatasync() in place of fsync().
+        GSD_DURABILITY_FDATASYNC,
+
+        /** Flush and fsync() in gsd_end_frame() only after a number of frames or an interval of
+            time.
+        */
+        GSD_DURABILITY_GROUP,
+
+        /// Never sync. The operating system writes the data to the device at its discretion.
+        GSD_DURABILITY_NONE
+        };
+
     enum
         {
         /** v1 file: Size of a GSD name in memory. v2 file: The name buffer size is a multiple of
@@ -185,37 +219,24 @@ extern "C"
         /// Data type of the chunk: one of gsd_type.
         uint8_t type;
 
-        /// Flags (for internal use).
+        /// Flags: a combination of gsd_flag values.
         uint8_t flags;
         };
 
-    /** Name/id mapping
+    /** Codec header
 
-        A string name paired with an ID. Used for storing sorted name/id mappings in a hash map.
+        The on-disk header that precedes the data of a compressed chunk.
     */
-    struct gsd_name_id_pair
+    struct gsd_codec_header
         {
-        /// Pointer to name (actual name storage is allocated in gsd_handle)
-        char* name;
-
-        /// Next name/id pair with the same hash
-        struct gsd_name_id_pair* next;
+        /// Number of compressed bytes that follow the header.
+        uint64_t compressed_size;
 
-        /// Entry id
-        uint16_t id;
-        };
-
-    /** Name/id hash map
-
-        A hash map of string names to integer identifiers.
-    */
-    struct gsd_name_id_map
-        {
-        /// Name/id mappings
-        struct gsd_name_id_pair* v;
+        /// Codec used to compress the data: one of gsd_codec.
+        uint32_t codec;
 
-        /// Number of entries in the mapping
-        size_t size;
+        /// Reserved for future use.
+        uint32_t reserved;
         };
 
     /** Array of index entries
@@ -257,6 +278,63 @@ extern "C"
         size_t reserved;
         };
 
+    /** Name/id mapping
+
+        A name paired with an ID. Used for storing name/id mappings in a hash map.
+    */
+    struct gsd_name_id_pair
+        {
+        /// Offset of the name in gsd_name_id_map::names
+        size_t name;
+
+        /// Hash of the name
+        uint32_t hash;
+
+        /// Entry id
+        uint16_t id;
+        };
+
+    /** Name/id hash map
+
+        An open addressing hash map of string names to integer identifiers. The map stores a copy of
+        each name.
+    */
+    struct gsd_name_id_map
+        {
+        /// Hash table of positions in *v*, UINT16_MAX marks empty slots.
+        uint16_t* slots;
+
+        /// Number of slots in the hash table (a power of 2).
+        size_t size;
+
+        /// Name/id mappings in the order inserted
+        struct gsd_name_id_pair* v;
+
+        /// Number of mappings
+        size_t n_pairs;
+
+        /// Number of mappings available in *v*
+        size_t reserved;
+
+        /// Null terminated names of the mappings
+        struct gsd_byte_buffer names;
+
+        /// Positions in *v* sorted by name
+        uint16_t* sorted;
+
+        /// Number of mappings in *sorted*, the rest are sorted on the next query
+        size_t n_sorted;
+
+        /// Positions in *v* of the names found by the last gsd_find_matching_chunk_name() query
+        uint16_t* matches;
+
+        /// Number of positions in *matches*
+        size_t n_matches;
+
+        /// Position in *matches* of the name last returned by gsd_find_matching_chunk_name()
+        size_t cursor;
+        };
+
     /** Name buffer
 
         Holds a list of string names in order separated by NULL terminators. In v1 files, each name
@@ -271,6 +349,87 @@ extern "C"
         size_t n_names;
         };
 
+    /** Frame directory
+
+        Holds the position of the first index entry of each frame in the file index. The entries of
+        frame *i* are `file_index.data[data[i]:data[i+1]]`.
+    */
+    struct gsd_frame_directory
+        {
+        /// Position of the first index entry of each frame
+        uint64_t* data;
+
+        /// Number of positions in the directory
+        size_t size;
+
+        /// Number of positions available in the directory
+        size_t reserved;
+        };
+
+    /** Chunk directory
+
+        Holds the positions of the index entries of each chunk name in the file index, sorted by
+        frame. The entries of the name with id *i* are `file_index.data[entries[k]]` for *k* in
+        `offsets[i]:offsets[i+1]`.
+    */
+    struct gsd_chunk_directory
+        {
+        /// Position in *entries* of the first index entry of each name id
+        uint64_t* offsets;
+
+        /// Number of name ids in the directory
+        size_t n_ids;
+
+        /// Positions of the index entries in the file index, grouped by name id
+        uint64_t* entries;
+
+        /// Number of index entries in the directory
+        size_t size;
+        };
+
+    /** Write segment
+
+        A run of bytes in the write buffer. Borrowed segments point to memory owned by the caller of
+        gsd_write_chunk_borrowed().
+    */
+    struct gsd_write_segment
+        {
+        /// Borrowed data, or NULL when the segment is in gsd_handle::write_buffer.
+        const char* data;
+
+        /// Offset of the segment in gsd_handle::write_buffer (when *data* is NULL).
+        size_t offset;
+
+        /// Number of bytes in the segment.
+        size_t size;
+        };
+
+    /** Write segment list
+
+        Orders the borrowed and copied chunks in the write buffer. The list is empty when the write
+        buffer holds no borrowed chunks.
+    */
+    struct gsd_write_segment_list
+        {
+        /// Segments in file order
+        struct gsd_write_segment* data;
+
+        /// Number of segments in the list
+        size_t size;
+
+        /// Number of segments available in the list
+        size_t reserved;
+
+        /// Number of bytes of gsd_handle::write_buffer referenced by the segments
+        size_t copied;
+
+        /// Total number of borrowed bytes
+        size_t borrowed;
+        };
+
+    /// Opaque state of the background writer thread.
+    struct gsd_async_writer;
+
     /** File handle
 
         A handle to an open GSD file.
@@ -326,6 +485,55 @@ extern "C"
 
         /// Number of index entries to buffer before flushing.
         uint64_t index_entries_to_buffer;
+
+        /// Scratch space used to compress chunks.
+        struct gsd_byte_buffer codec_buffer;
+
+        /// Location of each frame in the file index, extended as frames are accessed.
+        struct gsd_frame_directory frame_directory;
+
+        /// When to sync data to the storage device.
+        enum gsd_durability durability;
+
+        /// Number of frames to end between syncs with GSD_DURABILITY_GROUP.
+        uint64_t group_commit_frames;
+
+        /// Time (in seconds) between syncs with GSD_DURABILITY_GROUP.
+        double group_commit_interval;
+
+        /// Number of frames ended since the last flush with GSD_DURABILITY_GROUP.
+        uint64_t frames_since_flush;
+
+        /// Monotonic clock time (in seconds) of the last flush with GSD_DURABILITY_GROUP.
+        double last_flush_time;
+
+        /// Expected number of frames in the file, used to size the index when it grows.
+        uint64_t expected_frames;
+
+        /// Factor to multiply the index size by when it grows.
+        double index_growth_factor;
+
+        /// Size of the extents (in bytes) to preallocate file space in, 0 to disable.
+        uint64_t preallocate_size;
+
+        /// End of the preallocated file space (in bytes).
+        int64_t allocated_size;
+
+        /// File descriptor opened with O_DIRECT for large chunks, -1 when direct I/O is disabled.
+        int direct_fd;
+
+        /// State of the background writer thread, NULL when async writes are disabled.
+        struct gsd_async_writer* async_writer;
+
+        /// Borrowed and copied chunks in the write buffer.
+        struct gsd_write_segment_list write_segments;
+
+        /// Number of entries in frame_index for chunks written from the write buffer at the end of
+        /// a frame with borrowed chunks.
+        uint64_t flushed_buffer_index_entries;
+
+        /// Index entries of each chunk name, built when first needed.
+        struct gsd_chunk_directory chunk_directory;
         };
 
     /** Specify a version.
@@ -499,7 +707,7 @@ extern "C"
         @param type type ID that identifies the type of data in *data*.
         @param N Number of rows in the data.
         @param M Number of columns in the data.
-        @param flags set to 0, non-zero values reserved for future use.
+        @param flags 0 or GSD_FLAG_COMPRESSED.
         @param data Data buffer.
 
         @pre *handle* was opened by gsd_open().
@@ -515,11 +723,16 @@ extern "C"
 
         @note *N* == 0 is allowed. When *N* is 0, *data* may be NULL.
 
+        @note When *flags* is GSD_FLAG_COMPRESSED, gsd_write_chunk() shuffles the bytes of the
+        elements and compresses the result with GSD_CODEC_SHUFFLE_LZ. The chunk is stored
+        uncompressed when compression does not reduce its size or the file version is older than
+        2.2. gsd_read_chunk() decompresses chunks transparently.
+
         @return
           - GSD_SUCCESS (0) on success. Negative value on failure:
           - GSD_ERROR_IO: IO error (check errno).
           - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL, *N* == 0, *M* == 0, *type* is invalid, or
-            *flags* != 0.
+            *flags* is not 0 or GSD_FLAG_COMPRESSED.
           - GSD_ERROR_FILE_MUST_BE_WRITABLE: The file was opened read-only.
           - GSD_ERROR_NAMELIST_FULL: The file cannot store any additional unique chunk names.
           - GSD_ERROR_MEMORY_ALLOCATION_FAILED: failed to allocate memory.
@@ -532,6 +745,37 @@ extern "C"
                         uint8_t flags,
                         const void* data);
 
+    /** Add a data chunk to the current frame without copying it.
+
+        @param handle Handle to an open GSD file.
+        @param name Name of the data chunk.
+        @param type type ID that identifies the type of data in *data*.
+        @param N Number of rows in the data.
+        @param M Number of columns in the data.
+        @param flags 0 or GSD_FLAG_COMPRESSED.
+        @param data Data buffer.
+
+        @pre *handle* was opened by gsd_open().
+        @pre *name* is a unique name for data chunks in the given frame.
+        @pre data is allocated and contains at least `N * M * gsd_sizeof_type(type)` bytes.
+        @pre *data* remains valid and unchanged until the next call to gsd_end_frame(),
+             gsd_flush(), gsd_truncate(), or gsd_close() returns.
+
+        Behaves like gsd_write_chunk(), except that chunks smaller than the maximum write buffer
+        size are referenced instead of copied into the write buffer. gsd_end_frame() writes the
+        buffered chunks with one vectored write. Compressed chunks and chunks written with async
+        writes enabled are copied.
+
+        @return See gsd_write_chunk().
+    */
+    int gsd_write_chunk_borrowed(struct gsd_handle* handle,
+                                 const char* name,
+                                 enum gsd_type type,
+                                 uint64_t N,
+                                 uint32_t M,
+                                 uint8_t flags,
+                                 const void* data);
+
     /** Find a chunk in the GSD file.
 
         @param handle Handle to an open GSD file
@@ -550,6 +794,56 @@ extern "C"
     const struct gsd_index_entry*
     gsd_find_chunk(struct gsd_handle* handle, uint64_t frame, const char* name);
 
+    /** Find the ids of several chunk names.
+
+        @param handle Handle to an open GSD file.
+        @param names Chunk names to find.
+        @param n Number of names.
+        @param ids [out] Id of each name, or UINT16_MAX for names that are not in the file (*n*
+        elements).
+
+        The id of a name does not change until the file is truncated, so callers that read the same
+        chunks from many frames can find the ids once and pass them to gsd_find_frame_chunks().
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL, or *names* or *ids* is NULL and *n* > 0.
+    */
+    int gsd_find_chunk_ids(struct gsd_handle* handle,
+                           const char* const* names,
+                           size_t n,
+                           uint16_t* ids);
+
+    /** Find several chunks in a frame by id.
+
+        @param handle Handle to an open GSD file.
+        @param frame Frame to search.
+        @param ids Ids of the chunks from gsd_find_chunk_ids().
+        @param n Number of ids.
+        @param chunks [out] Index entry of each chunk, or NULL when the frame does not have it (*n*
+        elements).
+
+        @pre *handle* was opened in read or readwrite mode.
+
+        gsd_find_frame_chunks() searches the index entries of *frame* for each id without hashing
+        the chunk names. *chunks* is all NULL when *frame* is not less than the number of frames in
+        the file.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL, or *ids* or *chunks* is NULL and *n* > 0.
+          - GSD_ERROR_FILE_MUST_BE_READABLE: The file was opened in append mode.
+          - GSD_ERROR_IO: IO error (check errno).
+          - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory.
+
+        @note gsd_find_frame_chunks() calls gsd_flush() when the file is writable.
+    */
+    int gsd_find_frame_chunks(struct gsd_handle* handle,
+                              uint64_t frame,
+                              const uint16_t* ids,
+                              size_t n,
+                              const struct gsd_index_entry** chunks);
+
     /** Read a chunk from the GSD file.
 
         @param handle Handle to an open GSD file.
@@ -567,11 +861,171 @@ extern "C"
           - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL, *data* is NULL, or *chunk* is NULL.
           - GSD_ERROR_FILE_MUST_BE_READABLE: The file was opened in append mode.
           - GSD_ERROR_FILE_CORRUPT: The GSD file is corrupt.
+          - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory to decompress the chunk.
 
         @note gsd_read_chunk() calls gsd_flush() when the file is writable.
+        @note gsd_read_chunk() decompresses chunks stored with GSD_FLAG_COMPRESSED.
     */
     int gsd_read_chunk(struct gsd_handle* handle, void* data, const struct gsd_index_entry* chunk);
 
+    /** Plan a read of several chunks with gsd_read_frame().
+
+        @param handle Handle to an open GSD file.
+        @param chunks Chunks to read.
+        @param n Number of chunks.
+        @param offsets [out] Location of each chunk's data in the gsd_read_frame() buffer (*n*
+        elements).
+        @param size [out] Number of bytes needed in the gsd_read_frame() buffer.
+
+        @pre *chunks* were found by gsd_find_chunk().
+
+        gsd_plan_frame_read() places chunks that are close together in the file in runs. Each run
+        is read with a single call. The alignment of a run in the buffer matches the alignment of
+        its first chunk in the file modulo 8 bytes. The data of a chunk in a run is aligned when
+        it is aligned in the file relative to the start of the run.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL, *size* is NULL, or *chunks* or *offsets*
+            is NULL and *n* > 0.
+          - GSD_ERROR_FILE_CORRUPT: The GSD file is corrupt.
+          - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory.
+    */
+    int gsd_plan_frame_read(struct gsd_handle* handle,
+                            const struct gsd_index_entry* const* chunks,
+                            size_t n,
+                            uint64_t* offsets,
+                            uint64_t* size);
+
+    /** Read several chunks from the GSD file into one buffer.
+
+        @param handle Handle to an open GSD file.
+        @param data Buffer to read into.
+        @param chunks Chunks to read.
+        @param n Number of chunks.
+        @param offsets Location of each chunk's data in *data* from gsd_plan_frame_read().
+
+        @pre *handle* was opened in read or readwrite mode.
+        @pre *chunks* were found by gsd_find_chunk().
+        @pre *offsets* and the size of *data* were computed by gsd_plan_frame_read() with the same
+        *chunks*.
+
+        @post The data of chunk *i* is present at `data + offsets[i]`. Bytes between chunks in
+        *data* are undefined.
+
+        gsd_read_frame() reads each run of chunks with one call and decompresses compressed chunks
+        individually.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_IO: IO error (check errno).
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL, or *data*, *chunks*, or *offsets* is NULL
+            and *n* > 0.
+          - GSD_ERROR_FILE_MUST_BE_READABLE: The file was opened in append mode.
+          - GSD_ERROR_FILE_CORRUPT: The GSD file is corrupt.
+          - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory.
+
+        @note gsd_read_frame() calls gsd_flush() when the file is writable.
+    */
+    int gsd_read_frame(struct gsd_handle* handle,
+                       void* data,
+                       const struct gsd_index_entry* const* chunks,
+                       size_t n,
+                       const uint64_t* offsets);
+
+    /** Find the chunks with the same name in several frames.
+
+        @param handle Handle to an open GSD file.
+        @param name Name of the chunk to find.
+        @param frames Frames to search.
+        @param n Number of frames.
+        @param chunks [out] Index entry of the chunk in each frame (*n* elements).
+
+        @pre *handle* was opened in read or readwrite mode.
+
+        gsd_find_chunk_series() looks up *name* once and sets `chunks[i]` to the index entry of the
+        chunk in frame `frames[i]`, or NULL when that frame does not have the chunk or `frames[i]`
+        is not less than the number of frames in the file.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* or *name* is NULL, or *frames* or *chunks* is NULL
+            and *n* > 0.
+          - GSD_ERROR_FILE_MUST_BE_READABLE: The file was opened in append mode.
+          - GSD_ERROR_IO: IO error (check errno).
+          - GSD_ERROR_FILE_CORRUPT: The GSD file is corrupt.
+          - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory.
+
+        @note gsd_find_chunk_series() calls gsd_flush() when the file is writable.
+    */
+    int gsd_find_chunk_series(struct gsd_handle* handle,
+                              const char* name,
+                              const uint64_t* frames,
+                              size_t n,
+                              const struct gsd_index_entry** chunks);
+
+    /** Read the same chunk from several frames into one array.
+
+        @param handle Handle to an open GSD file.
+        @param data Buffer to read into.
+        @param chunks Chunks to read, NULL for frames without the chunk.
+        @param n Number of chunks.
+
+        @pre *handle* was opened in read or readwrite mode.
+        @pre *chunks* were found by gsd_find_chunk_series().
+        @pre *data* is at least `n * N * M * gsd_sizeof_type(type)` bytes.
+
+        @post The data of chunk *i* is present at `data + i * N * M * gsd_sizeof_type(type)`. The
+        bytes for NULL chunks are left unchanged.
+
+        gsd_read_chunk_series() reads uncompressed chunks that are stored in increasing order close
+        together in the file with one call.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_IO: IO error (check errno).
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL, *data* or *chunks* is NULL and *n* > 0, or
+            the chunks differ in *N*, *M*, or *type*.
+          - GSD_ERROR_FILE_MUST_BE_READABLE: The file was opened in append mode.
+          - GSD_ERROR_FILE_CORRUPT: The GSD file is corrupt.
+          - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory.
+
+        @note gsd_read_chunk_series() calls gsd_flush() when the file is writable.
+    */
+    int gsd_read_chunk_series(struct gsd_handle* handle,
+                              void* data,
+                              const struct gsd_index_entry* const* chunks,
+                              size_t n);
+
+    /** Find the index entries of a chunk in all frames.
+
+        @param handle Handle to an open GSD file.
+        @param name Name of the chunk to find.
+        @param entries [out] Positions of the chunk's index entries in `handle->file_index.data`,
+        sorted by frame.
+        @param n [out] Number of positions in *entries*.
+
+        @pre *handle* was opened in read or readwrite mode.
+
+        gsd_find_chunk_entries() builds a directory of the index entries of each chunk name when
+        first called and after the file index changes. Each following call takes O(1) time. The
+        positions remain valid until the next call that writes to or truncates the file. *n* is 0
+        when no frame has the chunk.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle*, *name*, *entries*, or *n* is NULL.
+          - GSD_ERROR_FILE_MUST_BE_READABLE: The file was opened in append mode.
+          - GSD_ERROR_IO: IO error (check errno).
+          - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory.
+
+        @note gsd_find_chunk_entries() calls gsd_flush() when the file is writable.
+    */
+    int gsd_find_chunk_entries(struct gsd_handle* handle,
+                               const char* name,
+                               const uint64_t** entries,
+                               size_t* n);
+
     /** Get the number of frames in the GSD file.
 
         @param handle Handle to an open GSD file
@@ -603,10 +1057,17 @@ extern "C"
         to find the next after that, and so on. Chunk names match if they begin with the string in
         *match*. Chunk names returned by this function may be present in at least one frame.
 
+        gsd_find_matching_chunk_name() returns the matching names in the order they were added to
+        the file. The handle keeps an index of the chunk names in sorted order, so finding the first
+        match takes O(log N + M log M) time for *M* matches among *N* names and each following
+        match takes O(1) time.
+
         @return Pointer to a string, NULL if no more matching chunks are found found, or NULL if
         *prev* is invalid
 
         @note  gsd_find_matching_chunk_name() calls gsd_flush() when the file is writable.
+
+        @note The returned string remains valid until the next chunk name is added to the file.
     */
     const char*
     gsd_find_matching_chunk_name(struct gsd_handle* handle, const char* match, const char* prev);
@@ -679,6 +1140,301 @@ extern "C"
     */
     int gsd_set_index_entries_to_buffer(struct gsd_handle* handle, uint64_t number);
 
+    /** Reserve space for index entries.
+
+        @param handle Handle to an open GSD file
+        @param n_entries Number of index entries the file should hold without growing the index.
+
+        @pre *handle* was opened by gsd_open() in a writable mode.
+
+        Growing the index copies it to the end of the file and leaves the old index in place as
+        unused space. Reserve the index after creating a file to avoid this when the number of
+        entries is known in advance.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_IO: IO error (check errno).
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+          - GSD_ERROR_FILE_MUST_BE_WRITABLE: The file was opened in read-only mode.
+          - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory.
+    */
+    int gsd_reserve_index(struct gsd_handle* handle, uint64_t n_entries);
+
+    /** Reserve space for chunk names.
+
+        @param handle Handle to an open GSD file
+        @param n_names Number of names the file should hold without growing the name list.
+
+        @pre *handle* was opened by gsd_open() in a writable mode.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_IO: IO error (check errno).
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+          - GSD_ERROR_FILE_MUST_BE_WRITABLE: The file was opened in read-only mode.
+          - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory.
+    */
+    int gsd_reserve_names(struct gsd_handle* handle, uint64_t n_names);
+
+    /** Get the expected number of frames.
+
+        @param handle Handle to an open GSD file
+
+        @pre *handle* was opened by gsd_open().
+
+        @return The expected number of frames, or 0 when not set.
+    */
+    uint64_t gsd_get_expected_frames(struct gsd_handle* handle);
+
+    /** Set the expected number of frames.
+
+        @param handle Handle to an open GSD file
+        @param number Expected number of frames in the file (0 to unset).
+
+        @pre *handle* was opened by gsd_open().
+
+        When the index grows, it grows to hold *number* frames with the average number of index
+        entries per frame written so far.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+    */
+    int gsd_set_expected_frames(struct gsd_handle* handle, uint64_t number);
+
+    /** Get the index growth factor.
+
+        @param handle Handle to an open GSD file
+
+        @pre *handle* was opened by gsd_open().
+
+        @return The index growth factor, or 0 on error.
+    */
+    double gsd_get_index_growth_factor(struct gsd_handle* handle);
+
+    /** Set the index growth factor.
+
+        @param handle Handle to an open GSD file
+        @param factor Multiply the index size by this factor each time it grows (must be greater
+        than 1).
+
+        @pre *handle* was opened by gsd_open().
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+          - GSD_ERROR_INVALID_ARGUMENT: factor <= 1
+    */
+    int gsd_set_index_growth_factor(struct gsd_handle* handle, double factor);
+
+    /** Get whether direct I/O is enabled.
+
+        @param handle Handle to an open GSD file
+
+        @pre *handle* was opened by gsd_open().
+
+        @return 1 when direct I/O is enabled, 0 otherwise.
+    */
+    int gsd_get_direct_io(struct gsd_handle* handle);
+
+    /** Enable or disable direct I/O.
+
+        @param handle Handle to an open GSD file
+        @param enable 1 to enable direct I/O, 0 to disable it.
+
+        @pre *handle* was opened by gsd_open().
+
+        When enabled, gsd_write_chunk() writes chunks that are too large for the write buffer
+        through a second file descriptor opened with `O_DIRECT`, bypassing the page cache. These
+        chunks start at locations aligned to 4 KiB. gsd_read_chunk() reads uncompressed chunks that
+        are at least as large as the maximum write buffer size and start at aligned locations the
+        same way. Transfers from memory that is not aligned to 4 KiB pass through an aligned bounce
+        buffer. The index, name list, header, and small chunks remain buffered.
+
+        Direct I/O is available on Linux.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_IO: The file system does not support direct I/O (check errno).
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+          - GSD_ERROR_INVALID_ARGUMENT: Direct I/O is not available on this platform.
+    */
+    int gsd_set_direct_io(struct gsd_handle* handle, int enable);
+
+    /** Get the preallocation extent size.
+
+        @param handle Handle to an open GSD file
+
+        @pre *handle* was opened by gsd_open().
+
+        @return The preallocation extent size in bytes, or 0 when preallocation is disabled.
+    */
+    uint64_t gsd_get_preallocate_size(struct gsd_handle* handle);
+
+    /** Set the preallocation extent size.
+
+        @param handle Handle to an open GSD file
+        @param size Size of the extents (in bytes) to preallocate file space in, 0 to disable.
+
+        @pre *handle* was opened by gsd_open() in a writable mode.
+
+        When the size is non-zero, writes that extend the file first reserve space up to the next
+        multiple of *size* bytes with `fallocate` (without changing the file size). Reserving space
+        in large extents reduces file fragmentation. gsd_close() releases the unused space past the
+        end of the file. Preallocation is available on Linux. On other platforms, and on file
+        systems that do not support preallocation, the size has no effect.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+          - GSD_ERROR_INVALID_ARGUMENT: *size* is larger than INT64_MAX
+          - GSD_ERROR_FILE_MUST_BE_WRITABLE: The file was opened in read-only mode.
+    */
+    int gsd_set_preallocate_size(struct gsd_handle* handle, uint64_t size);
+
+    /** Get the durability policy.
+
+        @param handle Handle to an open GSD file
+
+        @pre *handle* was opened by gsd_open().
+
+        @return The durability policy.
+    */
+    enum gsd_durability gsd_get_durability(struct gsd_handle* handle);
+
+    /** Set the durability policy.
+
+        @param handle Handle to an open GSD file
+        @param durability When to sync data to the storage device.
+
+        @pre *handle* was opened by gsd_open().
+
+        Every policy writes the data of a frame before the index entries that refer to it.
+        GSD_DURABILITY_FSYNC and GSD_DURABILITY_FDATASYNC sync the data before writing the index in
+        every gsd_flush(), so a system crash loses at most the frames written since the last flush.
+
+        GSD_DURABILITY_GROUP also syncs in every gsd_flush(), but gsd_end_frame() flushes only
+        after ending group_commit_frames frames or after group_commit_interval seconds have passed
+        since the last flush (whichever comes first). A system crash may lose the frames written
+        since the last flush.
+
+        GSD_DURABILITY_NONE never syncs. The file remains valid when the application exits
+        unexpectedly, but a system crash may leave index entries that refer to data that was never
+        written to the device.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+          - GSD_ERROR_INVALID_ARGUMENT: *durability* is not a valid policy
+    */
+    int gsd_set_durability(struct gsd_handle* handle, enum gsd_durability durability);
+
+    /** Get the number of frames between flushes with GSD_DURABILITY_GROUP.
+
+        @param handle Handle to an open GSD file
+
+        @pre *handle* was opened by gsd_open().
+
+        @return The number of frames, or 0 on error.
+    */
+    uint64_t gsd_get_group_commit_frames(struct gsd_handle* handle);
+
+    /** Set the number of frames between flushes with GSD_DURABILITY_GROUP.
+
+        @param handle Handle to an open GSD file
+        @param number Number of frames to end before flushing (must be greater than 0).
+
+        @pre *handle* was opened by gsd_open().
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+          - GSD_ERROR_INVALID_ARGUMENT: number == 0
+    */
+    int gsd_set_group_commit_frames(struct gsd_handle* handle, uint64_t number);
+
+    /** Get the time between flushes with GSD_DURABILITY_GROUP.
+
+        @param handle Handle to an open GSD file
+
+        @pre *handle* was opened by gsd_open().
+
+        @return The interval in seconds, or 0 on error.
+    */
+    double gsd_get_group_commit_interval(struct gsd_handle* handle);
+
+    /** Set the time between flushes with GSD_DURABILITY_GROUP.
+
+        @param handle Handle to an open GSD file
+        @param interval Time in seconds after the last flush when gsd_end_frame() flushes (must be
+        greater than 0).
+
+        @pre *handle* was opened by gsd_open().
+
+        @note gsd_end_frame() measures time with a resolution of one second.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+          - GSD_ERROR_INVALID_ARGUMENT: interval <= 0
+    */
+    int gsd_set_group_commit_interval(struct gsd_handle* handle, double interval);
+
+    /** Get whether async writes are enabled.
+
+        @param handle Handle to an open GSD file
+
+        @pre *handle* was opened by gsd_open().
+
+        @return 1 when async writes are enabled, 0 otherwise.
+    */
+    int gsd_get_async(struct gsd_handle* handle);
+
+    /** Enable or disable async writes.
+
+        @param handle Handle to an open GSD file
+        @param enable 1 to enable async writes, 0 to disable them.
+
+        @pre *handle* was opened by gsd_open() in GSD_OPEN_READWRITE or GSD_OPEN_APPEND mode.
+
+        When enabled, gsd_write_chunk() copies the chunk into a queue and returns immediately.
+        gsd_end_frame() hands the queued chunks to a background thread, which writes them, commits
+        the index, and syncs the file while the caller prepares the next frame. gsd_end_frame()
+        blocks only when the background thread is still writing the previous frame.
+
+        Functions that read from the file or change its settings wait for the background thread to
+        write all queued chunks first. Errors from the background thread are returned by the next
+        call to gsd_end_frame(), gsd_flush(), gsd_wait(), or gsd_close().
+
+        Disabling async writes waits for the background thread to finish and stops it. Async
+        writes are available on all platforms except Windows.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+          - GSD_ERROR_INVALID_ARGUMENT: Async writes are not available on this platform.
+          - GSD_ERROR_FILE_MUST_BE_WRITABLE: The file was opened read-only.
+          - GSD_ERROR_MEMORY_ALLOCATION_FAILED: Unable to allocate memory or start the thread.
+          - Any error from a queued write when disabling async writes.
+    */
+    int gsd_set_async(struct gsd_handle* handle, int enable);
+
+    /** Wait for queued writes to complete.
+
+        @param handle Handle to an open GSD file
+
+        @pre *handle* was opened by gsd_open().
+
+        Blocks until the background thread has written all chunks queued by gsd_write_chunk() and
+        gsd_end_frame(). Does nothing when async writes are disabled.
+
+        @return
+          - GSD_SUCCESS (0) on success. Negative value on failure:
+          - GSD_ERROR_INVALID_ARGUMENT: *handle* is NULL
+          - Any error the background thread encountered since the last check.
+    */
+    int gsd_wait(struct gsd_handle* handle);
+
 #ifdef __cplusplus
     }
 #endif
@@ -24,7 +24,9 @@ import copy
 import json
 import logging
 import warnings
-from collections import OrderedDict
+import weakref
+from collections import OrderedDict, namedtuple
+from collections.abc import MutableMapping
 
 import numpy
 
@@ -42,6 +44,73 @@ except ImportError:
 logger = logging.getLogger('gsd.hoomd')
 
 
+class _LazyFields:
+    """Read the fields of a container when they are first accessed.
+
+    `HOOMDTrajectory` stores a function that reads each pending field in
+    ``_loaders``.
+    """
+
+    def __getattr__(self, name):
+        loaders = self.__dict__.get('_loaders')
+        if loaders is None or name not in loaders:
+            raise AttributeError(
+                "'" + type(self).__name__ + "' object has no attribute '" + name + "'"
+            )
+
+        value = loaders.pop(name)()
+        self.__dict__[name] = value
+        return value
+
+
+class _LazyDict(MutableMapping):
+    """Dictionary that reads values when they are first accessed."""
+
+    def __init__(self):
+        self._data = {}
+        self._loaders = set()
+
+    def set_loader(self, key, loader):
+        """Set a function that reads the value of a key."""
+        self._data[key] = loader
+        self._loaders.add(key)
+
+    def __getitem__(self, key):
+        if key in self._loaders:
+            self._data[key] = self._data[key]()
+            self._loaders.discard(key)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._loaders.discard(key)
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        self._loaders.discard(key)
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def _contiguous_array(value, dtype, shape):
+    """Convert a value to a contiguous array of the given type and shape.
+
+    Return *value* itself when it is already such an array so that callers
+    can recognize arrays they have seen before.
+    """
+    array = numpy.ascontiguousarray(value, dtype=dtype)
+    if array.shape != tuple(shape):
+        array = array.reshape(shape)
+    return array
+
+
 class ConfigurationData:
     """Store configuration data.
 
@@ -103,11 +172,10 @@ class ConfigurationData:
         logger.debug('Validating ConfigurationData')
 
         if self.box is not None:
-            self.box = numpy.ascontiguousarray(self.box, dtype=numpy.float32)
-            self.box = self.box.reshape([6])
+            self.box = _contiguous_array(self.box, numpy.float32, [6])
 
 
-class ParticleData:
+class ParticleData(_LazyFields):
     """Store particle data chunks.
 
     Use the `Frame.particles` attribute of a to access the particles.
@@ -210,49 +278,38 @@ class ParticleData:
         logger.debug('Validating ParticleData')
 
         if self.position is not None:
-            self.position = numpy.ascontiguousarray(self.position, dtype=numpy.float32)
-            self.position = self.position.reshape([self.N, 3])
+            self.position = _contiguous_array(self.position, numpy.float32, [self.N, 3])
         if self.orientation is not None:
-            self.orientation = numpy.ascontiguousarray(
-                self.orientation, dtype=numpy.float32
+            self.orientation = _contiguous_array(
+                self.orientation, numpy.float32, [self.N, 4]
             )
-            self.orientation = self.orientation.reshape([self.N, 4])
         if self.typeid is not None:
-            self.typeid = numpy.ascontiguousarray(self.typeid, dtype=numpy.uint32)
-            self.typeid = self.typeid.reshape([self.N])
+            self.typeid = _contiguous_array(self.typeid, numpy.uint32, [self.N])
         if self.mass is not None:
-            self.mass = numpy.ascontiguousarray(self.mass, dtype=numpy.float32)
-            self.mass = self.mass.reshape([self.N])
+            self.mass = _contiguous_array(self.mass, numpy.float32, [self.N])
         if self.charge is not None:
-            self.charge = numpy.ascontiguousarray(self.charge, dtype=numpy.float32)
-            self.charge = self.charge.reshape([self.N])
+            self.charge = _contiguous_array(self.charge, numpy.float32, [self.N])
         if self.diameter is not None:
-            self.diameter = numpy.ascontiguousarray(self.diameter, dtype=numpy.float32)
-            self.diameter = self.diameter.reshape([self.N])
+            self.diameter = _contiguous_array(self.diameter, numpy.float32, [self.N])
         if self.body is not None:
-            self.body = numpy.ascontiguousarray(self.body, dtype=numpy.int32)
-            self.body = self.body.reshape([self.N])
+            self.body = _contiguous_array(self.body, numpy.int32, [self.N])
         if self.moment_inertia is not None:
-            self.moment_inertia = numpy.ascontiguousarray(
-                self.moment_inertia, dtype=numpy.float32
+            self.moment_inertia = _contiguous_array(
+                self.moment_inertia, numpy.float32, [self.N, 3]
             )
-            self.moment_inertia = self.moment_inertia.reshape([self.N, 3])
         if self.velocity is not None:
-            self.velocity = numpy.ascontiguousarray(self.velocity, dtype=numpy.float32)
-            self.velocity = self.velocity.reshape([self.N, 3])
+            self.velocity = _contiguous_array(self.velocity, numpy.float32, [self.N, 3])
         if self.angmom is not None:
-            self.angmom = numpy.ascontiguousarray(self.angmom, dtype=numpy.float32)
-            self.angmom = self.angmom.reshape([self.N, 4])
+            self.angmom = _contiguous_array(self.angmom, numpy.float32, [self.N, 4])
         if self.image is not None:
-            self.image = numpy.ascontiguousarray(self.image, dtype=numpy.int32)
-            self.image = self.image.reshape([self.N, 3])
+            self.image = _contiguous_array(self.image, numpy.int32, [self.N, 3])
 
         if self.types is not None and (not len(set(self.types)) == len(self.types)):
             msg = 'Type names must be unique.'
             raise ValueError(msg)
 
 
-class BondData:
+class BondData(_LazyFields):
     """Store bond data chunks.
 
     Use the `Frame.bonds`, `Frame.angles`, `Frame.dihedrals`,
@@ -303,6 +360,9 @@ class BondData:
           :chunk:`impropers/group`, :chunk:`pairs/group`).
     """
 
+    # Default values, shared by all instances with the same M.
+    _default_values = {}
+
     def __init__(self, M):
         self.M = M
         self.N = 0
@@ -310,11 +370,14 @@ class BondData:
         self.typeid = None
         self.group = None
 
-        self._default_value = OrderedDict()
-        self._default_value['N'] = numpy.uint32(0)
-        self._default_value['types'] = []
-        self._default_value['typeid'] = numpy.uint32(0)
-        self._default_value['group'] = numpy.array([0] * M, dtype=numpy.int32)
+        self._default_value = BondData._default_values.get(M)
+        if self._default_value is None:
+            self._default_value = OrderedDict()
+            self._default_value['N'] = numpy.uint32(0)
+            self._default_value['types'] = []
+            self._default_value['typeid'] = numpy.uint32(0)
+            self._default_value['group'] = numpy.array([0] * M, dtype=numpy.int32)
+            BondData._default_values[M] = self._default_value
 
     def validate(self):
         """Validate all attributes.
@@ -331,18 +394,16 @@ class BondData:
         logger.debug('Validating BondData')
 
         if self.typeid is not None:
-            self.typeid = numpy.ascontiguousarray(self.typeid, dtype=numpy.uint32)
-            self.typeid = self.typeid.reshape([self.N])
+            self.typeid = _contiguous_array(self.typeid, numpy.uint32, [self.N])
         if self.group is not None:
-            self.group = numpy.ascontiguousarray(self.group, dtype=numpy.int32)
-            self.group = self.group.reshape([self.N, self.M])
+            self.group = _contiguous_array(self.group, numpy.int32, [self.N, self.M])
 
         if self.types is not None and (not len(set(self.types)) == len(self.types)):
             msg = 'Type names must be unique.'
             raise ValueError(msg)
 
 
-class ConstraintData:
+class ConstraintData(_LazyFields):
     """Store constraint data.
 
     Use the `Frame.constraints` attribute to access the constraints.
@@ -366,17 +427,17 @@ class ConstraintData:
             (:chunk:`constraints/group`).
     """
 
+    _default_value = OrderedDict()
+    _default_value['N'] = numpy.uint32(0)
+    _default_value['value'] = numpy.float32(0)
+    _default_value['group'] = numpy.array([0, 0], dtype=numpy.int32)
+
     def __init__(self):
         self.M = 2
         self.N = 0
         self.value = None
         self.group = None
 
-        self._default_value = OrderedDict()
-        self._default_value['N'] = numpy.uint32(0)
-        self._default_value['value'] = numpy.float32(0)
-        self._default_value['group'] = numpy.array([0] * self.M, dtype=numpy.int32)
-
     def validate(self):
         """Validate all attributes.
 
@@ -392,11 +453,51 @@ class ConstraintData:
         logger.debug('Validating ConstraintData')
 
         if self.value is not None:
-            self.value = numpy.ascontiguousarray(self.value, dtype=numpy.float32)
-            self.value = self.value.reshape([self.N])
+            self.value = _contiguous_array(self.value, numpy.float32, [self.N])
         if self.group is not None:
-            self.group = numpy.ascontiguousarray(self.group, dtype=numpy.int32)
-            self.group = self.group.reshape([self.N, self.M])
+            self.group = _contiguous_array(self.group, numpy.int32, [self.N, self.M])
+
+
+# Type and shape of each valid state chunk. ``'NT'`` is the number of particle
+# types and other names refer to the sum of the given per-type count.
+_STATE_LAYOUT = OrderedDict(
+    [
+        ('hpmc/integrate/d', (numpy.float64, [1])),
+        ('hpmc/integrate/a', (numpy.float64, [1])),
+        ('hpmc/sphere/radius', (numpy.float32, ['NT'])),
+        ('hpmc/sphere/orientable', (numpy.uint8, ['NT'])),
+        ('hpmc/ellipsoid/a', (numpy.float32, ['NT'])),
+        ('hpmc/ellipsoid/b', (numpy.float32, ['NT'])),
+        ('hpmc/ellipsoid/c', (numpy.float32, ['NT'])),
+        ('hpmc/convex_polyhedron/N', (numpy.uint32, ['NT'])),
+        (
+            'hpmc/convex_polyhedron/vertices',
+            (numpy.float32, ['hpmc/convex_polyhedron/N', 3]),
+        ),
+        ('hpmc/convex_spheropolyhedron/N', (numpy.uint32, ['NT'])),
+        (
+            'hpmc/convex_spheropolyhedron/vertices',
+            (numpy.float32, ['hpmc/convex_spheropolyhedron/N', 3]),
+        ),
+        ('hpmc/convex_spheropolyhedron/sweep_radius', (numpy.float32, ['NT'])),
+        ('hpmc/convex_polygon/N', (numpy.uint32, ['NT'])),
+        (
+            'hpmc/convex_polygon/vertices',
+            (numpy.float32, ['hpmc/convex_polygon/N', 2]),
+        ),
+        ('hpmc/convex_spheropolygon/N', (numpy.uint32, ['NT'])),
+        (
+            'hpmc/convex_spheropolygon/vertices',
+            (numpy.float32, ['hpmc/convex_spheropolygon/N', 2]),
+        ),
+        ('hpmc/convex_spheropolygon/sweep_radius', (numpy.float32, ['NT'])),
+        ('hpmc/simple_polygon/N', (numpy.uint32, ['NT'])),
+        (
+            'hpmc/simple_polygon/vertices',
+            (numpy.float32, ['hpmc/simple_polygon/N', 2]),
+        ),
+    ]
+)
 
 
 class Frame:
@@ -425,6 +526,8 @@ class Frame:
             `array_like`)
     """
 
+    _valid_state = tuple(_STATE_LAYOUT)
+
     def __init__(self):
         self.configuration = ConfigurationData()
         self.particles = ParticleData()
@@ -437,28 +540,6 @@ class Frame:
         self.state = {}
         self.log = {}
 
-        self._valid_state = [
-            'hpmc/integrate/d',
-            'hpmc/integrate/a',
-            'hpmc/sphere/radius',
-            'hpmc/sphere/orientable',
-            'hpmc/ellipsoid/a',
-            'hpmc/ellipsoid/b',
-            'hpmc/ellipsoid/c',
-            'hpmc/convex_polyhedron/N',
-            'hpmc/convex_polyhedron/vertices',
-            'hpmc/convex_spheropolyhedron/N',
-            'hpmc/convex_spheropolyhedron/vertices',
-            'hpmc/convex_spheropolyhedron/sweep_radius',
-            'hpmc/convex_polygon/N',
-            'hpmc/convex_polygon/vertices',
-            'hpmc/convex_spheropolygon/N',
-            'hpmc/convex_spheropolygon/vertices',
-            'hpmc/convex_spheropolygon/sweep_radius',
-            'hpmc/simple_polygon/N',
-            'hpmc/simple_polygon/vertices',
-        ]
-
     def validate(self):
         """Validate all contained frame data."""
         logger.debug('Validating Frame')
@@ -473,182 +554,227 @@ class Frame:
         self.pairs.validate()
 
         # validate HPMC state
-        if self.particles.types is not None:
-            NT = len(self.particles.types)
+        if self.state:
+            if self.particles.types is not None:
+                NT = len(self.particles.types)
+            else:
+                NT = 1
+
+            for name, (dtype, shape) in _STATE_LAYOUT.items():
+                if name in self.state:
+                    resolved = self._state_shape(shape, NT)
+                    if resolved is not None:
+                        self.state[name] = _contiguous_array(
+                            self.state[name], dtype, resolved
+                        )
+
+        for k in self.state:
+            if k not in _STATE_LAYOUT:
+                raise RuntimeError('Not a valid state: ' + k)
+
+    def _state_shape(self, shape, NT):
+        """Resolve the shape of a state chunk given in `_STATE_LAYOUT`.
+
+        Returns ``None`` when the shape depends on a count that is not in the
+        state. `validate` leaves such chunks unchanged.
+        """
+        resolved = []
+        for dim in shape:
+            if dim == 'NT':
+                resolved.append(NT)
+            elif isinstance(dim, str):
+                if dim not in self.state:
+                    return None
+                resolved.append(int(numpy.sum(self.state[dim])))
+            else:
+                resolved.append(dim)
+        return resolved
+
+
+# Number of rows sampled by _fingerprint.
+_FINGERPRINT_ROWS = 64
+
+
+def _fingerprint(data):
+    """Sample evenly spaced rows of an array.
+
+    Arrays with different fingerprints differ, so comparing fingerprints
+    detects most changes without reading the whole array. Arrays with equal
+    fingerprints may still differ.
+
+    Args:
+        data: Value of a data chunk.
+
+    Returns:
+        `numpy.ndarray` view of at most ``2 * _FINGERPRINT_ROWS`` rows.
+    """
+    data = numpy.asarray(data)
+    if data.ndim == 0 or data.shape[0] <= _FINGERPRINT_ROWS:
+        return data
+
+    return data[:: data.shape[0] // _FINGERPRINT_ROWS]
+
+
+_CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def _frame_arrays(frame):
+    """Yield the arrays in a frame."""
+    for value in vars(frame).values():
+        if isinstance(value, dict):
+            items = value.values()
+        elif hasattr(value, '__dict__'):
+            items = vars(value).values()
         else:
-            NT = 1
+            continue
 
-        if 'hpmc/integrate/d' in self.state:
-            self.state['hpmc/integrate/d'] = numpy.ascontiguousarray(
-                self.state['hpmc/integrate/d'], dtype=numpy.float64
-            )
-            self.state['hpmc/integrate/d'] = self.state['hpmc/integrate/d'].reshape([1])
+        for item in items:
+            if isinstance(item, numpy.ndarray):
+                yield item
 
-        if 'hpmc/integrate/a' in self.state:
-            self.state['hpmc/integrate/a'] = numpy.ascontiguousarray(
-                self.state['hpmc/integrate/a'], dtype=numpy.float64
-            )
-            self.state['hpmc/integrate/a'] = self.state['hpmc/integrate/a'].reshape([1])
 
-        if 'hpmc/sphere/radius' in self.state:
-            self.state['hpmc/sphere/radius'] = numpy.ascontiguousarray(
-                self.state['hpmc/sphere/radius'], dtype=numpy.float32
-            )
-            self.state['hpmc/sphere/radius'] = self.state['hpmc/sphere/radius'].reshape(
-                [NT]
-            )
+def _copy_frame(frame):
+    """Copy a frame and its containers without copying the arrays."""
+    result = copy.copy(frame)
+    for name, value in vars(frame).items():
+        if isinstance(value, (dict, list)):
+            setattr(result, name, copy.copy(value))
+        elif hasattr(value, '__dict__'):
+            container = copy.copy(value)
+            for key, item in vars(value).items():
+                if isinstance(item, list):
+                    container.__dict__[key] = copy.copy(item)
+            setattr(result, name, container)
 
-        if 'hpmc/sphere/orientable' in self.state:
-            self.state['hpmc/sphere/orientable'] = numpy.ascontiguousarray(
-                self.state['hpmc/sphere/orientable'], dtype=numpy.uint8
-            )
-            self.state['hpmc/sphere/orientable'] = self.state[
-                'hpmc/sphere/orientable'
-            ].reshape([NT])
+    return result
 
-        if 'hpmc/ellipsoid/a' in self.state:
-            self.state['hpmc/ellipsoid/a'] = numpy.ascontiguousarray(
-                self.state['hpmc/ellipsoid/a'], dtype=numpy.float32
-            )
-            self.state['hpmc/ellipsoid/a'] = self.state['hpmc/ellipsoid/a'].reshape(
-                [NT]
-            )
-            self.state['hpmc/ellipsoid/b'] = numpy.ascontiguousarray(
-                self.state['hpmc/ellipsoid/b'], dtype=numpy.float32
-            )
-            self.state['hpmc/ellipsoid/b'] = self.state['hpmc/ellipsoid/b'].reshape(
-                [NT]
-            )
-            self.state['hpmc/ellipsoid/c'] = numpy.ascontiguousarray(
-                self.state['hpmc/ellipsoid/c'], dtype=numpy.float32
-            )
-            self.state['hpmc/ellipsoid/c'] = self.state['hpmc/ellipsoid/c'].reshape(
-                [NT]
-            )
 
-        if 'hpmc/convex_polyhedron/N' in self.state:
-            self.state['hpmc/convex_polyhedron/N'] = numpy.ascontiguousarray(
-                self.state['hpmc/convex_polyhedron/N'], dtype=numpy.uint32
-            )
-            self.state['hpmc/convex_polyhedron/N'] = self.state[
-                'hpmc/convex_polyhedron/N'
-            ].reshape([NT])
-            sumN = numpy.sum(self.state['hpmc/convex_polyhedron/N'])
+# containers with per-element fields that lazy frames read on first access
+_LAZY_CONTAINERS = [
+    'particles',
+    'bonds',
+    'angles',
+    'dihedrals',
+    'impropers',
+    'constraints',
+    'pairs',
+]
 
-            self.state['hpmc/convex_polyhedron/vertices'] = numpy.ascontiguousarray(
-                self.state['hpmc/convex_polyhedron/vertices'], dtype=numpy.float32
-            )
-            self.state['hpmc/convex_polyhedron/vertices'] = self.state[
-                'hpmc/convex_polyhedron/vertices'
-            ].reshape([sumN, 3])
 
-        if 'hpmc/convex_spheropolyhedron/N' in self.state:
-            self.state['hpmc/convex_spheropolyhedron/N'] = numpy.ascontiguousarray(
-                self.state['hpmc/convex_spheropolyhedron/N'], dtype=numpy.uint32
-            )
-            self.state['hpmc/convex_spheropolyhedron/N'] = self.state[
-                'hpmc/convex_spheropolyhedron/N'
-            ].reshape([NT])
-            sumN = numpy.sum(self.state['hpmc/convex_spheropolyhedron/N'])
-
-            self.state['hpmc/convex_spheropolyhedron/sweep_radius'] = (
-                numpy.ascontiguousarray(
-                    self.state['hpmc/convex_spheropolyhedron/sweep_radius'],
-                    dtype=numpy.float32,
-                )
-            )
-            self.state['hpmc/convex_spheropolyhedron/sweep_radius'] = self.state[
-                'hpmc/convex_spheropolyhedron/sweep_radius'
-            ].reshape([NT])
-
-            self.state['hpmc/convex_spheropolyhedron/vertices'] = (
-                numpy.ascontiguousarray(
-                    self.state['hpmc/convex_spheropolyhedron/vertices'],
-                    dtype=numpy.float32,
-                )
-            )
-            self.state['hpmc/convex_spheropolyhedron/vertices'] = self.state[
-                'hpmc/convex_spheropolyhedron/vertices'
-            ].reshape([sumN, 3])
+class _LazyChunks:
+    """Read the chunks of a frame on demand."""
 
-        if 'hpmc/convex_polygon/N' in self.state:
-            self.state['hpmc/convex_polygon/N'] = numpy.ascontiguousarray(
-                self.state['hpmc/convex_polygon/N'], dtype=numpy.uint32
-            )
-            self.state['hpmc/convex_polygon/N'] = self.state[
-                'hpmc/convex_polygon/N'
-            ].reshape([NT])
-            sumN = numpy.sum(self.state['hpmc/convex_polygon/N'])
+    def __init__(self, file, idx):
+        self._file = file
+        self._idx = idx
 
-            self.state['hpmc/convex_polygon/vertices'] = numpy.ascontiguousarray(
-                self.state['hpmc/convex_polygon/vertices'], dtype=numpy.float32
-            )
-            self.state['hpmc/convex_polygon/vertices'] = self.state[
-                'hpmc/convex_polygon/vertices'
-            ].reshape([sumN, 2])
+    def __contains__(self, name):
+        return self._file.chunk_exists(frame=self._idx, name=name)
 
-        if 'hpmc/convex_spheropolygon/N' in self.state:
-            self.state['hpmc/convex_spheropolygon/N'] = numpy.ascontiguousarray(
-                self.state['hpmc/convex_spheropolygon/N'], dtype=numpy.uint32
-            )
-            self.state['hpmc/convex_spheropolygon/N'] = self.state[
-                'hpmc/convex_spheropolygon/N'
-            ].reshape([NT])
-            sumN = numpy.sum(self.state['hpmc/convex_spheropolygon/N'])
-
-            self.state['hpmc/convex_spheropolygon/sweep_radius'] = (
-                numpy.ascontiguousarray(
-                    self.state['hpmc/convex_spheropolygon/sweep_radius'],
-                    dtype=numpy.float32,
-                )
-            )
-            self.state['hpmc/convex_spheropolygon/sweep_radius'] = self.state[
-                'hpmc/convex_spheropolygon/sweep_radius'
-            ].reshape([NT])
+    def __getitem__(self, name):
+        return self._file.read_chunk(frame=self._idx, name=name)
 
-            self.state['hpmc/convex_spheropolygon/vertices'] = numpy.ascontiguousarray(
-                self.state['hpmc/convex_spheropolygon/vertices'], dtype=numpy.float32
-            )
-            self.state['hpmc/convex_spheropolygon/vertices'] = self.state[
-                'hpmc/convex_spheropolygon/vertices'
-            ].reshape([sumN, 2])
 
-        if 'hpmc/simple_polygon/N' in self.state:
-            self.state['hpmc/simple_polygon/N'] = numpy.ascontiguousarray(
-                self.state['hpmc/simple_polygon/N'], dtype=numpy.uint32
-            )
-            self.state['hpmc/simple_polygon/N'] = self.state[
-                'hpmc/simple_polygon/N'
-            ].reshape([NT])
-            sumN = numpy.sum(self.state['hpmc/simple_polygon/N'])
+# Fields that are not arrays.
+_SCALAR_FIELDS = frozenset(['N', 'step', 'dimensions', 'types', 'type_shapes'])
 
-            self.state['hpmc/simple_polygon/vertices'] = numpy.ascontiguousarray(
-                self.state['hpmc/simple_polygon/vertices'], dtype=numpy.float32
-            )
-            self.state['hpmc/simple_polygon/vertices'] = self.state[
-                'hpmc/simple_polygon/vertices'
-            ].reshape([sumN, 2])
 
-        for k in self.state:
-            if k not in self._valid_state:
-                raise RuntimeError('Not a valid state: ' + k)
+def _check_fields(fields):
+    """Validate the names of the fields to read from each frame.
+
+    Args:
+        fields (list[str]): Chunk names.
+
+    Returns:
+        `frozenset` of the chunk names.
+    """
+    frame = Frame()
+    for field in fields:
+        path, _, name = field.partition('/')
+        if path == 'log' and name:
+            continue
+        if path == 'state' and name in _STATE_LAYOUT:
+            continue
+        if path == 'configuration' and name in frame.configuration._default_value:
+            continue
+        if path in _LAZY_CONTAINERS and name in getattr(frame, path)._default_value:
+            continue
+        raise ValueError('Invalid field: ' + str(field))
+
+    return frozenset(fields)
+
+
+def _field_chunk_names(fields):
+    """List the chunks to read for the given fields.
+
+    Args:
+        fields (frozenset[str]): Chunk names from `_check_fields`.
+
+    Returns:
+        list[str]: The chunk names, the number of elements of each selected
+        container, and the quantized forms of per-element chunks.
+    """
+    names = set(fields)
+    for field in fields:
+        path, _, name = field.partition('/')
+        if path in _LAZY_CONTAINERS:
+            names.add(path + '/N')
+            if name not in _SCALAR_FIELDS:
+                names.add('quantized/' + field)
+                names.add('quantized/' + field + '/scale')
+
+    return sorted(names)
+
+
+def _schema_fields():
+    """Name every field of the hoomd schema except the logged quantities."""
+    frame = Frame()
+    fields = ['configuration/' + name for name in frame.configuration._default_value]
+    for path in _LAZY_CONTAINERS:
+        container = getattr(frame, path)
+        fields.extend(path + '/' + name for name in container._default_value)
+    fields.extend('state/' + name for name in _STATE_LAYOUT)
+    return frozenset(fields)
+
+
+# Chunks that _read_frame reads from each frame, before the logged quantities.
+_SCHEMA_CHUNK_NAMES = _field_chunk_names(_schema_fields())
+
+# Arrays read from the frame buffer up to this size are copied out of it.
+_DETACH_BYTES = 4096
+
+
+def _detach(data):
+    """Copy a small array out of the frame buffer it is a view of.
+
+    Args:
+        data: Value read by `gsd.fl.GSDFile.read_frame`.
+
+    Returns:
+        A copy of *data* when it is a small array, *data* otherwise.
+    """
+    if isinstance(data, numpy.ndarray) and data.nbytes <= _DETACH_BYTES:
+        return data.copy()
+
+    return data
 
 
 class _HOOMDTrajectoryIterable:
     """Iterable over a HOOMDTrajectory object."""
 
-    def __init__(self, trajectory, indices):
+    def __init__(self, trajectory, indices, fields=None):
         self._trajectory = trajectory
         self._indices = indices
         self._indices_iterator = iter(indices)
+        self._fields = fields
 
     def __next__(self):
-        return self._trajectory[next(self._indices_iterator)]
+        return self._trajectory._getitem(next(self._indices_iterator), self._fields)
 
     next = __next__  # Python 2.7 compatibility
 
     def __iter__(self):
-        return type(self)(self._trajectory, self._indices)
+        return type(self)(self._trajectory, self._indices, self._fields)
 
     def __len__(self):
         return len(self._indices)
@@ -661,21 +787,217 @@ class _HOOMDTrajectoryView:
     instance.
     """
 
-    def __init__(self, trajectory, indices):
+    def __init__(self, trajectory, indices, fields=None):
         self._trajectory = trajectory
         self._indices = indices
+        self._fields = fields
 
     def __iter__(self):
-        return _HOOMDTrajectoryIterable(self._trajectory, self._indices)
+        return _HOOMDTrajectoryIterable(self._trajectory, self._indices, self._fields)
 
     def __len__(self):
         return len(self._indices)
 
     def __getitem__(self, key):
         if isinstance(key, slice):
-            return type(self)(self._trajectory, self._indices[key])
+            return type(self)(self._trajectory, self._indices[key], self._fields)
+
+        return self._trajectory._getitem(self._indices[key], self._fields)
+
+
+class _HOOMDTrajectoryWriter:
+    """Write frames with a fixed set of fields to a HOOMDTrajectory.
+
+    See `HOOMDTrajectory.writer`.
+    """
+
+    def __init__(self, trajectory, fields):
+        self._trajectory = trajectory
+        self._template = Frame()
+
+        names = list(fields)
+        for name in _check_fields(names):
+            if name.rpartition('/')[2] in _SCALAR_FIELDS:
+                raise ValueError('Not an array field: ' + name)
+
+        # name fields by the last part of the chunk name when it is unique
+        last = [name.rpartition('/')[2] for name in names] + ['step']
+        self._fields = []
+        self._counts = OrderedDict()
+        self._box = None
+        for name in names:
+            layout = fields[name]
+            shape = tuple(layout[:-1])
+            dtype = numpy.dtype(layout[-1])
+            path, _, short_name = name.partition('/')
+            keyword = name.rpartition('/')[2]
+            if last.count(keyword) > 1:
+                keyword = name.replace('/', '_')
+
+            if path == 'configuration':
+                expected_dtype, expected_shape = numpy.float32, [6]
+                self._box = len(self._fields)
+            elif path == 'state':
+                expected_dtype, expected_shape = _STATE_LAYOUT[short_name]
+            elif path == 'log':
+                expected_dtype, expected_shape = dtype, shape
+            else:
+                default = getattr(self._template, path)._default_value[short_name]
+                expected_dtype = numpy.asarray(default).dtype
+                expected_shape = ['N', *numpy.shape(default)]
+
+            # string dimensions depend on the data
+            if (
+                dtype != expected_dtype
+                or len(shape) != len(expected_shape)
+                or any(
+                    not isinstance(expected, str) and n != expected
+                    for n, expected in zip(shape, expected_shape)
+                )
+            ):
+                raise ValueError(
+                    'Field '
+                    + name
+                    + ' must have shape '
+                    + str(tuple(expected_shape))
+                    + ' and type '
+                    + str(numpy.dtype(expected_dtype))
+                )
+
+            if expected_shape[:1] == ['N']:
+                N = self._counts.setdefault(path, shape[0])
+                if N != shape[0]:
+                    msg = 'Fields of ' + path + ' must have the same length.'
+                    raise ValueError(msg)
+
+            self._fields.append(
+                (path, short_name, keyword, dtype, shape, name in trajectory._quantize)
+            )
+
+        self._keywords = frozenset(field[2] for field in self._fields)
+
+    def write(self, step=None, **arrays):
+        """Write one frame.
+
+        Args:
+            step (int): Time step of the frame (:chunk:`configuration/step`).
+                Set to ``None`` to leave it unset.
+            arrays (`numpy.ndarray`): Value of each field.
+        """
+        if arrays.keys() != self._keywords:
+            msg = (
+                'Expected arrays '
+                + str(sorted(self._keywords))
+                + ', got '
+                + str(sorted(arrays))
+            )
+            raise TypeError(msg)
+
+        trajectory = self._trajectory
+        template = self._template
+
+        values = [
+            _contiguous_array(arrays[keyword], dtype, shape)
+            for _, _, keyword, dtype, shape, _ in self._fields
+        ]
+
+        if trajectory._initial_frame is None and len(trajectory) > 0:
+            trajectory._read_frame(0)
+
+        box = None if self._box is None else values[self._box]
+        configuration = template.configuration
+        if trajectory._should_write_data('configuration', 'step', configuration, step):
+            trajectory.file.write_chunk(
+                'configuration/step', numpy.array([step], dtype=numpy.uint64)
+            )
+        if box is not None:
+            dimensions = 2 if box[2] == 0 else 3
+            if trajectory._should_write_data(
+                'configuration', 'dimensions', configuration, dimensions
+            ):
+                trajectory.file.write_chunk(
+                    'configuration/dimensions',
+                    numpy.array([dimensions], dtype=numpy.uint8),
+                )
+
+        for path, N in self._counts.items():
+            if trajectory._should_write_data(path, 'N', getattr(template, path), N):
+                trajectory.file.write_chunk(
+                    path + '/N', numpy.array([N], dtype=numpy.uint32)
+                )
+
+        for (path, name, _, _, _, quantized), data in zip(self._fields, values):
+            chunk_name = path + '/' + name
+            if path in ('state', 'log'):
+                trajectory.file.write_chunk(chunk_name, data)
+            elif trajectory._should_write_data(
+                path, name, getattr(template, path), data
+            ):
+                if quantized:
+                    trajectory._write_quantized(chunk_name, data, box)
+                else:
+                    trajectory.file.write_chunk(chunk_name, data)
+
+        trajectory.file.end_frame()
+
+    def append(self, frame):
+        """Append a frame that has the declared fields.
+
+        Args:
+            frame (:py:class:`Frame`): Frame to append.
+        """
+        for path, name, _, dtype, shape, _ in self._fields:
+            if path in ('state', 'log'):
+                value = getattr(frame, path).get(name)
+            else:
+                value = getattr(getattr(frame, path), name)
+
+            if (
+                not isinstance(value, numpy.ndarray)
+                or value.dtype != dtype
+                or value.shape != shape
+                or not value.flags.c_contiguous
+            ):
+                raise ValueError(
+                    'Field '
+                    + path
+                    + '/'
+                    + name
+                    + ' must be a contiguous array with shape '
+                    + str(shape)
+                    + ' and type '
+                    + str(dtype)
+                )
+
+        for path, N in self._counts.items():
+            if getattr(frame, path).N != N:
+                raise ValueError('Expected ' + str(N) + ' elements in ' + path)
+
+        for k in frame.state:
+            if k not in _STATE_LAYOUT:
+                raise RuntimeError('Not a valid state: ' + k)
 
-        return self._trajectory[self._indices[key]]
+        self._trajectory._append_validated(frame)
+
+
+def _quantization_offset(name, box, width):
+    """Offset of the fixed point integers of a quantized chunk.
+
+    Args:
+        name (str): Name of the data chunk.
+        box (`numpy.ndarray`): Box of the frame, or ``None``.
+        width (int): Number of columns in the chunk.
+
+    Returns:
+        `numpy.ndarray`: The lower corner of the box for
+        :chunk:`particles/position` and zeros for other chunks.
+    """
+    if name == 'particles/position':
+        if box is None:
+            box = ConfigurationData._default_value['box']
+        return -0.5 * numpy.asarray(box[0:3], dtype=numpy.float64)
+
+    return numpy.zeros(width)
 
 
 class HOOMDTrajectory:
@@ -683,21 +1005,97 @@ class HOOMDTrajectory:
 
     Args:
         file (`gsd.fl.GSDFile`): File to access.
+        quantize (dict[str, float]): Quantization step for each chunk to store
+            as fixed point integers.
+        cache_size (int): Total size (in bytes) of the arrays in the frames to
+            keep in the frame cache. Set to 0 to disable the cache.
+        lazy (bool): Set to ``True`` to read the per-element fields, state, and
+            log data of each frame when they are first accessed.
+        fields (list[str]): Names of the chunks to read from each frame (see
+            `select`). Set to ``None`` to read all chunks.
 
     Open hoomd GSD files with `open`.
+
+    `append` stores the per-particle and per-bond floating point chunks named in
+    ``quantize`` as integers in :chunk:`quantized/name`. The integers count
+    multiples of the quantization step from an offset: the lower corner of
+    :chunk:`configuration/box` for :chunk:`particles/position` and 0 for all
+    other chunks. `append` uses the smallest integer type that holds the
+    values. Reading a frame dequantizes these chunks to ``numpy.float32``
+    arrays. Quantized values differ from the appended values by up to half of
+    the quantization step.
+
+    With a nonzero ``cache_size``, indexing and iterating keep the frames read
+    most recently in memory and return them again without reading the file.
+    When the arrays of the cached frames exceed ``cache_size`` bytes, the
+    cache discards the least recently used frames. Every call returns a new
+    `Frame`, but the arrays in it are shared with the cache and are read-only.
+    Copy an array before modifying it. `cache_info` reports the hits and
+    misses of the cache.
+
+    Indexing and iterating read each frame with one call to
+    `gsd.fl.GSDFile.read_frame`. The per-element arrays of the frame are views
+    into a single buffer that holds all the chunks read from it, so keeping
+    any one of them keeps the whole buffer in memory. Copy the arrays that you
+    keep for longer than the frame. The box, state, and small logged arrays
+    are copied out of the buffer.
+
+    With ``lazy`` set to ``True``, indexing and iterating read only the
+    configuration, the number of elements, and the type names of each frame.
+    The other fields of `ParticleData`, `BondData`, and `ConstraintData` and
+    the values in `Frame.state` and `Frame.log` are read from the file when
+    first accessed, with the same fallbacks to frame 0 and the default values.
+    Access the fields before closing the file. Lazy frames are not cached.
     """
 
-    def __init__(self, file):
+    def __init__(self, file, quantize=None, cache_size=0, lazy=False, fields=None):
         if file.mode == 'ab':
             msg = 'Append mode not yet supported'
             raise ValueError(msg)
 
         self._file = file
         self._initial_frame = None
+        self._lazy = lazy
+        self._fields = None
+        if fields is not None:
+            self._fields = _check_fields(fields)
+
+        # Frame 0 read with each set of fields, to fill missing fields.
+        self._initial_projections = {}
+
+        self._quantize = {}
+        if quantize is not None:
+            for name, step in quantize.items():
+                path, _, field = name.partition('/')
+                container = getattr(Frame(), path, None)
+                if (
+                    path == 'configuration'
+                    or not hasattr(container, '_default_value')
+                    or field not in container._default_value
+                    or numpy.asarray(container._default_value[field]).dtype
+                    != numpy.float32
+                ):
+                    raise ValueError('Cannot quantize ' + name)
+                if step <= 0:
+                    raise ValueError('Quantization step must be positive for ' + name)
+                self._quantize[name] = float(step)
 
         # Used to cache positive results when chunks exist in frame 0.
         self._chunk_exists_frame_0 = {}
 
+        # Fingerprints and quantized values of the frame 0 arrays, and the
+        # results of comparing appended arrays to frame 0 by container.
+        self._initial_fingerprints = {}
+        self._initial_grids = {}
+        self._appended = None
+
+        self._cache = OrderedDict()
+        self._cache_size = 0
+        self._cache_currsize = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self.cache_size = cache_size
+
         logger.info('opening HOOMDTrajectory: ' + str(self.file))
 
         if self.file.schema != 'hoomd':
@@ -721,6 +1119,81 @@ class HOOMDTrajectory:
         """:class:`gsd.fl.GSDFile`: The file handle."""
         return self._file
 
+    @property
+    def cache_size(self):
+        """int: Total size (in bytes) of the arrays in the frame cache.
+
+        Set to 0 to disable the cache.
+        """
+        return self._cache_size
+
+    @cache_size.setter
+    def cache_size(self, size):
+        if size < 0:
+            msg = 'cache_size must not be negative'
+            raise ValueError(msg)
+        self._cache_size = int(size)
+        self._cache_evict()
+
+    def cache_info(self):
+        """Get statistics of the frame cache.
+
+        Returns:
+            A named tuple with the fields ``hits``, ``misses``, ``maxsize``,
+            and ``currsize``. ``maxsize`` and ``currsize`` are in bytes.
+        """
+        return _CacheInfo(
+            self._cache_hits, self._cache_misses, self._cache_size, self._cache_currsize
+        )
+
+    def cache_clear(self):
+        """Remove all frames from the frame cache and reset the statistics."""
+        self._cache.clear()
+        self._cache_currsize = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def _cache_evict(self):
+        """Discard the least recently used frames until the cache fits."""
+        while self._cache_currsize > self._cache_size:
+            _, (_, nbytes) = self._cache.popitem(last=False)
+            self._cache_currsize -= nbytes
+
+    def _read_frame_cached(self, idx, fields=None):
+        """Read a frame through the frame cache.
+
+        Args:
+            idx (int): Frame index to read.
+            fields (frozenset[str]): Chunk names to read, or ``None`` to read
+                all chunks.
+
+        Returns:
+            `Frame` with the frame data.
+        """
+        if self._cache_size == 0 or self._lazy:
+            return self._read_frame(idx, fields)
+
+        key = (idx, fields)
+        if key in self._cache:
+            self._cache_hits += 1
+            self._cache.move_to_end(key)
+            frame, _ = self._cache[key]
+            return _copy_frame(frame)
+
+        self._cache_misses += 1
+        frame = self._read_frame(idx, fields)
+        nbytes = 0
+        for array in _frame_arrays(frame):
+            array.flags.writeable = False
+            nbytes += array.nbytes
+
+        if nbytes <= self._cache_size:
+            self._cache[key] = (frame, nbytes)
+            self._cache_currsize += nbytes
+            self._cache_evict()
+
+        return _copy_frame(frame)
+
     def __len__(self):
         """The number of frames in the trajectory."""
         return self.file.nframes
@@ -737,10 +1210,24 @@ class HOOMDTrajectory:
         or the default value. If the given data differs, write it out to the
         frame. If it is the same, do not write it out as it can be instantiated
         either from the value at the initial frame or the default value.
-        """
-        logger.debug('Appending frame to hoomd trajectory: ' + str(self.file))
 
+        `append` remembers the result of comparing each array. When a later
+        call finds the same array object in the same container and the
+        sampled rows of the array are unchanged, it reuses the result without
+        scanning the array. After modifying a few elements of an array in
+        place, assign a new array to the field so that `append` compares it
+        again.
+        """
         frame.validate()
+        self._append_validated(frame)
+
+    def _append_validated(self, frame):
+        """Append a frame without validating it.
+
+        Args:
+            frame (:py:class:`Frame`): Frame to append.
+        """
+        logger.debug('Appending frame to hoomd trajectory: ' + str(self.file))
 
         # want the initial frame specified as a reference to detect if chunks
         # need to be written
@@ -776,7 +1263,12 @@ class HOOMDTrajectory:
                         b = numpy.array(data, dtype=numpy.dtype((bytes, wid)))
                         data = b.view(dtype=numpy.int8).reshape(len(b), wid)
 
-                    self.file.write_chunk(path + '/' + name, data)
+                    if path + '/' + name in self._quantize:
+                        self._write_quantized(
+                            path + '/' + name, data, frame.configuration.box
+                        )
+                    else:
+                        self.file.write_chunk(path + '/' + name, data)
 
         # write state data
         for state, data in frame.state.items():
@@ -792,11 +1284,146 @@ class HOOMDTrajectory:
         """Remove all frames from the file."""
         self.file.truncate()
         self._initial_frame = None
+        self._initial_projections.clear()
+        self._reset_comparisons()
+        self.cache_clear()
+
+    def _reset_comparisons(self):
+        """Forget the comparisons made against the previous frame 0."""
+        self._initial_fingerprints.clear()
+        self._initial_grids.clear()
+        self._appended = None
 
     def close(self):
         """Close the file."""
         self.file.close()
         del self._initial_frame
+        self.cache_clear()
+
+    def _write_quantized(self, name, data, box):
+        """Write a floating point chunk as fixed point integers.
+
+        Args:
+            name (str): Name of the data chunk.
+            data (`numpy.ndarray`): Values to quantize.
+            box (`numpy.ndarray`): Box of the frame the data is from, or
+                ``None``.
+        """
+        step = self._quantize[name]
+        data = numpy.asarray(data, dtype=numpy.float64)
+        if data.ndim == 1:
+            data = data.reshape([data.shape[0], 1])
+
+        offset = _quantization_offset(name, box, data.shape[1])
+        values = numpy.rint((data - offset) / step)
+
+        dtype = numpy.int16
+        if values.size > 0:
+            low = values.min()
+            high = values.max()
+            for dtype in (numpy.int16, numpy.uint16, numpy.int32, numpy.uint32):
+                info = numpy.iinfo(dtype)
+                if low >= info.min and high <= info.max:
+                    break
+            else:
+                raise ValueError(
+                    'Quantization step ' + str(step) + ' is too small for ' + name
+                )
+
+        scale = numpy.array([numpy.full(data.shape[1], step), offset])
+        self.file.write_chunk('quantized/' + name, values.astype(dtype))
+        self.file.write_chunk('quantized/' + name + '/scale', scale)
+
+    def _quantized_grid(self, name, data, step):
+        """Round values to the fixed point grid of frame 0.
+
+        Args:
+            name (str): Name of the data chunk.
+            data (`numpy.ndarray`): Values to round.
+            step (float): Quantization step.
+
+        Returns:
+            `numpy.ndarray` of the integer multiples of the step.
+        """
+        data = numpy.asarray(data, dtype=numpy.float64)
+        if data.ndim == 1:
+            data = data.reshape([data.shape[0], 1])
+
+        offset = _quantization_offset(
+            name, self._initial_frame.configuration.box, data.shape[1]
+        )
+        return numpy.rint((data - offset) / step)
+
+    def _read_quantized(self, chunks, name):
+        """Dequantize a chunk stored by `_write_quantized`.
+
+        Args:
+            chunks (dict[str, numpy.ndarray]): Chunks read from the frame.
+            name (str): Name of the data chunk.
+
+        Returns:
+            `numpy.ndarray` of ``numpy.float32`` with the dequantized values.
+        """
+        values = chunks['quantized/' + name]
+        scale = chunks['quantized/' + name + '/scale'].reshape([2, -1])
+
+        data = values.reshape([values.shape[0], -1]) * scale[0] + scale[1]
+        return data.astype(numpy.float32).reshape(values.shape)
+
+    def _read_field(self, chunks, name, default, N, initial_frame):
+        """Read a per-element quantity of a frame.
+
+        Args:
+            chunks: Chunks of the frame, indexable by chunk name.
+            name (str): Name of the data chunk.
+            default: Default value of one element.
+            N (int): Number of elements in the frame.
+            initial_frame (:py:class:`Frame`): Frame 0, or ``None`` when reading
+                frame 0.
+
+        Returns:
+            `numpy.ndarray` with the chunk data, the data from frame 0 when the
+            chunk is not present, or the default value when the chunk is not
+            present in frame 0 or the number of elements differs. Data that
+            does not come from the given frame is read-only. Default values
+            are broadcast views with a stride of 0 along the first axis.
+        """
+        if name in chunks:
+            return chunks[name]
+        if 'quantized/' + name in chunks:
+            return self._read_quantized(chunks, name)
+
+        path, _, field = name.partition('/')
+        initial_frame_container = None
+        if initial_frame is not None:
+            initial_frame_container = getattr(initial_frame, path)
+
+        if initial_frame_container is not None and initial_frame_container.N == N:
+            # read default from initial frame
+            data = getattr(initial_frame_container, field)
+        else:
+            # broadcast the default value without allocating N copies
+            tmp = numpy.array([default])
+            s = list(tmp.shape)
+            s[0] = N
+            data = numpy.broadcast_to(tmp, s)
+
+        data.flags.writeable = False
+        return data
+
+    def _read_initial_log(self, log, initial_frame):
+        """Read a logged quantity from frame 0.
+
+        Args:
+            log (str): Name of the log chunk.
+            initial_frame (:py:class:`Frame`): Frame 0.
+
+        Returns:
+            Read-only `numpy.ndarray` with the value in frame 0.
+        """
+        data = initial_frame.log[log[4:]]
+        data.flags.writeable = False
+        return data
 
     def _should_write(self, path, name, frame):
         """Test if we should write a given data chunk.
@@ -809,34 +1436,101 @@ class HOOMDTrajectory:
         Returns:
             False if the data matches that in the initial frame. False
             if the data matches all default values. True otherwise.
+
+        Reuse the result for an array that was appended from the same
+        container before, when its sampled rows have not changed since.
         """
         container = getattr(frame, path)
         data = getattr(container, name)
+        if not isinstance(data, numpy.ndarray):
+            return self._should_write_data(path, name, container, data)
+
+        fingerprint = _fingerprint(data)
+        if self._appended is None:
+            self._appended = weakref.WeakKeyDictionary()
+        records = self._appended.setdefault(container, {})
+        record = records.get(name)
+        if (
+            record is not None
+            and record[0]() is data
+            and numpy.array_equal(record[1], fingerprint)
+        ):
+            return record[2]
+
+        result = self._should_write_data(path, name, container, data, fingerprint)
+        records[name] = (weakref.ref(data), fingerprint.copy(), result)
+        return result
+
+    def _should_write_data(self, path, name, container, data, fingerprint=None):
+        """Test if we should write the given value of a data chunk.
+
+        Args:
+            path (str): Path part of the data chunk.
+            name (str): Name part of the data chunk.
+            container: Container that holds the default values of the chunk.
+            data: Value of the data chunk.
+            fingerprint (`numpy.ndarray`): `_fingerprint` of the data, or
+                ``None`` to compute it.
 
+        Returns:
+            False if the data is ``None``. False if the data matches that in
+            the initial frame. False if the data matches all default values.
+            True otherwise.
+        """
         if data is None:
             return False
 
+        chunk_name = path + '/' + name
+        if fingerprint is None and isinstance(data, numpy.ndarray):
+            fingerprint = _fingerprint(data)
+
         if self._initial_frame is not None:
-            initial_container = getattr(self._initial_frame, path)
-            initial_data = getattr(initial_container, name)
-            if numpy.array_equal(initial_data, data):
-                logger.debug(
-                    'skipping data chunk, matches frame 0: ' + path + '/' + name
+            initial_data = getattr(getattr(self._initial_frame, path), name)
+            if fingerprint is None:
+                matches_initial_frame = numpy.array_equal(initial_data, data)
+            elif numpy.shape(initial_data) != data.shape:
+                matches_initial_frame = False
+            elif chunk_name in self._quantize:
+                # frame 0 holds dequantized values, compare on its fixed point
+                # grid so that reading frame 0 stays within half of the step
+                step = self._quantize[chunk_name]
+                if chunk_name not in self._initial_grids:
+                    grid = self._quantized_grid(chunk_name, initial_data, step)
+                    self._initial_grids[chunk_name] = grid
+                    self._initial_fingerprints[chunk_name] = _fingerprint(grid)
+                grid = self._initial_grids[chunk_name]
+                matches_initial_frame = numpy.array_equal(
+                    self._initial_fingerprints[chunk_name],
+                    self._quantized_grid(chunk_name, fingerprint, step),
+                ) and numpy.array_equal(
+                    grid, self._quantized_grid(chunk_name, data, step)
                 )
+            else:
+                # differing fingerprints prove a change without a full scan
+                if chunk_name not in self._initial_fingerprints:
+                    self._initial_fingerprints[chunk_name] = _fingerprint(initial_data)
+                matches_initial_frame = numpy.array_equal(
+                    self._initial_fingerprints[chunk_name], fingerprint
+                ) and numpy.array_equal(initial_data, data)
+            if matches_initial_frame:
+                logger.debug('skipping data chunk, matches frame 0: ' + chunk_name)
                 return False
 
-        matches_default_value = False
+        if self._chunk_exists_frame_0.get(chunk_name, False):
+            return True
+
+        default = container._default_value[name]
         if name == 'types':
-            matches_default_value = data == container._default_value[name]
+            matches_default_value = data == default
+        elif fingerprint is None:
+            matches_default_value = numpy.array_equiv(data, default)
         else:
             matches_default_value = numpy.array_equiv(
-                data, container._default_value[name]
-            )
+                fingerprint, default
+            ) and numpy.array_equiv(data, default)
 
-        if matches_default_value and not self._chunk_exists_frame_0.get(
-            path + '/' + name, False
-        ):
-            logger.debug('skipping data chunk, default value: ' + path + '/' + name)
+        if matches_default_value:
+            logger.debug('skipping data chunk, default value: ' + chunk_name)
             return False
 
         return True
@@ -852,11 +1546,13 @@ class HOOMDTrajectory:
         for item in iterable:
             self.append(item)
 
-    def _read_frame(self, idx):
+    def _read_frame(self, idx, fields=None):
         """Read the frame at the given index from the file.
 
         Args:
             idx (int): Frame index to read.
+            fields (frozenset[str]): Chunk names to read, or ``None`` to read
+                all chunks.
 
         Returns:
             `Frame` with the frame data
@@ -864,103 +1560,128 @@ class HOOMDTrajectory:
         Replace any data chunks not present in the given frame with either data
         from frame 0, or initialize from default values if not in frame 0. Cache
         frame 0 data to avoid file read overhead. Return any default data as
-        non-writeable numpy arrays.
+        non-writeable numpy arrays. When *fields* is given, leave the fields
+        that are not named in it as ``None``.
         """
         if idx >= len(self):
             raise IndexError
 
         logger.debug('reading frame ' + str(idx) + ' from: ' + str(self.file))
 
-        if self._initial_frame is None and idx != 0:
-            self._read_frame(0)
+        if fields is None:
+            if self._initial_frame is None and idx != 0:
+                self._read_frame(0)
+            initial_frame = self._initial_frame
+            paths = None
+        else:
+            if fields not in self._initial_projections and idx != 0:
+                self._read_frame(0, fields)
+            initial_frame = self._initial_projections.get(fields)
+            paths = {field.partition('/')[0] for field in fields}
+
+        def selected(name):
+            return fields is None or name in fields
 
         frame = Frame()
+        if self._lazy:
+            chunks = _LazyChunks(self.file, idx)
+            for path in _LAZY_CONTAINERS:
+                getattr(frame, path)._loaders = {}
+            frame.state = _LazyDict()
+            frame.log = _LazyDict()
+        elif fields is None:
+            logged_data_names = self.file.find_matching_chunk_names('log/')
+            chunks = self.file.read_frame(
+                idx, names=_SCHEMA_CHUNK_NAMES + logged_data_names
+            )
+        else:
+            chunks = self.file.read_frame(idx, names=_field_chunk_names(fields))
+
         # read configuration first
-        if self.file.chunk_exists(frame=idx, name='configuration/step'):
-            step_arr = self.file.read_chunk(frame=idx, name='configuration/step')
+        if not selected('configuration/step'):
+            pass
+        elif 'configuration/step' in chunks:
+            step_arr = chunks['configuration/step']
             frame.configuration.step = step_arr[0]
 
             if idx == 0:
                 self._chunk_exists_frame_0['configuration/step'] = True
-        elif self._initial_frame is not None:
-            frame.configuration.step = self._initial_frame.configuration.step
+        elif initial_frame is not None:
+            frame.configuration.step = initial_frame.configuration.step
         else:
             frame.configuration.step = frame.configuration._default_value['step']
 
-        if self.file.chunk_exists(frame=idx, name='configuration/dimensions'):
-            dimensions_arr = self.file.read_chunk(
-                frame=idx, name='configuration/dimensions'
-            )
+        if not selected('configuration/dimensions'):
+            pass
+        elif 'configuration/dimensions' in chunks:
+            dimensions_arr = chunks['configuration/dimensions']
             frame.configuration.dimensions = dimensions_arr[0]
 
             if idx == 0:
                 self._chunk_exists_frame_0['configuration/dimensions'] = True
-        elif self._initial_frame is not None:
-            frame.configuration.dimensions = (
-                self._initial_frame.configuration.dimensions
-            )
+        elif initial_frame is not None:
+            frame.configuration.dimensions = initial_frame.configuration.dimensions
         else:
             frame.configuration.dimensions = frame.configuration._default_value[
                 'dimensions'
             ]
 
-        if self.file.chunk_exists(frame=idx, name='configuration/box'):
-            frame.configuration.box = self.file.read_chunk(
-                frame=idx, name='configuration/box'
-            )
+        if not selected('configuration/box'):
+            pass
+        elif 'configuration/box' in chunks:
+            frame.configuration.box = _detach(chunks['configuration/box'])
 
             if idx == 0:
                 self._chunk_exists_frame_0['configuration/box'] = True
-        elif self._initial_frame is not None:
-            frame.configuration.box = copy.copy(self._initial_frame.configuration.box)
+        elif initial_frame is not None:
+            frame.configuration.box = copy.copy(initial_frame.configuration.box)
         else:
             frame.configuration.box = copy.copy(
                 frame.configuration._default_value['box']
             )
 
         # then read all groups that have N, types, etc...
-        for path in [
-            'particles',
-            'bonds',
-            'angles',
-            'dihedrals',
-            'impropers',
-            'constraints',
-            'pairs',
-        ]:
+        for path in _LAZY_CONTAINERS:
+            if paths is not None and path not in paths:
+                continue
+
             container = getattr(frame, path)
-            if self._initial_frame is not None:
-                initial_frame_container = getattr(self._initial_frame, path)
+            if initial_frame is not None:
+                initial_frame_container = getattr(initial_frame, path)
 
             container.N = 0
-            if self.file.chunk_exists(frame=idx, name=path + '/N'):
-                N_arr = self.file.read_chunk(frame=idx, name=path + '/N')
+            if path + '/N' in chunks:
+                N_arr = chunks[path + '/N']
                 container.N = N_arr[0]
 
                 if idx == 0:
                     self._chunk_exists_frame_0[path + '/N'] = True
-            elif self._initial_frame is not None:
+            elif initial_frame is not None:
                 container.N = initial_frame_container.N
 
             # type names
-            if 'types' in container._default_value:
-                if self.file.chunk_exists(frame=idx, name=path + '/types'):
-                    tmp = self.file.read_chunk(frame=idx, name=path + '/types')
+            if 'types' in container._default_value and selected(path + '/types'):
+                if path + '/types' in chunks:
+                    tmp = chunks[path + '/types']
                     tmp = tmp.view(dtype=numpy.dtype((bytes, tmp.shape[1])))
                     tmp = tmp.reshape([tmp.shape[0]])
                     container.types = list(a.decode('UTF-8') for a in tmp)
 
                     if idx == 0:
                         self._chunk_exists_frame_0[path + '/types'] = True
-                elif self._initial_frame is not None:
+                elif initial_frame is not None:
                     container.types = copy.copy(initial_frame_container.types)
                 else:
                     container.types = copy.copy(container._default_value['types'])
 
             # type shapes
-            if 'type_shapes' in container._default_value and path == 'particles':
-                if self.file.chunk_exists(frame=idx, name=path + '/type_shapes'):
-                    tmp = self.file.read_chunk(frame=idx, name=path + '/type_shapes')
+            if (
+                'type_shapes' in container._default_value
+                and path == 'particles'
+                and selected(path + '/type_shapes')
+            ):
+                if path + '/type_shapes' in chunks:
+                    tmp = chunks[path + '/type_shapes']
                     tmp = tmp.view(dtype=numpy.dtype((bytes, tmp.shape[1])))
                     tmp = tmp.reshape([tmp.shape[0]])
                     container.type_shapes = list(
@@ -969,7 +1690,7 @@ class HOOMDTrajectory:
 
                     if idx == 0:
                         self._chunk_exists_frame_0[path + '/type_shapes'] = True
-                elif self._initial_frame is not None:
+                elif initial_frame is not None:
                     container.type_shapes = copy.copy(
                         initial_frame_container.type_shapes
                     )
@@ -983,57 +1704,148 @@ class HOOMDTrajectory:
                     continue
 
                 # per particle/bond quantities
-                if self.file.chunk_exists(frame=idx, name=path + '/' + name):
-                    container.__dict__[name] = self.file.read_chunk(
-                        frame=idx, name=path + '/' + name
-                    )
+                chunk_name = path + '/' + name
+                if not selected(chunk_name):
+                    continue
 
-                    if idx == 0:
-                        self._chunk_exists_frame_0[path + '/' + name] = True
+                if idx == 0 and (
+                    chunk_name in chunks or 'quantized/' + chunk_name in chunks
+                ):
+                    self._chunk_exists_frame_0[chunk_name] = True
+
+                default = container._default_value[name]
+                if self._lazy:
+                    del container.__dict__[name]
+                    container._loaders[name] = (
+                        lambda name=chunk_name, default=default, N=container.N: (
+                            self._read_field(chunks, name, default, N, initial_frame)
+                        )
+                    )
                 else:
-                    if (
-                        self._initial_frame is not None
-                        and initial_frame_container.N == container.N
-                    ):
-                        # read default from initial frame
-                        container.__dict__[name] = initial_frame_container.__dict__[
-                            name
-                        ]
-                    else:
-                        # initialize from default value
-                        tmp = numpy.array([container._default_value[name]])
-                        s = list(tmp.shape)
-                        s[0] = container.N
-                        container.__dict__[name] = numpy.empty(shape=s, dtype=tmp.dtype)
-                        container.__dict__[name][:] = tmp
-
-                    container.__dict__[name].flags.writeable = False
+                    container.__dict__[name] = self._read_field(
+                        chunks, chunk_name, default, container.N, initial_frame
+                    )
 
         # read state data
         for state in frame._valid_state:
-            if self.file.chunk_exists(frame=idx, name='state/' + state):
-                frame.state[state] = self.file.read_chunk(
-                    frame=idx, name='state/' + state
-                )
+            if selected('state/' + state) and 'state/' + state in chunks:
+                if self._lazy:
+                    frame.state.set_loader(
+                        state, lambda state=state: chunks['state/' + state]
+                    )
+                else:
+                    frame.state[state] = _detach(chunks['state/' + state])
 
         # read log data
-        logged_data_names = self.file.find_matching_chunk_names('log/')
+        if fields is None:
+            logged_data_names = self.file.find_matching_chunk_names('log/')
+        else:
+            logged_data_names = sorted(
+                field for field in fields if field.startswith('log/')
+            )
         for log in logged_data_names:
-            if self.file.chunk_exists(frame=idx, name=log):
-                frame.log[log[4:]] = self.file.read_chunk(frame=idx, name=log)
+            if log in chunks:
+                if self._lazy:
+                    frame.log.set_loader(log[4:], lambda log=log: chunks[log])
+                else:
+                    frame.log[log[4:]] = _detach(chunks[log])
 
                 if idx == 0:
                     self._chunk_exists_frame_0[log] = True
-            elif self._initial_frame is not None:
-                frame.log[log[4:]] = self._initial_frame.log[log[4:]]
-                frame.log[log[4:]].flags.writeable = False
+            elif initial_frame is not None and (
+                fields is None or log[4:] in initial_frame.log
+            ):
+                if self._lazy:
+                    frame.log.set_loader(
+                        log[4:],
+                        lambda log=log: self._read_initial_log(log, initial_frame),
+                    )
+                else:
+                    frame.log[log[4:]] = self._read_initial_log(log, initial_frame)
 
         # store initial frame
-        if self._initial_frame is None and idx == 0:
-            self._initial_frame = copy.deepcopy(frame)
+        if idx == 0:
+            self._reset_comparisons()
+            if fields is None and self._initial_frame is None:
+                self._initial_frame = copy.deepcopy(frame)
+            elif fields is not None and fields not in self._initial_projections:
+                self._initial_projections[fields] = copy.deepcopy(frame)
 
         return frame
 
+    def select(self, *fields):
+        """Select the fields to read from each frame.
+
+        Args:
+            fields (str): Names of the chunks to read, such as
+                ``'particles/position'``, ``'configuration/box'``,
+                ``'state/hpmc/sphere/radius'``, or ``'log/value'``.
+
+        Returns:
+            A view of the trajectory that reads only the named fields. Index,
+            slice, and iterate over the view as over the trajectory.
+
+        Frames read through the view leave the fields that are not named as
+        ``None`` (``N`` is always read for the selected containers). The view
+        reads the selected chunks of a frame with one call to
+        `gsd.fl.GSDFile.read_frame` and skips the lookups, reads, and default
+        values of all other fields.
+
+        Example::
+
+            for frame in trajectory.select('particles/position')[::10]:
+                analyze(frame.particles.position)
+        """
+        return _HOOMDTrajectoryView(self, range(len(self)), _check_fields(fields))
+
+    def writer(self, fields):
+        """Write frames with a fixed set of array fields.
+
+        Args:
+            fields (dict[str, tuple]): Shape and type of each field to write,
+                such as ``{'particles/position': (N, 3, 'f4')}``. The last
+                element of each tuple is the `numpy.dtype` and the others are
+                the dimensions.
+
+        Returns:
+            An object with a ``write(step=None, **arrays)`` method that appends
+            one frame with the given step and arrays to the file and an
+            ``append(frame)`` method that appends a `Frame` with the declared
+            fields.
+
+        `writer` checks the names, types, and shapes of the fields once.
+        ``write`` takes each array as a keyword argument named after the last
+        part of its chunk name (``position`` for ``'particles/position'``).
+        Fields that share the last part are named by the whole chunk name with
+        ``/`` replaced by ``_`` (``bonds_group`` for ``'bonds/group'``).
+        ``write`` converts arrays that do not have the declared type and shape
+        and writes the chunks directly to the file without building a `Frame`.
+        It writes the number of elements of each container implied by the
+        shapes and :chunk:`configuration/dimensions` implied by the box.
+
+        Like `append`, ``write`` skips the per-element and configuration
+        chunks that match frame 0 or the default values. The fields must be
+        arrays: write the type names and other scalar fields in frame 0 with
+        `append`.
+
+        ``append(frame)`` appends a `Frame` without calling `Frame.validate`.
+        It checks only that each declared field of the frame is a C-contiguous
+        `numpy.ndarray` with the declared type and shape and that each
+        container has the number of elements implied by the shapes. Use it
+        when building frames with the declared arrays at a high rate. Leave
+        the other array fields as ``None`` or set them to arrays with the
+        proper type and shape: ``append(frame)`` writes them unchecked.
+
+        Example::
+
+            writer = trajectory.writer(
+                {'particles/position': (N, 3, 'f4'), 'log/energy': (1, 'f8')}
+            )
+            for step in range(1000):
+                writer.write(step=step, position=position, energy=energy)
+        """
+        return _HOOMDTrajectoryWriter(self, fields)
+
     def __getitem__(self, key):
         """Index trajectory frames.
 
@@ -1043,23 +1855,39 @@ class HOOMDTrajectory:
         Warning:
             As you loop over frames, each frame is read from the file when it is
             reached in the iteration. Multiple passes may lead to multiple disk
-            reads if the file does not fit in cache.
+            reads if the file does not fit in cache. Set `cache_size` to keep
+            recently read frames in memory.
         """
         if isinstance(key, slice):
-            return _HOOMDTrajectoryView(self, range(*key.indices(len(self))))
+            return _HOOMDTrajectoryView(
+                self, range(*key.indices(len(self))), self._fields
+            )
+
+        return self._getitem(key, self._fields)
+
+    def _getitem(self, key, fields):
+        """Read the frame at an integer index.
 
+        Args:
+            key (int): Frame index, negative values count from the end.
+            fields (frozenset[str]): Chunk names to read, or ``None`` to read
+                all chunks.
+
+        Returns:
+            `Frame` with the frame data.
+        """
         if isinstance(key, int):
             if key < 0:
                 key += len(self)
             if key >= len(self) or key < 0:
                 raise IndexError()
-            return self._read_frame(key)
+            return self._read_frame_cached(key, fields)
 
         raise TypeError
 
     def __iter__(self):
         """Iterate over frames in the trajectory."""
-        return _HOOMDTrajectoryIterable(self, range(len(self)))
+        return _HOOMDTrajectoryIterable(self, range(len(self)), self._fields)
 
     def __enter__(self):
         """Enter the context manager."""
@@ -1074,7 +1902,18 @@ class HOOMDTrajectory:
         self._file.flush()
 
 
-def open(name, mode='r'):  # noqa: A001 - allow shadowing builtin open
+def open(  # noqa: A001
+    name,
+    mode='r',
+    compression=None,
+    quantize=None,
+    durability='fsync',
+    expected_frames=None,
+    preallocate=None,
+    cache_size=0,
+    lazy=False,
+    fields=None,
+):
     """Open a hoomd schema GSD file.
 
     The return value of `open` can be used as a context manager.
@@ -1082,6 +1921,22 @@ def open(name, mode='r'):  # noqa: A001 - allow shadowing builtin open
     Args:
         name (str): File name to open.
         mode (str): File open mode.
+        compression (list[str]): Compress chunks with names that match any of
+            these shell-style patterns (see `gsd.fl.open`).
+        quantize (dict[str, float]): Quantization step for each chunk to store
+            as fixed point integers (see `HOOMDTrajectory`).
+        durability (str): When to sync written data to the storage device
+            (see `gsd.fl.open`).
+        expected_frames (int): Expected number of frames in the file
+            (see `gsd.fl.open`).
+        preallocate (int): Size of the extents (in bytes) to reserve file
+            space in (see `gsd.fl.GSDFile.preallocate`).
+        cache_size (int): Total size (in bytes) of the arrays in the frames to
+            keep in memory (see `HOOMDTrajectory`).
+        lazy (bool): Set to ``True`` to read the fields of each frame when they
+            are first accessed (see `HOOMDTrajectory`).
+        fields (list[str]): Names of the chunks to read from each frame (see
+            `HOOMDTrajectory.select`).
 
     Returns:
         `HOOMDTrajectory` instance that accesses the file **name** with the
@@ -1110,6 +1965,21 @@ def open(name, mode='r'):  # noqa: A001 - allow shadowing builtin open
     |                  | Creates the file if it doesn't exist.       |
     +------------------+---------------------------------------------+
 
+    Tip:
+        Compress per-particle data to reduce the file size, for example with
+        ``compression=['particles/position', 'particles/velocity',
+        'particles/image']``.
+
+    Tip:
+        Quantize per-particle data that does not need full precision, such as
+        trajectories for visualization, with
+        ``quantize={'particles/position': 1e-3}``. Combine with
+        ``compression=['quantized/*']`` to reduce the file size further.
+
+    Tip:
+        On network file systems, open with ``durability='group'`` to sync once
+        per group of frames. Set ``trajectory.file.group_commit_frames`` and
+        ``trajectory.file.group_commit_interval`` to choose the group size.
     """
     if not fl_imported:
         msg = 'file layer module is not available'
@@ -1123,10 +1993,17 @@ def open(name, mode='r'):  # noqa: A001 - allow shadowing builtin open
         mode=mode,
         application='gsd.hoomd ' + gsd.version.version,
         schema='hoomd',
-        schema_version=[1, 4],
+        schema_version=[1, 5],
+        compression=compression,
+        durability=durability,
+        expected_frames=expected_frames,
     )
+    if preallocate is not None:
+        gsdfileobj.preallocate = preallocate
 
-    return HOOMDTrajectory(gsdfileobj)
+    return HOOMDTrajectory(
+        gsdfileobj, quantize=quantize, cache_size=cache_size, lazy=lazy, fields=fields
+    )
 
 
 def read_log(name, scalar_only=False):
@@ -1189,42 +2066,47 @@ def read_log(name, scalar_only=False):
             log_exists_frame_0 = gsdfileobj.chunk_exists(frame=0, name=log)
             is_configuration_step = log == 'configuration/step'
 
-            if log_exists_frame_0 or is_configuration_step:
-                if is_configuration_step and not log_exists_frame_0:
-                    # handle default configuration step on frame 0
-                    tmp = numpy.array([0], dtype=numpy.uint64)
-                else:
-                    tmp = gsdfileobj.read_chunk(frame=0, name=log)
-                    # if chunk contains string, put it in the numpy array
-                    if isinstance(tmp, str):
-                        tmp = numpy.array([tmp], dtype=numpy.dtypes.StringDType)
+            if not log_exists_frame_0 and not is_configuration_step:
+                continue
 
-                if scalar_only and not tmp.shape[0] == 1:
-                    continue
-                if tmp.shape[0] == 1:
-                    logged_data_dict[log] = numpy.full(
-                        fill_value=tmp[0],
-                        shape=(gsdfileobj.nframes,),
-                        dtype=tmp.dtype,
-                    )
-                else:
-                    logged_data_dict[log] = numpy.tile(
-                        tmp, (gsdfileobj.nframes, *tuple(1 for _ in tmp.shape))
-                    )
+            if is_configuration_step and not log_exists_frame_0:
+                # handle default configuration step on frame 0
+                tmp = numpy.array([0], dtype=numpy.uint64)
+            else:
+                tmp = gsdfileobj.read_chunk(frame=0, name=log)
 
-            for idx in range(1, gsdfileobj.nframes):
-                for key in logged_data_dict.keys():
-                    if not gsdfileobj.chunk_exists(frame=idx, name=key):
-                        continue
-                    data = gsdfileobj.read_chunk(frame=idx, name=key)
-                    if (
-                        not isinstance(
-                            logged_data_dict[key].dtype, numpy.dtypes.StringDType
-                        )
-                        and len(logged_data_dict[key][idx].shape) == 0
-                    ):
-                        logged_data_dict[key][idx] = data[0]
-                    else:
-                        logged_data_dict[key][idx] = data
+            if isinstance(tmp, str):
+                logged_data_dict[log] = _read_log_strings(gsdfileobj, log, tmp)
+                continue
+
+            if scalar_only and not tmp.shape[0] == 1:
+                continue
+
+            # Read the quantity from all frames at once and fill the frames
+            # where it is missing with the value from frame 0.
+            try:
+                series, mask = gsdfileobj.read_chunk_series(name=log)
+            except KeyError:
+                series = numpy.zeros((gsdfileobj.nframes, *tmp.shape), dtype=tmp.dtype)
+                mask = numpy.zeros(gsdfileobj.nframes, dtype=bool)
+            series[~mask] = tmp
+
+            if tmp.shape[0] == 1:
+                series = series[:, 0]
+            logged_data_dict[log] = series
 
     return logged_data_dict
+
+
+def _read_log_strings(gsdfileobj, log, value_0):
+    """Read a string log quantity from every frame of a file."""
+    result = numpy.full(
+        fill_value=value_0,
+        shape=(gsdfileobj.nframes,),
+        dtype=numpy.dtypes.StringDType,
+    )
+    for idx in range(1, gsdfileobj.nframes):
+        if gsdfileobj.chunk_exists(frame=idx, name=log):
+            result[idx] = gsdfileobj.read_chunk(frame=idx, name=log)
+
+    return result
@@ -23,6 +23,15 @@ cdef extern from "gsd.h" nogil:
         GSD_OPEN_READONLY
         GSD_OPEN_APPEND
 
+    cdef enum gsd_flag:
+        GSD_FLAG_COMPRESSED=1
+
+    cdef enum gsd_durability:
+        GSD_DURABILITY_FSYNC=0
+        GSD_DURABILITY_FDATASYNC
+        GSD_DURABILITY_GROUP
+        GSD_DURABILITY_NONE
+
     cdef enum gsd_error:
         GSD_SUCCESS = 0
         GSD_ERROR_IO = -1
@@ -66,15 +75,19 @@ cdef extern from "gsd.h" nogil:
         void *mapped_data
         size_t mapped_len
 
-    cdef struct gsd_name_id_map:
-        void *v
-        size_t size
-
     cdef struct gsd_write_buffer:
         char *data
         size_t size
         size_t reserved
 
+    cdef struct gsd_name_id_map:
+        uint16_t *slots
+        size_t size
+        void *v
+        size_t n_pairs
+        size_t reserved
+        gsd_write_buffer names
+
     cdef struct gsd_handle:
         int fd
         gsd_header header
@@ -115,11 +128,50 @@ cdef extern from "gsd.h" nogil:
                         uint8_t M,
                         uint8_t flags,
                         const void *data)
+    int gsd_write_chunk_borrowed(gsd_handle* handle,
+                                 const char *name,
+                                 gsd_type type,
+                                 uint64_t N,
+                                 uint32_t M,
+                                 uint8_t flags,
+                                 const void *data)
     const gsd_index_entry* gsd_find_chunk(gsd_handle* handle,
                                           uint64_t frame,
                                           const char *name)
+    int gsd_find_chunk_ids(gsd_handle* handle,
+                           const char* const* names,
+                           size_t n,
+                           uint16_t* ids)
+    int gsd_find_frame_chunks(gsd_handle* handle,
+                              uint64_t frame,
+                              const uint16_t* ids,
+                              size_t n,
+                              const gsd_index_entry** chunks)
     int gsd_read_chunk(gsd_handle* handle, void* data,
                        const gsd_index_entry* chunk)
+    int gsd_plan_frame_read(gsd_handle* handle,
+                            const gsd_index_entry* const* chunks,
+                            size_t n,
+                            uint64_t* offsets,
+                            uint64_t* size)
+    int gsd_read_frame(gsd_handle* handle,
+                       void* data,
+                       const gsd_index_entry* const* chunks,
+                       size_t n,
+                       const uint64_t* offsets)
+    int gsd_find_chunk_series(gsd_handle* handle,
+                              const char *name,
+                              const uint64_t* frames,
+                              size_t n,
+                              const gsd_index_entry** chunks)
+    int gsd_read_chunk_series(gsd_handle* handle,
+                              void* data,
+                              const gsd_index_entry* const* chunks,
+                              size_t n)
+    int gsd_find_chunk_entries(gsd_handle* handle,
+                               const char *name,
+                               const uint64_t** entries,
+                               size_t* n)
     uint64_t gsd_get_nframes(gsd_handle* handle)
     size_t gsd_sizeof_type(gsd_type type)
     const char *gsd_find_matching_chunk_name(gsd_handle* handle,
@@ -130,3 +182,22 @@ cdef extern from "gsd.h" nogil:
     int gsd_set_maximum_write_buffer_size(gsd_handle* handle, uint64_t size)
     uint64_t gsd_get_index_entries_to_buffer(gsd_handle* handle)
     int gsd_set_index_entries_to_buffer(gsd_handle* handle, uint64_t number)
+    gsd_durability gsd_get_durability(gsd_handle* handle)
+    int gsd_set_durability(gsd_handle* handle, gsd_durability durability)
+    uint64_t gsd_get_group_commit_frames(gsd_handle* handle)
+    int gsd_set_group_commit_frames(gsd_handle* handle, uint64_t number)
+    double gsd_get_group_commit_interval(gsd_handle* handle)
+    int gsd_set_group_commit_interval(gsd_handle* handle, double interval)
+    int gsd_reserve_index(gsd_handle* handle, uint64_t n_entries)
+    int gsd_reserve_names(gsd_handle* handle, uint64_t n_names)
+    uint64_t gsd_get_expected_frames(gsd_handle* handle)
+    int gsd_set_expected_frames(gsd_handle* handle, uint64_t number)
+    double gsd_get_index_growth_factor(gsd_handle* handle)
+    int gsd_set_index_growth_factor(gsd_handle* handle, double factor)
+    uint64_t gsd_get_preallocate_size(gsd_handle* handle)
+    int gsd_set_preallocate_size(gsd_handle* handle, uint64_t size)
+    int gsd_get_direct_io(gsd_handle* handle)
+    int gsd_set_direct_io(gsd_handle* handle, int enable)
+    int gsd_get_async(gsd_handle* handle)
+    int gsd_set_async(gsd_handle* handle, int enable)
+    int gsd_wait(gsd_handle* handle)
@@ -29,7 +29,9 @@ The :py:class:`GSDFile` in this module can be used with the
 
 """
 
+import fnmatch
 import logging
+import re
 import struct
 import sys
 from collections import namedtuple
@@ -52,6 +54,12 @@ gsd_header_struct = struct.Struct('QQQQQII64s64s80s')
 gsd_index_entry = namedtuple('gsd_index_entry', 'frame N location M id type flags')
 gsd_index_entry_struct = struct.Struct('QQqIHBB')
 
+gsd_codec_header = namedtuple('gsd_codec_header', 'compressed_size codec reserved')
+gsd_codec_header_struct = struct.Struct('QII')
+
+GSD_FLAG_COMPRESSED = 1
+GSD_CODEC_SHUFFLE_LZ = 1
+
 gsd_type_mapping = {
     1: ('uint8', numpy.dtype('uint8')),
     2: ('uint16', numpy.dtype('uint16')),
@@ -67,6 +75,71 @@ gsd_type_mapping = {
 }
 
 
+def _read_lz_length(src, pos, length):
+    """Read a LZ length continuation starting at ``src[pos]``."""
+    while True:
+        if pos >= len(src):
+            msg = 'Truncated compressed data'
+            raise RuntimeError(msg)
+        value = src[pos]
+        pos += 1
+        length += value
+        if value != 255:  # noqa: PLR2004
+            return pos, length
+
+
+def _lz_decompress(src, size):
+    """Decompress a stream written by the GSD LZ codec."""
+    dst = bytearray(size)
+    ip = 0
+    op = 0
+
+    while ip < len(src):
+        token = src[ip]
+        ip += 1
+
+        n_literals = token >> 4
+        if n_literals == 15:  # noqa: PLR2004
+            ip, n_literals = _read_lz_length(src, ip, n_literals)
+        if n_literals > len(src) - ip or n_literals > size - op:
+            msg = 'Invalid compressed data'
+            raise RuntimeError(msg)
+        dst[op : op + n_literals] = src[ip : ip + n_literals]
+        ip += n_literals
+        op += n_literals
+
+        # the last sequence has no match
+        if ip == len(src):
+            break
+
+        if len(src) - ip < 2:  # noqa: PLR2004
+            msg = 'Truncated compressed data'
+            raise RuntimeError(msg)
+        offset = src[ip] | (src[ip + 1] << 8)
+        ip += 2
+
+        match_length = token & 0xF
+        if match_length == 15:  # noqa: PLR2004
+            ip, match_length = _read_lz_length(src, ip, match_length)
+        match_length += 4
+
+        if offset == 0 or offset > op or match_length > size - op:
+            msg = 'Invalid compressed data'
+            raise RuntimeError(msg)
+
+        # overlapping matches repeat the last offset bytes
+        pattern = dst[op - offset : op]
+        repeats = match_length // offset + 1
+        dst[op : op + match_length] = (pattern * repeats)[:match_length]
+        op += match_length
+
+    if op != size:
+        msg = 'Invalid compressed data'
+        raise RuntimeError(msg)
+
+    return dst
+
+
 class GSDFile:
     """GSD file access interface.
 
@@ -186,7 +259,7 @@ class GSDFile:
         if entry.id >= len(self.__namelist):
             return False
 
-        if entry.flags != 0:
+        if (entry.flags & ~GSD_FLAG_COMPRESSED) != 0:
             return False
 
         return True
@@ -349,7 +422,10 @@ class GSDFile:
             return numpy.array([], dtype=gsd_type_mapping[chunk.type][1])
 
         self.__file.seek(chunk.location, 0)
-        data_raw = self.__file.read(size)
+        if chunk.flags & GSD_FLAG_COMPRESSED:
+            data_raw = self.__read_compressed(chunk)
+        else:
+            data_raw = self.__file.read(size)
 
         if len(data_raw) != size:
             raise OSError
@@ -365,21 +441,76 @@ class GSDFile:
 
         return data_npy.reshape([chunk.N, chunk.M])
 
-    def find_matching_chunk_names(self, match):
-        """Find chunk names in the file that start with the string *match*.
+    def read_frame(self, frame, names=None):
+        """Read several data chunks from a frame.
 
         Args:
-            match (str): Start of the chunk name to match
+            frame (int): Index of the frame to read.
+            names (list[str]): Names of the chunks to read. Set to ``None`` to
+                read all chunks in the frame.
 
         Returns:
-            list[str]: Matching chunk names
+            dict[str, numpy.ndarray]: Data read from the file, keyed by chunk
+            name. Chunks that are not present in the frame are omitted.
         """
-        result = []
-        for key in self.__namelist.keys():
-            if key.startswith(match):
-                result.append(key)
+        if not self.__is_open:
+            msg = 'File is not open'
+            raise ValueError(msg)
+
+        if names is None:
+            names = self.find_matching_chunk_names('')
+
+        return {
+            name: self.read_chunk(frame, name)
+            for name in names
+            if self._find_chunk(frame, name) is not None
+        }
+
+    def __read_compressed(self, chunk):
+        """Read and decompress the chunk at the current file position."""
+        header_raw = self.__file.read(gsd_codec_header_struct.size)
+        if len(header_raw) != gsd_codec_header_struct.size:
+            raise OSError
+        header = gsd_codec_header._make(gsd_codec_header_struct.unpack(header_raw))
+
+        if header.codec != GSD_CODEC_SHUFFLE_LZ:
+            msg = 'Unknown codec ' + str(header.codec) + ' in: ' + str(self.__file)
+            raise RuntimeError(msg)
+
+        compressed = self.__file.read(header.compressed_size)
+        if len(compressed) != header.compressed_size:
+            raise OSError
+
+        dtype = gsd_type_mapping[chunk.type][1]
+        data = _lz_decompress(compressed, chunk.N * chunk.M * dtype.itemsize)
+        if dtype.itemsize == 1:
+            return data
+
+        # reverse the byte shuffle
+        shuffled = numpy.frombuffer(data, dtype=numpy.uint8)
+        return shuffled.reshape([dtype.itemsize, chunk.N * chunk.M]).T.tobytes()
 
-        return result
+    def find_matching_chunk_names(self, match, syntax='prefix'):
+        """Find chunk names in the file that match *match*.
+
+        Args:
+            match (str): Pattern to match.
+            syntax (str): ``'prefix'``, ``'glob'``, or ``'regex'`` (see
+                `gsd.fl.GSDFile.find_matching_chunk_names`).
+
+        Returns:
+            list[str]: Matching chunk names
+        """
+        names = self.__namelist.keys()
+        if syntax == 'prefix':
+            return [name for name in names if name.startswith(match)]
+        if syntax == 'glob':
+            return [name for name in names if fnmatch.fnmatchcase(name, match)]
+        if syntax == 'regex':
+            regex = re.compile(match)
+            return [name for name in names if regex.fullmatch(name)]
+
+        raise ValueError('Invalid syntax: ' + str(syntax))
 
     def __getstate__(self):
         """Implement the pickle protocol."""
@@ -9,6 +9,7 @@ import platform
 import random
 import shutil
 import sys
+import time
 
 import numpy
 import pytest
@@ -17,7 +18,7 @@ import gsd.fl
 import gsd.pygsd
 
 test_path = pathlib.Path(os.path.realpath(__file__)).parent
-current_gsd_version = (2, 1)
+current_gsd_version = (2, 2)
 
 
 def test_create(tmp_path, open_mode):
@@ -670,6 +671,82 @@ def test_find_matching_chunk_names(tmp_path, open_mode):
         assert len(other_chunks) == 0
 
 
+def test_find_matching_chunk_names_syntax(tmp_path):
+    """Test prefix, glob, and regex chunk name queries."""
+    data = numpy.array([1, 2, 3, 4, 5], dtype=numpy.float32)
+    names = ['log/b', 'particles/N', 'log/a2', 'log/a1', 'log/c/x', 'logger']
+
+    with gsd.fl.open(
+        name=tmp_path / 'test.gsd',
+        mode='w',
+        application='test_find_matching_chunk_names_syntax',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        for name in names[:3]:
+            f.write_chunk(name=name, data=data)
+        f.end_frame()
+        assert f.find_matching_chunk_names('log/') == ['log/b', 'log/a2']
+
+        # the cached results include names added in later frames
+        for name in names[3:]:
+            f.write_chunk(name=name, data=data)
+        f.end_frame()
+        assert f.find_matching_chunk_names('log/') == [
+            'log/b',
+            'log/a2',
+            'log/a1',
+            'log/c/x',
+        ]
+
+    with gsd.fl.open(name=tmp_path / 'test.gsd', mode='r') as f:
+        assert f.find_matching_chunk_names('') == names
+        assert f.find_matching_chunk_names('log') == [
+            'log/b',
+            'log/a2',
+            'log/a1',
+            'log/c/x',
+            'logger',
+        ]
+        assert f.find_matching_chunk_names('log/a', syntax='prefix') == [
+            'log/a2',
+            'log/a1',
+        ]
+        assert f.find_matching_chunk_names('log/?', syntax='glob') == ['log/b']
+        assert f.find_matching_chunk_names('*/a*', syntax='glob') == [
+            'log/a2',
+            'log/a1',
+        ]
+        assert f.find_matching_chunk_names(r'log/a\d', syntax='regex') == [
+            'log/a2',
+            'log/a1',
+        ]
+        assert f.find_matching_chunk_names('logs?/.*', syntax='regex') == [
+            'log/b',
+            'log/a2',
+            'log/a1',
+            'log/c/x',
+        ]
+        assert f.find_matching_chunk_names('particles/N|logger', syntax='regex') == [
+            'particles/N',
+            'logger',
+        ]
+        assert f.find_matching_chunk_names('log/', syntax='regex') == []
+
+        with pytest.raises(ValueError):
+            f.find_matching_chunk_names('log/', syntax='other')
+
+    with gsd.pygsd.GSDFile(file=open(str(tmp_path / 'test.gsd'), mode='rb')) as f:
+        assert f.find_matching_chunk_names('*/a*', syntax='glob') == [
+            'log/a2',
+            'log/a1',
+        ]
+        assert f.find_matching_chunk_names(r'log/a\d', syntax='regex') == [
+            'log/a2',
+            'log/a1',
+        ]
+
+
 def test_chunk_name_limit(tmp_path, open_mode):
     """Test that providing more than the maximum allowed chunk names errors."""
     with gsd.fl.open(
@@ -1215,3 +1292,803 @@ def test_pending_index_entries(tmp_path):
         # All test chunks should be present in the file.
         for i in range(16):
             assert f.chunk_exists(name=str(i), frame=1)
+
+
+def test_read_chunk_no_copy(tmp_path):
+    """Test read_chunk with copy=False."""
+    data1d = numpy.array([1, 2, 3, 4, 5, 10012], dtype=numpy.int64)
+    data2d = numpy.array([[1, 2, 3], [4, 5, 6]], dtype=numpy.float32)
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_read_chunk_no_copy.gsd',
+        mode='w',
+        application='test_read_chunk_no_copy',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        f.write_chunk(name='data1d', data=data1d)
+        f.write_chunk(name='data2d', data=data2d)
+        f.write_chunk(name='data_zero', data=numpy.array([], dtype=numpy.float32))
+        f.write_chunk(name='string', data='test')
+        f.end_frame()
+
+        with pytest.raises(ValueError):
+            f.read_chunk(frame=0, name='data1d', copy=False)
+
+    with gsd.fl.open(name=tmp_path / 'test_read_chunk_no_copy.gsd', mode='r') as f:
+        read_data1d = f.read_chunk(frame=0, name='data1d', copy=False)
+        read_data2d = f.read_chunk(frame=0, name='data2d', copy=False)
+
+        assert read_data1d.dtype == data1d.dtype
+        assert not read_data1d.flags.writeable
+        numpy.testing.assert_array_equal(data1d, read_data1d)
+        assert read_data2d.shape == (2, 3)
+        numpy.testing.assert_array_equal(data2d, read_data2d)
+
+        assert f.read_chunk(frame=0, name='data_zero', copy=False).shape == (0,)
+        assert f.read_chunk(frame=0, name='string', copy=False) == 'test'
+
+        with pytest.raises(KeyError):
+            f.read_chunk(frame=1, name='data1d', copy=False)
+
+    # The arrays remain valid after the file is closed.
+    numpy.testing.assert_array_equal(data1d, read_data1d)
+    numpy.testing.assert_array_equal(data2d, read_data2d)
+
+
+@pytest.mark.parametrize(
+    'typ',
+    [
+        numpy.uint8,
+        numpy.uint16,
+        numpy.uint32,
+        numpy.uint64,
+        numpy.int8,
+        numpy.int16,
+        numpy.int32,
+        numpy.int64,
+        numpy.float32,
+        numpy.float64,
+    ],
+)
+def test_compression(tmp_path, typ):
+    """Test reading and writing compressed chunks."""
+    rng = numpy.random.default_rng(seed=10)
+    smooth = numpy.arange(0, 30000, dtype=typ).reshape([10000, 3])
+    noise = rng.integers(0, 100, size=[1000, 3]).astype(typ)
+    string = 'compressible ' * 100
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_compression.gsd',
+        mode='w',
+        application='test_compression',
+        schema='none',
+        schema_version=[1, 2],
+        compression=['particles/*', 'string'],
+    ) as f:
+        assert f.compression == ('particles/*', 'string')
+        f.maximum_write_buffer_size = 1024
+
+        for i in range(3):
+            f.write_chunk(name='particles/smooth', data=smooth)
+            f.write_chunk(name='particles/noise', data=noise)
+            f.write_chunk(name='particles/short', data=numpy.array([i], dtype=typ))
+            f.write_chunk(name='uncompressed', data=smooth)
+            f.write_chunk(name='string', data=string)
+            f.end_frame()
+
+        numpy.testing.assert_array_equal(
+            f.read_chunk(frame=0, name='particles/smooth'), smooth
+        )
+
+    with gsd.fl.open(name=tmp_path / 'test_compression.gsd', mode='r') as f:
+        assert f.compression == ()
+        for i in range(3):
+            for copy in (True, False):
+                numpy.testing.assert_array_equal(
+                    f.read_chunk(frame=i, name='particles/smooth', copy=copy), smooth
+                )
+                numpy.testing.assert_array_equal(
+                    f.read_chunk(frame=i, name='particles/noise', copy=copy), noise
+                )
+            numpy.testing.assert_array_equal(
+                f.read_chunk(frame=i, name='particles/short'), [i]
+            )
+            numpy.testing.assert_array_equal(
+                f.read_chunk(frame=i, name='uncompressed'), smooth
+            )
+            assert f.read_chunk(frame=i, name='string') == string
+
+    with gsd.pygsd.GSDFile(
+        file=open(str(tmp_path / 'test_compression.gsd'), mode='rb')
+    ) as f:
+        for i in range(3):
+            numpy.testing.assert_array_equal(
+                f.read_chunk(frame=i, name='particles/smooth'), smooth
+            )
+            numpy.testing.assert_array_equal(
+                f.read_chunk(frame=i, name='particles/noise'), noise
+            )
+            assert f.read_chunk(frame=i, name='string') == string
+
+    # Compression reduces the size of the file.
+    with gsd.fl.open(
+        name=tmp_path / 'test_compression_none.gsd',
+        mode='w',
+        application='test_compression',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        f.write_chunk(name='particles/smooth', data=smooth)
+        f.end_frame()
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_compression_all.gsd',
+        mode='w',
+        application='test_compression',
+        schema='none',
+        schema_version=[1, 2],
+        compression='*',
+    ) as f:
+        f.write_chunk(name='particles/smooth', data=smooth)
+        f.end_frame()
+
+    assert os.path.getsize(tmp_path / 'test_compression_all.gsd') < os.path.getsize(
+        tmp_path / 'test_compression_none.gsd'
+    )
+
+
+def test_read_frame(tmp_path, open_mode):
+    """Test reading all chunks in a frame at once."""
+    data1 = numpy.arange(10, dtype=numpy.uint8)
+    data2 = numpy.arange(30, dtype=numpy.float64).reshape([10, 3])
+    data3 = numpy.arange(300, dtype=numpy.int32).reshape([100, 3])
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_read_frame.gsd',
+        mode=open_mode.write,
+        application='test_read_frame',
+        schema='none',
+        schema_version=[1, 2],
+        compression=['compressed'],
+    ) as f:
+        f.write_chunk(name='chunk1', data=data1)
+        f.write_chunk(name='chunk2', data=data2)
+        f.write_chunk(name='compressed', data=data3)
+        f.write_chunk(name='string', data='a string')
+        f.end_frame()
+        f.write_chunk(name='chunk2', data=data2 * 2)
+        f.end_frame()
+
+        assert sorted(f.read_frame(frame=0)) == [
+            'chunk1',
+            'chunk2',
+            'compressed',
+            'string',
+        ]
+
+    with gsd.fl.open(name=tmp_path / 'test_read_frame.gsd', mode=open_mode.read) as f:
+        chunks = f.read_frame(frame=0)
+        assert sorted(chunks) == ['chunk1', 'chunk2', 'compressed', 'string']
+        numpy.testing.assert_array_equal(chunks['chunk1'], data1)
+        numpy.testing.assert_array_equal(chunks['chunk2'], data2)
+        numpy.testing.assert_array_equal(chunks['compressed'], data3)
+        assert chunks['string'] == 'a string'
+        assert chunks['chunk2'].dtype == numpy.float64
+
+        chunks = f.read_frame(frame=1)
+        assert list(chunks) == ['chunk2']
+        numpy.testing.assert_array_equal(chunks['chunk2'], data2 * 2)
+
+        chunks = f.read_frame(frame=0, names=['chunk2', 'missing'])
+        assert list(chunks) == ['chunk2']
+
+        assert f.read_frame(frame=0, names=[]) == {}
+
+        assert f.read_frame(frame=2) == {}
+
+
+def test_read_frame_new_names(tmp_path):
+    """Test that read_frame finds names added after a previous read."""
+    with gsd.fl.open(
+        name=tmp_path / 'test_read_frame_new_names.gsd',
+        mode='w',
+        application='test_read_frame_new_names',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        f.write_chunk(name='chunk1', data=numpy.array([1]))
+        f.end_frame()
+
+        assert list(f.read_frame(frame=0, names=['chunk1', 'chunk2'])) == ['chunk1']
+        assert list(f.read_frame(frame=0)) == ['chunk1']
+
+        f.write_chunk(name='chunk2', data=numpy.array([2]))
+        f.end_frame()
+
+        assert f.read_frame(frame=1, names=['chunk1', 'chunk2']) == {
+            'chunk2': numpy.array([2])
+        }
+        assert list(f.read_frame(frame=1)) == ['chunk2']
+        assert f.read_frame(frame=2) == {}
+
+        # existing names keep the cached plans, new names replace them
+        f.write_chunk(name='chunk1', data=numpy.array([4]))
+        f.write_chunk(name='chunk3', data=numpy.array([5]))
+        f.end_frame()
+
+        assert f.read_frame(frame=2, names=['chunk1', 'chunk2', 'chunk3']) == {
+            'chunk1': numpy.array([4]),
+            'chunk3': numpy.array([5]),
+        }
+        assert f.find_matching_chunk_names('chunk') == ['chunk1', 'chunk2', 'chunk3']
+
+        f.truncate()
+        f.write_chunk(name='chunk2', data=numpy.array([3]))
+        f.end_frame()
+
+        assert f.read_frame(frame=0, names=['chunk1', 'chunk2']) == {
+            'chunk2': numpy.array([3])
+        }
+
+
+def test_read_chunk_series(tmp_path, open_mode):
+    """Test reading a chunk from many frames into one array."""
+    data = numpy.arange(30, dtype=numpy.float32).reshape([10, 3])
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_read_chunk_series.gsd',
+        mode=open_mode.write,
+        application='test_read_chunk_series',
+        schema='none',
+        schema_version=[1, 2],
+        compression=['compressed'],
+    ) as f:
+        for i in range(5):
+            if i != 2:
+                f.write_chunk(name='chunk', data=data * i)
+                f.write_chunk(name='compressed', data=data[:, 0] + i)
+            f.write_chunk(name='changes', data=numpy.zeros(i + 1))
+            f.write_chunk(name='string', data='a string')
+            f.end_frame()
+
+        series, mask = f.read_chunk_series(name='chunk')
+        assert series.shape == (5, 10, 3)
+        numpy.testing.assert_array_equal(mask, [True, True, False, True, True])
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_read_chunk_series.gsd', mode=open_mode.read
+    ) as f:
+        series, mask = f.read_chunk_series(name='chunk')
+        assert series.dtype == numpy.float32
+        numpy.testing.assert_array_equal(mask, [True, True, False, True, True])
+        for i in [0, 1, 3, 4]:
+            numpy.testing.assert_array_equal(series[i], data * i)
+        numpy.testing.assert_array_equal(series[2], 0)
+
+        series, mask = f.read_chunk_series(name='compressed', frames=[4, 2, 0])
+        assert series.shape == (3, 10)
+        numpy.testing.assert_array_equal(mask, [True, False, True])
+        numpy.testing.assert_array_equal(series[0], data[:, 0] + 4)
+        numpy.testing.assert_array_equal(series[2], data[:, 0])
+
+        out = numpy.full((2, 10, 3), -1, dtype=numpy.float32)
+        result, mask = f.read_chunk_series(name='chunk', frames=[2, 3], out=out)
+        assert result is out
+        numpy.testing.assert_array_equal(out[0], -1)
+        numpy.testing.assert_array_equal(out[1], data * 3)
+
+        with pytest.raises(ValueError):
+            f.read_chunk_series(name='chunk', frames=[2, 3], out=out[:, :5])
+        with pytest.raises(ValueError):
+            f.read_chunk_series(name='changes')
+        with pytest.raises(ValueError):
+            f.read_chunk_series(name='string')
+        with pytest.raises(KeyError):
+            f.read_chunk_series(name='missing')
+        with pytest.raises(IndexError):
+            f.read_chunk_series(name='chunk', frames=[5])
+
+        with pytest.raises(KeyError):
+            f.read_chunk_series(name='chunk', frames=[2])
+
+
+def test_read_chunk_series_runs(tmp_path):
+    """Test reading series of chunks stored close together and far apart."""
+    small = numpy.arange(4, dtype=numpy.int64)
+    large = numpy.arange(30000, dtype=numpy.float64)
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_read_chunk_series_runs.gsd',
+        mode='w',
+        application='test_read_chunk_series_runs',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        for i in range(100):
+            f.write_chunk(name='small', data=small + i)
+            f.write_chunk(name='large', data=large + i)
+            if i % 10 == 0:
+                f.write_chunk(name='spacer', data=numpy.zeros(1000))
+            f.end_frame()
+
+    with gsd.fl.open(name=tmp_path / 'test_read_chunk_series_runs.gsd', mode='r') as f:
+        series, mask = f.read_chunk_series(name='small')
+        assert mask.all()
+        numpy.testing.assert_array_equal(series, small + numpy.arange(100)[:, None])
+
+        series, mask = f.read_chunk_series(name='large')
+        assert mask.all()
+        numpy.testing.assert_array_equal(series, large + numpy.arange(100)[:, None])
+
+        frames = [99, 5, 5, 6, 50, 7]
+        series, mask = f.read_chunk_series(name='small', frames=frames)
+        numpy.testing.assert_array_equal(series, small + numpy.array(frames)[:, None])
+
+
+def test_frames_with_chunk(tmp_path, open_mode):
+    """Test finding the frames that have a chunk."""
+    with gsd.fl.open(
+        name=tmp_path / 'test_frames_with_chunk.gsd',
+        mode=open_mode.write,
+        application='test_frames_with_chunk',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        for i in range(10):
+            f.write_chunk(name='every', data=numpy.array([i]))
+            if i % 4 == 0:
+                f.write_chunk(name='sparse', data=numpy.array([i]))
+            f.end_frame()
+
+        numpy.testing.assert_array_equal(f.frames_with_chunk('sparse'), [0, 4, 8])
+
+        f.write_chunk(name='sparse', data=numpy.array([10]))
+        f.write_chunk(name='new', data=numpy.array([10]))
+        f.end_frame()
+
+        numpy.testing.assert_array_equal(f.frames_with_chunk('sparse'), [0, 4, 8, 10])
+        numpy.testing.assert_array_equal(f.frames_with_chunk('new'), [10])
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_frames_with_chunk.gsd', mode=open_mode.read
+    ) as f:
+        frames = f.frames_with_chunk('every')
+        assert frames.dtype == numpy.uint64
+        numpy.testing.assert_array_equal(frames, numpy.arange(10))
+        numpy.testing.assert_array_equal(f.frames_with_chunk('sparse'), [0, 4, 8, 10])
+        assert len(f.frames_with_chunk('missing')) == 0
+
+        series, mask = f.read_chunk_series('sparse', frames=[10, 9, 8])
+        numpy.testing.assert_array_equal(mask, [True, False, True])
+        numpy.testing.assert_array_equal(series[:, 0], [10, 0, 8])
+
+
+def test_index(tmp_path, open_mode):
+    """Test the index and names attributes."""
+    with gsd.fl.open(
+        name=tmp_path / 'test_index.gsd',
+        mode=open_mode.write,
+        application='test_index',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        f.write_chunk(name='chunk1', data=numpy.arange(10, dtype=numpy.float32))
+        f.write_chunk(name='chunk2', data=numpy.zeros((4, 3), dtype=numpy.uint8))
+        f.end_frame()
+        f.write_chunk(name='chunk2', data=numpy.zeros((5, 3), dtype=numpy.uint8))
+        f.end_frame()
+
+        assert len(f.index) == 3
+
+    with gsd.fl.open(name=tmp_path / 'test_index.gsd', mode=open_mode.read) as f:
+        index = f.index
+        names = f.names
+        assert not index.flags.writeable
+        assert list(names) == ['chunk1', 'chunk2']
+        numpy.testing.assert_array_equal(index['frame'], [0, 0, 1])
+        assert list(names[index['id']]) == ['chunk1', 'chunk2', 'chunk2']
+        numpy.testing.assert_array_equal(index['N'], [10, 4, 5])
+        numpy.testing.assert_array_equal(index['M'], [1, 3, 3])
+        numpy.testing.assert_array_equal(index['flags'], 0)
+
+        for entry, name in zip(index, names[index['id']]):
+            data = f.read_chunk(frame=entry['frame'], name=name)
+            assert data.size == entry['N'] * entry['M']
+            assert data.dtype.itemsize == gsd.fl._numpy_dtype[entry['type']].itemsize
+
+
+def test_find_chunk_many_frames(tmp_path, open_mode):
+    """Test chunk lookups in files with many frames, including empty ones."""
+    nframes = 2000
+
+    def chunks_in_frame(i):
+        names = []
+        if i % 3 != 0:
+            names.append('a')
+        if i % 5 != 0:
+            names.append('b')
+        if i % 7 == 0:
+            names.append('c')
+        return names
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_find_chunk_many_frames.gsd',
+        mode=open_mode.write,
+        application='test_find_chunk_many_frames',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        f.index_entries_to_buffer = 16
+        for i in range(nframes):
+            for name in chunks_in_frame(i):
+                f.write_chunk(name=name, data=numpy.array([i], dtype=numpy.int64))
+            f.end_frame()
+
+            # look up chunks in earlier frames while the file grows
+            if i % 100 == 0 and open_mode.write != 'a':
+                j = i // 2
+                assert f.chunk_exists(frame=j, name='a') == ('a' in chunks_in_frame(j))
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_find_chunk_many_frames.gsd', mode=open_mode.read
+    ) as f:
+        assert f.nframes == nframes
+        frames = list(range(nframes))
+        random.Random(4).shuffle(frames)
+        for i in frames:
+            for name in ('a', 'b', 'c'):
+                exists = name in chunks_in_frame(i)
+                assert f.chunk_exists(frame=i, name=name) == exists
+                if exists:
+                    assert f.read_chunk(frame=i, name=name)[0] == i
+
+
+@pytest.mark.parametrize('durability', ['fsync', 'fdatasync', 'group', 'none'])
+def test_durability(tmp_path, durability):
+    """Test writing files with each durability policy."""
+    with gsd.fl.open(
+        name=tmp_path / 'test_durability.gsd',
+        mode='w',
+        application='test_durability',
+        schema='none',
+        schema_version=[1, 2],
+        durability=durability,
+    ) as f:
+        assert f.durability == durability
+        f.maximum_write_buffer_size = 1024
+        f.group_commit_frames = 4
+        assert f.group_commit_frames == 4
+        f.group_commit_interval = 1000
+        assert f.group_commit_interval == 1000
+
+        for i in range(10):
+            f.write_chunk(name='data', data=numpy.arange(1000, dtype=numpy.int64) + i)
+            f.end_frame()
+
+        with gsd.fl.open(name=tmp_path / 'test_durability.gsd', mode='r') as reader:
+            if durability == 'group':
+                assert reader.nframes == 8
+            else:
+                assert reader.nframes == 10
+
+    with gsd.fl.open(name=tmp_path / 'test_durability.gsd', mode='r') as f:
+        assert f.nframes == 10
+        for i in range(10):
+            numpy.testing.assert_array_equal(
+                f.read_chunk(frame=i, name='data'), numpy.arange(1000) + i
+            )
+
+
+def test_durability_invalid(tmp_path):
+    """Test that invalid durability settings raise errors."""
+    with pytest.raises(ValueError):
+        gsd.fl.open(
+            name=tmp_path / 'test_durability_invalid.gsd',
+            mode='w',
+            application='test_durability_invalid',
+            schema='none',
+            schema_version=[1, 2],
+            durability='sometimes',
+        )
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_durability_invalid.gsd',
+        mode='w',
+        application='test_durability_invalid',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        assert f.durability == 'fsync'
+        with pytest.raises(ValueError):
+            f.durability = 'always'
+        with pytest.raises(RuntimeError):
+            f.group_commit_frames = 0
+        with pytest.raises(RuntimeError):
+            f.group_commit_interval = 0
+
+
+def test_group_commit_interval(tmp_path):
+    """Test that the group commit interval flushes after less than a second."""
+    with gsd.fl.open(
+        name=tmp_path / 'test_group_commit_interval.gsd',
+        mode='w',
+        application='test_group_commit_interval',
+        schema='none',
+        schema_version=[1, 2],
+        durability='group',
+    ) as f:
+        f.group_commit_frames = 1000
+        f.group_commit_interval = 0.05
+
+        f.write_chunk(name='data', data=numpy.array([0], dtype=numpy.int64))
+        f.end_frame()
+        time.sleep(0.1)
+        f.write_chunk(name='data', data=numpy.array([1], dtype=numpy.int64))
+        f.end_frame()
+
+        with gsd.fl.open(
+            name=tmp_path / 'test_group_commit_interval.gsd', mode='r'
+        ) as reader:
+            assert reader.nframes == 2
+
+
+def test_expected_sizes(tmp_path):
+    """Test that size hints reduce the unused space left by growing the index."""
+    nframes = 500
+    names = [f'log/quantity{i}' for i in range(40)]
+
+    def write(fname, **kwargs):
+        with gsd.fl.open(
+            name=tmp_path / fname,
+            mode='w',
+            application='test_expected_sizes',
+            schema='none',
+            schema_version=[1, 2],
+            **kwargs,
+        ) as f:
+            f.index_entries_to_buffer = 64
+            for i in range(nframes):
+                for name in names:
+                    f.write_chunk(name=name, data=numpy.array([i], dtype=numpy.int32))
+                f.end_frame()
+
+        with gsd.fl.open(name=tmp_path / fname, mode='r') as f:
+            assert f.nframes == nframes
+            assert sorted(f.find_matching_chunk_names('')) == sorted(names)
+            for i in (0, nframes // 2, nframes - 1):
+                for name in names:
+                    assert f.read_chunk(frame=i, name=name)[0] == i
+
+        return os.path.getsize(tmp_path / fname)
+
+    size_default = write('default.gsd')
+    assert write('expected_frames.gsd', expected_frames=nframes) < size_default
+    assert (
+        write(
+            'expected_entries.gsd',
+            expected_index_entries=nframes * len(names),
+            expected_names=len(names),
+        )
+        < size_default
+    )
+
+    with gsd.fl.open(
+        name=tmp_path / 'growth.gsd',
+        mode='w',
+        application='test_expected_sizes',
+        schema='none',
+        schema_version=[1, 2],
+        expected_frames=10,
+    ) as f:
+        assert f.expected_frames == 10
+        assert f.index_growth_factor == 2.0
+        f.index_growth_factor = 1.5
+        assert f.index_growth_factor == 1.5
+        with pytest.raises(RuntimeError):
+            f.index_growth_factor = 1.0
+
+
+def test_preallocate(tmp_path):
+    """Test writing files with preallocated space."""
+    data = numpy.arange(10000, dtype=numpy.float64)
+    preallocate = 2**24
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_preallocate.gsd',
+        mode='w',
+        application='test_preallocate',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        assert f.preallocate == 0
+        f.preallocate = preallocate
+        assert f.preallocate == preallocate
+        f.maximum_write_buffer_size = 1024
+
+        for i in range(10):
+            f.write_chunk(name='data', data=data + i)
+            f.end_frame()
+
+    stat = os.stat(tmp_path / 'test_preallocate.gsd')
+    assert stat.st_size < preallocate
+    if platform.system() == 'Linux':
+        # close releases the unused space
+        assert stat.st_blocks * 512 < preallocate
+
+    with gsd.fl.open(name=tmp_path / 'test_preallocate.gsd', mode='r') as f:
+        assert f.nframes == 10
+        for i in range(10):
+            numpy.testing.assert_array_equal(
+                f.read_chunk(frame=i, name='data'), data + i
+            )
+
+        with pytest.raises(RuntimeError):
+            f.preallocate = preallocate
+
+
+@pytest.mark.parametrize('offset', [0, 1])
+def test_direct_io(tmp_path, offset):
+    """Test writing and reading large chunks with direct I/O."""
+    # offset the data in memory to test both aligned and unaligned buffers
+    buffer = numpy.arange(300000 + offset, dtype=numpy.uint8)
+    data = buffer[offset:]
+    small = numpy.arange(100, dtype=numpy.float32)
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_direct_io.gsd',
+        mode='w',
+        application='test_direct_io',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        assert not f.direct_io
+        try:
+            f.direct_io = True
+        except (OSError, RuntimeError):
+            pytest.skip('Direct I/O is not supported.')
+        assert f.direct_io
+        f.maximum_write_buffer_size = 65536
+
+        for i in range(3):
+            f.write_chunk(name='small', data=small + i)
+            f.write_chunk(name='large', data=data + i)
+            f.end_frame()
+
+        numpy.testing.assert_array_equal(f.read_chunk(frame=1, name='large'), data + 1)
+        f.direct_io = False
+        assert not f.direct_io
+
+    with gsd.fl.open(name=tmp_path / 'test_direct_io.gsd', mode='r') as f:
+        f.direct_io = True
+        f.maximum_write_buffer_size = 65536
+        for i in range(3):
+            numpy.testing.assert_array_equal(
+                f.read_chunk(frame=i, name='small'), small + i
+            )
+            numpy.testing.assert_array_equal(
+                f.read_chunk(frame=i, name='large'), data + i
+            )
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith('win'), reason='Async writes are not available on Windows.'
+)
+def test_asynchronous(tmp_path):
+    """Test writing frames in a background thread."""
+    data = numpy.zeros(shape=(1000, 3), dtype=numpy.float32)
+    large = numpy.arange(100000, dtype=numpy.int64)
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_asynchronous.gsd',
+        mode='w',
+        application='test_asynchronous',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        assert not f.asynchronous
+        f.asynchronous = True
+        assert f.asynchronous
+        f.maximum_write_buffer_size = 65536
+
+        for i in range(20):
+            # write_chunk copies the data, so the caller may reuse the array
+            data[:] = i
+            f.write_chunk(name='data', data=data)
+            f.write_chunk(name='large', data=large + i)
+            f.end_frame()
+            assert f.nframes == i + 1
+
+        numpy.testing.assert_array_equal(f.read_chunk(frame=5, name='data'), 5)
+        assert f.nframes == 20
+
+        f.write_chunk(name='data', data=data)
+        f.wait()
+        f.end_frame()
+        f.asynchronous = False
+        assert not f.asynchronous
+        f.write_chunk(name='data', data=data)
+        f.end_frame()
+
+    with gsd.fl.open(name=tmp_path / 'test_asynchronous.gsd', mode='r') as f:
+        assert f.nframes == 22
+        for i in range(20):
+            numpy.testing.assert_array_equal(f.read_chunk(frame=i, name='data'), i)
+            numpy.testing.assert_array_equal(
+                f.read_chunk(frame=i, name='large'), large + i
+            )
+        assert not f.chunk_exists(frame=20, name='large')
+        numpy.testing.assert_array_equal(f.read_chunk(frame=21, name='data'), 19)
+
+        with pytest.raises(RuntimeError):
+            f.asynchronous = True
+
+
+def test_write_chunk_borrow(tmp_path):
+    """Test writing chunks without copying them into the write buffer."""
+    data = numpy.zeros(shape=(1000, 3), dtype=numpy.float32)
+    small = numpy.zeros(10, dtype=numpy.uint16)
+    large = numpy.zeros(20000, dtype=numpy.int64)
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_write_chunk_borrow.gsd',
+        mode='w',
+        application='test_write_chunk_borrow',
+        schema='none',
+        schema_version=[1, 2],
+        compression=['compressed'],
+    ) as f:
+        f.maximum_write_buffer_size = 65536
+
+        for i in range(10):
+            # the arrays are reused after end_frame returns
+            data[:] = i
+            small[:] = i
+            large[:] = i
+            f.write_chunk(name='copied', data=small)
+            f.write_chunk(name='data', data=data, borrow=True)
+            f.write_chunk(name='small', data=small, borrow=True)
+            f.write_chunk(name='compressed', data=data, borrow=True)
+            f.write_chunk(name='large', data=large, borrow=True)
+            f.write_chunk(name='string', data='frame ' + str(i), borrow=True)
+            f.end_frame()
+
+    with gsd.fl.open(name=tmp_path / 'test_write_chunk_borrow.gsd', mode='r') as f:
+        assert f.nframes == 10
+        for i in range(10):
+            numpy.testing.assert_array_equal(f.read_chunk(frame=i, name='copied'), i)
+            numpy.testing.assert_array_equal(f.read_chunk(frame=i, name='data'), i)
+            numpy.testing.assert_array_equal(f.read_chunk(frame=i, name='small'), i)
+            numpy.testing.assert_array_equal(
+                f.read_chunk(frame=i, name='compressed'), i
+            )
+            numpy.testing.assert_array_equal(f.read_chunk(frame=i, name='large'), i)
+            assert f.read_chunk(frame=i, name='string') == 'frame ' + str(i)
+
+
+def test_write_chunk_borrow_batches_index(tmp_path):
+    """Test that borrowed chunks do not flush the index every frame."""
+    data = numpy.zeros(shape=(100, 3), dtype=numpy.float32)
+
+    with gsd.fl.open(
+        name=tmp_path / 'test_borrow_batches_index.gsd',
+        mode='w',
+        application='test_borrow_batches_index',
+        schema='none',
+        schema_version=[1, 2],
+    ) as f:
+        for i in range(10):
+            data[:] = i
+            f.write_chunk(name='data', data=data, borrow=True)
+            f.end_frame()
+
+        # the index entries are buffered like those of copied chunks
+        with gsd.fl.open(
+            name=tmp_path / 'test_borrow_batches_index.gsd', mode='r'
+        ) as g:
+            assert g.nframes == 0
+
+    with gsd.fl.open(name=tmp_path / 'test_borrow_batches_index.gsd', mode='r') as f:
+        assert f.nframes == 10
+        for i in range(10):
+            numpy.testing.assert_array_equal(f.read_chunk(frame=i, name='data'), i)
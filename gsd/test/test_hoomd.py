@@ -970,6 +970,32 @@ def test_read_log(tmp_path):
     )
 
 
+def test_read_log_many_frames(tmp_path):
+    """Test that read_log fills missing frames with the frame 0 value."""
+    frames = []
+    for i in range(20):
+        frame = gsd.hoomd.Frame()
+        frame.configuration.step = i * 10
+        if i % 3 == 0:
+            frame.log['value/energy'] = [float(i)]
+            frame.log['particles/charge'] = [i, -i, 2 * i]
+        frames.append(frame)
+
+    with gsd.hoomd.open(name=tmp_path / 'test_log.gsd', mode='w') as hf:
+        hf.extend(frames)
+
+    logged_data_dict = gsd.hoomd.read_log(name=tmp_path / 'test_log.gsd')
+    expected = [float(i) if i % 3 == 0 else 0.0 for i in range(20)]
+    numpy.testing.assert_array_equal(
+        logged_data_dict['configuration/step'], numpy.arange(20) * 10
+    )
+    numpy.testing.assert_array_equal(logged_data_dict['log/value/energy'], expected)
+    assert logged_data_dict['log/particles/charge'].shape == (20, 3)
+    numpy.testing.assert_array_equal(
+        logged_data_dict['log/particles/charge'][:, 1], [-e for e in expected]
+    )
+
+
 def test_read_log_warning(tmp_path):
     """Test that read_log issues a warning."""
     frame = gsd.hoomd.Frame()
@@ -1074,3 +1100,584 @@ def test_initial_frame_copy(tmp_path, open_mode):
         for key in frame_1.log.keys():
             assert frame_1.log[key] is initial.log[key]
             assert not frame_1.log[key].flags.writeable
+
+
+def test_compression(tmp_path):
+    """Test that compressed particle data round trips."""
+    frame = gsd.hoomd.Frame()
+    frame.particles.N = 1000
+    frame.particles.position = numpy.linspace(
+        -10, 10, 3000, dtype=numpy.float32
+    ).reshape([1000, 3])
+    frame.particles.image = numpy.zeros([1000, 3], dtype=numpy.int32)
+
+    with gsd.hoomd.open(
+        name=tmp_path / 'test_compression.gsd',
+        mode='w',
+        compression=['particles/position', 'particles/image'],
+    ) as hf:
+        assert hf.file.compression == ('particles/position', 'particles/image')
+        hf.extend([frame, frame])
+
+    with gsd.hoomd.open(name=tmp_path / 'test_compression.gsd', mode='r') as hf:
+        for read_frame in hf:
+            numpy.testing.assert_array_equal(
+                read_frame.particles.position, frame.particles.position
+            )
+            numpy.testing.assert_array_equal(
+                read_frame.particles.image, frame.particles.image
+            )
+
+
+def test_quantize(tmp_path):
+    """Test that quantized particle data round trips within the step."""
+    rng = numpy.random.default_rng(seed=5)
+    frame = gsd.hoomd.Frame()
+    frame.configuration.box = [20, 20, 20, 0, 0, 0]
+    frame.particles.N = 1000
+    frame.particles.position = rng.uniform(-10, 10, size=[1000, 3]).astype(
+        numpy.float32
+    )
+    frame.particles.velocity = rng.normal(size=[1000, 3]).astype(numpy.float32)
+    frame.particles.mass = rng.uniform(1, 2, size=1000).astype(numpy.float32)
+    quantize = {
+        'particles/position': 1e-3,
+        'particles/velocity': 1e-2,
+        'particles/mass': 1e-4,
+    }
+
+    with gsd.hoomd.open(
+        name=tmp_path / 'test_quantize.gsd', mode='w', quantize=quantize
+    ) as hf:
+        hf.append(frame)
+        frame.configuration.step = 1
+        hf.append(frame)
+        frame.particles.position = frame.particles.position + 1
+        frame.configuration.step = 2
+        hf.append(frame)
+
+    with gsd.hoomd.open(name=tmp_path / 'test_quantize.gsd', mode='r') as hf:
+        assert not hf.file.chunk_exists(frame=0, name='particles/position')
+        position = hf.file.read_chunk(frame=0, name='quantized/particles/position')
+        assert position.dtype == numpy.int16
+        # Unchanged values are not written again.
+        assert not hf.file.chunk_exists(frame=1, name='quantized/particles/position')
+        assert hf.file.chunk_exists(frame=2, name='quantized/particles/position')
+
+        for name, step in quantize.items():
+            data = getattr(frame.particles, name.split('/')[1])
+            read_data = getattr(hf[2].particles, name.split('/')[1])
+            assert read_data.dtype == numpy.float32
+            assert read_data.shape == data.shape
+            numpy.testing.assert_allclose(read_data, data, rtol=0, atol=step)
+
+
+def test_quantize_sub_step(tmp_path):
+    """Test that frames skipped as unchanged stay within half of the step."""
+    frame = gsd.hoomd.Frame()
+    frame.configuration.box = [10, 10, 10, 0, 0, 0]
+    frame.particles.N = 1
+
+    with gsd.hoomd.open(
+        name=tmp_path / 'test_quantize_sub_step.gsd',
+        mode='w',
+        quantize={'particles/position': 0.1},
+    ) as hf:
+        for x in (0.0, 0.09, 0.04):
+            frame.particles.position = [[x, 0, 0]]
+            hf.append(frame)
+
+    with gsd.hoomd.open(name=tmp_path / 'test_quantize_sub_step.gsd', mode='r') as hf:
+        assert hf.file.chunk_exists(frame=1, name='quantized/particles/position')
+        assert not hf.file.chunk_exists(frame=2, name='quantized/particles/position')
+        for x, frame in zip((0.0, 0.09, 0.04), hf):
+            assert abs(frame.particles.position[0, 0] - x) <= 0.05 + 1e-6
+
+
+def test_quantize_invalid(tmp_path):
+    """Test that quantize rejects unsupported chunks and steps."""
+    for quantize in (
+        {'particles/image': 1},
+        {'configuration/box': 1},
+        {'particles/position': 0},
+    ):
+        with pytest.raises(ValueError):
+            gsd.hoomd.open(
+                name=tmp_path / 'test_quantize_invalid.gsd', mode='w', quantize=quantize
+            )
+
+    frame = gsd.hoomd.Frame()
+    frame.particles.N = 1
+    frame.particles.position = [[1e6, 0, 0]]
+    with gsd.hoomd.open(
+        name=tmp_path / 'test_quantize_invalid.gsd',
+        mode='w',
+        quantize={'particles/position': 1e-6},
+    ) as hf, pytest.raises(ValueError):
+        hf.append(frame)
+
+
+def test_cache(tmp_path):
+    """Test the frame cache."""
+    frames = []
+    for i in range(10):
+        frame = gsd.hoomd.Frame()
+        frame.configuration.step = i
+        frame.particles.N = 100
+        frame.particles.position = numpy.full((100, 3), i, dtype=numpy.float32)
+        frame.log['value'] = [i]
+        frames.append(frame)
+
+    with gsd.hoomd.open(name=tmp_path / 'test_cache.gsd', mode='w') as hf:
+        hf.extend(frames)
+
+    with gsd.hoomd.open(name=tmp_path / 'test_cache.gsd', mode='r') as hf:
+        assert hf.cache_size == 0
+        hf[0]
+        assert hf.cache_info() == (0, 0, 0, 0)
+
+    with gsd.hoomd.open(
+        name=tmp_path / 'test_cache.gsd', mode='r', cache_size=2**20
+    ) as hf:
+        frame = hf[3]
+        assert hf.cache_info().misses == 1
+        assert not frame.particles.position.flags.writeable
+        frame.configuration.step = 1000
+
+        frame = hf[3]
+        assert hf.cache_info().hits == 1
+        assert frame.configuration.step == 3
+        numpy.testing.assert_array_equal(frame.particles.position, 3)
+        numpy.testing.assert_array_equal(frame.log['value'], [3])
+
+        for i, frame in enumerate(hf):
+            assert frame.configuration.step == i
+        info = hf.cache_info()
+        assert info.hits == 2
+        assert info.misses == 10
+        assert 0 < info.currsize <= info.maxsize
+
+        # evict all but the most recently used frames
+        frame_size = info.currsize // 10
+        hf.cache_size = frame_size * 3
+        assert hf.cache_info().currsize <= frame_size * 3
+        hf[9]
+        assert hf.cache_info().hits == 3
+        hf[0]
+        assert hf.cache_info().misses == 11
+
+        hf.cache_clear()
+        assert hf.cache_info() == (0, 0, frame_size * 3, 0)
+
+        with pytest.raises(ValueError):
+            hf.cache_size = -1
+
+
+def test_lazy(tmp_path, open_mode):
+    """Test that lazy frames match frames read eagerly."""
+    frame0 = gsd.hoomd.Frame()
+    frame0.particles.N = 4
+    frame0.particles.types = ['A', 'B']
+    frame0.particles.typeid = [0, 1, 0, 1]
+    frame0.particles.mass = [1, 2, 3, 4]
+    frame0.particles.position = numpy.arange(12, dtype=numpy.float32).reshape([4, 3])
+    frame0.bonds.N = 2
+    frame0.bonds.group = [[0, 1], [2, 3]]
+    frame0.constraints.N = 1
+    frame0.constraints.value = [1.5]
+    frame0.constraints.group = [[0, 1]]
+    frame0.state['hpmc/sphere/radius'] = [0.5, 1.0]
+    frame0.log['value/energy'] = [1.0]
+    frame0.log['particles/charge'] = [1, 2, 3, 4]
+
+    frame1 = gsd.hoomd.Frame()
+    frame1.configuration.step = 10
+    frame1.particles.N = 4
+    frame1.particles.position = -frame0.particles.position
+    frame1.log['value/energy'] = [2.0]
+
+    frame2 = gsd.hoomd.Frame()
+    frame2.configuration.step = 20
+    frame2.particles.N = 2
+
+    with gsd.hoomd.open(name=tmp_path / 'test_lazy.gsd', mode=open_mode.write) as hf:
+        hf.extend([frame0, frame1, frame2])
+
+    with gsd.hoomd.open(
+        name=tmp_path / 'test_lazy.gsd', mode=open_mode.read
+    ) as eager, gsd.hoomd.open(
+        name=tmp_path / 'test_lazy.gsd', mode=open_mode.read, lazy=True
+    ) as lazy:
+        frame = lazy[1]
+        assert 'position' not in frame.particles.__dict__
+        numpy.testing.assert_array_equal(
+            frame.particles.position, frame1.particles.position
+        )
+        assert 'position' in frame.particles.__dict__
+        assert 'mass' not in frame.particles.__dict__
+
+        for eager_frame, lazy_frame in zip(eager, lazy):
+            assert lazy_frame.configuration.step == eager_frame.configuration.step
+            for path in gsd.hoomd._LAZY_CONTAINERS:
+                eager_container = getattr(eager_frame, path)
+                lazy_container = getattr(lazy_frame, path)
+                assert lazy_container.N == eager_container.N
+                for name in eager_container._default_value:
+                    numpy.testing.assert_array_equal(
+                        getattr(lazy_container, name), getattr(eager_container, name)
+                    )
+            assert dict(lazy_frame.state).keys() == eager_frame.state.keys()
+            for key, value in eager_frame.state.items():
+                numpy.testing.assert_array_equal(lazy_frame.state[key], value)
+            assert list(lazy_frame.log) == list(eager_frame.log)
+            for key, value in eager_frame.log.items():
+                numpy.testing.assert_array_equal(lazy_frame.log[key], value)
+
+        # fields that fall back to frame 0 or the defaults are read-only
+        frame = lazy[2]
+        assert not frame.particles.mass.flags.writeable
+        numpy.testing.assert_array_equal(frame.particles.mass, [1, 1])
+        assert not frame.log['value/energy'].flags.writeable
+
+        with pytest.raises(AttributeError):
+            _ = frame.particles.not_a_field
+
+
+def test_select(tmp_path, open_mode):
+    """Test reading selected fields."""
+    frames = []
+    for i in range(6):
+        frame = gsd.hoomd.Frame()
+        frame.configuration.step = i
+        frame.configuration.box = [i + 1, i + 1, i + 1, 0, 0, 0]
+        frame.particles.N = 3
+        frame.particles.position = numpy.full((3, 3), i, dtype=numpy.float32)
+        if i == 0:
+            frame.particles.mass = [2, 2, 2]
+            frame.particles.types = ['A', 'B']
+        frame.log['value'] = [i]
+        frames.append(frame)
+
+    with gsd.hoomd.open(
+        name=tmp_path / 'test_select.gsd',
+        mode=open_mode.write,
+        quantize={'particles/position': 0.5},
+    ) as hf:
+        hf.extend(frames)
+
+    with gsd.hoomd.open(name=tmp_path / 'test_select.gsd', mode=open_mode.read) as hf:
+        view = hf.select('particles/position', 'particles/mass', 'log/value')
+        assert len(view) == 6
+        for i, frame in enumerate(view[::2]):
+            numpy.testing.assert_array_equal(frame.particles.position, 2 * i)
+            numpy.testing.assert_array_equal(frame.particles.mass, [2, 2, 2])
+            numpy.testing.assert_array_equal(frame.log['value'], [2 * i])
+            assert frame.particles.N == 3
+            assert frame.particles.velocity is None
+            assert frame.particles.types is None
+            assert frame.configuration.step is None
+            assert frame.bonds.N == 0
+
+        frame = view[-1]
+        numpy.testing.assert_array_equal(frame.particles.position, 5)
+
+        # selecting fields does not change the full frames
+        frame = hf[3]
+        assert frame.configuration.step == 3
+        assert frame.particles.types == ['A', 'B']
+        numpy.testing.assert_array_equal(frame.particles.velocity, 0)
+
+        with pytest.raises(ValueError):
+            hf.select('particles/not_a_field')
+
+    with gsd.hoomd.open(
+        name=tmp_path / 'test_select.gsd',
+        mode=open_mode.read,
+        fields=['configuration/box', 'particles/types'],
+    ) as hf:
+        for i, frame in enumerate(hf):
+            numpy.testing.assert_array_equal(
+                frame.configuration.box, [i + 1, i + 1, i + 1, 0, 0, 0]
+            )
+            assert frame.particles.types == ['A', 'B']
+            assert frame.particles.position is None
+            assert frame.log == {}
+
+
+def test_default_broadcast(tmp_path):
+    """Test that missing fields read as read-only broadcasts of the default."""
+    frame0 = gsd.hoomd.Frame()
+    frame0.particles.N = 4
+    frame0.particles.mass = [1, 2, 3, 4]
+
+    frame1 = gsd.hoomd.Frame()
+    frame1.particles.N = 1000
+
+    with gsd.hoomd.open(name=tmp_path / 'test_default.gsd', mode='w') as hf:
+        hf.extend([frame0, frame1])
+
+    with gsd.hoomd.open(name=tmp_path / 'test_default.gsd', mode='r') as hf:
+        frame = hf[1]
+        for name in ['mass', 'moment_inertia', 'image']:
+            data = getattr(frame.particles, name)
+            assert data.shape[0] == 1000
+            assert data.strides[0] == 0
+            assert not data.flags.writeable
+
+        numpy.testing.assert_array_equal(frame.particles.mass, 1)
+        numpy.testing.assert_array_equal(frame.particles.orientation[999], [1, 0, 0, 0])
+
+        with gsd.hoomd.open(name=tmp_path / 'test_copy.gsd', mode='w') as copy_hf:
+            copy_hf.extend(hf)
+
+    with gsd.hoomd.open(name=tmp_path / 'test_copy.gsd', mode='r') as hf:
+        numpy.testing.assert_array_equal(hf[0].particles.mass, [1, 2, 3, 4])
+        numpy.testing.assert_array_equal(hf[1].particles.mass, numpy.ones(1000))
+
+
+def test_append_read_only_view(tmp_path):
+    """Test that append writes changes made behind a read-only view."""
+    base = numpy.zeros([1000, 3], dtype=numpy.float32)
+    view = base.view()
+    view.flags.writeable = False
+
+    frame = gsd.hoomd.Frame()
+    frame.particles.N = 1000
+    frame.particles.position = view
+    frame.validate()
+    assert frame.particles.position is view
+
+    with gsd.hoomd.open(name=tmp_path / 'test_view.gsd', mode='w') as hf:
+        hf.append(frame)
+        hf.append(frame)
+        base[0, 0] = 5
+        hf.append(frame)
+        base[0, 0] = 0
+        base[1, 2] = 7
+        hf.append(frame)
+
+    with gsd.fl.open(name=tmp_path / 'test_view.gsd', mode='r') as f:
+        assert list(f.frames_with_chunk('particles/position')) == [2, 3]
+
+    with gsd.hoomd.open(name=tmp_path / 'test_view.gsd', mode='r') as hf:
+        assert hf[1].particles.position[0, 0] == 0
+        assert hf[2].particles.position[0, 0] == 5
+        assert hf[3].particles.position[0, 0] == 0
+        assert hf[3].particles.position[1, 2] == 7
+
+
+def test_append_reuses_comparisons(tmp_path):
+    """Test that append skips comparing arrays it appended before."""
+    position = numpy.zeros([1000, 3], dtype=numpy.float32)
+    position[:, 0] = 1
+
+    frame = gsd.hoomd.Frame()
+    frame.particles.N = 1000
+    frame.particles.position = position
+
+    with gsd.hoomd.open(name=tmp_path / 'test_reuse.gsd', mode='w') as hf:
+        hf.append(frame)
+        hf.append(frame)
+
+        compared = []
+        should_write_data = hf._should_write_data
+
+        def record(path, name, *args):
+            compared.append(path + '/' + name)
+            return should_write_data(path, name, *args)
+
+        hf._should_write_data = record
+        hf.append(frame)
+        assert 'particles/position' not in compared
+        assert 'particles/N' in compared
+
+        # changes to the sampled rows are detected
+        frame.particles.position += 1
+        hf.append(frame)
+        assert 'particles/position' in compared
+
+        # a new array is always compared
+        compared.clear()
+        changed = frame.particles.position.copy()
+        changed[1, 2] = 7
+        frame.particles.position = changed
+        hf.append(frame)
+        assert 'particles/position' in compared
+
+    with gsd.fl.open(name=tmp_path / 'test_reuse.gsd', mode='r') as f:
+        assert list(f.frames_with_chunk('particles/position')) == [0, 3, 4]
+
+    with gsd.hoomd.open(name=tmp_path / 'test_reuse.gsd', mode='r') as hf:
+        numpy.testing.assert_array_equal(hf[2].particles.position, position - 1)
+        numpy.testing.assert_array_equal(hf[3].particles.position, position)
+        numpy.testing.assert_array_equal(hf[4].particles.position, changed)
+
+
+def test_validate_state():
+    """Test that validate converts state data to the schema types and shapes."""
+    frame = gsd.hoomd.Frame()
+    frame.particles.types = ['A', 'B']
+    frame.state['hpmc/integrate/d'] = 0.5
+    frame.state['hpmc/sphere/radius'] = [1, 2]
+    frame.state['hpmc/convex_polygon/N'] = [3, 1]
+    frame.state['hpmc/convex_polygon/vertices'] = [0, 0, 1, 0, 0, 1, 2, 2]
+    frame.validate()
+
+    assert frame.state['hpmc/integrate/d'].dtype == numpy.float64
+    assert frame.state['hpmc/integrate/d'].shape == (1,)
+    assert frame.state['hpmc/sphere/radius'].dtype == numpy.float32
+    assert frame.state['hpmc/convex_polygon/N'].dtype == numpy.uint32
+    assert frame.state['hpmc/convex_polygon/vertices'].shape == (4, 2)
+
+    frame.state['hpmc/sphere/radius'] = [1, 2, 3]
+    with pytest.raises(ValueError):
+        frame.validate()
+
+    frame = gsd.hoomd.Frame()
+    frame.state['hpmc/not_a_shape/radius'] = [1]
+    with pytest.raises(RuntimeError):
+        frame.validate()
+
+    # vertices without the number of vertices are left unchanged
+    frame = gsd.hoomd.Frame()
+    frame.state['hpmc/convex_polygon/vertices'] = [[0, 0], [1, 0], [0, 1]]
+    frame.validate()
+    assert frame.state['hpmc/convex_polygon/vertices'] == [[0, 0], [1, 0], [0, 1]]
+
+
+def test_writer(tmp_path):
+    """Test writing frames with a schema bound writer."""
+    frame0 = gsd.hoomd.Frame()
+    frame0.particles.N = 4
+    frame0.particles.types = ['A', 'B']
+    frame0.particles.position = numpy.zeros([4, 3])
+    frame0.bonds.N = 2
+    frame0.bonds.group = [[0, 1], [2, 3]]
+    frame0.configuration.box = [10, 10, 0, 0, 0, 0]
+
+    with gsd.hoomd.open(name=tmp_path / 'test_writer.gsd', mode='w') as hf:
+        hf.append(frame0)
+
+        writer = hf.writer(
+            {
+                'configuration/box': (6, 'f4'),
+                'particles/position': (4, 3, 'f4'),
+                'bonds/group': (2, 2, 'i4'),
+                'angles/group': (1, 3, 'i4'),
+                'log/value': (1, 'f8'),
+            }
+        )
+        for i in range(1, 4):
+            writer.write(
+                step=i,
+                box=[10, 10, 0, 0, 0, 0],
+                position=numpy.full([4, 3], i // 2, dtype=numpy.float32),
+                bonds_group=[[0, 1], [2, 3]],
+                angles_group=[[i, i + 1, i + 2]],
+                value=[i],
+            )
+
+        with pytest.raises(TypeError):
+            writer.write(step=4, position=numpy.zeros([4, 3]))
+
+        with pytest.raises(ValueError):
+            hf.writer({'particles/position': (4, 3, 'f8')})
+        with pytest.raises(ValueError):
+            hf.writer({'particles/position': (4, 'f4')})
+        with pytest.raises(ValueError):
+            hf.writer({'particles/position': (4, 3, 'f4'), 'particles/mass': (5, 'f4')})
+        with pytest.raises(ValueError):
+            hf.writer({'particles/N': (1, 'u4')})
+        with pytest.raises(ValueError):
+            hf.writer({'particles/not_a_field': (4, 'f4')})
+
+    with gsd.hoomd.open(name=tmp_path / 'test_writer.gsd', mode='r') as hf:
+        assert len(hf) == 4
+        for i, frame in enumerate(hf[1:], start=1):
+            assert frame.configuration.step == i
+            assert frame.configuration.dimensions == 2
+            assert frame.particles.types == ['A', 'B']
+            numpy.testing.assert_array_equal(frame.particles.position, i // 2)
+            numpy.testing.assert_array_equal(frame.bonds.group, [[0, 1], [2, 3]])
+            numpy.testing.assert_array_equal(frame.angles.group, [[i, i + 1, i + 2]])
+            numpy.testing.assert_array_equal(frame.log['value'], [i])
+
+    with gsd.fl.open(name=tmp_path / 'test_writer.gsd', mode='r') as f:
+        assert list(f.frames_with_chunk('particles/position')) == [2, 3]
+        assert list(f.frames_with_chunk('particles/N')) == [0]
+        assert list(f.frames_with_chunk('bonds/group')) == [0]
+        assert list(f.frames_with_chunk('configuration/box')) == [0]
+        assert list(f.frames_with_chunk('configuration/dimensions')) == [0]
+        assert list(f.frames_with_chunk('angles/N')) == [1, 2, 3]
+
+
+def test_writer_append(tmp_path):
+    """Test appending frames with the declared fields of a writer."""
+    with gsd.hoomd.open(name=tmp_path / 'test_writer_append.gsd', mode='w') as hf:
+        writer = hf.writer(
+            {
+                'particles/position': (4, 3, 'f4'),
+                'state/hpmc/sphere/radius': (1, 'f4'),
+                'log/value': (1, 'f8'),
+            }
+        )
+        for i in range(3):
+            frame = gsd.hoomd.Frame()
+            frame.configuration.step = i
+            frame.particles.N = 4
+            frame.particles.types = ['A']
+            frame.particles.position = numpy.full([4, 3], i, dtype=numpy.float32)
+            frame.state['hpmc/sphere/radius'] = numpy.array([0.5], dtype=numpy.float32)
+            frame.log['value'] = numpy.array([i], dtype=numpy.float64)
+            writer.append(frame)
+
+        frame.particles.position = numpy.zeros([4, 3])
+        with pytest.raises(ValueError):
+            writer.append(frame)
+        frame.particles.position = numpy.zeros([4, 3], dtype=numpy.float32).T.copy().T
+        with pytest.raises(ValueError):
+            writer.append(frame)
+        frame.particles.position = numpy.zeros([4, 3], dtype=numpy.float32)
+        frame.particles.N = 5
+        with pytest.raises(ValueError):
+            writer.append(frame)
+        frame.particles.N = 4
+        del frame.log['value']
+        with pytest.raises(ValueError):
+            writer.append(frame)
+        frame.log['value'] = numpy.array([0], dtype=numpy.float64)
+        frame.state['not_a_state'] = numpy.array([0])
+        with pytest.raises(RuntimeError):
+            writer.append(frame)
+
+    with gsd.hoomd.open(name=tmp_path / 'test_writer_append.gsd', mode='r') as hf:
+        assert len(hf) == 3
+        for i, frame in enumerate(hf):
+            assert frame.configuration.step == i
+            numpy.testing.assert_array_equal(frame.particles.position, i)
+            numpy.testing.assert_array_equal(frame.state['hpmc/sphere/radius'], [0.5])
+            numpy.testing.assert_array_equal(frame.log['value'], [i])
+
+
+def test_read_frame_detach(tmp_path, open_mode):
+    """Test that small fields do not share memory with per-element arrays."""
+    frame = gsd.hoomd.Frame()
+    frame.configuration.box = [2, 3, 4, 0, 0, 0]
+    frame.particles.N = 100
+    frame.particles.position = numpy.ones([100, 3])
+    frame.log['value'] = [1.5]
+    frame.log['per_particle'] = numpy.arange(2000)
+
+    with gsd.hoomd.open(name=tmp_path / 'test_detach.gsd', mode=open_mode.write) as hf:
+        hf.file.write_chunk(name='other/chunk', data=numpy.zeros(10))
+        hf.append(frame)
+
+    with gsd.hoomd.open(name=tmp_path / 'test_detach.gsd', mode=open_mode.read) as hf:
+        read = hf[0]
+        position = read.particles.position
+        for data in (read.configuration.box, read.log['value']):
+            assert data.flags.owndata
+            assert not numpy.shares_memory(data, position)
+        numpy.testing.assert_array_equal(read.configuration.box, [2, 3, 4, 0, 0, 0])
+        numpy.testing.assert_array_equal(read.log['value'], [1.5])
+        numpy.testing.assert_array_equal(read.log['per_particle'], numpy.arange(2000))